@@ -0,0 +1,28 @@
+"""
+Call Access — who may watch a call, or download what it left behind.
+
+Every call has an observe token, sent to the rep in its ``status``
+message. It opens ``/ws/observe/{session_id}`` while the call is live, and
+the call's journal and audio (``/api/calls/{session_id}/...``) once it has
+ended. ``SUPERVISOR_TOKEN`` opens every call. A token is passed as
+``?token=``.
+
+Only a SHA-256 digest of a call's token is kept with its journal and its
+audio, so reading those files does not give the token away.
+"""
+
+import hashlib
+import secrets
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def allowed(token: str | None, supervisor_token: str = "", digest: str | None = None) -> bool:
+    """Whether ``token`` is the supervisor's or the one whose digest is ``digest``."""
+    if not token:
+        return False
+    if supervisor_token and secrets.compare_digest(token.encode(), supervisor_token.encode()):
+        return True
+    return bool(digest) and secrets.compare_digest(token_digest(token), digest)
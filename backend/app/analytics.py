@@ -0,0 +1,391 @@
+"""
+Call Analytics — a deterministic post-call summary from the call's own events.
+
+The end-of-call summary used to be whatever the model recollected when it
+was asked to call ``save_call_summary()``. Now the server keeps a
+``CallTimeline`` for every call: the dashboard messages that
+``_send_dashboard`` also journals, stored as a few NumPy columns. When the
+call ends, ``analyze()`` turns the timeline into a summary in
+milliseconds, with no model involved:
+
+  - talk ratio overall and per minute, from the measured ``talk_ratio``
+    pushes (cumulative speech seconds per side), or from transcript
+    word counts when the audio gave no split;
+  - sentiment curve: the ``update_dashboard`` sentiment as a step
+    function (positive 1, neutral 0, negative -1) sampled at the end of
+    each minute, with its time-weighted mean;
+  - dashboard scores: the last value and the mean of each;
+  - objections per minute and per category (``log_objection`` calls plus
+    local hints the model never resolved, so nothing counts twice);
+  - longest monologue and response latencies, from final transcripts.
+    These need two separate speakers, so practice calls only: a live
+    call's one mic hears both sides;
+  - coach latency: from a final transcript to the next coaching tool call.
+
+Transcripts only carry the time they were finalized, so a stretch of
+speech is taken to start ``words / WORDS_PER_SECOND`` earlier.
+
+``CallTimeline.from_journal()`` rebuilds a timeline from a stored call
+journal (``app.journal``), so a finished call can be scored again offline
+with the same code. The timeline ends at the journal's ``call_analytics``
+record, like the live analysis did.
+
+``local_call_summary()`` reshapes the analytics into a
+``save_call_summary`` record. It is sent when the model does not deliver
+its own summary in time (``app.shutdown``).
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from app.metrics import REGISTRY
+from app.prompts.objections import OBJECTION_CATEGORIES
+
+CALL_ANALYTICS_SECONDS = REGISTRY.histogram(
+    "lsc_call_analytics_seconds",
+    "Time to compute one call's post-call analytics from its timeline.",
+)
+
+WORDS_PER_SECOND = 2.5
+
+TRANSCRIPT = 0
+DASHBOARD = 1
+OBJECTION = 2
+HINT = 3
+TALK = 4
+TOOL = 5  # Other coaching tool calls
+COACH_TOOLS = frozenset({"update_dashboard", "log_objection", "get_coaching_tip"})
+
+INPUT = 0
+OUTPUT = 1
+SENTIMENTS = {"negative": -1.0, "neutral": 0.0, "positive": 1.0}
+SCORES = ("discovery_score", "rapport_score", "objection_score", "next_steps_score")
+CATEGORIES = list(OBJECTION_CATEGORIES)  # Ends with "custom"
+_CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+
+# values columns: sentiment + scores for DASHBOARD rows, rep/prospect
+# seconds for TALK rows
+_VALUES = 1 + len(SCORES)
+
+
+def _round(value, digits: int = 1):
+    return None if value is None or math.isnan(value) else round(float(value), digits)
+
+
+class CallTimeline:
+    """One call's dashboard events as growable NumPy columns."""
+
+    def __init__(self, mode: str = "live", started: float | None = None, capacity: int = 256):
+        self.mode = mode
+        # Millisecond timestamps, like the call journal's
+        self.started = round(time.time() if started is None else started, 3)
+        self.ended: float | None = None  # Seconds; set when the call ends
+        self.n = 0
+        self.t = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.source = np.zeros(capacity, dtype=np.int8)  # Transcripts: INPUT / OUTPUT
+        self.code = np.zeros(capacity, dtype=np.int8)  # Objections, hints: category
+        self.words = np.zeros(capacity, dtype=np.int32)
+        self.coach = np.zeros(capacity, dtype=bool)  # A coaching tool call
+        self.resolved = np.zeros(capacity, dtype=bool)  # Hints the model resolved
+        self.values = np.full((capacity, _VALUES), np.nan)
+        self._hints: dict[str, int] = {}  # Hint id → row
+        self.key_moments: list[dict] = []
+
+    # ── Building ────────────────────────────────────────────────────────
+    def _row(self, t: float, kind: int) -> int:
+        if self.n == len(self.t):
+            grow = len(self.t)
+            for name in ("t", "kind", "source", "code", "words", "coach", "resolved"):
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate((column, np.zeros(grow, dtype=column.dtype))))
+            self.values = np.concatenate((self.values, np.full((grow, _VALUES), np.nan)))
+        row = self.n
+        self.t[row] = t - self.started
+        self.kind[row] = kind
+        self.n += 1
+        return row
+
+    def add(self, message: dict, t: float | None = None) -> None:
+        """Record one outbound dashboard message (as ``_send_dashboard`` sees it)."""
+        t = round(time.time() if t is None else t, 3)
+        kind = message.get("type")
+        if kind == "transcript":
+            words = len((message.get("text") or "").split())
+            if message.get("partial") or not words:
+                return
+            row = self._row(t, TRANSCRIPT)
+            self.source[row] = OUTPUT if message.get("source") == "output" else INPUT
+            self.words[row] = words
+        elif kind == "tool_call":
+            name = message.get("name")
+            args = message.get("args") or {}
+            if name == "update_dashboard":
+                row = self._row(t, DASHBOARD)
+                self.values[row, 0] = SENTIMENTS.get(args.get("sentiment"), np.nan)
+                for i, field in enumerate(SCORES, 1):
+                    value = args.get(field, -1)
+                    if isinstance(value, (int, float)) and value >= 0:
+                        self.values[row, i] = value
+                if args.get("key_moment"):
+                    self.key_moments.append({
+                        "t": round(t - self.started, 1),
+                        "type": args.get("key_moment_type") or "positive",
+                        "text": args["key_moment"],
+                    })
+            elif name == "log_objection":
+                row = self._row(t, OBJECTION)
+                self.code[row] = _CATEGORY_CODES.get(args.get("objection_type"), _CATEGORY_CODES["custom"])
+            elif name in COACH_TOOLS:
+                row = self._row(t, TOOL)
+            else:
+                return
+            self.coach[row] = name in COACH_TOOLS
+        elif kind == "objection_hint":
+            row = self._row(t, HINT)
+            self.code[row] = _CATEGORY_CODES.get(message.get("category"), _CATEGORY_CODES["custom"])
+            self._hints[message.get("id")] = row
+        elif kind == "objection_hint_resolved":
+            row = self._hints.pop(message.get("id"), None)
+            if row is not None:
+                self.resolved[row] = True  # The model's log_objection counts instead
+        elif kind == "talk_ratio":
+            if message.get("rep_pct") is None:
+                return  # No rep/prospect split measured (yet)
+            row = self._row(t, TALK)
+            self.values[row, 0] = message.get("rep_seconds") or 0.0
+            self.values[row, 1] = message.get("prospect_seconds") or 0.0
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "CallTimeline":
+        """Rebuild a timeline from call journal records (``{"t": ..., "e": {...}}``)."""
+        timeline = None
+        for record in records:
+            event = record["e"]
+            if timeline is None:
+                mode = event.get("mode", "live") if event.get("type") == "call_started" else "live"
+                timeline = cls(mode, started=record["t"])
+            if event.get("type") == "call_analytics":
+                timeline.ended = record["t"] - timeline.started
+                break
+            timeline.add(event, record["t"])
+        return timeline if timeline is not None else cls(started=0.0)
+
+    @classmethod
+    def from_journal(cls, path: str | Path) -> "CallTimeline":
+        with Path(path).open("rb") as fh:
+            return cls.from_records(json.loads(line) for line in fh if line.strip())
+
+    # ── Analysis ────────────────────────────────────────────────────────
+    def analyze(self, now: float | None = None) -> dict:
+        """The call's summary; everything up to ``now`` (default: the end)."""
+        began = time.perf_counter()
+        if self.ended is None:
+            self.ended = round(time.time() if now is None else now, 3) - self.started
+        n = self.n
+        t, kind = self.t[:n], self.kind[:n]
+        duration = max(self.ended, float(t.max()) if n else 0.0, 1e-3)
+        minutes = max(1, math.ceil(duration / 60))
+        minute = np.minimum((t // 60).astype(np.int64), minutes - 1)
+        minute_ends = np.minimum(np.arange(1, minutes + 1) * 60.0, duration)
+
+        talk = self._talk(t, kind, minute, minutes, minute_ends)
+        sentiment = self._sentiment(t, kind, duration, minute_ends)
+        scores = self._scores(kind)
+        objections = self._objections(kind, minute, minutes, duration)
+        turns = self._turns(t, kind)
+
+        finals = [s["final"] for s in scores.values() if s["final"] is not None]
+        overall = round(sum(finals) / len(finals)) if finals else None
+        CALL_ANALYTICS_SECONDS.observe(time.perf_counter() - began)
+        return {
+            "mode": self.mode,
+            "duration_s": round(duration, 1),
+            "overall_score": overall,
+            "summary": self._sentence(duration, talk, sentiment, objections, overall),
+            "talk_ratio": talk,
+            "sentiment": sentiment,
+            "scores": scores,
+            "objections": objections,
+            **turns,
+            "key_moments": self.key_moments,
+        }
+
+    def _talk(self, t, kind, minute, minutes, minute_ends) -> dict:
+        rows = np.flatnonzero(kind == TALK)
+        if len(rows):
+            # Cumulative speech seconds: the last push at or before each minute's end
+            idx = np.searchsorted(t[rows], minute_ends, side="right") - 1
+            cumulative = np.where(idx[:, None] >= 0, self.values[rows[np.maximum(idx, 0)], :2], 0.0)
+            per_minute = np.diff(cumulative, axis=0, prepend=0.0)
+            total = self.values[rows[-1], :2]
+            source = "measured"
+        else:
+            rows = np.flatnonzero(kind == TRANSCRIPT)
+            if self.mode != "practice" or not len(rows):
+                return {"rep_pct": None, "prospect_pct": None, "source": None, "per_minute": []}
+            # Practice mode: the mic is the rep, the model is the prospect
+            per_minute = np.stack([
+                np.bincount(minute[rows], weights=(self.source[rows] == side) * self.words[rows],
+                            minlength=minutes)
+                for side in (INPUT, OUTPUT)
+            ], axis=1)
+            total = per_minute.sum(axis=0)
+            source = "transcript_words"
+        spoken = per_minute.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rep_pct = np.where(spoken > 0, 100 * per_minute[:, 0] / spoken, np.nan)
+        overall = 100 * total[0] / total.sum() if total.sum() > 0 else None
+        return {
+            "rep_pct": None if overall is None else round(overall),
+            "prospect_pct": None if overall is None else 100 - round(overall),
+            "source": source,
+            "per_minute": [None if math.isnan(v) else round(v) for v in rep_pct],
+        }
+
+    def _sentiment(self, t, kind, duration, minute_ends) -> dict:
+        rows = np.flatnonzero((kind == DASHBOARD) & ~np.isnan(self.values[:self.n, 0]))
+        # A step function that starts neutral at 0 s
+        at = np.concatenate(([0.0], t[rows]))
+        level = np.concatenate(([0.0], self.values[rows, 0]))
+        curve = level[np.searchsorted(at, minute_ends, side="right") - 1]
+        held = np.diff(np.concatenate((at, [duration])))
+        mean = float(np.dot(level, held) / duration) if duration > 0 else 0.0
+        final = {v: k for k, v in SENTIMENTS.items()}[float(level[-1])]
+        return {
+            "final": final,
+            "mean": round(mean, 2) + 0.0,
+            "lowest_minute": int(np.argmin(curve)) if len(rows) else None,
+            "per_minute": [float(v) for v in curve],
+        }
+
+    def _scores(self, kind) -> dict:
+        values = self.values[:self.n][kind == DASHBOARD, 1:]
+        scores = {}
+        for i, field in enumerate(SCORES):
+            column = values[:, i][~np.isnan(values[:, i])]
+            scores[field.removesuffix("_score")] = {
+                "final": int(column[-1]) if len(column) else None,
+                "mean": _round(column.mean()) if len(column) else None,
+            }
+        return scores
+
+    def _objections(self, kind, minute, minutes, duration) -> dict:
+        counted = (kind == OBJECTION) | ((kind == HINT) & ~self.resolved[:self.n])
+        per_minute = np.bincount(minute[counted], minlength=minutes)
+        by_category = np.bincount(self.code[:self.n][counted], minlength=len(CATEGORIES))
+        return {
+            "count": int(per_minute.sum()),
+            "per_minute": per_minute.tolist(),
+            "per_minute_avg": round(float(per_minute.sum()) / (duration / 60), 2),
+            "peak_minute": int(np.argmax(per_minute)) if per_minute.any() else None,
+            "by_category": {CATEGORIES[i]: int(by_category[i]) for i in np.flatnonzero(by_category)},
+        }
+
+    def _turns(self, t, kind) -> dict:
+        rows = np.flatnonzero(kind == TRANSCRIPT)
+        tt, source, words = t[rows], self.source[rows], self.words[rows].astype(np.float64)
+        began = tt - words / WORDS_PER_SECOND  # When each transcript started, roughly
+        result = {"longest_monologue": None, "response_latency": None}
+
+        coach = np.flatnonzero(self.coach[:self.n])
+        if len(coach) and len(rows):
+            # Each coaching tool call against the final transcript just before it
+            before = np.searchsorted(tt, t[coach], side="right") - 1
+            lag = t[coach][before >= 0] - tt[before[before >= 0]]
+            result["coach_latency"] = _latency(lag)
+        else:
+            result["coach_latency"] = None
+
+        if self.mode != "practice" or not len(rows) or (source == source[0]).all():
+            return result
+        speakers = ("rep", "prospect")
+        # Runs of consecutive transcripts from the same speaker
+        starts = np.flatnonzero(np.diff(source, prepend=-1) != 0)
+        ends = np.append(starts[1:], len(rows)) - 1
+        lengths = tt[ends] - began[starts]
+        run_words = np.add.reduceat(words, starts)
+        longest = int(np.argmax(lengths))
+        result["longest_monologue"] = {
+            "speaker": speakers[source[starts[longest]]],
+            "seconds": round(float(lengths[longest]), 1),
+            "words": int(run_words[longest]),
+            "at_s": round(float(began[starts[longest]]), 1),
+        }
+        # From the end of one speaker's run to the start of the other's
+        gap = np.maximum(began[starts[1:]] - tt[ends[:-1]], 0.0)
+        responder = source[starts[1:]]
+        result["response_latency"] = {
+            speakers[side]: _latency(gap[responder == side]) for side in (INPUT, OUTPUT)
+        }
+        return result
+
+    def _sentence(self, duration, talk, sentiment, objections, overall) -> str:
+        length = f"{duration / 60:.0f}-minute" if duration >= 60 else f"{duration:.0f}-second"
+        parts = [f"{length} {self.mode} call"]
+        if talk["rep_pct"] is not None:
+            parts.append(f"rep talked {talk['rep_pct']}% of the time")
+        if objections["count"]:
+            top = max(objections["by_category"].items(), key=lambda kv: kv[1])[0]
+            parts.append(f"{objections['count']} objections (mostly {top})")
+        else:
+            parts.append("no objections")
+        parts.append(f"sentiment ended {sentiment['final']}")
+        sentence = ", ".join(parts) + "."
+        if overall is not None:
+            sentence += f" Average dashboard score {overall}/100."
+        return sentence[0].upper() + sentence[1:]
+
+
+def _latency(values: np.ndarray) -> dict | None:
+    if not len(values):
+        return None
+    return {
+        "median_s": round(float(np.median(values)), 2),
+        "p90_s": round(float(np.percentile(values, 90)), 2),
+        "count": int(len(values)),
+    }
+
+
+def prompt_facts(analytics: dict) -> str:
+    """The measured numbers, for the model's optional ``save_call_summary()``."""
+    facts = {
+        "duration_minutes": round(analytics["duration_s"] / 60, 1),
+        "rep_talk_pct": analytics["talk_ratio"]["rep_pct"],
+        "prospect_talk_pct": analytics["talk_ratio"]["prospect_pct"],
+        "objections": analytics["objections"]["by_category"],
+        "final_sentiment": analytics["sentiment"]["final"],
+    }
+    return json.dumps(facts)
+
+
+def local_call_summary(analytics: dict) -> dict:
+    """A ``save_call_summary``-shaped record built from the analytics alone.
+
+    Sent in place of the model's summary when the model does not deliver
+    one in time, so the CRM webhook still gets a call summary.
+    """
+    talk = analytics["talk_ratio"]
+    scores = analytics["scores"]
+    return {
+        "type": "call_summary",
+        "timestamp": time.time(),
+        "source": "local",
+        "summary": analytics["summary"],
+        "overall_score": analytics["overall_score"],
+        "outcome": None,  # Only the model can judge that
+        "scores": {
+            "overall": analytics["overall_score"],
+            **{field: value["final"] for field, value in scores.items()},
+        },
+        "objections_faced": list(analytics["objections"]["by_category"]),
+        "objection_count": analytics["objections"]["count"],
+        "key_moments": [moment["text"] for moment in analytics["key_moments"]],
+        "next_steps": [],
+        "talk_ratio": {"rep": talk["rep_pct"], "prospect": talk["prospect_pct"], "source": talk["source"]},
+    }
@@ -0,0 +1,158 @@
+"""
+Barge-In Detector — stop the AI prospect the moment the rep talks over it.
+
+In practice mode the model's audio reaches the browser in chunks and is
+scheduled back to back, so anything already queued keeps playing after the
+rep starts to interrupt. Two signals trigger a barge-in:
+
+  - ``voice``: the rep's mic shows ``min_speech_ms`` of continuous speech
+    (VAD frames, see ``app/vad.py``) while prospect audio is still playing
+    on the client — the fast path, usually a few hundred ms ahead of the
+    model;
+  - ``model``: a Live event arrives with ``interrupted`` set.
+
+On a trigger the ``on_trigger`` callback cancels queued outbound audio and
+sends an ``interrupt`` message, and the client flushes its playback buffer
+and answers ``playback_flushed``. After a ``voice`` trigger, model audio
+from the interrupted answer is discarded until the model confirms with
+``interrupted`` or ``turn_complete``, or ``resume_after`` seconds pass
+(a false trigger then only costs the tail of one answer).
+
+Latency is recorded in ``lsc_barge_in_seconds``: ``detect`` is speech
+onset → trigger, ``flush`` is trigger → client ack (one round trip), and
+``total`` is speech onset → silence on the client.
+"""
+
+import time
+
+import numpy as np
+
+from app.metrics import LATENCY_BUCKETS, REGISTRY
+from app.vad import FRAME_MS
+
+BARGE_INS = REGISTRY.counter("lsc_barge_ins_total", "Barge-ins by trigger.", ["reason"])
+BARGE_IN_SECONDS = REGISTRY.histogram(
+    "lsc_barge_in_seconds",
+    "Barge-in latency: speech onset → trigger (detect), trigger → client flushed (flush), "
+    "onset → flushed (total).",
+    ["stage"],
+    buckets=(0.025,) + LATENCY_BUCKETS[3:],
+)
+SUPPRESSED_AUDIO_BYTES = REGISTRY.counter(
+    "lsc_barge_in_suppressed_bytes_total", "Model audio discarded after a barge-in."
+)
+
+
+class BargeInDetector:
+    """Per-session barge-in state for practice mode."""
+
+    def __init__(
+        self,
+        on_trigger,
+        min_speech_ms: int = 200,
+        resume_after: float = 1.5,
+        output_rate: int = 24000,
+        clock=time.monotonic,
+    ):
+        self._on_trigger = on_trigger
+        self._min_frames = max(1, min_speech_ms // FRAME_MS)
+        self.resume_after = resume_after
+        self._output_bytes_per_second = output_rate * 2
+        self._clock = clock
+
+        self._playing_until = 0.0  # Estimated end of client playback
+        self._run = 0  # Consecutive speech frames on the mic
+        self._onset: float | None = None  # Estimated start of the current speech run
+        self._suppress_until = 0.0
+        self._triggered_at: float | None = None
+        self._trigger_onset: float | None = None
+
+        self.triggers = {"voice": 0, "model": 0}
+        self.suppressed_bytes = 0
+        self.flushed_ms = 0
+        self.latencies: list[float] = []
+
+    @property
+    def playing(self) -> bool:
+        return self._clock() < self._playing_until
+
+    @property
+    def suppressing(self) -> bool:
+        return self._clock() < self._suppress_until
+
+    # ── Model side ──
+    def allow_output(self, nbytes: int) -> bool:
+        """Whether a chunk of model audio should be sent; tracks playback if so."""
+        now = self._clock()
+        if self.suppressing:
+            self.suppressed_bytes += nbytes
+            SUPPRESSED_AUDIO_BYTES.inc(nbytes)
+            return False
+        start = max(now, self._playing_until)
+        self._playing_until = start + nbytes / self._output_bytes_per_second
+        return True
+
+    def on_model_interrupted(self) -> None:
+        """The model stopped its answer; what comes next is a new one."""
+        if self.suppressing:
+            self._suppress_until = 0.0  # Confirms our voice trigger
+            return
+        if self.playing:
+            self._trigger("model")
+
+    def on_turn_complete(self) -> None:
+        self._suppress_until = 0.0
+
+    # ── Rep side ──
+    def on_input_frames(self, speech: np.ndarray) -> None:
+        """Take the VAD speech mask of one mic chunk."""
+        if not speech.size:
+            return
+        if not speech[-1]:
+            self._run, self._onset = 0, None
+            return
+        # Length of the speech run at the end of this chunk
+        tail = speech.size if speech.all() else speech.size - 1 - int(np.flatnonzero(~speech)[-1])
+        if tail < speech.size or self._onset is None:
+            # The run started inside this chunk, ``tail`` frames before its end
+            self._run = tail
+            self._onset = self._clock() - tail * FRAME_MS / 1000
+        else:
+            self._run += tail
+        if self._run >= self._min_frames and self.playing and not self.suppressing:
+            self._suppress_until = self._clock() + self.resume_after
+            self._trigger("voice")
+
+    def _trigger(self, reason: str) -> None:
+        now = self._clock()
+        self._playing_until = now
+        self._triggered_at = now
+        self._trigger_onset = self._onset
+        self.triggers[reason] += 1
+        BARGE_INS.labels(reason).inc()
+        if self._onset is not None:
+            BARGE_IN_SECONDS.labels("detect").observe(now - self._onset)
+        self._on_trigger(reason)
+
+    # ── Client side ──
+    def on_flushed(self, flushed_ms: float = 0) -> None:
+        """The client reported its playback buffer empty."""
+        if self._triggered_at is None:
+            return
+        now = self._clock()
+        BARGE_IN_SECONDS.labels("flush").observe(now - self._triggered_at)
+        if self._trigger_onset is not None:
+            total = now - self._trigger_onset
+            BARGE_IN_SECONDS.labels("total").observe(total)
+            self.latencies.append(total)
+        self.flushed_ms += flushed_ms
+        self._triggered_at = self._trigger_onset = None
+
+    def stats(self) -> dict:
+        return {
+            "voice": self.triggers["voice"],
+            "model": self.triggers["model"],
+            "suppressed_bytes": self.suppressed_bytes,
+            "flushed_ms": round(self.flushed_ms),
+            "p50_ms": round(1000 * float(np.median(self.latencies))) if self.latencies else None,
+        }
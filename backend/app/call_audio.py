@@ -0,0 +1,310 @@
+"""
+Call Audio — both sides of a call, mixed into one stereo WAV for review.
+
+A call started with ``"record_audio": true`` in its config (or every call,
+with ``RECORD_AUDIO=true``) keeps its audio in
+``<AUDIO_RECORDING_DIR>/<session_id>.wav``:
+
+    left   the rep's mic PCM (16 kHz from the browser)
+    right  the model's audio as the client played it (24 kHz, practice mode)
+
+Both channels are 16-bit at ``OUTPUT_SAMPLE_RATE``. Mic audio is
+resampled on the way in, with linear interpolation that carries over
+chunk boundaries.
+
+The hot path only appends ``(channel, arrival time, rate, pcm)`` to a
+list. A background task hands each batch to a worker thread every
+``flush_interval`` seconds. The worker resamples, lines the chunk up on
+the call's timeline and copies it straight into a memory-mapped file. The
+file is preallocated ``block_seconds`` at a time, so a long call never
+holds more than one batch in memory. Chunk placement:
+
+  - Each channel has a cursor, the first frame after its last chunk.
+    A chunk that arrives where the cursor expects it (within ``slack``)
+    goes right at the cursor, so jitter never tears up continuous speech.
+    One that arrives later starts at its arrival time, and the gap stays
+    silent (the preallocated file is all zeros).
+  - Mic chunks were captured over the time just before they arrived.
+    Model audio starts playing when it arrives, or after what is already
+    queued, because the model streams faster than real time.
+  - A barge-in (``interrupt()``) flushes the client's playback buffer. It
+    also cuts the model channel back to that moment, so the recording
+    does not keep an answer nobody heard.
+
+While recording, the file is ``<session_id>.wav.part``. ``close()``
+writes the WAV header, trims the preallocated tail and renames the file.
+``GET /api/calls/{session_id}/audio`` serves finished files as a
+``FileResponse``, with Range requests. The file is sent in chunks, or
+zero-copy where the ASGI server offers ``http.response.pathsend``. It is
+never read whole. The route needs the call's observe token: its digest is
+written next to the WAV as ``<session_id>.access`` when recording starts
+(see ``app/access.py``), and read back by ``audio_access()``.
+"""
+
+import asyncio
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.journal import SESSION_ID
+from app.metrics import REGISTRY
+from app.protocol import OUTPUT_SAMPLE_RATE
+
+CALL_AUDIO_WRITE_SECONDS = REGISTRY.histogram(
+    "lsc_call_audio_write_seconds",
+    "Time to resample and write one batch of a call's audio into its WAV file.",
+)
+
+REP = 0  # Left
+MODEL = 1  # Right
+CUT = 2  # Barge-in marker on the model channel
+
+CHANNELS = 2
+SAMPLE_BYTES = 2
+FRAME_BYTES = CHANNELS * SAMPLE_BYTES
+WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def wav_header(rate: int, data_bytes: int) -> bytes:
+    return WAV_HEADER.pack(
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, 1, CHANNELS, rate, rate * FRAME_BYTES, FRAME_BYTES, SAMPLE_BYTES * 8,
+        b"data", data_bytes,
+    )
+
+
+def audio_state(directory: str | os.PathLike, session_id: str) -> str | None:
+    """``"live"`` while a call's audio is being written, ``"stored"`` after."""
+    if not SESSION_ID.match(session_id):
+        return None
+    path = Path(directory) / f"{session_id}.wav"
+    if path.exists():
+        return "stored"
+    if path.with_suffix(".wav.part").exists():
+        return "live"
+    return None
+
+
+def audio_access(directory: str | os.PathLike, session_id: str) -> str | None:
+    """The token digest kept with a call's audio, if any."""
+    if not SESSION_ID.match(session_id):
+        return None
+    try:
+        return (Path(directory) / f"{session_id}.access").read_text().strip() or None
+    except OSError:
+        return None
+
+
+class _Resampler:
+    """Linear-interpolation resampler that carries state across chunks."""
+
+    def __init__(self, src: int, dst: int):
+        self.src = src
+        self.dst = dst
+        self.step = src / dst
+        self._pos = 0.0  # Next output sample, in input samples from the next chunk's start
+        self._last = 0.0  # Last input sample seen (position -1)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        if self.src == self.dst or not len(x):
+            return x
+        n = len(x)
+        count = int((n - 1 - self._pos) // self.step) + 1 if self._pos <= n - 1 else 0
+        positions = self._pos + self.step * np.arange(count)
+        out = np.interp(positions, np.arange(-1, n), np.concatenate(([self._last], x)))
+        self._pos += count * self.step - n
+        self._last = float(x[-1])
+        return out
+
+
+class _Track:
+    """One channel's resampler and write cursor (worker thread only)."""
+
+    __slots__ = ("resampler", "cursor")
+
+    def __init__(self):
+        self.resampler: _Resampler | None = None
+        self.cursor = 0  # Frames
+
+    def resample(self, pcm: bytes, rate: int, out_rate: int) -> np.ndarray:
+        samples = np.frombuffer(pcm, dtype="<i2")
+        if rate == out_rate:
+            return samples
+        if self.resampler is None or self.resampler.src != rate:
+            self.resampler = _Resampler(rate, out_rate)
+        out = self.resampler(samples.astype(np.float32))
+        return np.clip(np.rint(out), -32768, 32767).astype("<i2")
+
+
+class CallAudioRecorder:
+    """Writes one call's stereo WAV from a background writer."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        rate: int = OUTPUT_SAMPLE_RATE,
+        flush_interval: float = 0.5,
+        block_seconds: float = 60.0,
+        slack: float = 0.25,
+        max_pending_bytes: int = 8 * 1024 * 1024,
+        clock=time.monotonic,
+        access: str | None = None,
+    ):
+        self.path = Path(path)
+        self.access = access  # Token digest for the download route
+        self.rate = rate
+        self.flush_interval = flush_interval
+        self.block_frames = int(block_seconds * rate)
+        self.slack = int(slack * rate)
+        self.max_pending_bytes = max_pending_bytes
+        self._clock = clock
+        self._started = clock()
+        self._pending: list[tuple[int, float, int, bytes]] = []
+        self._pending_bytes = 0
+        self._tracks = (_Track(), _Track())
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Future | None = None
+        self._fd: int | None = None
+        self._map: mmap.mmap | None = None
+        self._capacity = 0  # Frames mapped
+        self.frames = 0  # Frames of audio written (the end of the later track)
+        self.received_bytes = 0
+        self.dropped_bytes = 0
+        self.cuts = 0
+        self.batches = 0
+
+    @property
+    def part_path(self) -> Path:
+        return self.path.with_suffix(".wav.part")
+
+    def start(self) -> "CallAudioRecorder":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.access:
+            self.path.with_suffix(".access").write_text(self.access)
+        self._fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._grow(self.block_frames)
+        self._task = asyncio.create_task(self._run(), name=f"call-audio-{self.path.stem}")
+        return self
+
+    # ── Hot path: buffer only ───────────────────────────────────────────
+    def _add(self, channel: int, pcm: bytes, rate: int) -> None:
+        if self._pending_bytes >= self.max_pending_bytes:
+            self.dropped_bytes += len(pcm)  # The gap stays silent
+            return
+        self._pending.append((channel, self._clock() - self._started, rate, pcm))
+        self._pending_bytes += len(pcm)
+        self.received_bytes += len(pcm)
+
+    def rep(self, pcm: bytes, rate: int) -> None:
+        """Mic PCM as it arrived from the client."""
+        if pcm:
+            self._add(REP, pcm, rate)
+
+    def model(self, pcm: bytes, rate: int) -> None:
+        """Model audio as it was sent to the client."""
+        if pcm:
+            self._add(MODEL, pcm, rate)
+
+    def interrupt(self) -> None:
+        """The client flushed its playback: drop model audio queued past now."""
+        self._pending.append((CUT, self._clock() - self._started, 0, b""))
+
+    # ── Writer ──────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Shielded: close() must not interrupt a write halfway
+            self._flushing = asyncio.ensure_future(self._flush())
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        started = time.perf_counter()
+        await asyncio.to_thread(self._write, batch)
+        CALL_AUDIO_WRITE_SECONDS.observe(time.perf_counter() - started)
+        self.batches += 1
+
+    def _grow(self, frames: int) -> None:
+        """Extend the file and its mapping to hold at least ``frames``."""
+        capacity = -(-frames // self.block_frames) * self.block_frames
+        size = WAV_HEADER.size + capacity * FRAME_BYTES
+        if self._map is not None:
+            self._map.close()
+        try:
+            os.posix_fallocate(self._fd, 0, size)
+        except (AttributeError, OSError):
+            os.ftruncate(self._fd, size)  # Sparse, but still reads as zeros
+        self._map = mmap.mmap(self._fd, size)
+        self._capacity = capacity
+
+    def _write(self, batch: list[tuple[int, float, int, bytes]]) -> None:
+        for channel, t, rate, pcm in batch:
+            arrived = int(t * self.rate)
+            if channel == CUT:
+                track = self._tracks[MODEL]
+                if track.cursor > arrived:
+                    self._view()[arrived:track.cursor, MODEL] = 0
+                    track.cursor = arrived
+                    self.cuts += 1
+                continue
+            track = self._tracks[channel]
+            samples = track.resample(pcm, rate, self.rate)
+            n = len(samples)
+            if not n:
+                continue
+            # Mic audio was captured just before it arrived; model audio plays from now
+            due = arrived - n if channel == REP else arrived
+            at = track.cursor if due < track.cursor + self.slack else due
+            if at + n > self._capacity:
+                self._grow(at + n)
+            self._view()[at:at + n, channel] = samples
+            track.cursor = at + n
+            self.frames = max(self.frames, track.cursor)
+
+    def _view(self) -> np.ndarray:
+        """The mapped frames as an (n, 2) int16 array (dropped before a remap)."""
+        return np.ndarray(
+            (self._capacity, CHANNELS), dtype="<i2", buffer=self._map, offset=WAV_HEADER.size
+        )
+
+    def _finish(self) -> None:
+        data_bytes = self.frames * FRAME_BYTES
+        self._map[:WAV_HEADER.size] = wav_header(self.rate, data_bytes)
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        os.ftruncate(self._fd, WAV_HEADER.size + data_bytes)
+        os.fsync(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        os.replace(self.part_path, self.path)
+
+    async def close(self) -> None:
+        """Write what is buffered and turn the file into a finished WAV."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        await self._flush()
+        await asyncio.to_thread(self._finish)
+
+    def stats(self) -> dict:
+        return {
+            "seconds": round(self.frames / self.rate, 1),
+            "received_bytes": self.received_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "cuts": self.cuts,
+            "batches": self.batches,
+        }
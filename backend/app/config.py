@@ -22,9 +22,124 @@ USE_VERTEX = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "FALSE").upper() == "TRUE"
 # n8n webhook for post-call CRM logging
 N8N_WEBHOOK_URL = os.getenv("N8N_WEBHOOK_URL", "")
 
+# Background webhook delivery (see app/delivery.py)
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "10"))
+WEBHOOK_BATCH_WINDOW = float(os.getenv("WEBHOOK_BATCH_WINDOW", "2.0"))
+WEBHOOK_MAX_RETRIES = int(os.getenv("WEBHOOK_MAX_RETRIES", "5"))
+WEBHOOK_SPILL_PATH = os.getenv("WEBHOOK_SPILL_PATH", "data/webhook_spill.ndjson")
+# Also send each call's local analytics, as call_analytics_batch POSTs
+WEBHOOK_SEND_ANALYTICS = os.getenv("WEBHOOK_SEND_ANALYTICS", "0").lower() in ("1", "true", "yes")
+
 # Firestore collection for call logs
 FIRESTORE_COLLECTION = "call_logs"
 
+# Local append-only event journal per call (see app/journal.py); "" disables it
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "data/journal")
+JOURNAL_COMMIT_MS = float(os.getenv("JOURNAL_COMMIT_MS", "200"))
+JOURNAL_SEGMENT_BYTES = int(os.getenv("JOURNAL_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+JOURNAL_MAX_CALLS = int(os.getenv("JOURNAL_MAX_CALLS", "1000"))
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() in ("1", "true", "yes")
+
+# Post-call summary: local analytics (see app/analytics.py) always run at the
+# end of a call; live calls also ask the model for save_call_summary() unless
+# this is off (clients can override per call with "model_summary")
+MODEL_CALL_SUMMARY = os.getenv("MODEL_CALL_SUMMARY", "true").lower() in ("1", "true", "yes")
+# Seconds to wait for the model's summary before falling back to the local one
+CALL_SUMMARY_DEADLINE_SECONDS = float(os.getenv("CALL_SUMMARY_DEADLINE_SECONDS", "10"))
+
+# Session store bounds (see app/sessions.py)
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_MAX_EVENTS = int(os.getenv("SESSION_MAX_EVENTS", "2000"))
+# Approximate event bytes held by all sessions, and by any one session
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+SESSION_MAX_BYTES_PER_SESSION = int(os.getenv("SESSION_MAX_BYTES_PER_SESSION", str(16 * 1024 * 1024)))
+
+# Live backend: "gemini" (real Live API), "mock" (offline, see app/mock_live.py)
+# or "replay" (a recorded call, see app/recording.py)
+LIVE_BACKEND = os.getenv("LIVE_BACKEND", "gemini").lower()
+MOCK_LIVE_SCRIPT = os.getenv("MOCK_LIVE_SCRIPT", "")
+MOCK_FIRST_EVENT_MS = float(os.getenv("MOCK_FIRST_EVENT_MS", "300"))
+MOCK_STEP_MS = float(os.getenv("MOCK_STEP_MS", "40"))
+MOCK_TURN_AUDIO_SECONDS = float(os.getenv("MOCK_TURN_AUDIO_SECONDS", "4"))
+MOCK_CONTEXT_MS_PER_1K = float(os.getenv("MOCK_CONTEXT_MS_PER_1K", "0"))
+
+# Call recording and offline replay (see app/recording.py). Calls are
+# recorded when their config asks for it, or all of them with RECORD_CALLS.
+# LIVE_BACKEND=replay plays REPLAY_RECORDING back instead of the model,
+# REPLAY_SPEED times real time (0: as fast as possible)
+RECORD_CALLS = os.getenv("RECORD_CALLS", "false").lower() in ("1", "true", "yes")
+RECORDING_DIR = os.getenv("RECORDING_DIR", "data/recordings")
+REPLAY_RECORDING = os.getenv("REPLAY_RECORDING", "")
+REPLAY_SPEED = float(os.getenv("REPLAY_SPEED", "1.0"))
+
+# Stereo WAV of a call's audio for review (see app/call_audio.py): opt-in
+# per call with "record_audio": true, or every call with RECORD_AUDIO
+RECORD_AUDIO = os.getenv("RECORD_AUDIO", "false").lower() in ("1", "true", "yes")
+AUDIO_RECORDING_DIR = os.getenv("AUDIO_RECORDING_DIR", "data/audio")
+
+# Offline re-scoring of archived calls (see app/rescore.py): the scorer
+# ("gemini", "gemini:<model>", "stub" or "module:factory"), worker processes
+# (0: one per core) and the directory the Parquet results go to
+RESCORE_SCORER = os.getenv("RESCORE_SCORER", "gemini")
+RESCORE_WORKERS = int(os.getenv("RESCORE_WORKERS", "0"))
+RESCORE_OUTPUT_DIR = os.getenv("RESCORE_OUTPUT_DIR", "data/scores")
+
+# Voice-activity gate on inbound mic audio (see app/vad.py).
+# Mode "off" | "gate" | "thin"; clients can override per session via config.vad
+VAD_MODE = os.getenv("VAD_MODE", "off").lower()
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-50"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "600"))
+# Live API input audio is billed at 32 tokens per second
+AUDIO_TOKENS_PER_SECOND = float(os.getenv("AUDIO_TOKENS_PER_SECOND", "32"))
+
+# Seconds between server-measured talk_ratio pushes (see app/talk.py)
+TALK_RATIO_INTERVAL = float(os.getenv("TALK_RATIO_INTERVAL", "5"))
+
+# Screen-share frame pipeline (see app/frames.py)
+SCREEN_MAX_DIM = int(os.getenv("SCREEN_MAX_DIM", "768"))
+SCREEN_DEDUPE_DISTANCE = int(os.getenv("SCREEN_DEDUPE_DISTANCE", "6"))
+SCREEN_MIN_INTERVAL = float(os.getenv("SCREEN_MIN_INTERVAL", "1.0"))
+SCREEN_TOKENS_PER_MINUTE = float(os.getenv("SCREEN_TOKENS_PER_MINUTE", "6000"))
+SCREEN_MAX_PIXELS = int(os.getenv("SCREEN_MAX_PIXELS", "40000000"))
+
+# Per-connection outbound send queue (see app/outbound.py)
+OUTBOUND_MAX_QUEUE = int(os.getenv("OUTBOUND_MAX_QUEUE", "256"))
+
+# Inbound mic audio re-framing and bounded queue (see app/inbound.py)
+AUDIO_FRAME_MS = int(os.getenv("AUDIO_FRAME_MS", "100"))
+INBOUND_MAX_FRAMES = int(os.getenv("INBOUND_MAX_FRAMES", "50"))
+INBOUND_UPSTREAM_DEPTH = int(os.getenv("INBOUND_UPSTREAM_DEPTH", "8"))
+INBOUND_OVERFLOW = os.getenv("INBOUND_OVERFLOW", "signal")
+
+# Practice-mode barge-in (see app/bargein.py)
+BARGE_IN_MIN_SPEECH_MS = int(os.getenv("BARGE_IN_MIN_SPEECH_MS", "200"))
+BARGE_IN_RESUME_SECONDS = float(os.getenv("BARGE_IN_RESUME_SECONDS", "1.5"))
+
+# How long a dropped call waits for its client to reconnect (see app/resume.py)
+RESUME_GRACE_SECONDS = float(os.getenv("RESUME_GRACE_SECONDS", "30"))
+
+# Long-call mode: context compression + periodic call-state block (see app/longcall.py)
+LONG_CALL = os.getenv("LONG_CALL", "0").lower() in ("1", "true", "yes")
+LONG_CALL_TRIGGER_TOKENS = int(os.getenv("LONG_CALL_TRIGGER_TOKENS", "32000"))
+LONG_CALL_TARGET_TOKENS = int(os.getenv("LONG_CALL_TARGET_TOKENS", "16000"))
+LONG_CALL_SUMMARY_SECONDS = float(os.getenv("LONG_CALL_SUMMARY_SECONDS", "300"))
+
+# Read-only viewers on /ws/observe/{session_id} (see app/fanout.py)
+OBSERVER_MAX_QUEUE = int(os.getenv("OBSERVER_MAX_QUEUE", "128"))
+OBSERVER_MAX_RESYNCS = int(os.getenv("OBSERVER_MAX_RESYNCS", "3"))
+OBSERVER_SEND_TIMEOUT = float(os.getenv("OBSERVER_SEND_TIMEOUT", "5"))
+# Opens every call (viewers, journals, audio) and the floor view; otherwise
+# the call's own observe token is needed, and the floor view stays closed
+SUPERVISOR_TOKEN = os.getenv("SUPERVISOR_TOKEN", "")
+
+# Team floor view, /api/floor and /ws/floor (see app/floor.py): a call is
+# in trouble below this score or above this rep share of talk time. Both
+# routes need ?token=SUPERVISOR_TOKEN
+FLOOR_TROUBLE_SCORE = int(os.getenv("FLOOR_TROUBLE_SCORE", "40"))
+FLOOR_TROUBLE_REP_TALK_PCT = int(os.getenv("FLOOR_TROUBLE_REP_TALK_PCT", "70"))
+FLOOR_PUSH_SECONDS = float(os.getenv("FLOOR_PUSH_SECONDS", "1"))
+
 # Server
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8080"))
@@ -0,0 +1,176 @@
+"""
+Dashboard State — fold the call's dashboard on the server, send deltas.
+
+Every ``update_dashboard`` call used to reach the browser twice (as
+``tool_call`` and again inside ``tool_result``), together with hints, talk
+ratios and transcripts, and the frontend rebuilt the dashboard from the
+whole stream. ``DashboardState`` does that fold once per call on the
+server. Clients that announce ``"dashboard": "delta"`` in their config then
+receive only what changed:
+
+    {"type":"dashboard_delta","v":7,
+     "set":  {"sentiment":"negative","scores":{"rapport":70},"talkRatio":{...}},
+     "add":  {"coachingTips":[...],"objections":[...],"keyMoments":[...],"transcript":[...]},
+     "drop": {"objections":["<hint id>"]}}
+
+``set`` replaces fields (``scores`` key by key), ``add`` appends to lists
+(coaching tips are shown newest first, so clients prepend those), and
+``drop`` removes provisional objection hints by id. Every section is
+optional. Field names match the frontend's ``DashboardState``.
+
+``v`` increases by one per delta. A client that sees a gap (or joins late,
+or resumes) asks for ``{"type":"snapshot"}`` and receives the whole state:
+
+    {"type":"dashboard_snapshot","v":7,"state":{...}}
+
+The fold runs for every call, delta client or not, so a snapshot is
+always available.
+"""
+
+import time
+from collections import deque
+
+# Tools whose calls and results are fully covered by deltas
+FOLDED_TOOLS = frozenset({"update_dashboard", "log_objection"})
+SCORE_FIELDS = {
+    "discovery_score": "discovery",
+    "rapport_score": "rapport",
+    "objection_score": "objection",
+    "next_steps_score": "nextSteps",
+}
+
+
+def folded(message: dict) -> bool:
+    """Whether delta clients get ``message`` as a delta instead of raw."""
+    kind = message.get("type")
+    if kind in ("tool_call", "tool_result"):
+        return message.get("name") in FOLDED_TOOLS
+    if kind == "transcript":
+        return not message.get("partial")
+    return kind in ("objection_hint", "objection_hint_resolved", "talk_ratio")
+
+
+class DashboardState:
+    """Per-call dashboard folded from the outbound message stream."""
+
+    def __init__(self, max_tips: int = 10, max_transcript: int = 300):
+        self.version = 0
+        self.coaching_tips: deque[str] = deque(maxlen=max_tips)  # Newest first
+        self.sentiment = "neutral"
+        # None until the model scores a field, so a first score of 0 is a change
+        self.scores: dict[str, int | None] = dict.fromkeys(SCORE_FIELDS.values())
+        self.talk_ratio: dict = {"rep": 50, "prospect": 50}
+        self.objections: list[dict] = []
+        self.key_moments: list[dict] = []
+        self.transcript: deque[dict] = deque(maxlen=max_transcript)
+
+    def apply(self, message: dict) -> dict | None:
+        """Fold one outbound message; return the delta, or None if nothing changed."""
+        kind = message.get("type")
+        if kind == "tool_call":
+            if message.get("name") == "update_dashboard":
+                return self._update_dashboard(message.get("args") or {})
+            if message.get("name") == "log_objection":
+                args = message.get("args") or {}
+                return self._add_objection({
+                    "type": args.get("objection_type", "custom"),
+                    "text": args.get("objection_text", ""),
+                    "suggestedResponse": args.get("suggested_response", ""),
+                    "timestamp": time.time(),
+                })
+        elif kind == "objection_hint":
+            return self._add_objection({
+                "type": message["category"],
+                "text": message["text"],
+                "suggestedResponse": message["framework"],
+                "timestamp": time.time(),
+                "hintId": message["id"],
+            })
+        elif kind == "objection_hint_resolved":
+            hint_id = message["id"]
+            kept = [o for o in self.objections if o.get("hintId") != hint_id]
+            if len(kept) != len(self.objections):
+                self.objections = kept
+                return self._delta(dropped={"objections": [hint_id]})
+        elif kind == "talk_ratio":
+            if message.get("rep_pct") is not None and message.get("prospect_pct") is not None:
+                talk = {"rep": message["rep_pct"], "prospect": message["prospect_pct"], "measured": True}
+                if talk != self.talk_ratio:
+                    self.talk_ratio = talk
+                    return self._delta(changed={"talkRatio": talk})
+        elif kind == "transcript":
+            text = message.get("text") or ""
+            if not message.get("partial") and text.strip():
+                entry = {"text": text, "source": message["source"], "timestamp": time.time()}
+                self.transcript.append(entry)
+                return self._delta(added={"transcript": [entry]})
+        return None
+
+    def _update_dashboard(self, args: dict) -> dict | None:
+        changed: dict = {}
+        added: dict = {}
+        tip = args.get("coaching_tip")
+        if tip and (not self.coaching_tips or self.coaching_tips[0] != tip):
+            self.coaching_tips.appendleft(tip)
+            added["coachingTips"] = [tip]
+        sentiment = args.get("sentiment")
+        if sentiment and sentiment != self.sentiment:
+            self.sentiment = changed["sentiment"] = sentiment
+        scores = {}
+        for arg, field in SCORE_FIELDS.items():
+            value = args.get(arg, -1)
+            if isinstance(value, (int, float)) and value >= 0 and value != self.scores[field]:
+                self.scores[field] = scores[field] = int(value)
+        if scores:
+            changed["scores"] = scores
+        rep = args.get("rep_talk_pct", -1)
+        # The server's own measurement (talk_ratio) wins over the model's guess
+        if isinstance(rep, (int, float)) and rep >= 0 and not self.talk_ratio.get("measured"):
+            talk = {"rep": int(rep), "prospect": 100 - int(rep)}
+            if talk != self.talk_ratio:
+                self.talk_ratio = changed["talkRatio"] = talk
+        if args.get("key_moment"):
+            moment = {
+                "text": args["key_moment"],
+                "type": args.get("key_moment_type") or "positive",
+                "timestamp": time.time(),
+            }
+            self.key_moments.append(moment)
+            added["keyMoments"] = [moment]
+        if not changed and not added:
+            return None
+        return self._delta(changed, added)
+
+    def _add_objection(self, objection: dict) -> dict:
+        self.objections.append(objection)
+        return self._delta(added={"objections": [objection]})
+
+    def _delta(self, changed: dict | None = None, added: dict | None = None, dropped: dict | None = None) -> dict:
+        self.version += 1
+        delta = {"type": "dashboard_delta", "v": self.version}
+        if changed:
+            delta["set"] = changed
+        if added:
+            delta["add"] = added
+        if dropped:
+            delta["drop"] = dropped
+        return delta
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "dashboard_snapshot",
+            "v": self.version,
+            "state": {
+                "coachingTips": list(self.coaching_tips),
+                "sentiment": self.sentiment,
+                # Unscored fields show as 0, like the frontend's initial state
+                "scores": {field: value or 0 for field, value in self.scores.items()},
+                "talkRatio": dict(self.talk_ratio),
+                "objections": list(self.objections),
+                "keyMoments": list(self.key_moments),
+                "transcript": list(self.transcript),
+            },
+        }
+
+    def stats(self) -> dict:
+        return {"version": self.version, "objections": len(self.objections)}
@@ -0,0 +1,318 @@
+"""
+Webhook Delivery Queue — non-blocking, batched CRM webhook delivery.
+
+``save_call_summary`` runs inside the agent's tool execution, on (or next
+to) the event loop that serves every live call. It must never wait on the
+network. Instead it hands the summary to ``WebhookDelivery.enqueue()``,
+which returns immediately. A background worker then:
+
+  1. collects up to ``batch_size`` summaries (or whatever arrives within
+     ``batch_window`` seconds) into one POST
+  2. delivers via a pooled ``httpx.AsyncClient`` with bounded retries and
+     exponential backoff
+  3. puts a batch that still failed back on the queue after a growing
+     delay (up to ``requeue_max`` seconds), so an outage longer than the
+     retry window is ridden out rather than waiting for a restart
+
+The NDJSON spill file is an append-only log. ``enqueue()`` appends the
+summary before it returns, so a crash never loses it. Each delivery
+appends ``{"id": ..., "done": true}`` markers for the delivered summaries.
+Once ``compact_after`` markers have piled up, the file is rewritten with
+only what is still pending. ``start()`` replays the log and queues what
+is left.
+
+Batch payload, one POST per payload ``type`` in the batch:
+    {"type": "call_summary_batch", "count": N, "items": [<call_data>, ...]}
+    {"type": "call_analytics_batch", "count": N, "items": [<analytics>, ...]}
+
+Local post-call analytics are only sent with ``WEBHOOK_SEND_ANALYTICS``.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+from app.config import (
+    N8N_WEBHOOK_URL,
+    WEBHOOK_BATCH_SIZE,
+    WEBHOOK_BATCH_WINDOW,
+    WEBHOOK_MAX_RETRIES,
+    WEBHOOK_SPILL_PATH,
+)
+
+
+class WebhookDelivery:
+    """Background batched webhook sender with a disk-backed spill file."""
+
+    def __init__(
+        self,
+        url: str = "",
+        spill_path: str | os.PathLike = "",
+        batch_size: int = 10,
+        batch_window: float = 2.0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 5.0,
+        max_queue: int = 10_000,
+        requeue_max: float = 300.0,
+        compact_after: int = 1000,
+    ):
+        self.url = url
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.requeue_max = requeue_max
+        self.compact_after = compact_after
+
+        # id → payload for everything not yet delivered (mirrors the spill file)
+        self._pending: dict[str, dict] = {}
+        self._pending_lock = threading.Lock()
+        self._spill_lock = threading.Lock()  # Appends vs. compaction
+        self._done_markers = 0  # In the spill file since its last compaction
+        self._failed_in_a_row = 0
+        self._queue: asyncio.Queue[str] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._worker: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed_batches = 0
+        self.requeued = 0
+        self.retries = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed_batches": self.failed_batches,
+            "requeued": self.requeued,
+            "retries": self.retries,
+        }
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    async def start(self) -> None:
+        """Start the worker and re-queue anything left in the spill file."""
+        if not self.enabled or self._worker is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        )
+
+        recovered = await asyncio.to_thread(self._load_spill)
+        with self._pending_lock:
+            self._pending.update(recovered)
+            pending_ids = list(self._pending)
+        await asyncio.to_thread(self._compact_spill)
+        for item_id in pending_ids:
+            self._queue.put_nowait(item_id)
+        if recovered:
+            print(f"Webhook delivery: recovered {len(recovered)} spilled summaries")
+
+        self._worker = asyncio.create_task(self._run(), name="webhook-delivery")
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Flush what we can within ``drain_timeout``, then persist the rest."""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await self._client.aclose()
+        self._client = None
+        await asyncio.to_thread(self._compact_spill)
+
+    # ── Producer side ───────────────────────────────────────────────────
+    def enqueue(self, payload: dict) -> str:
+        """Queue ``payload`` for delivery. Never blocks; safe from any thread."""
+        item_id = uuid.uuid4().hex
+        with self._pending_lock:
+            self._pending[item_id] = payload
+        self.enqueued += 1
+        # On disk before we return; a worker that isn't running (tool
+        # invoked outside the server) finds it on the next start()
+        self._append_spill([{"id": item_id, "payload": payload}])
+
+        loop = self._loop
+        if loop is None or self._worker is None:
+            return item_id
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._put(item_id)
+        else:
+            # Sync tools may run in ADK's tool thread pool
+            loop.call_soon_threadsafe(self._put, item_id)
+        return item_id
+
+    def _put(self, item_id: str) -> None:
+        if self._worker is None:
+            return  # Stopped; the spill file has it
+        try:
+            self._queue.put_nowait(item_id)
+        except asyncio.QueueFull:
+            # Stays in _pending and the spill file; try again later
+            print("Webhook delivery queue full; summary kept in spill file")
+            self._loop.call_later(self.backoff_max, self._put, item_id)
+
+    def _requeue(self, batch: list[str]) -> None:
+        with self._pending_lock:
+            batch = [item_id for item_id in batch if item_id in self._pending]
+        self.requeued += len(batch)
+        for item_id in batch:
+            self._put(item_id)
+
+    # ── Worker ──────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                delivered = await self._deliver(batch)
+                failed = [item_id for item_id in batch if item_id not in delivered]
+                with self._pending_lock:
+                    for item_id in delivered:
+                        self._pending.pop(item_id, None)
+                self.delivered += len(delivered)
+                if delivered:
+                    await asyncio.to_thread(self._mark_done, delivered)
+                if not failed:
+                    self._failed_in_a_row = 0
+                else:
+                    # Still pending; back on the queue once the outage may be over
+                    self.failed_batches += 1
+                    self._failed_in_a_row += 1
+                    delay = min(self.requeue_max, self.backoff_max * 2 ** (self._failed_in_a_row - 1))
+                    self._loop.call_later(delay, self._requeue, failed)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: list[str]) -> list[str]:
+        """POST the batch, one request per payload type; return the ids delivered."""
+        with self._pending_lock:
+            items = {i: self._pending[i] for i in batch if i in self._pending}
+        delivered = [i for i in batch if i not in items]  # Nothing left to send
+        groups: dict[str, list[str]] = {}
+        for item_id, payload in items.items():
+            groups.setdefault(payload.get("type") or "call_summary", []).append(item_id)
+        for kind, ids in groups.items():
+            if await self._post(kind, [items[i] for i in ids]):
+                delivered.extend(ids)
+        return delivered
+
+    async def _post(self, kind: str, items: list[dict]) -> bool:
+        body = {"type": f"{kind}_batch", "count": len(items), "items": items}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._client.post(self.url, json=body)
+                if response.status_code < 500 and response.status_code != 429:
+                    # 4xx (other than 429) won't succeed on retry either
+                    return response.is_success
+            except httpx.HTTPError as exc:
+                print(f"Webhook delivery error: {exc}")
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(min(self.backoff_max, self.backoff_base * 2**attempt))
+        return False
+
+    # ── Spill file ──────────────────────────────────────────────────────
+    def _load_spill(self) -> dict[str, dict]:
+        if self.spill_path is None or not self.spill_path.exists():
+            return {}
+        recovered = {}
+        with self.spill_path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                    if record.get("done"):
+                        recovered.pop(record["id"], None)
+                    else:
+                        recovered[record["id"]] = record["payload"]
+                except (ValueError, KeyError, AttributeError):
+                    continue  # Torn final line after a crash
+        return recovered
+
+    def _append_spill(self, records: list[dict]) -> None:
+        if self.spill_path is None:
+            return
+        data = "".join(json.dumps(record) + "\n" for record in records)
+        with self._spill_lock:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.spill_path.open("a", encoding="utf-8") as fh:
+                fh.write(data)
+
+    def _mark_done(self, batch: list[str]) -> None:
+        self._append_spill([{"id": item_id, "done": True} for item_id in batch])
+        self._done_markers += len(batch)
+        if self._done_markers >= self.compact_after:
+            self._compact_spill()
+
+    def _compact_spill(self) -> None:
+        """Rewrite the spill file with only the pending summaries."""
+        if self.spill_path is None:
+            return
+        with self._spill_lock:
+            with self._pending_lock:
+                records = [{"id": k, "payload": v} for k, v in self._pending.items()]
+            self._done_markers = 0
+            if not records:
+                self.spill_path.unlink(missing_ok=True)
+                return
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.spill_path.with_suffix(self.spill_path.suffix + ".tmp")
+            with tmp.open("w", encoding="utf-8") as fh:
+                for record in records:
+                    fh.write(json.dumps(record) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.spill_path)
+
+
+webhook_delivery = WebhookDelivery(
+    url=N8N_WEBHOOK_URL,
+    spill_path=WEBHOOK_SPILL_PATH,
+    batch_size=WEBHOOK_BATCH_SIZE,
+    batch_window=WEBHOOK_BATCH_WINDOW,
+    max_retries=WEBHOOK_MAX_RETRIES,
+)
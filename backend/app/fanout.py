@@ -0,0 +1,237 @@
+"""
+Supervisor Fan-Out — any number of read-only viewers per live call.
+
+``/ws`` is one client per call; managers who want to watch a rep's call
+connect to ``/ws/observe/{session_id}`` instead. Each call has a
+``CallBroadcast``. It receives the call's dashboard deltas (see
+``app/dashboard_state.py``) and partial transcripts, serializes each one
+exactly once, and appends the same frame to every viewer's queue. A viewer
+starts from a snapshot of the dashboard, so joining late costs one frame,
+not a replay.
+
+Viewers never hold up the rep or ``run_live``: ``publish()`` is
+synchronous and only appends to bounded per-viewer queues, and each
+viewer's socket is written by its own task. A viewer that falls
+``max_queue`` frames behind is *degraded*: its queue is thrown away and
+replaced by a fresh snapshot (the deltas it skipped are folded in there).
+A viewer that needs more than ``max_resyncs`` of those without catching
+up in between, or whose socket blocks a single send for ``send_timeout``
+seconds, is disconnected.
+
+Watching a call needs a token, passed as ``?token=`` and checked before the
+socket is accepted: the call's own observe token (sent to the rep in its
+``status`` message, to share with a manager), or ``SUPERVISOR_TOKEN``,
+which opens every call.
+"""
+
+import asyncio
+import json
+import secrets
+from collections import deque
+
+from app.metrics import REGISTRY
+
+OBSERVERS = REGISTRY.gauge("lsc_observers", "Read-only viewers connected to live calls.")
+OBSERVER_FRAMES = REGISTRY.counter(
+    "lsc_observer_frames_total",
+    "Frames to viewers: sent, skipped by a resync, or lost with a dropped viewer.",
+    ["outcome"],
+)
+OBSERVER_DISCONNECTS = REGISTRY.counter(
+    "lsc_observer_disconnects_total",
+    "Viewers that left: closed by the viewer, call ended, too slow, or refused (bad token).",
+    ["reason"],
+)
+
+
+class Viewer:
+    """One observer socket with its own bounded frame queue."""
+
+    def __init__(self, ws, max_queue: int, max_resyncs: int, send_timeout: float):
+        self.ws = ws
+        self.max_queue = max_queue
+        self.max_resyncs = max_resyncs
+        self.send_timeout = send_timeout
+        self._queue: deque[str] = deque()
+        self._wakeup = asyncio.Event()
+        self._finishing = False
+        self._behind = 0  # Resyncs since the queue last drained
+        self.resyncs = 0
+        self.sent = 0
+        self.closed_reason: str | None = None
+
+    def push(self, frame: str, snapshot) -> None:
+        if self.closed_reason is not None or self._finishing:
+            return
+        if len(self._queue) >= self.max_queue:
+            OBSERVER_FRAMES.labels("skipped").inc(len(self._queue))
+            self._queue.clear()
+            self._behind += 1
+            self.resyncs += 1
+            if self._behind > self.max_resyncs:
+                self.close("slow")
+                return
+            frame = snapshot()  # Already includes the frame being pushed
+        self._queue.append(frame)
+        self._wakeup.set()
+
+    def finish(self, frame: str) -> None:
+        """Send ``frame`` after what is queued, then stop."""
+        if self.closed_reason is None and not self._finishing:
+            self._queue.append(frame)
+            self._finishing = True
+            self._wakeup.set()
+
+    def close(self, reason: str) -> None:
+        """Stop now; whatever is still queued is dropped."""
+        if self.closed_reason is None:
+            self.closed_reason = reason
+            OBSERVER_FRAMES.labels("dropped").inc(len(self._queue))
+            self._queue.clear()
+            self._wakeup.set()
+
+    def _stalled(self, task: asyncio.Task) -> None:
+        self.close("slow")
+        task.cancel()
+
+    async def serve(self) -> None:
+        """Write queued frames until the viewer is closed or finished."""
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue and self.closed_reason is None:
+                frame = self._queue.popleft()
+                # A timer rather than wait_for: wait_for wraps every send in
+                # a task, which under load costs more than the send itself
+                watchdog = loop.call_later(self.send_timeout, self._stalled, task)
+                try:
+                    await self.ws.send_text(frame)
+                except asyncio.CancelledError:
+                    if self.closed_reason == "slow":
+                        return
+                    raise
+                except Exception:
+                    self.close("closed")  # Viewer's socket is gone
+                    return
+                finally:
+                    watchdog.cancel()
+                self.sent += 1
+                OBSERVER_FRAMES.labels("sent").inc()
+            if self.closed_reason is not None:
+                return
+            if self._finishing:
+                self.closed_reason = "call_ended"
+                return
+            self._behind = 0
+
+
+class CallBroadcast:
+    """Serialize-once pub/sub for one call's viewers."""
+
+    def __init__(
+        self,
+        session_id: str,
+        snapshot,
+        max_queue: int = 128,
+        max_resyncs: int = 3,
+        send_timeout: float = 5.0,
+        token: str | None = None,
+    ):
+        self.session_id = session_id
+        self._snapshot = snapshot  # fn() -> dashboard_snapshot message
+        self.token = token or secrets.token_urlsafe(16)
+        self.max_queue = max_queue
+        self.max_resyncs = max_resyncs
+        self.send_timeout = send_timeout
+        self.viewers: set[Viewer] = set()
+        self.published = 0
+        self.joined = 0
+
+    def snapshot_frame(self) -> str:
+        return json.dumps(self._snapshot())
+
+    def publish(self, message: dict) -> None:
+        if not self.viewers:
+            return
+        frame = json.dumps(message)  # Once, however many viewers there are
+        self.published += 1
+        for viewer in self.viewers:
+            viewer.push(frame, self.snapshot_frame)
+
+    def join(self, ws) -> Viewer:
+        viewer = Viewer(ws, self.max_queue, self.max_resyncs, self.send_timeout)
+        viewer.push(self.snapshot_frame(), self.snapshot_frame)
+        self.viewers.add(viewer)
+        self.joined += 1
+        OBSERVERS.inc()
+        return viewer
+
+    def leave(self, viewer: Viewer) -> None:
+        if viewer in self.viewers:
+            self.viewers.discard(viewer)
+            OBSERVERS.dec()
+            viewer.close("closed")
+            OBSERVER_DISCONNECTS.labels(viewer.closed_reason).inc()
+
+    def close(self) -> None:
+        """The call ended: viewers get what is queued, then ``call_ended``."""
+        frame = json.dumps({"type": "call_ended", "session_id": self.session_id})
+        for viewer in self.viewers:
+            viewer.finish(frame)
+
+
+class Broadcaster:
+    """session_id → ``CallBroadcast`` for every call that can be observed."""
+
+    def __init__(
+        self,
+        max_queue: int = 128,
+        max_resyncs: int = 3,
+        send_timeout: float = 5.0,
+        supervisor_token: str = "",
+    ):
+        self.max_queue = max_queue
+        self.max_resyncs = max_resyncs
+        self.send_timeout = send_timeout
+        self.supervisor_token = supervisor_token
+        self._calls: dict[str, CallBroadcast] = {}
+        self.refused = 0
+
+    def open(self, session_id: str, snapshot, token: str | None = None) -> CallBroadcast:
+        broadcast = CallBroadcast(
+            session_id, snapshot, self.max_queue, self.max_resyncs, self.send_timeout, token
+        )
+        self._calls[session_id] = broadcast
+        return broadcast
+
+    def get(self, session_id: str) -> CallBroadcast | None:
+        return self._calls.get(session_id)
+
+    def authorize(self, session_id: str, token: str | None) -> bool:
+        """Whether ``token`` may watch ``session_id``: its observe token or the supervisor's."""
+        allowed = False
+        if token:
+            token_bytes = token.encode()
+            broadcast = self._calls.get(session_id)
+            if self.supervisor_token:
+                allowed = secrets.compare_digest(token_bytes, self.supervisor_token.encode())
+            if not allowed and broadcast is not None:
+                allowed = secrets.compare_digest(token_bytes, broadcast.token.encode())
+        if not allowed:
+            self.refused += 1
+            OBSERVER_DISCONNECTS.labels("refused").inc()
+        return allowed
+
+    def close(self, session_id: str) -> None:
+        broadcast = self._calls.pop(session_id, None)
+        if broadcast is not None:
+            broadcast.close()
+
+    def stats(self) -> dict:
+        return {
+            "calls": len(self._calls),
+            "viewers": sum(len(b.viewers) for b in self._calls.values()),
+            "refused": self.refused,
+        }
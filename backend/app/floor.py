@@ -0,0 +1,177 @@
+"""
+Floor View — live aggregates across every active call on this node.
+
+Team leads want one screen for the whole floor: how many calls are live,
+how they are scoring on average, which objections are coming up, how the
+prospects feel, and which calls need someone to step in. Rebuilding that
+from every session on each request would cost O(calls) per read, and
+hundreds of calls are live at once.
+
+``FloorView`` is maintained incrementally instead. Each call's dashboard
+deltas (see ``app/dashboard_state.py``) already say exactly what changed,
+so ``on_delta`` moves the running totals by the difference between the
+call's old and new values. Reads then cost O(objection categories + calls
+in trouble), however many calls are live. The serialized snapshot is
+cached per version, so ``/api/floor`` and every ``/ws/floor`` client share
+one ``json.dumps``.
+
+A call is *in trouble* while the prospect's sentiment is negative, any
+score it has been given is below ``trouble_score``, or the rep holds more
+than ``trouble_rep_pct`` percent of the talk time.
+
+Calls in trouble are listed by session id so a lead can open them, which
+is why both routes are for ``SUPERVISOR_TOKEN`` holders only.
+"""
+
+import json
+import time
+from collections import Counter
+
+from app.dashboard_state import SCORE_FIELDS
+from app.prompts.objections import OBJECTION_CATEGORIES
+
+SCORES = tuple(SCORE_FIELDS.values())
+
+
+class _CallFloor:
+    """One call's current contribution to the floor totals."""
+
+    __slots__ = ("mode", "sentiment", "scores", "rep_pct", "objections", "hints", "trouble", "since")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.sentiment = "neutral"
+        self.scores: dict[str, int] = {}  # Only fields the model has scored
+        self.rep_pct: int | None = None
+        self.objections: Counter = Counter()
+        self.hints: dict[str, str] = {}  # Provisional hint id → category
+        self.trouble: tuple[str, ...] = ()
+        self.since = 0.0  # When the call got into trouble
+
+
+class FloorView:
+    """Running totals over the active calls, updated from dashboard deltas."""
+
+    def __init__(self, trouble_score: int = 40, trouble_rep_pct: int = 70):
+        self.trouble_score = trouble_score
+        self.trouble_rep_pct = trouble_rep_pct
+        self.version = 0
+        self._calls: dict[str, _CallFloor] = {}
+        self._modes: Counter = Counter()
+        self._score_sum = dict.fromkeys(SCORES, 0)
+        self._score_n = dict.fromkeys(SCORES, 0)
+        self._objections = dict.fromkeys(OBJECTION_CATEGORIES, 0)
+        self._sentiments: Counter = Counter()
+        self._trouble: dict[str, _CallFloor] = {}
+        self._frame: tuple[int, str] = (-1, "")
+
+    def open(self, session_id: str, mode: str) -> None:
+        call = self._calls[session_id] = _CallFloor(mode)
+        self._modes[mode] += 1
+        self._sentiments[call.sentiment] += 1
+        self.version += 1
+
+    def close(self, session_id: str) -> None:
+        call = self._calls.pop(session_id, None)
+        if call is None:
+            return
+        self._modes[call.mode] -= 1
+        self._sentiments[call.sentiment] -= 1
+        for field, value in call.scores.items():
+            self._score_sum[field] -= value
+            self._score_n[field] -= 1
+        for category, n in call.objections.items():
+            self._objections[category] -= n
+        self._trouble.pop(session_id, None)
+        self.version += 1
+
+    def on_delta(self, session_id: str, delta: dict) -> None:
+        """Fold one call's ``dashboard_delta`` into the totals."""
+        call = self._calls.get(session_id)
+        changed = delta.get("set", {})
+        added = delta.get("add", {}).get("objections")
+        dropped = delta.get("drop", {}).get("objections")
+        if call is None or not (changed or added or dropped):
+            return  # Transcript-only deltas don't move the floor
+
+        sentiment = changed.get("sentiment")
+        if sentiment is not None and sentiment != call.sentiment:
+            self._sentiments[call.sentiment] -= 1
+            self._sentiments[sentiment] += 1
+            call.sentiment = sentiment
+        for field, value in changed.get("scores", {}).items():
+            if field not in self._score_sum:
+                continue
+            old = call.scores.get(field)
+            if old is None:
+                self._score_n[field] += 1
+                old = 0
+            self._score_sum[field] += value - old
+            call.scores[field] = value
+        talk = changed.get("talkRatio")
+        if talk is not None:
+            call.rep_pct = talk.get("rep")
+        for objection in added or ():
+            category = objection.get("type")
+            if category not in self._objections:
+                category = "custom"
+            self._objections[category] += 1
+            call.objections[category] += 1
+            if objection.get("hintId"):
+                call.hints[objection["hintId"]] = category
+        for hint_id in dropped or ():
+            category = call.hints.pop(hint_id, None)
+            if category is not None:
+                self._objections[category] -= 1
+                call.objections[category] -= 1
+
+        self._update_trouble(session_id, call)
+        self.version += 1
+
+    def _update_trouble(self, session_id: str, call: _CallFloor) -> None:
+        reasons = []
+        if call.sentiment == "negative":
+            reasons.append("negative_sentiment")
+        if any(value < self.trouble_score for value in call.scores.values()):
+            reasons.append("low_score")
+        if call.rep_pct is not None and call.rep_pct > self.trouble_rep_pct:
+            reasons.append("rep_talking")
+        if reasons and not call.trouble:
+            call.since = time.time()
+            self._trouble[session_id] = call
+        elif not reasons:
+            self._trouble.pop(session_id, None)
+        call.trouble = tuple(reasons)
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "floor",
+            "v": self.version,
+            "active_calls": len(self._calls),
+            "by_mode": {mode: n for mode, n in self._modes.items() if n},
+            "avg_scores": {
+                field: round(self._score_sum[field] / n, 1) if (n := self._score_n[field]) else None
+                for field in SCORES
+            },
+            "objections": dict(self._objections),
+            "sentiment": {s: n for s, n in self._sentiments.items() if n},
+            "in_trouble": [  # Oldest trouble first: dict order is entry order
+                {
+                    "session_id": session_id,
+                    "mode": call.mode,
+                    "reasons": list(call.trouble),
+                    "since": call.since,
+                }
+                for session_id, call in self._trouble.items()
+            ],
+        }
+
+    def frame(self) -> str:
+        """The snapshot as JSON, serialized once per version."""
+        if self._frame[0] != self.version:
+            self._frame = (self.version, json.dumps(self.snapshot()))
+        return self._frame[1]
+
+    def stats(self) -> dict:
+        return {"calls": len(self._calls), "in_trouble": len(self._trouble), "version": self.version}
+
@@ -0,0 +1,224 @@
+"""
+Screen Frame Pipeline — dedupe, downscale and budget screen-share images.
+
+The browser captures a JPEG of the shared screen every few seconds, changed
+or not, and each image costs the model hundreds of input tokens. Before a
+frame reaches ``send_content`` it passes three gates, cheapest first:
+
+  1. **Rate / budget** — a per-session token bucket (``tokens_per_minute``)
+     and a minimum interval between frames. When the model is lagging
+     (upstream queue backing up, or the model silent for ``lag_seconds``
+     after the last frame we sent) the interval doubles, up to ``max_backoff``×, and recovers
+     once the model catches up. No decoding happens for frames dropped here.
+  2. **Dedupe** — a 64-bit perceptual hash (DCT of a 32×32 grayscale
+     thumbnail, decoded with JPEG draft mode at ≤1/8 scale). Frames
+     within ``dedupe_distance`` bits of the last forwarded frame are
+     dropped: cursor blinks and clock ticks don't count as changes.
+  3. **Downscale** — frames larger than ``max_dim`` are resized and
+     re-encoded, which keeps them within one 768×768 token tile.
+
+A frame whose header claims more than ``max_pixels`` is counted as
+invalid before anything is decoded, as is one Pillow refuses as a
+decompression bomb.
+
+Image token cost follows the Gemini rule: 258 tokens if both sides are
+≤384 px, otherwise 258 per 768×768 tile.
+"""
+
+import io
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from app.metrics import REGISTRY
+
+TOKENS_PER_TILE = 258
+HASH_SIZE = 8
+_THUMB = 32
+
+SCREEN_FRAMES = REGISTRY.counter(
+    "lsc_screen_frames_total",
+    "Screen-share frames by outcome (forwarded / duplicate / rate_limited / invalid).",
+    ["outcome"],
+)
+SCREEN_BYTES = REGISTRY.counter(
+    "lsc_screen_bytes_total", "Screen-share JPEG bytes received and forwarded.", ["direction"]
+)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * math.sqrt(2.0 / n)
+    m[0] /= math.sqrt(2.0)
+    return m.astype(np.float32)
+
+
+_DCT = _dct_matrix(_THUMB)
+
+
+def image_tokens(width: int, height: int) -> int:
+    """Input tokens the model charges for an image of this size."""
+    if width <= 384 and height <= 384:
+        return TOKENS_PER_TILE
+    return TOKENS_PER_TILE * math.ceil(width / 768) * math.ceil(height / 768)
+
+
+def phash(image: Image.Image) -> int:
+    """64-bit DCT perceptual hash."""
+    thumb = image.convert("L").resize((_THUMB, _THUMB), Image.Resampling.BILINEAR)
+    pixels = np.asarray(thumb, dtype=np.float32)
+    coeffs = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    low = coeffs[1:]  # Skip DC: overall brightness isn't content
+    bits = coeffs > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+@dataclass(frozen=True)
+class FrameSettings:
+    max_dim: int = 768
+    jpeg_quality: int = 70
+    dedupe_distance: int = 6
+    min_interval: float = 1.0
+    tokens_per_minute: float = 6000.0
+    lag_queue_depth: int = 16
+    lag_seconds: float = 4.0
+    max_backoff: int = 8
+    max_pixels: int = 40_000_000  # Larger headers are invalid, never decoded
+
+
+class ScreenFramePipeline:
+    """Per-session screen-share gate. ``process()`` is safe to run in a thread."""
+
+    def __init__(self, settings: FrameSettings = FrameSettings(), clock=time.monotonic):
+        self.settings = settings
+        self._clock = clock
+        self._tokens = settings.tokens_per_minute  # Bucket starts full
+        self._refilled_at = clock()
+        self._last_sent_at: float | None = None
+        self._last_hash: int | None = None
+        self._last_model_event_at = clock()
+        self._backoff = 1
+
+        self.received = 0
+        self.forwarded = 0
+        self.duplicates = 0
+        self.rate_limited = 0
+        self.invalid = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.tokens_in = 0  # What forwarding every frame as-is would have cost
+        self.tokens_out = 0
+
+    def note_model_event(self) -> None:
+        """Called for every model event; the model isn't lagging right now."""
+        self._last_model_event_at = self._clock()
+
+    def process(self, jpeg: bytes, queue_depth: int = 0) -> bytes | None:
+        """Return the (possibly re-encoded) JPEG to forward, or None to drop."""
+        s = self.settings
+        now = self._clock()
+        self.received += 1
+        self.bytes_in += len(jpeg)
+        SCREEN_BYTES.labels("in").inc(len(jpeg))
+
+        # ── 1. Rate and budget (no decode) ──
+        self._tokens = min(
+            s.tokens_per_minute,
+            self._tokens + (now - self._refilled_at) * s.tokens_per_minute / 60.0,
+        )
+        self._refilled_at = now
+        # Lagging: upstream queue backing up, or we've sent a frame and the
+        # model has been silent for longer than lag_seconds since
+        lagging = queue_depth >= s.lag_queue_depth or (
+            self._last_sent_at is not None
+            and self._last_model_event_at < self._last_sent_at
+            and now - self._last_model_event_at > s.lag_seconds
+        )
+        self._backoff = min(s.max_backoff, self._backoff * 2) if lagging else max(1, self._backoff // 2)
+        too_soon = (
+            self._last_sent_at is not None
+            and now - self._last_sent_at < s.min_interval * self._backoff
+        )
+        if too_soon or self._tokens < TOKENS_PER_TILE:
+            return self._rate_limited(jpeg)
+
+        # ── 2. Perceptual dedupe ──
+        try:
+            image = Image.open(io.BytesIO(jpeg))
+            width, height = image.size
+            if width * height > s.max_pixels:
+                return self._invalid()  # Refused from the header, never decoded
+            self.tokens_in += image_tokens(width, height)
+            image.draft("L", (_THUMB * 2, _THUMB * 2))
+            frame_hash = phash(image)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return self._invalid()
+        if self._last_hash is not None and (frame_hash ^ self._last_hash).bit_count() <= s.dedupe_distance:
+            self.duplicates += 1
+            SCREEN_FRAMES.labels("duplicate").inc()
+            return None
+
+        # ── 3. Downscale + re-encode ──
+        out, out_size = self._downscale(jpeg, width, height)
+        cost = image_tokens(*out_size)
+        if self._tokens < cost:
+            return self._rate_limited(None)
+
+        self._tokens -= cost
+        self._last_hash = frame_hash
+        self._last_sent_at = now
+        self.forwarded += 1
+        self.bytes_out += len(out)
+        self.tokens_out += cost
+        SCREEN_FRAMES.labels("forwarded").inc()
+        SCREEN_BYTES.labels("out").inc(len(out))
+        return out
+
+    def _downscale(self, jpeg: bytes, width: int, height: int) -> tuple[bytes, tuple[int, int]]:
+        s = self.settings
+        scale = s.max_dim / max(width, height)
+        if scale >= 1.0:
+            return jpeg, (width, height)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = Image.open(io.BytesIO(jpeg))
+        image.draft("RGB", size)  # DCT-domain downscale while decoding
+        image = image.convert("RGB").resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        buf = io.BytesIO()
+        image.save(buf, format="JPEG", quality=s.jpeg_quality, optimize=True)
+        return buf.getvalue(), size
+
+    def _rate_limited(self, jpeg: bytes | None) -> None:
+        self.rate_limited += 1
+        SCREEN_FRAMES.labels("rate_limited").inc()
+        if jpeg is not None:
+            # Not decoded: estimate its cost from the header only
+            try:
+                width, height = Image.open(io.BytesIO(jpeg)).size
+            except (OSError, ValueError, Image.DecompressionBombError):
+                return None
+            if width * height <= self.settings.max_pixels:
+                self.tokens_in += image_tokens(width, height)
+        return None
+
+    def _invalid(self) -> None:
+        self.invalid += 1
+        SCREEN_FRAMES.labels("invalid").inc()
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "forwarded": self.forwarded,
+            "duplicates": self.duplicates,
+            "rate_limited": self.rate_limited,
+            "invalid": self.invalid,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": max(0, self.bytes_in - self.bytes_out),
+            "tokens_saved": max(0, self.tokens_in - self.tokens_out),
+            "backoff": self._backoff,
+        }
@@ -0,0 +1,162 @@
+"""
+Objection Hints — local fast-path alerts ahead of the model.
+
+The Live model reports objections through ``log_objection()``, often
+seconds after the prospect finished speaking. ``ObjectionHinter`` runs the
+compiled objection matcher over the prospect's transcription deltas as they
+stream in and produces a provisional ``objection_hint`` immediately,
+including the coaching framework for the category.
+
+When the model's ``log_objection`` call arrives it resolves the most recent
+open hint:
+
+    {"type":"objection_hint","id":"h3","category":"price","trigger":"budget",
+     "text":"...","framework":"Price & Budget: ...","source":"input"}
+    {"type":"objection_hint_resolved","id":"h3","status":"confirmed"|"overridden",
+     "objection_type":"price","hint_ms":140.2,"model_ms":2310.5}
+
+Latency is measured from the first transcription delta of the utterance:
+``hint_ms`` to our hint, ``model_ms`` to the model's tool call.
+"""
+
+import statistics
+import time
+
+from app.metrics import OBJECTION_HINT_LATENCY, OBJECTION_MODEL_LATENCY
+from app.prompts.objections import get_objection_framework, objection_scanner
+
+# Don't repeat a hint for the same category within this window
+HINT_COOLDOWN_SECONDS = 10.0
+# A log_objection call older than this no longer resolves an open hint
+HINT_RESOLVE_WINDOW_SECONDS = 30.0
+
+
+class ObjectionHinter:
+    """Per-session transcript scanner that emits provisional objection hints."""
+
+    def __init__(self, source: str = "input", clock=time.monotonic):
+        self.source = source
+        self._clock = clock
+        self._scanner = objection_scanner()
+        self._text = ""  # Current utterance, for hint snippets
+        self._utterance_start: float | None = None
+        self._last_hint_at: dict[str, float] = {}
+        self._open: list[dict] = []  # Unresolved hints, oldest first
+        self._seq = 0
+
+        self.hints_sent = 0
+        self.confirmed = 0
+        self.overridden = 0
+        self.missed = 0  # Model found an objection we didn't hint
+        self.hint_latencies_ms: list[float] = []
+        self.model_latencies_ms: list[float] = []
+
+    def on_transcript(self, text: str, partial: bool) -> list[dict]:
+        """Feed one transcription event; return hint messages to send now.
+
+        Partial events carry deltas. The final (non-partial) event repeats
+        the whole utterance, so it only flushes the scanner — unless no
+        deltas were seen, in which case the full text is scanned.
+        """
+        now = self._clock()
+        if self._utterance_start is None:
+            self._utterance_start = now
+
+        if partial:
+            self._text += text
+            matches = self._scanner.feed(text)
+        else:
+            if not self._text:
+                self._text = text
+                matches = self._scanner.feed(text)
+            else:
+                matches = []
+            matches += self._scanner.flush()
+
+        hints = []
+        for match in matches:
+            last = self._last_hint_at.get(match.category)
+            if last is not None and now - last < HINT_COOLDOWN_SECONDS:
+                continue
+            self._last_hint_at[match.category] = now
+            hints.append(self._make_hint(match, now))
+
+        if not partial:
+            self._scanner.reset()
+            self._text = ""
+            self._utterance_start = None
+        return hints
+
+    def on_model_objection(self, objection_type: str) -> dict | None:
+        """Resolve the latest open hint against a ``log_objection`` call."""
+        now = self._clock()
+        self._open = [
+            h for h in self._open if now - h["_at"] <= HINT_RESOLVE_WINDOW_SECONDS
+        ]
+        if not self._open:
+            self.missed += 1
+            return None
+
+        # Prefer an open hint of the same category, else the most recent one
+        hint = next(
+            (h for h in reversed(self._open) if h["category"] == objection_type),
+            self._open[-1],
+        )
+        self._open.remove(hint)
+        status = "confirmed" if hint["category"] == objection_type else "overridden"
+        if status == "confirmed":
+            self.confirmed += 1
+        else:
+            self.overridden += 1
+
+        model_ms = (now - hint["_utterance_start"]) * 1000
+        self.model_latencies_ms.append(model_ms)
+        OBJECTION_MODEL_LATENCY.observe(model_ms / 1000)
+        return {
+            "type": "objection_hint_resolved",
+            "id": hint["id"],
+            "status": status,
+            "objection_type": objection_type,
+            "framework": get_objection_framework(objection_type),
+            "hint_ms": round(hint["_hint_ms"], 1),
+            "model_ms": round(model_ms, 1),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "hints_sent": self.hints_sent,
+            "confirmed": self.confirmed,
+            "overridden": self.overridden,
+            "missed": self.missed,
+            "hint_ms_p50": _median(self.hint_latencies_ms),
+            "model_ms_p50": _median(self.model_latencies_ms),
+        }
+
+    def _make_hint(self, match, now: float) -> dict:
+        self._seq += 1
+        hint_ms = (now - self._utterance_start) * 1000
+        self.hints_sent += 1
+        self.hint_latencies_ms.append(hint_ms)
+        OBJECTION_HINT_LATENCY.observe(hint_ms / 1000)
+        self._open.append({
+            "id": f"h{self._seq}",
+            "category": match.category,
+            "_at": now,
+            "_utterance_start": self._utterance_start,
+            "_hint_ms": hint_ms,
+        })
+        # A little context around the trigger, from the current utterance
+        snippet = self._text[max(0, match.start - 40):match.end + 40].strip()
+        return {
+            "type": "objection_hint",
+            "id": f"h{self._seq}",
+            "category": match.category,
+            "trigger": match.trigger,
+            "text": snippet,
+            "framework": get_objection_framework(match.category),
+            "source": self.source,
+        }
+
+
+def _median(values: list[float]) -> float | None:
+    return round(statistics.median(values), 1) if values else None
@@ -0,0 +1,302 @@
+"""
+Inbound Audio Pump — re-frame mic PCM and bound what waits for the model.
+
+The browser's ScriptProcessorNode hands us 4096-sample chunks (256 ms), and
+``read_client`` used to push each one straight into the unbounded
+``LiveRequestQueue``. Two stages now sit in between:
+
+  1. ``AudioReframer`` — copies PCM into a preallocated ring buffer and cuts
+     it into fixed ``frame_ms`` frames (100 ms by default), whatever chunk
+     size the client uses. Frames are whole 20 ms VAD frames, so the gate
+     downstream never carries a partial frame between chunks.
+  2. ``InboundAudioQueue`` — a bounded per-session queue in front of the
+     ``LiveRequestQueue``. A pump task forwards from it only while the
+     upstream queue holds fewer than ``upstream_limit`` requests, so a
+     stalled model connection backs up here, where the size is capped,
+     instead of inside ADK.
+
+Overflow policy when the bounded queue is full:
+
+  - ``drop_oldest``: the oldest audio frame is dropped. Stale audio is worth
+    less than current audio to a live conversation.
+  - ``signal``: as above, but the client is also told to pause sending
+    (``{"type":"backpressure","paused":true}``) once the queue is three
+    quarters full, and to resume once it is back under a quarter.
+
+Activity markers from the VAD gate are never dropped, so segments stay
+balanced. Images and text still go straight to the ``LiveRequestQueue``;
+they are rare and already rate-limited.
+
+The upstream depth comes from ``UpstreamQueue``, a ``LiveRequestQueue``
+that counts requests in (every send) and out (the runner's ``get()``)
+itself rather than reading ADK's private ``asyncio.Queue``.
+"""
+
+import asyncio
+from collections import deque
+
+from google.adk.agents.live_request_queue import LiveRequest, LiveRequestQueue
+from google.genai import types
+
+from app.metrics import DEPTH_BUCKETS, REGISTRY
+
+OVERFLOW_POLICIES = ("drop_oldest", "signal")
+
+INBOUND_QUEUED_FRAMES = REGISTRY.gauge(
+    "lsc_inbound_queued_frames", "Mic audio frames waiting in inbound queues (all sessions)."
+)
+INBOUND_QUEUE_DEPTH = REGISTRY.histogram(
+    "lsc_inbound_queue_depth",
+    "Inbound audio queue depth sampled on every enqueue.",
+    buckets=DEPTH_BUCKETS,
+)
+INBOUND_DROPPED = REGISTRY.counter(
+    "lsc_inbound_dropped_frames_total", "Mic audio frames dropped on inbound queue overflow."
+)
+INBOUND_SIGNALS = REGISTRY.counter(
+    "lsc_inbound_backpressure_total", "Backpressure pause/resume signals sent to clients.", ["state"]
+)
+
+
+class UpstreamQueue(LiveRequestQueue):
+    """``LiveRequestQueue`` that tracks its own depth.
+
+    Every request goes in through ``send()`` and the runner takes it out
+    with ``get()``, so ``depth`` doesn't depend on how ADK stores them.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.depth = 0
+
+    def send(self, req: LiveRequest) -> None:
+        super().send(req)
+        self.depth += 1
+
+    def send_content(self, content: types.Content, partial: bool = False) -> None:
+        self.send(LiveRequest(content=content, partial=partial))
+
+    def send_realtime(self, blob: types.Blob) -> None:
+        self.send(LiveRequest(blob=blob))
+
+    def send_activity_start(self) -> None:
+        self.send(LiveRequest(activity_start=types.ActivityStart()))
+
+    def send_activity_end(self) -> None:
+        self.send(LiveRequest(activity_end=types.ActivityEnd()))
+
+    def send_audio_stream_end(self) -> None:
+        self.send(LiveRequest(audio_stream_end=True))
+
+    def close(self) -> None:
+        self.send(LiveRequest(close=True))
+
+    async def get(self) -> LiveRequest:
+        request = await super().get()
+        self.depth -= 1
+        return request
+
+
+class PcmRingBuffer:
+    """Fixed-capacity byte ring; writes never allocate."""
+
+    def __init__(self, capacity: int):
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self.capacity = capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self._size
+
+    def write(self, data) -> int:
+        """Copy as much of ``data`` as fits; returns the number of bytes taken."""
+        n = min(len(data), self.free)
+        end = (self._start + self._size) % self.capacity
+        first = min(n, self.capacity - end)
+        self._view[end:end + first] = data[:first]
+        if n > first:
+            self._view[:n - first] = data[first:n]
+        self._size += n
+        return n
+
+    def read(self, n: int) -> bytes:
+        n = min(n, self._size)
+        first = min(n, self.capacity - self._start)
+        out = bytes(self._view[self._start:self._start + first])
+        if n > first:
+            out += bytes(self._view[:n - first])
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+        return out
+
+
+class AudioReframer:
+    """Cut a stream of 16-bit mono PCM chunks into fixed-duration frames."""
+
+    def __init__(self, frame_ms: int = 100, sample_rate: int = 16000, capacity_frames: int = 4):
+        self.frame_ms = frame_ms
+        self.sample_rate = sample_rate
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self._ring = PcmRingBuffer(self.frame_bytes * capacity_frames)
+
+    def feed(self, pcm) -> list[bytes]:
+        """Take a chunk; return the whole frames now available."""
+        frames = []
+        data = memoryview(pcm)
+        while data:
+            taken = self._ring.write(data)
+            data = data[taken:]
+            while len(self._ring) >= self.frame_bytes:
+                frames.append(self._ring.read(self.frame_bytes))
+        return frames
+
+    def flush(self) -> bytes:
+        """Whatever partial frame is buffered (end of stream)."""
+        return self._ring.read(len(self._ring))
+
+
+class InboundAudioQueue:
+    """Bounded audio queue + pump task in front of a ``LiveRequestQueue``.
+
+    Exposes the ``send_realtime`` / ``send_activity_start`` /
+    ``send_activity_end`` subset of ``LiveRequestQueue``, so the audio path
+    can write to either.
+    """
+
+    def __init__(
+        self,
+        live_queue,
+        max_frames: int = 50,
+        upstream_limit: int = 8,
+        overflow: str = "signal",
+        on_signal=None,
+        poll_interval: float = 0.01,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        self.live_queue = live_queue
+        self.max_frames = max_frames
+        self.upstream_limit = upstream_limit
+        self.overflow = overflow
+        self._on_signal = on_signal
+        self._poll = poll_interval
+        self._items: deque = deque()  # ("audio", Blob) | ("start", None) | ("end", None)
+        self._audio = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.paused = False
+
+        self.enqueued = 0
+        self.forwarded = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.signals = 0
+
+    # ── LiveRequestQueue subset ──
+    def send_realtime(self, blob) -> None:
+        if self._audio >= self.max_frames:
+            self._drop_oldest()
+        self._items.append(("audio", blob))
+        self._audio += 1
+        self.enqueued += 1
+        INBOUND_QUEUED_FRAMES.inc()
+        INBOUND_QUEUE_DEPTH.observe(self._audio)
+        self.max_depth = max(self.max_depth, self._audio)
+        self._update_signal()
+        self._wakeup.set()
+
+    def send_activity_start(self) -> None:
+        self._items.append(("start", None))
+        self._wakeup.set()
+
+    def send_activity_end(self) -> None:
+        self._items.append(("end", None))
+        self._wakeup.set()
+
+    @property
+    def depth(self) -> int:
+        return self._audio
+
+    def _drop_oldest(self) -> None:
+        for i, (kind, _) in enumerate(self._items):
+            if kind == "audio":
+                del self._items[i]
+                break
+        self._audio -= 1
+        self.dropped += 1
+        INBOUND_QUEUED_FRAMES.dec()
+        INBOUND_DROPPED.inc()
+
+    def _update_signal(self) -> None:
+        if self.overflow != "signal" or self._on_signal is None:
+            return
+        if not self.paused and self._audio >= self.max_frames * 3 // 4:
+            self._signal(True)
+        elif self.paused and self._audio <= self.max_frames // 4:
+            self._signal(False)
+
+    def _signal(self, paused: bool) -> None:
+        self.paused = paused
+        self.signals += 1
+        INBOUND_SIGNALS.labels("pause" if paused else "resume").inc()
+        self._on_signal(paused)
+
+    # ── Pump ──
+    def start(self) -> "InboundAudioQueue":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def _upstream_depth(self) -> int:
+        return self.live_queue.depth
+
+    async def _run(self) -> None:
+        while True:
+            if not self._items:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if self._upstream_depth() >= self.upstream_limit:
+                await asyncio.sleep(self._poll)
+                continue
+            kind, blob = self._items.popleft()
+            if kind == "audio":
+                self._audio -= 1
+                self.forwarded += 1
+                INBOUND_QUEUED_FRAMES.dec()
+                self.live_queue.send_realtime(blob)
+                self._update_signal()
+            elif kind == "start":
+                self.live_queue.send_activity_start()
+            else:
+                self.live_queue.send_activity_end()
+
+    async def drain(self, timeout: float = 2.0) -> None:
+        """Wait (up to ``timeout``) for queued audio to reach the live queue."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._items and self._task is not None and not self._task.done():
+            if loop.time() >= deadline:
+                return
+            await asyncio.sleep(self._poll)
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        INBOUND_QUEUED_FRAMES.dec(self._audio)
+        self._audio = 0
+        self._items.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "forwarded": self.forwarded,
+            "dropped": self.dropped,
+            "max_depth": self.max_depth,
+            "signals": self.signals,
+        }
@@ -0,0 +1,316 @@
+"""
+Call Journal — an append-only, crash-safe event log per call.
+
+Transcripts, tool calls, dashboard updates and usage used to exist only on
+their way to the browser. Now every one of them is also appended to the
+call's journal, one NDJSON record per event:
+
+    {"t": 1718000000.123, "e": {"type": "tool_call", "name": "...", ...}}
+
+The hot path never touches the disk. ``append()`` serializes the record
+and adds it to the call's in-memory buffer. A background worker wakes when
+there is something buffered, waits ``commit_interval`` seconds so records
+from every call pile up, and writes them all in one group commit off the
+event loop: a single write (plus ``fsync``) per call.
+
+While a call is live its journal lives in ``<directory>/<session_id>/``,
+rotated into numbered segments of about ``segment_bytes`` each. When the
+call finishes the segments are *compacted* into one
+``<directory>/<session_id>.ndjson``. Partial transcripts (superseded by
+the final ones) and any torn final line left by a crash are dropped. Only
+the newest ``max_calls`` compacted journals are kept. Segment directories
+found at startup belong to calls that died with the server, so they are
+compacted then.
+
+A finished call's journal is streamed back out in chunks by ``stream()``
+(``GET /api/calls/{session_id}/events``), never loaded whole. That route
+needs the call's observe token: its digest is the ``access`` field of the
+``call_started`` record (see ``app/access.py``), read by ``access()``.
+"""
+
+import asyncio
+import json
+import os
+import re
+import shutil
+import time
+from collections import deque
+from pathlib import Path
+
+from app.config import (
+    JOURNAL_COMMIT_MS,
+    JOURNAL_DIR,
+    JOURNAL_FSYNC,
+    JOURNAL_MAX_CALLS,
+    JOURNAL_SEGMENT_BYTES,
+)
+from app.metrics import REGISTRY
+
+JOURNAL_RECORDS = REGISTRY.counter(
+    "lsc_journal_records_total",
+    "Call journal records: written to disk, or dropped with the buffer full.",
+    ["outcome"],
+)
+JOURNAL_COMMIT_SECONDS = REGISTRY.histogram(
+    "lsc_journal_commit_seconds",
+    "Time to write (and fsync) one group commit of every call's buffered records.",
+)
+
+SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+READ_CHUNK = 64 * 1024
+
+
+class _Segment:
+    """The open segment file of one live call (worker thread only)."""
+
+    __slots__ = ("directory", "index", "fh", "size")
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.index = 0
+        self.fh = None
+        self.size = 0
+
+    def write(self, data: bytes, segment_bytes: int, fsync: bool) -> None:
+        if self.fh is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.index += 1
+            self.fh = open(self.directory / f"{self.index:06d}.ndjson", "ab")
+            self.size = 0
+        self.fh.write(data)
+        self.fh.flush()
+        if fsync:
+            os.fsync(self.fh.fileno())
+        self.size += len(data)
+        if self.size >= segment_bytes:
+            self.close()  # The next write opens a new segment
+
+    def close(self) -> None:
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+
+class CallJournal:
+    """Per-call NDJSON journals with background group commits."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike = "",
+        commit_interval: float = 0.2,
+        segment_bytes: int = 4 * 1024 * 1024,
+        max_pending_bytes: int = 16 * 1024 * 1024,
+        max_calls: int = 1000,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.commit_interval = commit_interval
+        self.segment_bytes = segment_bytes
+        self.max_pending_bytes = max_pending_bytes
+        self.max_calls = max_calls
+        self.fsync = fsync
+
+        self._live: set[str] = set()  # Taking appends
+        self._pending: dict[str, list[bytes]] = {}
+        self._pending_bytes = 0
+        self._finishing: set[str] = set()  # Ended; compacted by the next commit
+        self._compacting: set[str] = set()
+        self._segments: dict[str, _Segment] = {}  # Worker thread only
+        self._compacted: deque[Path] = deque()  # Oldest first
+        self._access: dict[str, str] = {}  # Live calls: session_id → token digest
+        self._wakeup = asyncio.Event()
+        self._worker: asyncio.Task | None = None
+        self._stopping = False
+
+        self.records = 0
+        self.dropped = 0
+        self.commits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def stats(self) -> dict:
+        return {
+            "live_calls": len(self._live) + len(self._finishing) + len(self._compacting),
+            "stored_calls": len(self._compacted),
+            "pending_bytes": self._pending_bytes,
+            "records": self.records,
+            "dropped": self.dropped,
+            "commits": self.commits,
+        }
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+    async def start(self) -> None:
+        """Compact journals left by a crash, then start the writer."""
+        if not self.enabled or self._worker is not None:
+            return
+        recovered = await asyncio.to_thread(self._recover)
+        if recovered:
+            print(f"Call journal: compacted {recovered} journals left from the last run")
+        self._worker = asyncio.create_task(self._run(), name="call-journal")
+
+    async def stop(self) -> None:
+        """Commit and compact everything still buffered."""
+        if self._worker is None:
+            return
+        for session_id in list(self._live):
+            self.finish(session_id)
+        self._stopping = True
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+
+    # ── Producer side ───────────────────────────────────────────────────
+    def open(self, session_id: str, meta: dict, t: float | None = None) -> None:
+        """Start a call's journal with a ``call_started`` record."""
+        if not self.enabled or not SESSION_ID.match(session_id):
+            return
+        self._live.add(session_id)
+        if meta.get("access"):
+            self._access[session_id] = meta["access"]
+        self.append(session_id, {"type": "call_started", "session_id": session_id, **meta}, t)
+
+    def append(self, session_id: str, event: dict, t: float | None = None) -> None:
+        """Buffer one event (at ``t``, default now). Never blocks or touches the disk."""
+        if session_id not in self._live:
+            return
+        if self._pending_bytes >= self.max_pending_bytes:
+            self.dropped += 1
+            JOURNAL_RECORDS.labels("dropped").inc()
+            return
+        t = time.time() if t is None else t
+        line = json.dumps({"t": round(t, 3), "e": event}, default=str).encode() + b"\n"
+        self._pending.setdefault(session_id, []).append(line)
+        self._pending_bytes += len(line)
+        self.records += 1
+        self._wakeup.set()
+
+    def finish(self, session_id: str) -> None:
+        """The call is over: commit what is left and compact its journal."""
+        if session_id in self._live:
+            self.append(session_id, {"type": "call_ended"})
+            self._live.discard(session_id)
+            self._finishing.add(session_id)
+            self._wakeup.set()
+
+    # ── Reading ─────────────────────────────────────────────────────────
+    def state(self, session_id: str) -> str | None:
+        """``"live"`` while still being written, ``"stored"`` once compacted."""
+        if not self.enabled or not SESSION_ID.match(session_id):
+            return None
+        if session_id in self._live or session_id in self._finishing or session_id in self._compacting:
+            return "live"
+        if (self.directory / f"{session_id}.ndjson").exists():
+            return "stored"
+        return None
+
+    def access(self, session_id: str) -> str | None:
+        """The token digest kept with a call's journal, live or stored."""
+        if session_id in self._access:
+            return self._access[session_id]
+        if self.state(session_id) != "stored":
+            return None
+        with open(self.directory / f"{session_id}.ndjson", "rb") as fh:
+            try:
+                event = json.loads(fh.readline())["e"]
+            except (ValueError, KeyError, TypeError):
+                return None
+        return event.get("access") if event.get("type") == "call_started" else None
+
+    def stream(self, session_id: str):
+        """Yield a stored journal in chunks (a sync generator, for a thread)."""
+        with open(self.directory / f"{session_id}.ndjson", "rb") as fh:
+            while chunk := fh.read(READ_CHUNK):
+                yield chunk
+
+    # ── Worker ──────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if not self._stopping:
+                await asyncio.sleep(self.commit_interval)  # Let a group pile up
+            await self._commit_pending()
+            if self._stopping:
+                return
+
+    async def _commit_pending(self) -> None:
+        self._wakeup.clear()
+        batch, self._pending, self._pending_bytes = self._pending, {}, 0
+        finished, self._finishing = self._finishing, set()
+        if not batch and not finished:
+            return
+        self._compacting = finished
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._commit, batch, finished)
+        finally:
+            self._compacting = set()
+        JOURNAL_COMMIT_SECONDS.observe(time.perf_counter() - started)
+        self.commits += 1
+
+    def _commit(self, batch: dict[str, list[bytes]], finished: set[str]) -> None:
+        for session_id, lines in batch.items():
+            segment = self._segments.get(session_id)
+            if segment is None:
+                segment = self._segments[session_id] = _Segment(self.directory / session_id)
+            try:
+                segment.write(b"".join(lines), self.segment_bytes, self.fsync)
+            except OSError as exc:
+                print(f"Call journal write failed (session_id={session_id}): {exc}")
+                continue
+            JOURNAL_RECORDS.labels("written").inc(len(lines))
+        for session_id in finished:
+            segment = self._segments.pop(session_id, None)
+            if segment is not None:
+                segment.close()
+            try:
+                self._compact(session_id)
+            except OSError as exc:
+                print(f"Call journal compaction failed (session_id={session_id}): {exc}")
+            self._access.pop(session_id, None)
+
+    # ── Compaction ──────────────────────────────────────────────────────
+    def _compact(self, session_id: str) -> None:
+        """Merge a call's segments into one file without superseded records."""
+        segments = self.directory / session_id
+        if not segments.is_dir():
+            return
+        target = self.directory / f"{session_id}.ndjson"
+        tmp = target.with_suffix(".ndjson.tmp")
+        with tmp.open("wb") as out:
+            for path in sorted(segments.glob("*.ndjson")):
+                with path.open("rb") as fh:
+                    for line in fh:
+                        try:
+                            event = json.loads(line)["e"]
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Torn final line after a crash
+                        if event.get("type") == "transcript" and event.get("partial"):
+                            continue
+                        out.write(line)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, target)
+        shutil.rmtree(segments, ignore_errors=True)
+        self._compacted.append(target)
+        while len(self._compacted) > self.max_calls:
+            self._compacted.popleft().unlink(missing_ok=True)
+
+    def _recover(self) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stored = sorted(self.directory.glob("*.ndjson"), key=lambda p: p.stat().st_mtime)
+        self._compacted.extend(stored)
+        orphans = [p.name for p in self.directory.iterdir() if p.is_dir() and SESSION_ID.match(p.name)]
+        for session_id in orphans:
+            self._compact(session_id)
+        return len(orphans)
+
+
+call_journal = CallJournal(
+    directory=JOURNAL_DIR,
+    commit_interval=JOURNAL_COMMIT_MS / 1000,
+    segment_bytes=JOURNAL_SEGMENT_BYTES,
+    max_calls=JOURNAL_MAX_CALLS,
+    fsync=JOURNAL_FSYNC,
+)
@@ -0,0 +1,150 @@
+"""
+Long-Call Mode — keep 60–90 minute calls inside the model's context budget.
+
+A Live session keeps every audio token, transcript and tool call in its
+context, so prefill cost and per-turn latency climb for the whole call and
+an hour of audio alone (~115k tokens at 32 tokens/s) nearly fills the
+window. Long-call mode (``"long_call": true`` in the client config, or
+``LONG_CALL=1``) changes two things:
+
+  - the ``RunConfig`` turns on the Live API's sliding-window context
+    compression: once the context reaches ``trigger_tokens`` the oldest
+    turns are discarded down to ``target_tokens``, so only a recent window
+    stays verbatim. Session resumption is switched on as well, so ADK can
+    reconnect transparently when the server rotates a long connection;
+  - in live mode a ``CallDigest`` folds the coach's own tool calls (scores,
+    sentiment, objections, key moments) into a compact state block, which
+    is sent to the model every ``summary_seconds`` when it has changed. The
+    turns that fall out of the window are gone, but what the coach concluded
+    from them is not.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+
+from google.genai import types
+
+from app.metrics import REGISTRY
+
+STATE_BLOCKS = REGISTRY.counter(
+    "lsc_long_call_state_blocks_total", "Call-state summaries sent to the model in long-call mode."
+)
+
+STATE_BLOCK_HEADER = (
+    "[CALL STATE] Summary of the call so far. Older turns may have left your "
+    "context; keep coaching from this state. Do not reply to this message."
+)
+SCORE_LABELS = {
+    "discovery_score": "discovery",
+    "rapport_score": "rapport",
+    "objection_score": "objections",
+    "next_steps_score": "next steps",
+}
+
+
+@dataclass(frozen=True)
+class LongCallSettings:
+    trigger_tokens: int = 32000
+    target_tokens: int = 16000
+    summary_seconds: float = 300.0
+
+    def compression(self) -> types.ContextWindowCompressionConfig:
+        return types.ContextWindowCompressionConfig(
+            trigger_tokens=self.trigger_tokens,
+            sliding_window=types.SlidingWindow(target_tokens=self.target_tokens),
+        )
+
+
+def _clip(text: str, limit: int = 80) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class CallDigest:
+    """Compact running state of a call, folded from the coach's tool calls."""
+
+    def __init__(self, max_moments: int = 6):
+        self.scores: dict[str, int] = {}
+        self.sentiment = ""
+        self.rep_talk_pct: int | None = None
+        self.last_tip = ""
+        # objection type → [count, latest quote]
+        self.objections: dict[str, list] = {}
+        self.moments: deque[tuple[str, str]] = deque(maxlen=max_moments)
+        self.turns = 0
+        self.blocks_sent = 0
+        self._version = 0
+        self._sent_version = 0
+
+    def on_tool_call(self, name: str, args: dict) -> None:
+        if name == "update_dashboard":
+            for key in SCORE_LABELS:
+                value = args.get(key, -1)
+                if isinstance(value, (int, float)) and value >= 0:
+                    self.scores[key] = int(value)
+            if args.get("sentiment"):
+                self.sentiment = args["sentiment"]
+            pct = args.get("rep_talk_pct", -1)
+            if isinstance(pct, (int, float)) and pct >= 0:
+                self.rep_talk_pct = int(pct)
+            if args.get("coaching_tip"):
+                self.last_tip = _clip(args["coaching_tip"])
+            if args.get("key_moment"):
+                self.moments.append(
+                    (args.get("key_moment_type") or "positive", _clip(args["key_moment"]))
+                )
+        elif name == "log_objection":
+            kind = args.get("objection_type") or "custom"
+            entry = self.objections.setdefault(kind, [0, ""])
+            entry[0] += 1
+            entry[1] = _clip(args.get("objection_text", ""))
+        else:
+            return
+        self._version += 1
+
+    def on_turn_complete(self) -> None:
+        self.turns += 1
+
+    @property
+    def changed(self) -> bool:
+        return self._version != self._sent_version
+
+    def state_block(self, rep_talk_pct: int | None = None) -> str:
+        """Render the state for the model and mark it as sent.
+
+        ``rep_talk_pct`` (the measured ratio, see ``app/talk.py``) takes
+        precedence over the coach's own estimate.
+        """
+        lines = [STATE_BLOCK_HEADER, f"Turns so far: {self.turns}"]
+        if self.scores:
+            lines.append("Scores: " + ", ".join(
+                f"{SCORE_LABELS[key]} {value}" for key, value in self.scores.items()
+            ))
+        if self.sentiment:
+            lines.append(f"Prospect sentiment: {self.sentiment}")
+        talk = rep_talk_pct if rep_talk_pct is not None else self.rep_talk_pct
+        if talk is not None:
+            lines.append(f"Rep talk time: {talk}%")
+        if self.objections:
+            total = sum(count for count, _ in self.objections.values())
+            lines.append(f"Objections ({total}): " + "; ".join(
+                f'{kind}{f" x{count}" if count > 1 else ""} "{quote}"'
+                for kind, (count, quote) in self.objections.items()
+            ))
+        if self.moments:
+            lines.append("Recent key moments: " + "; ".join(
+                f"[{kind}] {text}" for kind, text in self.moments
+            ))
+        if self.last_tip:
+            lines.append(f"Last tip given: {self.last_tip}")
+        self._sent_version = self._version
+        self.blocks_sent += 1
+        STATE_BLOCKS.inc()
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turns,
+            "objections": sum(count for count, _ in self.objections.values()),
+            "state_blocks": self.blocks_sent,
+        }
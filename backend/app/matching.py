@@ -0,0 +1,225 @@
+"""
+Aho-Corasick Trigger Matcher — one pass over text, all hits, streaming.
+
+Built once from a ``{category: [trigger, ...]}`` mapping. Matching is
+case-insensitive and word-boundary aware: ``"cost"`` matches "the cost is"
+but not "Costco", and ``"board"`` doesn't fire on "onboarding".
+
+The automaton runs over *words* rather than characters, so boundaries come
+for free and multi-word triggers ("not a priority right now") are just word
+sequences in the trie. Text is normalized with one length-preserving
+``str.translate`` (punctuation → space) and split in C; each word then
+costs a single dict lookup in a precomputed transition table. Most
+utterances contain none of the words that *end* a trigger, and those are
+rejected with a C-level set check before the automaton loop runs.
+
+For streaming, a word touching the end of a fed chunk may be the first
+half of a longer word ("bud" + "get"), so it is held back until the next
+chunk or ``flush()``. A hit is never reported early and never missed
+across a chunk boundary.
+"""
+
+import re
+import string
+from collections import deque
+from typing import Iterable, NamedTuple
+
+# Every separator becomes a plain space; curly apostrophes become "'".
+# All mappings are 1:1 so offsets into the original text are preserved.
+_SEPARATORS = (set(string.punctuation) | set(string.whitespace) | set("—–…“”«»¿¡")) - {"'"}
+_APOSTROPHES = "'’‘`"
+_TABLE = str.maketrans({**{c: " " for c in _SEPARATORS}, "’": "'", "‘": "'", "`": "'"})
+# Apostrophes only belong to a word between two word characters ("can't")
+_EDGE_APOSTROPHE = re.compile(r"(?<!\w)'|'(?!\w)")
+_TOKEN = re.compile(r"\S+")
+
+
+class TriggerMatch(NamedTuple):
+    """One trigger hit. ``start``/``end`` are offsets into the fed text."""
+
+    category: str
+    trigger: str
+    start: int
+    end: int
+
+
+def _prepare(text: str) -> str:
+    """Lowercase and fold separators to spaces without changing offsets."""
+    prepared = text.lower()
+    if len(prepared) != len(text):
+        # A few characters (e.g. "İ") expand when lowercased; keep those as-is
+        prepared = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+    prepared = prepared.translate(_TABLE)
+    if "'" in prepared:
+        prepared = _EDGE_APOSTROPHE.sub(" ", prepared)
+    return prepared
+
+
+class TriggerMatcher:
+    """Compiled word-level Aho-Corasick automaton over categorized triggers."""
+
+    def __init__(self, triggers: dict[str, Iterable[str]]):
+        patterns: list[tuple[tuple[str, ...], str, str]] = []  # (words, category, trigger)
+        for category, phrases in triggers.items():
+            for phrase in phrases:
+                words = tuple(_prepare(phrase).split())
+                if words:
+                    patterns.append((words, category, phrase))
+
+        # ── Trie over words ──
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for index, (words, _, _) in enumerate(patterns):
+            state = 0
+            for word in words:
+                nxt = goto[state].get(word)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][word] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(index)
+
+        # ── Failure links (BFS) folded into a full transition table ──
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Inherit the failure state's transitions, then override with our own
+            row = dict(delta[fail[state]])
+            for word, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[state]].get(word, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                row[word] = nxt
+            delta[state] = row
+
+        self._delta = delta
+        self._outputs: list[tuple[tuple[str, str, int], ...] | None] = [
+            tuple((patterns[i][1], patterns[i][2], len(patterns[i][0])) for i in out) or None
+            for out in outputs
+        ]
+        # A trigger can only complete on one of these words
+        self._final_words = frozenset(p[0][-1] for p in patterns)
+        self.max_words = max((len(p[0]) for p in patterns), default=1)
+        self.pattern_count = len(patterns)
+
+    def scanner(self) -> "TriggerScanner":
+        """Create an incremental scanner for a stream of text chunks."""
+        return TriggerScanner(self)
+
+    def find_all(self, text: str) -> list[TriggerMatch]:
+        """Return every trigger hit in ``text``, in order of where it ends."""
+        hits: list[TriggerMatch] = []
+        self._scan(_prepare(text), 0, 0, deque(maxlen=self.max_words), hits)
+        return hits
+
+    def categories(self, text: str) -> list[str]:
+        """Distinct matching categories, ordered by first occurrence."""
+        return list(dict.fromkeys(m.category for m in self.find_all(text)))
+
+    def _scan(
+        self,
+        text: str,
+        base: int,
+        state: int,
+        starts: deque,
+        hits: list[TriggerMatch],
+    ) -> int:
+        """Run the automaton over prepared ``text`` and return the new state.
+
+        ``base`` is the absolute offset of ``text[0]``; ``starts`` holds the
+        absolute start offsets of the last words of earlier chunks, for
+        triggers that straddle a chunk boundary.
+        """
+        delta = self._delta
+        words = text.split()
+        if not words:
+            return state
+
+        if self._final_words.isdisjoint(words):
+            # No hit possible. The end state only depends on the last
+            # ``max_words`` words, so replay just those.
+            end_state = state
+            for word in words if state else words[-self.max_words:]:
+                end_state = delta[end_state].get(word, 0)
+            if end_state == 0:
+                return 0
+            # A trigger prefix is still open — take the slow path to record spans
+
+        outputs = self._outputs
+        spans = None  # Word offsets are only computed once something matches
+        for i, word in enumerate(words):
+            state = delta[state].get(word, 0)
+            out = outputs[state]
+            if out is not None:
+                if spans is None:
+                    spans = [m.span() for m in _TOKEN.finditer(text)]
+                end = base + spans[i][1]
+                for category, trigger, length in out:
+                    j = i - length + 1
+                    # j < 0: the trigger started in a previous chunk
+                    start = base + spans[j][0] if j >= 0 else starts[j]
+                    hits.append(TriggerMatch(category, trigger, start, end))
+
+        if state:
+            # A trigger prefix is still open; remember where its words began
+            if spans is None:
+                spans = [m.span() for m in _TOKEN.finditer(text)]
+            starts.extend(base + s for s, _ in spans[-self.max_words:])
+        return state
+
+
+class TriggerScanner:
+    """Streaming state over a ``TriggerMatcher``.
+
+    ``feed()`` partial text as it arrives; hits are returned once the word
+    that completes them is known to be whole. Call ``flush()`` at the end
+    of an utterance to resolve a trigger sitting at the very end.
+    """
+
+    __slots__ = ("_matcher", "_state", "_offset", "_pending", "_starts")
+
+    def __init__(self, matcher: TriggerMatcher):
+        self._matcher = matcher
+        self._starts: deque[int] = deque(maxlen=matcher.max_words)
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new utterance (offsets restart at zero)."""
+        self._state = 0
+        self._offset = 0  # Offset of the first character in _pending
+        self._pending = ""
+        self._starts.clear()
+
+    def feed(self, text: str) -> list[TriggerMatch]:
+        return self._run(self._pending + text, final=False)
+
+    def flush(self) -> list[TriggerMatch]:
+        """Treat the end of fed text as a word boundary."""
+        if not self._pending:
+            return []
+        return self._run(self._pending, final=True)
+
+    def _run(self, text: str, final: bool) -> list[TriggerMatch]:
+        hits: list[TriggerMatch] = []
+        prepared = _prepare(text)
+        cut = len(prepared)
+        if not final and prepared:
+            # Hold back the word that touches the end of the chunk. A trailing
+            # apostrophe may still become "can't", so it counts as touching.
+            if text[-1] in _APOSTROPHES:
+                cut = prepared.rfind(" ", 0, cut - 1) + 1
+            elif prepared[-1] != " ":
+                cut = prepared.rfind(" ") + 1
+        base = self._offset
+        if cut:
+            self._state = self._matcher._scan(
+                prepared[:cut], base, self._state, self._starts, hits
+            )
+        self._pending = text[cut:]
+        self._offset = base + cut
+        return hits
@@ -0,0 +1,320 @@
+"""
+Metrics — lightweight Prometheus-style counters, gauges and histograms.
+
+Recording is a dict lookup plus an integer add (histograms add a bisect),
+so instrumentation on the hot path costs close to nothing. Nothing is
+formatted until ``/metrics`` is scraped, when ``REGISTRY.render()`` emits
+the Prometheus text exposition format.
+
+``SessionMetrics`` holds the per-connection timestamps needed to turn the
+stream of client inputs and model events into latency observations.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+FAST_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05,
+)
+DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+def _escape(value) -> str:
+    """A label value as the text format wants it: backslash, quote and newline escaped."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: str):
+        """Return the child for a label combination (created on first use)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _samples(self):
+        for key, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), fn: Callable[[], float] | None = None):
+        super().__init__(name, documentation, labelnames)
+        self._fn = fn  # Sampled at scrape time instead of being pushed
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+    def _samples(self):
+        if self._fn is not None:
+            self._children[()].set(self._fn())
+        yield from super()._samples()
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def _samples(self):
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), fn=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, fn=fn))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── Session lifecycle ──────────────────────────────────────────────────
+SESSIONS_STARTED = REGISTRY.counter(
+    "lsc_sessions_started_total", "WebSocket sessions started.", ["mode"]
+)
+SESSIONS_ACTIVE = REGISTRY.gauge(
+    "lsc_sessions_active", "WebSocket sessions currently open.", ["mode"]
+)
+
+# ── Hot-path latency ───────────────────────────────────────────────────
+FIRST_EVENT_LATENCY = REGISTRY.histogram(
+    "lsc_first_event_latency_seconds",
+    "Time from the last client audio chunk to the next model event.",
+    ["mode"],
+)
+FIRST_TOOL_CALL_LATENCY = REGISTRY.histogram(
+    "lsc_first_tool_call_latency_seconds",
+    "Time from the first client input of a turn to its first tool call.",
+    ["mode"],
+)
+TURN_COMPLETE_LATENCY = REGISTRY.histogram(
+    "lsc_turn_complete_latency_seconds",
+    "Time from the first client input of a turn to turn_complete.",
+    ["mode"],
+)
+HANDLE_EVENT_SECONDS = REGISTRY.histogram(
+    "lsc_handle_event_seconds",
+    "Time spent in _handle_event (serialization + send) per ADK event.",
+    ["mode"],
+    buckets=FAST_BUCKETS,
+)
+UPSTREAM_QUEUE_DEPTH = REGISTRY.histogram(
+    "lsc_upstream_send_queue_depth",
+    "LiveRequestQueue depth sampled when client input is enqueued.",
+    ["mode"],
+    buckets=DEPTH_BUCKETS,
+)
+EVENTS_TOTAL = REGISTRY.counter(
+    "lsc_model_events_total", "ADK events received from run_live.", ["mode"]
+)
+
+# ── Objection fast path vs model path ──────────────────────────────────
+OBJECTION_HINT_LATENCY = REGISTRY.histogram(
+    "lsc_objection_hint_latency_seconds",
+    "Time from the first transcript delta of an utterance to the local hint.",
+    buckets=FAST_BUCKETS + LATENCY_BUCKETS[4:],
+)
+OBJECTION_MODEL_LATENCY = REGISTRY.histogram(
+    "lsc_objection_model_latency_seconds",
+    "Time from the first transcript delta of an utterance to log_objection.",
+)
+
+# ── Token usage ────────────────────────────────────────────────────────
+TOKENS_TOTAL = REGISTRY.counter(
+    "lsc_tokens_total", "Tokens reported in usage_metadata.", ["mode", "kind"]
+)
+
+
+class SessionMetrics:
+    """Per-connection timestamps that turn the event stream into latencies."""
+
+    __slots__ = (
+        "mode", "_clock", "_last_audio_at", "_turn_started_at", "_tool_called",
+        "_first_event", "_first_tool", "_turn_complete", "_handle", "_depth",
+        "_events", "_tokens",
+    )
+
+    def __init__(self, mode: str, clock=time.perf_counter):
+        self.mode = mode
+        self._clock = clock
+        self._last_audio_at: float | None = None
+        self._turn_started_at: float | None = None
+        self._tool_called = False
+        # Resolve labelled children once per session, not per event
+        self._first_event = FIRST_EVENT_LATENCY.labels(mode)
+        self._first_tool = FIRST_TOOL_CALL_LATENCY.labels(mode)
+        self._turn_complete = TURN_COMPLETE_LATENCY.labels(mode)
+        self._handle = HANDLE_EVENT_SECONDS.labels(mode)
+        self._depth = UPSTREAM_QUEUE_DEPTH.labels(mode)
+        self._events = EVENTS_TOTAL.labels(mode)
+        self._tokens = {
+            kind: TOKENS_TOTAL.labels(mode, kind) for kind in ("prompt", "candidates", "total")
+        }
+
+    def open(self) -> None:
+        SESSIONS_STARTED.labels(self.mode).inc()
+        SESSIONS_ACTIVE.labels(self.mode).inc()
+
+    def close(self) -> None:
+        SESSIONS_ACTIVE.labels(self.mode).dec()
+
+    # ── Client side ──
+    def on_client_input(self, audio: bool = False, queue_depth: int | None = None) -> None:
+        now = self._clock()
+        if audio:
+            self._last_audio_at = now
+        if self._turn_started_at is None:
+            self._turn_started_at = now
+        if queue_depth is not None:
+            self._depth.observe(queue_depth)
+
+    # ── Model side ──
+    def on_model_event(self) -> float:
+        """Record an incoming event; returns a start mark for ``on_handled``."""
+        now = self._clock()
+        self._events.inc()
+        if self._last_audio_at is not None:
+            self._first_event.observe(now - self._last_audio_at)
+            self._last_audio_at = None
+        return now
+
+    def on_handled(self, started: float) -> None:
+        self._handle.observe(self._clock() - started)
+
+    def on_tool_call(self) -> None:
+        if not self._tool_called and self._turn_started_at is not None:
+            self._first_tool.observe(self._clock() - self._turn_started_at)
+        self._tool_called = True
+
+    def on_turn_complete(self) -> None:
+        if self._turn_started_at is not None:
+            self._turn_complete.observe(self._clock() - self._turn_started_at)
+        self._turn_started_at = None
+        self._tool_called = False
+
+    def on_usage(self, prompt: int, candidates: int, total: int) -> None:
+        self._tokens["prompt"].inc(prompt)
+        self._tokens["candidates"].inc(candidates)
+        self._tokens["total"].inc(total)
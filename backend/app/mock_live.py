@@ -0,0 +1,336 @@
+"""
+Mock Gemini Live Runner — offline stand-in for ``Runner.run_live``.
+
+Selected with ``LIVE_BACKEND=mock``. It drains the ``LiveRequestQueue``
+exactly like the real runner, and after every ``turn_audio_seconds`` of
+inbound audio (or any text message) it plays one scripted turn back as
+real ADK ``Event`` objects. A turn can contain transcription deltas, tool
+calls (the real tool functions run, so results are genuine), 24 kHz audio
+blobs in practice mode, usage metadata and ``turn_complete``.
+
+Context is accounted like the real session: inbound audio (32 tokens/s),
+text and the model's own output add tokens, usage events report the
+running total as ``prompt_token_count``, and a ``RunConfig`` with
+``context_window_compression`` slides it back to ``target_tokens`` once it
+reaches ``trigger_tokens``. ``context_ms_per_1k`` adds a prefill delay to the
+first event of each turn in proportion to the context, so latency grows
+over a long call the way it does against the real API (0 disables it).
+
+Like the real model it can be interrupted: an ``activity_start``, or loud
+input audio (above ``barge_in_db``) while a turn is playing in practice
+mode, cancels the turn after ``interrupt_ms`` and yields an event with
+``interrupted`` set.
+
+Scripts are JSON, either built in or loaded from ``MOCK_LIVE_SCRIPT``:
+
+    {
+      "turns":   [[step, ...], ...],   # played in rotation
+      "summary": [step, ...]           # played when the call-end prompt arrives
+    }
+
+    step = {"kind": "input_transcript" | "output_transcript", "text": "..."}
+         | {"kind": "tool_call", "name": "update_dashboard", "args": {...}}
+         | {"kind": "audio", "ms": 100}
+         | {"kind": "usage", "prompt": 120, "candidates": 30}
+         | {"kind": "turn_complete"}
+    (every step may carry "delay_ms" to override the default step interval)
+
+Tool-call args get a ``_mock_sent_at`` wall-clock stamp so load tests can
+measure end-to-end event latency through the server.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from google.adk.events import Event
+from google.genai import types
+
+from app.tools.coaching import get_coaching_tip
+from app.tools.crm import save_call_summary
+from app.tools.dashboard import log_objection, update_dashboard
+
+TOOLS = {
+    "update_dashboard": update_dashboard,
+    "log_objection": log_objection,
+    "save_call_summary": save_call_summary,
+    "get_coaching_tip": get_coaching_tip,
+}
+
+INPUT_BYTES_PER_SECOND = 16000 * 2  # 16 kHz, 16-bit mono
+AUDIO_TOKENS_PER_SECOND = 32
+OUTPUT_SAMPLE_RATE = 24000
+
+DEFAULT_SCRIPT = {
+    "turns": [
+        [
+            {"kind": "input_transcript", "text": "Thanks for calling. We're evaluating a few options right now."},
+            {"kind": "tool_call", "name": "update_dashboard", "args": {
+                "coaching_tip": "Ask what's driving the evaluation.",
+                "sentiment": "neutral", "discovery_score": 40, "rep_talk_pct": 55}},
+            {"kind": "output_transcript", "text": "Sure, what prompted you to start looking?"},
+            {"kind": "audio", "ms": 100}, {"kind": "audio", "ms": 100}, {"kind": "audio", "ms": 100},
+            {"kind": "usage", "prompt": 180, "candidates": 40},
+            {"kind": "turn_complete"},
+        ],
+        [
+            {"kind": "input_transcript", "text": "Honestly it sounds too expensive for our budget this quarter."},
+            {"kind": "tool_call", "name": "log_objection", "args": {
+                "objection_type": "price",
+                "objection_text": "it sounds too expensive for our budget",
+                "suggested_response": "I hear you. What would solving this be worth to the team?"}},
+            {"kind": "tool_call", "name": "update_dashboard", "args": {
+                "coaching_tip": "Reframe cost as ROI.", "sentiment": "negative",
+                "objection_score": 50, "key_moment": "Price objection raised",
+                "key_moment_type": "objection"}},
+            {"kind": "output_transcript", "text": "Yeah, I get that. Budget's tight for everyone."},
+            {"kind": "audio", "ms": 100}, {"kind": "audio", "ms": 100},
+            {"kind": "usage", "prompt": 220, "candidates": 60},
+            {"kind": "turn_complete"},
+        ],
+        [
+            {"kind": "input_transcript", "text": "I'd need to ask my boss before we commit to anything."},
+            {"kind": "tool_call", "name": "update_dashboard", "args": {
+                "coaching_tip": "Offer to join the meeting with their manager.",
+                "sentiment": "neutral", "rapport_score": 60, "next_steps_score": 45}},
+            {"kind": "output_transcript", "text": "Let me check with my manager and get back to you."},
+            {"kind": "audio", "ms": 100},
+            {"kind": "usage", "prompt": 260, "candidates": 35},
+            {"kind": "turn_complete"},
+        ],
+    ],
+    "summary": [
+        {"kind": "tool_call", "name": "save_call_summary", "args": {
+            "summary": "Discovery call with a price objection; follow-up with the manager.",
+            "overall_score": 62, "outcome": "follow_up",
+            "objections_faced": ["price", "authority"],
+            "key_moments": ["Price objection raised"],
+            "next_steps": ["Send ROI one-pager", "Book call with manager"],
+            "rep_talk_pct": 55, "prospect_talk_pct": 45}},
+        {"kind": "turn_complete"},
+    ],
+}
+
+
+@lru_cache(maxsize=16)
+def _voice_pcm(samples: int) -> bytes:
+    """A voiced-sounding 24 kHz tone, so output audio registers as speech."""
+    return b"".join(
+        int(6000 * math.sin(2 * math.pi * 180 * i / OUTPUT_SAMPLE_RATE)).to_bytes(2, "little", signed=True)
+        for i in range(samples)
+    )
+
+
+def _level_db(pcm: bytes) -> float:
+    samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2").astype(np.float32)
+    return 10.0 * math.log10(float(np.mean(samples * samples)) / 32768.0**2 + 1e-10) if samples.size else -100.0
+
+
+def _step_tokens(step: dict) -> float:
+    """Rough context cost of one scripted step (~4 characters per token)."""
+    kind = step["kind"]
+    if kind in ("input_transcript", "output_transcript"):
+        return len(step["text"]) / 4
+    if kind == "tool_call":
+        return len(json.dumps(step.get("args", {}))) / 4 + 10
+    if kind == "audio":
+        return step.get("ms", 100) / 1000 * AUDIO_TOKENS_PER_SECOND
+    return 0.0
+
+
+def load_script(path: str | None) -> dict:
+    if not path:
+        return DEFAULT_SCRIPT
+    return json.loads(Path(path).read_text())
+
+
+class MockLiveRunner:
+    """Drop-in replacement for ``Runner`` that only implements ``run_live``."""
+
+    def __init__(
+        self,
+        script: dict | None = None,
+        first_event_ms: float = 300.0,
+        step_ms: float = 40.0,
+        turn_audio_seconds: float = 4.0,
+        jitter: float = 0.2,
+        seed: int | None = None,
+        author: str = "live_sales_coach",
+        interrupt_ms: float = 400.0,
+        barge_in_db: float = -35.0,
+        context_ms_per_1k: float = 0.0,
+    ):
+        self.script = script or DEFAULT_SCRIPT
+        self.first_event_ms = first_event_ms
+        self.step_ms = step_ms
+        self.turn_audio_seconds = turn_audio_seconds
+        self.jitter = jitter
+        self.author = author
+        self.interrupt_ms = interrupt_ms
+        self.barge_in_db = barge_in_db
+        self.context_ms_per_1k = context_ms_per_1k
+        self._rng = random.Random(seed)
+
+    async def run_live(self, *, user_id, session_id, live_request_queue, run_config=None, **_):
+        audio_out = bool(
+            run_config is not None
+            and any(
+                str(getattr(m, "value", m)).upper() == "AUDIO"
+                for m in run_config.response_modalities or []
+            )
+        )
+        out: asyncio.Queue = asyncio.Queue()
+        done = object()
+        turn_index = 0
+        playing: set[asyncio.Task] = set()
+        compression = getattr(run_config, "context_window_compression", None)
+        context = 0.0  # Tokens in the session's context window
+
+        def grow(tokens: float) -> None:
+            nonlocal context
+            context += tokens
+            if compression is not None and compression.trigger_tokens:
+                if context >= compression.trigger_tokens:
+                    window = compression.sliding_window
+                    context = float(window.target_tokens if window and window.target_tokens else 0)
+
+        async def play(steps: list[dict]) -> None:
+            prefill = context / 1000 * self.context_ms_per_1k
+            await asyncio.sleep(self._delay(self.first_event_ms) + prefill / 1000)
+            for i, step in enumerate(steps):
+                if i:
+                    await asyncio.sleep(self._delay(step.get("delay_ms", self.step_ms)))
+                grow(_step_tokens(step))
+                for event in self._events_for(step, audio_out, context=int(context)):
+                    await out.put(event)
+
+        def start(steps: list[dict]) -> None:
+            task = asyncio.create_task(play(steps))
+            playing.add(task)
+            task.add_done_callback(playing.discard)
+
+        interrupting: asyncio.Task | None = None
+
+        async def interrupt() -> None:
+            await asyncio.sleep(self._delay(self.interrupt_ms))
+            for task in list(playing):
+                task.cancel()
+            await out.put(self._event(interrupted=True))
+
+        def barge_in() -> None:
+            nonlocal interrupting
+            if audio_out and playing and (interrupting is None or interrupting.done()):
+                interrupting = asyncio.create_task(interrupt())
+
+        async def consume() -> None:
+            nonlocal turn_index
+            audio_bytes = 0
+            try:
+                while True:
+                    request = await live_request_queue.get()
+                    if request.close:
+                        break
+                    if request.activity_start is not None:
+                        barge_in()
+                    if request.blob is not None and request.blob.data:
+                        if _level_db(request.blob.data) > self.barge_in_db:
+                            barge_in()
+                        audio_bytes += len(request.blob.data)
+                        grow(len(request.blob.data) / INPUT_BYTES_PER_SECOND * AUDIO_TOKENS_PER_SECOND)
+                        if audio_bytes >= self.turn_audio_seconds * INPUT_BYTES_PER_SECOND:
+                            audio_bytes = 0
+                            turns = self.script["turns"]
+                            start(turns[turn_index % len(turns)])
+                            turn_index += 1
+                    elif request.content is not None:
+                        text = " ".join(p.text or "" for p in request.content.parts or [])
+                        grow(len(text) / 4)
+                        if "save_call_summary" in text:
+                            start(self.script.get("summary", []))
+                        elif text:
+                            turns = self.script["turns"]
+                            start(turns[turn_index % len(turns)])
+                            turn_index += 1
+                # Let in-flight turns (e.g. the summary) finish, like the real API
+                if playing:
+                    await asyncio.gather(*playing, return_exceptions=True)
+            finally:
+                await out.put(done)
+
+        consumer = asyncio.create_task(consume())
+        try:
+            while True:
+                event = await out.get()
+                if event is done:
+                    break
+                yield event
+        finally:
+            consumer.cancel()
+            if interrupting is not None:
+                interrupting.cancel()
+            for task in list(playing):
+                task.cancel()
+
+    def _delay(self, ms: float) -> float:
+        spread = ms * self.jitter
+        return max(0.0, ms + self._rng.uniform(-spread, spread)) / 1000
+
+    def _events_for(self, step: dict, audio_out: bool, context: int = 0) -> list[Event]:
+        kind = step["kind"]
+        if kind in ("input_transcript", "output_transcript"):
+            field = "input_transcription" if kind == "input_transcript" else "output_transcription"
+            if kind == "output_transcript" and not audio_out:
+                return [self._event(content=types.Content(
+                    role="model", parts=[types.Part(text=step["text"])]))]
+            # Partial word-sized deltas, then the final full transcript
+            words = step["text"].split(" ")
+            events = [
+                self._event(partial=True, **{field: types.Transcription(
+                    text=w + (" " if i < len(words) - 1 else ""), finished=False)})
+                for i, w in enumerate(words)
+            ]
+            events.append(self._event(partial=False, **{field: types.Transcription(
+                text=step["text"], finished=True)}))
+            return events
+
+        if kind == "tool_call":
+            name = step["name"]
+            args = dict(step.get("args", {}))
+            call = self._event(content=types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(
+                    name=name, args={**args, "_mock_sent_at": time.time()}))]))
+            result = TOOLS[name](**args) if name in TOOLS else {"status": "success"}
+            response = self._event(content=types.Content(role="user", parts=[types.Part(
+                function_response=types.FunctionResponse(name=name, response=result))]))
+            return [call, response]
+
+        if kind == "audio":
+            if not audio_out:
+                return []
+            samples = int(OUTPUT_SAMPLE_RATE * step.get("ms", 100) / 1000)
+            return [self._event(content=types.Content(role="model", parts=[types.Part(
+                inline_data=types.Blob(
+                    data=_voice_pcm(samples),
+                    mime_type=f"audio/pcm;rate={OUTPUT_SAMPLE_RATE}"))]))]
+
+        if kind == "usage":
+            prompt = context or step.get("prompt", 0)
+            candidates = step.get("candidates", 0)
+            return [self._event(usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt,
+                candidates_token_count=candidates,
+                total_token_count=prompt + candidates,
+            ))]
+
+        if kind == "turn_complete":
+            return [self._event(turn_complete=True)]
+
+        raise ValueError(f"Unknown mock step kind: {kind}")
+
+    def _event(self, **fields) -> Event:
+        return Event(author=self.author, **fields)
@@ -0,0 +1,384 @@
+"""
+Outbound Writer — per-connection send queue with coalescing.
+
+``_handle_event`` used to await ``ws.send_json`` for every audio part,
+transcript, tool call and usage record, so one slow browser stalled
+``run_live`` for its session and every small message paid for its own
+frame. Now each connection gets an ``OutboundWriter``: the event handler
+only enqueues (it never awaits the socket) and a single writer task
+drains the queue.
+
+Cheap, lossless coalescing happens on every enqueue:
+
+  - consecutive partial transcripts from the same source are concatenated;
+  - a final transcript drops the queued partials of its source (the final
+    carries the full text).
+
+Once the queue is past ``pressure`` (a fraction of ``max_queue``), messages
+that a newer one supersedes are merged into it rather than queued twice:
+``talk_ratio`` and ``usage`` keep only the latest (usage counts are summed),
+and ``update_dashboard`` tool calls are folded together — later scores,
+sentiment and tip win, "-1 / empty means no update" fields don't clobber
+earlier values, and two different key moments are never merged.
+
+When the queue is full, the oldest droppable message (partial transcript,
+usage, talk ratio) is evicted, then the oldest message of any kind. A
+browser that far behind has already missed that audio.
+
+On a barge-in (``app/bargein.py``) ``cancel_audio()`` drops every queued
+audio message and ``put_urgent()`` sends the ``interrupt`` ahead of the queue.
+
+The writer can outlive its socket: ``detach()`` parks it (audio is dropped,
+everything else keeps queueing within the bound) and ``attach()`` points it
+at a new socket. Dashboard-relevant messages get a ``seq`` number and are
+kept in a ``ReplayLog``, so a resumed client receives exactly the messages
+after the last ``seq`` it saw (see ``app/resume.py``).
+
+Clients that announce ``"batch": true`` in their config receive bursts of
+JSON messages as one ``{"type":"batch","messages":[...]}`` frame. Binary
+audio frames are never batched and keep their position in the stream.
+"""
+
+import asyncio
+from collections import deque
+
+from app.metrics import DEPTH_BUCKETS, REGISTRY
+from app.protocol import HEADER_SIZE
+
+# Messages the client can lose without visible effect (or that a later one replaces)
+DROPPABLE = frozenset({"usage", "talk_ratio"})
+# update_dashboard args that mean "no update" at these values
+_NO_UPDATE = (-1, "", None)
+# Messages that change what the dashboard shows, replayed on resume
+REPLAYABLE = frozenset({
+    "text", "tool_call", "tool_result", "objection_hint", "objection_hint_resolved", "talk_ratio",
+})
+
+OUTBOUND_MESSAGES = REGISTRY.counter(
+    "lsc_outbound_messages_total",
+    "Outbound messages by outcome (sent / merged / dropped / cancelled).",
+    ["outcome"],
+)
+OUTBOUND_FRAMES = REGISTRY.counter(
+    "lsc_outbound_frames_total", "WebSocket frames written (json / batch / binary).", ["kind"]
+)
+OUTBOUND_QUEUE_DEPTH = REGISTRY.histogram(
+    "lsc_outbound_queue_depth",
+    "Outbound queue depth seen by the writer at the start of each drain.",
+    buckets=DEPTH_BUCKETS,
+)
+
+
+def _is_partial(item, source: str | None = None) -> bool:
+    return (
+        isinstance(item, dict)
+        and item.get("type") == "transcript"
+        and item.get("partial")
+        and (source is None or item.get("source") == source)
+    )
+
+
+def _droppable(item) -> bool:
+    return isinstance(item, dict) and (item.get("type") in DROPPABLE or bool(item.get("partial")))
+
+
+def _is_audio(item) -> bool:
+    return not isinstance(item, dict) or item.get("type") == "audio"
+
+
+def _replayable(message: dict) -> bool:
+    kind = message.get("type")
+    return kind in REPLAYABLE or (kind == "transcript" and not message.get("partial"))
+
+
+class ReplayLog:
+    """Numbered ring of recent dashboard messages for resumed clients."""
+
+    def __init__(self, maxlen: int = 512):
+        self._entries: deque[dict] = deque(maxlen=maxlen)
+        self.seq = 0
+
+    def record(self, message: dict) -> dict:
+        """Number a copy of ``message``, keep it and return it for sending.
+
+        The caller's dict is also journaled and broadcast, so it is left as is.
+        """
+        self.seq += 1
+        entry = {**message, "seq": self.seq}
+        self._entries.append(entry)
+        return entry
+
+    def since(self, seq: int | None) -> list[dict]:
+        """Messages numbered after ``seq`` (all retained ones if None)."""
+        if seq is None:
+            return list(self._entries)
+        return [m for m in self._entries if m["seq"] > seq]
+
+
+def _is_dashboard(item) -> bool:
+    return (
+        isinstance(item, dict)
+        and item.get("type") == "tool_call"
+        and item.get("name") == "update_dashboard"
+    )
+
+
+def merge_dashboard(older: dict, newer: dict) -> dict | None:
+    """Fold two ``update_dashboard`` arg dicts, or None if both carry a key moment."""
+    if older.get("key_moment") and newer.get("key_moment"):
+        return None
+    merged = dict(older)
+    for key, value in newer.items():
+        if value not in _NO_UPDATE:
+            merged[key] = value
+        else:
+            merged.setdefault(key, value)
+    return merged
+
+
+class OutboundWriter:
+    """Queue + writer task for one WebSocket.
+
+    ``send_json`` / ``send_bytes`` mirror the WebSocket methods so the event
+    handler can write to either, but they only enqueue and never block.
+    """
+
+    def __init__(
+        self,
+        ws,
+        max_queue: int = 256,
+        batch: bool = False,
+        max_batch: int = 32,
+        pressure: float = 0.25,
+        replay: ReplayLog | None = None,
+    ):
+        self.ws = ws
+        self.replay = replay
+        self.max_queue = max_queue
+        self.batch = batch
+        self.max_batch = max_batch
+        self._pressure_depth = max(1, int(max_queue * pressure))
+        self._queue: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+        self.enqueued = 0
+        self.sent = 0
+        self.frames = 0
+        self.merged = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.max_depth = 0
+
+    # ── Producer side ──
+    async def send_json(self, message: dict) -> None:
+        self.put(message)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.put(data)
+
+    def put(self, item) -> None:
+        """Enqueue one JSON message (dict) or binary frame (bytes)."""
+        if self.ws is None and _is_audio(item):
+            return  # Nobody is listening; stale by the time anyone is
+        self.enqueued += 1
+        if self.replay is not None and isinstance(item, dict) and _replayable(item):
+            item = self.replay.record(item)
+        if isinstance(item, dict) and self._coalesce(item):
+            self._merged()
+        else:
+            if len(self._queue) >= self.max_queue:
+                self._evict()
+            self._queue.append(item)
+            self.max_depth = max(self.max_depth, len(self._queue))
+        self._wakeup.set()
+
+    def put_urgent(self, message: dict) -> None:
+        """Send ``message`` ahead of everything already queued."""
+        if self.ws is None:
+            return
+        self.enqueued += 1
+        self._queue.appendleft(message)
+        self._wakeup.set()
+
+    def cancel_audio(self) -> int:
+        """Drop all queued audio (binary frames and legacy JSON); returns its PCM bytes."""
+        kept: deque = deque()
+        cancelled = dropped_bytes = 0
+        for item in self._queue:
+            if isinstance(item, dict):
+                if item.get("type") != "audio":
+                    kept.append(item)
+                    continue
+                dropped_bytes += len(item.get("data", "")) * 3 // 4
+            else:
+                dropped_bytes += max(0, len(item) - HEADER_SIZE)
+            cancelled += 1
+        self._queue = kept
+        self.cancelled += cancelled
+        OUTBOUND_MESSAGES.labels("cancelled").inc(cancelled)
+        return dropped_bytes
+
+    def _coalesce(self, message: dict) -> bool:
+        """Merge ``message`` into the queue; True if it needs no slot of its own."""
+        queue = self._queue
+        if not queue:
+            return False
+        kind = message.get("type")
+        if kind == "transcript":
+            source = message.get("source")
+            if message.get("partial"):
+                last = queue[-1]
+                if _is_partial(last, source):
+                    queue[-1] = {**last, "text": last["text"] + message.get("text", "")}
+                    return True
+            else:
+                before = len(queue)
+                self._queue = queue = deque(i for i in queue if not _is_partial(i, source))
+                self.merged += before - len(queue)
+                OUTBOUND_MESSAGES.labels("merged").inc(before - len(queue))
+            return False
+
+        if len(queue) < self._pressure_depth:
+            return False
+        if kind not in DROPPABLE and not _is_dashboard(message):
+            return False
+        # Under pressure: replace superseded state in place of queueing it twice
+        for i in range(len(queue) - 1, -1, -1):
+            queued = queue[i]
+            if not isinstance(queued, dict) or queued.get("type") != kind:
+                continue
+            if kind == "talk_ratio":
+                del queue[i]
+                queue.append(message)
+                return True
+            if kind == "usage":
+                del queue[i]
+                queue.append({
+                    key: value + message.get(key, 0) if key != "type" else value
+                    for key, value in queued.items()
+                })
+                return True
+            if _is_dashboard(queued):
+                args = merge_dashboard(queued.get("args", {}), message.get("args", {}))
+                if args is None:
+                    return False
+                del queue[i]
+                queue.append({**message, "args": args})
+                return True
+        return False
+
+    def _evict(self) -> None:
+        queue = self._queue
+        for i, item in enumerate(queue):
+            if _droppable(item):
+                del queue[i]
+                break
+        else:
+            queue.popleft()
+        self.dropped += 1
+        OUTBOUND_MESSAGES.labels("dropped").inc()
+
+    def _merged(self) -> None:
+        self.merged += 1
+        OUTBOUND_MESSAGES.labels("merged").inc()
+
+    # ── Writer side ──
+    def start(self) -> "OutboundWriter":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self) -> None:
+        queue_depth = OUTBOUND_QUEUE_DEPTH
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            queue_depth.observe(len(self._queue))
+            while self._queue and self.ws is not None:
+                try:
+                    await self._write_next()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # Socket gone: keep queueing until a client reattaches
+                    self.detach()
+            if self._closing:
+                return
+
+    @property
+    def attached(self) -> bool:
+        return self.ws is not None
+
+    def detach(self) -> None:
+        """Stop writing to the current socket; queued audio is dropped."""
+        self.ws = None
+        self.cancel_audio()
+
+    def attach(self, ws, last_seq: int | None = None) -> None:
+        """Write to ``ws`` from now on, starting with the messages it missed.
+
+        The queue is replaced by the replay log after ``last_seq``: anything
+        queued but never sent is in there too, and what isn't (usage, partial
+        transcripts) is stale.
+        """
+        missed = self.replay.since(last_seq) if self.replay is not None else []
+        self._queue = deque(missed)
+        self.ws = ws
+        self._wakeup.set()
+
+    async def _write_next(self) -> None:
+        queue = self._queue
+        item = queue.popleft()
+        if not isinstance(item, dict):
+            await self.ws.send_bytes(item)
+            self._sent(1, "binary")
+            return
+        if not self.batch or not queue or not isinstance(queue[0], dict):
+            await self.ws.send_json(item)
+            self._sent(1, "json")
+            return
+        messages = [item]
+        while queue and isinstance(queue[0], dict) and len(messages) < self.max_batch:
+            messages.append(queue.popleft())
+        await self.ws.send_json({"type": "batch", "messages": messages})
+        self._sent(len(messages), "batch")
+
+    def _sent(self, messages: int, kind: str) -> None:
+        self.sent += messages
+        self.frames += 1
+        OUTBOUND_MESSAGES.labels("sent").inc(messages)
+        OUTBOUND_FRAMES.labels(kind).inc()
+
+    async def close(self, timeout: float = 2.0) -> None:
+        """Flush what's queued (up to ``timeout``), then stop the writer."""
+        if self._task is None:
+            return
+        if self.ws is None:
+            self._queue.clear()  # Nobody left to flush to
+        self._closing = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()  # Stuck on a send: never leave it running
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # Our caller is being cancelled, not just the writer
+        except Exception:
+            pass  # The writer's own failure; the socket is going away anyway
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "frames": self.frames,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "max_depth": self.max_depth,
+        }
@@ -0,0 +1,93 @@
+"""
+Persona Runner Registry — one practice agent + runner per persona.
+
+Building a practice session used to mean formatting the full practice
+instruction, constructing an ``Agent`` and wrapping it in a fresh
+``Runner`` on every connect. None of that depends on the connection: the
+runner is stateless between sessions (state lives in the session service),
+so every practice call for a persona can share one instance.
+
+Entries are built lazily on first use (or up front with ``warm()``) and
+remember a deep copy of the persona definition and the instruction
+template they were built from. ``get()`` compares those with ``==`` — the
+strings are usually the very same objects, so the check is near free —
+and if a persona was edited or replaced in ``PERSONAS`` at runtime, the
+entry is rebuilt.
+"""
+
+import copy
+import time
+from typing import Any, Callable, Iterable, NamedTuple
+
+from app import agent as agent_module
+from app.prompts.personas import PERSONAS
+
+DEFAULT_PERSONA = "sarah-startup"
+
+
+class _Entry(NamedTuple):
+    persona: dict  # Snapshot the runner was built from
+    instruction: str
+    runner: Any
+
+
+class PersonaRunnerRegistry:
+    """Caches a practice runner per persona, rebuilt when the persona changes."""
+
+    def __init__(self, make_runner: Callable[[Any], Any]):
+        self._make_runner = make_runner
+        self._entries: dict[str, _Entry] = {}
+        self.hits = 0
+        self.builds = 0
+        self.rebuilds = 0
+        self.build_seconds = 0.0
+
+    def resolve(self, persona_id: str) -> str:
+        """Unknown personas fall back to the default, as ``create_practice_agent`` does."""
+        return persona_id if persona_id in PERSONAS else DEFAULT_PERSONA
+
+    def get(self, persona_id: str) -> tuple[Any, dict]:
+        """Return ``(runner, persona)`` for ``persona_id``, building it if needed."""
+        persona_id = self.resolve(persona_id)
+        persona = PERSONAS[persona_id]
+
+        entry = self._entries.get(persona_id)
+        if (
+            entry is not None
+            and entry.instruction == agent_module.PRACTICE_AGENT_INSTRUCTION
+            and entry.persona == persona
+        ):
+            self.hits += 1
+            return entry.runner, persona
+
+        if entry is not None:
+            self.rebuilds += 1
+        started = time.perf_counter()
+        runner = self._make_runner(agent_module.create_practice_agent(persona_id))
+        self.build_seconds += time.perf_counter() - started
+        self.builds += 1
+        self._entries[persona_id] = _Entry(
+            copy.deepcopy(persona), agent_module.PRACTICE_AGENT_INSTRUCTION, runner
+        )
+        return runner, persona
+
+    def warm(self, persona_ids: Iterable[str] | None = None) -> None:
+        """Build runners ahead of the first connect (defaults to every persona)."""
+        for persona_id in persona_ids if persona_ids is not None else list(PERSONAS):
+            self.get(persona_id)
+
+    def invalidate(self, persona_id: str | None = None) -> None:
+        """Drop one cached persona, or all of them."""
+        if persona_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(persona_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "builds": self.builds,
+            "rebuilds": self.rebuilds,
+            "build_ms_total": round(self.build_seconds * 1000, 1),
+        }
@@ -3,6 +3,8 @@ Objection Categories and Response Framework.
 Ported from QuotaHit's objection library.
 """
 
+from app.matching import TriggerMatch, TriggerMatcher, TriggerScanner
+
 OBJECTION_CATEGORIES = {
     "price": {
         "name": "Price & Budget",
@@ -68,16 +70,28 @@ OBJECTION_CATEGORIES = {
 }
 
 
+# Compiled once at import — one pass per transcript, word-boundary aware
+OBJECTION_MATCHER = TriggerMatcher(
+    {category: info["triggers"] for category, info in OBJECTION_CATEGORIES.items()}
+)
+
+
+def detect_objections(text: str) -> list[TriggerMatch]:
+    """Find every objection trigger in text, with category and span."""
+    return OBJECTION_MATCHER.find_all(text)
+
+
+def objection_scanner() -> TriggerScanner:
+    """Incremental scanner for streaming transcription deltas."""
+    return OBJECTION_MATCHER.scanner()
+
+
 def detect_objection_type(text: str) -> str:
-    """Detect the objection category from text."""
-    text_lower = text.lower()
-    for category, info in OBJECTION_CATEGORIES.items():
-        if category == "custom":
-            continue
-        for trigger in info["triggers"]:
-            if trigger in text_lower:
-                return category
-    return "custom"
+    """Detect the objection category from text (earliest match wins)."""
+    matches = OBJECTION_MATCHER.find_all(text)
+    if not matches:
+        return "custom"
+    return min(matches, key=lambda m: m.start).category
 
 
 def get_objection_framework(category: str) -> str:
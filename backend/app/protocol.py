@@ -0,0 +1,76 @@
+"""
+Binary WebSocket Frame Protocol — raw PCM without base64-in-JSON.
+
+Clients that announce ``"binary": true`` in their ``config`` message
+exchange audio (and screen-share JPEGs) as binary WebSocket frames with a
+small fixed header. JSON text frames remain for control messages only.
+Clients that don't announce it keep the legacy base64 JSON path.
+
+Frame layout (network byte order, 8-byte header + payload):
+
+    0      1      2             4                          8
+    +------+------+-------------+--------------------------+---------
+    | ver  | kind |  sequence   |   sample rate (Hz) / 0   | payload
+    +------+------+-------------+--------------------------+---------
+"""
+
+import struct
+
+PROTOCOL_VERSION = 1
+
+# Frame kinds
+KIND_AUDIO = 0x01  # 16-bit little-endian mono PCM
+KIND_IMAGE = 0x02  # JPEG screen-share frame
+
+HEADER = struct.Struct("!BBHI")
+HEADER_SIZE = HEADER.size
+
+INPUT_SAMPLE_RATE = 16000  # Browser mic → Gemini
+OUTPUT_SAMPLE_RATE = 24000  # Gemini audio out → browser
+
+
+class FrameError(ValueError):
+    """Raised when a binary frame is malformed or unsupported."""
+
+
+def pack_frame(kind: int, payload: bytes, seq: int = 0, sample_rate: int = 0) -> bytes:
+    """Prefix ``payload`` with a binary frame header."""
+    return HEADER.pack(PROTOCOL_VERSION, kind, seq & 0xFFFF, sample_rate) + payload
+
+
+def unpack_frame(frame: bytes) -> tuple[int, int, int, memoryview]:
+    """Split a binary frame into ``(kind, seq, sample_rate, payload)``.
+
+    The payload is returned as a zero-copy memoryview over ``frame``.
+    """
+    if len(frame) < HEADER_SIZE:
+        raise FrameError(f"Frame too short: {len(frame)} bytes")
+    version, kind, seq, sample_rate = HEADER.unpack_from(frame)
+    if version != PROTOCOL_VERSION:
+        raise FrameError(f"Unsupported protocol version: {version}")
+    if kind not in (KIND_AUDIO, KIND_IMAGE):
+        raise FrameError(f"Unknown frame kind: {kind}")
+    return kind, seq, sample_rate, memoryview(frame)[HEADER_SIZE:]
+
+
+def sample_rate_from_mime(mime_type: str, default: int = OUTPUT_SAMPLE_RATE) -> int:
+    """Parse the ``rate=`` parameter of an ``audio/pcm;rate=24000`` mime type."""
+    for param in mime_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key == "rate" and value.isdigit():
+            return int(value)
+    return default
+
+
+class FrameSequencer:
+    """Per-connection outbound sequence counter (wraps at 16 bits)."""
+
+    __slots__ = ("_seq",)
+
+    def __init__(self) -> None:
+        self._seq = 0
+
+    def next(self) -> int:
+        seq = self._seq
+        self._seq = (seq + 1) & 0xFFFF
+        return seq
@@ -0,0 +1,275 @@
+"""
+Call Recording & Replay — capture a real call, play it back offline.
+
+A call started with ``"record": true`` in its config (or every call, with
+``RECORD_CALLS=true``) is recorded to ``<RECORDING_DIR>/<session_id>.lscr``.
+The recording holds everything the client sent and every ADK event
+``run_live`` produced, each with its offset from the start of the call:
+
+    b"LSCR\\x01" + zlib stream of records
+    record = <kind: u8> <t: f64 seconds> <length: u32> <payload>
+
+    META          JSON: the client's config message, session id, start time
+    CLIENT_BYTES  a binary WebSocket frame as received (``app.protocol``)
+    CLIENT_TEXT   a text WebSocket message as received
+    EVENT         an ADK ``Event`` as JSON
+    EVENT_AUDIO   an audio-only ``Event``: mime type, NUL, raw PCM
+
+Records are buffered in memory and compressed and written by a background
+task every ``flush_interval`` seconds. Each flush ends with a zlib sync
+point, so a crash loses at most the last interval and ``read_recording``
+stops cleanly at a torn tail.
+
+``ReplayRunner`` is a stand-in for ``Runner`` (``LIVE_BACKEND=replay``,
+``REPLAY_RECORDING=<file>``). Its ``run_live`` drains the request queue
+like the real runner and yields the recorded events, at the recorded pace
+scaled by ``speed``, or as fast as possible with ``speed=0``. It never
+touches the network. The local tools in ``REPLAY_TOOLS`` are run again
+with the recorded arguments, and their fresh results replace the recorded
+function responses, so tool code changes show up in a replay. Tools with
+side effects or network access (``save_call_summary``, search) keep their
+recorded results. ``bench/replay.py`` plays the client side back at
+the server, so a recording runs through ``_read_client`` and
+``_handle_event`` like the original call did.
+"""
+
+import asyncio
+import inspect
+import json
+import struct
+import time
+import zlib
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from google.adk.events import Event
+from google.genai import types
+
+from app.tools.coaching import get_coaching_tip
+from app.tools.dashboard import log_objection, update_dashboard
+
+MAGIC = b"LSCR\x01"
+HEADER = struct.Struct("<BdI")
+
+META = 0
+CLIENT_BYTES = 1
+CLIENT_TEXT = 2
+EVENT = 3
+EVENT_AUDIO = 4
+
+# Pure local tools, safe to run again during a replay
+REPLAY_TOOLS = {
+    "update_dashboard": update_dashboard,
+    "log_objection": log_objection,
+    "get_coaching_tip": get_coaching_tip,
+}
+
+
+class Record(NamedTuple):
+    kind: int
+    t: float  # Seconds since the start of the call
+    payload: bytes
+
+
+def _audio_only(event) -> types.Blob | None:
+    """The blob of an event that is nothing but one audio part."""
+    content = event.content
+    if (
+        content is None
+        or len(content.parts or []) != 1
+        or event.partial
+        or event.turn_complete
+        or event.interrupted
+        or event.usage_metadata is not None
+        or event.input_transcription is not None
+        or event.output_transcription is not None
+    ):
+        return None
+    blob = content.parts[0].inline_data
+    if blob is None or not blob.data or "audio" not in (blob.mime_type or ""):
+        return None
+    return blob
+
+
+def decode_event(record: Record, author: str = "replay") -> Event:
+    if record.kind == EVENT_AUDIO:
+        mime_type, _, data = record.payload.partition(b"\0")
+        return Event(author=author, content=types.Content(role="model", parts=[
+            types.Part(inline_data=types.Blob(data=data, mime_type=mime_type.decode()))
+        ]))
+    return Event.model_validate_json(record.payload)
+
+
+class CallRecorder:
+    """Writes one call's recording from a background flush task."""
+
+    def __init__(self, path: str | Path, meta: dict, flush_interval: float = 0.5, level: int = 1):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._started = time.monotonic()
+        self._compressor = zlib.compressobj(level)
+        self._buffer: list[bytes] = []
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Future | None = None
+        self._fh = None
+        self.records = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+        self._add(META, json.dumps({**meta, "started_at": time.time()}).encode())
+
+    def start(self) -> "CallRecorder":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("wb")
+        self._fh.write(MAGIC)
+        self._task = asyncio.create_task(self._run(), name=f"recorder-{self.path.stem}")
+        return self
+
+    def _add(self, kind: int, payload: bytes) -> None:
+        self._buffer.append(HEADER.pack(kind, time.monotonic() - self._started, len(payload)))
+        self._buffer.append(payload)
+        self.records += 1
+        self.raw_bytes += HEADER.size + len(payload)
+
+    # ── Hot path: buffer only ───────────────────────────────────────────
+    def client(self, message: dict) -> None:
+        """Record one ASGI ``websocket.receive`` message from the client."""
+        if message.get("bytes") is not None:
+            self._add(CLIENT_BYTES, message["bytes"])
+        elif message.get("text") is not None:
+            self._add(CLIENT_TEXT, message["text"].encode())
+
+    def event(self, event) -> None:
+        blob = _audio_only(event)
+        if blob is not None:
+            self._add(EVENT_AUDIO, blob.mime_type.encode() + b"\0" + blob.data)
+        else:
+            self._add(EVENT, event.model_dump_json(exclude_none=True, exclude_defaults=True).encode())
+
+    # ── Writer ──────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            # Shielded: close() must not interrupt a write halfway
+            self._flushing = asyncio.ensure_future(self._flush())
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self) -> None:
+        if not self._buffer:
+            return
+        data, self._buffer = b"".join(self._buffer), []
+        await asyncio.to_thread(self._write, data, zlib.Z_SYNC_FLUSH)
+
+    def _write(self, data: bytes, mode: int) -> None:
+        out = self._compressor.compress(data) + self._compressor.flush(mode)
+        self._fh.write(out)
+        self._fh.flush()
+        self.written_bytes += len(out)
+
+    async def close(self) -> None:
+        """Write what is buffered and finish the zlib stream."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        data, self._buffer = b"".join(self._buffer), []
+        await asyncio.to_thread(self._write, data, zlib.Z_FINISH)
+        self._fh.close()
+
+    def stats(self) -> dict:
+        return {
+            "records": self.records,
+            "raw_bytes": self.raw_bytes,
+            "written_bytes": self.written_bytes,
+        }
+
+
+def read_recording(path: str | Path, chunk_size: int = 256 * 1024) -> Iterator[Record]:
+    """Stream the records of a recording; a torn tail just ends the stream."""
+    decompressor = zlib.decompressobj()
+    pending = bytearray()
+    with Path(path).open("rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a call recording")
+        while chunk := fh.read(chunk_size):
+            try:
+                pending += decompressor.decompress(chunk)
+            except zlib.error:
+                break  # Torn write after a crash
+            offset = 0
+            while len(pending) - offset >= HEADER.size:
+                kind, t, length = HEADER.unpack_from(pending, offset)
+                end = offset + HEADER.size + length
+                if end > len(pending):
+                    break
+                yield Record(kind, t, bytes(pending[offset + HEADER.size:end]))
+                offset = end
+            del pending[:offset]
+
+
+def load_recording(path: str | Path) -> tuple[dict, list[Record], list[Record]]:
+    """(meta, client records, event records) of a whole recording."""
+    meta: dict = {}
+    client: list[Record] = []
+    events: list[Record] = []
+    for record in read_recording(path):
+        if record.kind == META:
+            meta = json.loads(record.payload)
+        elif record.kind in (CLIENT_BYTES, CLIENT_TEXT):
+            client.append(record)
+        else:
+            events.append(record)
+    return meta, client, events
+
+
+def _rerun_tool(name: str, args: dict):
+    tool = REPLAY_TOOLS[name]
+    accepted = inspect.signature(tool).parameters
+    return tool(**{k: v for k, v in args.items() if k in accepted})
+
+
+class ReplayRunner:
+    """Drop-in for ``Runner`` that plays a recording's events back."""
+
+    def __init__(self, path: str | Path, speed: float = 1.0, author: str = "live_sales_coach"):
+        self.path = Path(path)
+        self.speed = speed  # 1.0 = recorded pace, 0 = as fast as possible
+        self.author = author
+        _, _, self._events = load_recording(self.path)
+        self.tools_rerun = 0
+
+    async def run_live(self, *, user_id, session_id, live_request_queue, run_config=None, **_):
+        closed = asyncio.Event()
+
+        async def consume() -> None:
+            while not (await live_request_queue.get()).close:
+                pass  # Inbound audio, images and text go nowhere
+            closed.set()
+
+        consumer = asyncio.create_task(consume())
+        fresh: dict[str, deque] = defaultdict(deque)  # Tool name → rerun results
+        started = time.monotonic()
+        try:
+            for record in self._events:
+                if self.speed > 0:
+                    delay = started + record.t / self.speed - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                event = decode_event(record, self.author)
+                for fc in event.get_function_calls():
+                    if fc.name in REPLAY_TOOLS:
+                        fresh[fc.name].append(_rerun_tool(fc.name, dict(fc.args or {})))
+                        self.tools_rerun += 1
+                for fr in event.get_function_responses():
+                    if fresh[fr.name]:
+                        fr.response = fresh[fr.name].popleft()
+                yield event
+            await closed.wait()
+        finally:
+            consumer.cancel()
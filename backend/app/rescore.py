@@ -0,0 +1,441 @@
+"""
+Batch Re-scoring — score archived calls again, offline, on every core.
+
+``python -m app.rescore`` walks directories of archived calls: call
+recordings (``*.lscr``, see ``app.recording``) and call journals
+(``*.ndjson``, see ``app.journal``). When a call has both, the recording
+wins. Each call is scored again in a process pool, one worker per core by
+default:
+
+  - objection detection: the objection matcher runs again over the
+    prospect's transcripts the way ``ObjectionHinter`` does live, so
+    trigger changes apply to old calls. The model's recorded
+    ``log_objection`` calls still resolve the hints;
+  - talk ratio: a recording holds the call's audio, so ``TalkTimeTracker``
+    measures it again. A journal only kept the ``talk_ratio`` pushes,
+    which are used as they are;
+  - the local analytics (``CallTimeline.analyze()``) of the rebuilt call;
+  - rubric scores in the ``update_dashboard`` dimensions (discovery,
+    rapport, objection, next_steps) from a pluggable scorer
+    (``app.scorers``): ``STANDARD_MODEL`` by default, ``--scorer stub``
+    without the network.
+
+Every call becomes one row of a Parquet dataset in the output directory.
+Rows are written a row group at a time as the workers finish, into
+``_scores-<run>-<n>.parquet``. Parquet readers (pyarrow, pandas, DuckDB)
+skip files starting with "_", so the directory stays readable while a
+run is going. A part loses the "_" once it holds ``rows_per_file`` rows or
+the run ends, so a run that dies loses at most its open part; the next
+run deletes it. Calls already scored by the same scorer are
+skipped, so an interrupted overnight run picks up where it stopped. A call
+that fails to load or score gets a row with ``error`` set and is tried
+again on the next run.
+
+The dataset keeps one row per call and scorer: its latest outcome. When
+the writer closes, sealed files holding a row that a later one
+supersedes (an error row for a call that has since been retried) are
+rewritten without it, through a "_" part and an atomic rename.
+
+    python -m app.rescore data/recordings data/journal --out data/scores --scorer gemini
+
+Needs the ``batch`` extra (``pip install '.[batch]'``) for pyarrow.
+"""
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.analytics import CATEGORIES, CallTimeline
+from app.config import (
+    JOURNAL_DIR,
+    RECORDING_DIR,
+    RESCORE_OUTPUT_DIR,
+    RESCORE_SCORER,
+    RESCORE_WORKERS,
+    TALK_RATIO_INTERVAL,
+    VAD_HANGOVER_MS,
+    VAD_MODE,
+    VAD_THRESHOLD_DB,
+)
+from app.hints import ObjectionHinter
+from app.protocol import KIND_AUDIO, unpack_frame
+from app.recording import CLIENT_BYTES, CLIENT_TEXT, META, decode_event, read_recording
+from app.scorers import RUBRIC, CallScorer, load_scorer
+from app.talk import TalkTimeTracker
+from app.vad import VadSettings
+
+# The server's VAD defaults; a recorded config may override them per call
+DEFAULT_VAD = VadSettings(mode=VAD_MODE, threshold_db=VAD_THRESHOLD_DB, hangover_ms=VAD_HANGOVER_MS)
+# Detected again from the transcripts instead
+HINT_TYPES = frozenset({"objection_hint", "objection_hint_resolved"})
+
+_SCORE = pa.int16()
+_TIME = pa.timestamp("ms", tz="UTC")
+SCHEMA = pa.schema([
+    ("session_id", pa.string()),
+    ("source", pa.string()),  # "recording" | "journal"
+    ("path", pa.string()),
+    ("mode", pa.string()),
+    ("started_at", _TIME),
+    ("duration_s", pa.float64()),
+    ("rep_pct", _SCORE),
+    ("prospect_pct", _SCORE),
+    ("talk_source", pa.string()),
+    ("objections", pa.int32()),
+    ("objections_per_minute", pa.float64()),
+    *[(f"objections_{category}", pa.int32()) for category in CATEGORIES],
+    ("sentiment_final", pa.string()),
+    ("sentiment_mean", pa.float64()),
+    # The Live model's last update_dashboard scores during the call
+    *[(f"live_{dim}", _SCORE) for dim in RUBRIC],
+    # The scorer's
+    *[(dim, _SCORE) for dim in RUBRIC],
+    ("overall", _SCORE),
+    ("outcome", pa.string()),
+    ("summary", pa.string()),
+    ("scorer", pa.string()),
+    ("scored_at", _TIME),
+    ("error", pa.string()),
+])
+
+
+@dataclass
+class ArchivedCall:
+    session_id: str
+    path: Path
+    source: str  # "recording" | "journal"
+    mode: str
+    started: float  # Epoch seconds
+    ended: float
+    # (epoch seconds, dashboard message), as _send_dashboard sent them
+    messages: list[tuple[float, dict]] = field(default_factory=list)
+
+
+# ── Loading ─────────────────────────────────────────────────────────────
+def archived_calls(roots: list[str | Path]) -> list[Path]:
+    """The calls under ``roots`` (files or directories), one per session."""
+    found: dict[str, Path] = {}
+    for root in map(Path, roots):
+        paths = [root] if root.is_file() else [*root.glob("*.ndjson"), *root.glob("*.lscr")]
+        for path in sorted(paths):
+            # A call's recording has its audio; its journal doesn't
+            if path.suffix == ".lscr" or found.get(path.stem, path).suffix != ".lscr":
+                found[path.stem] = path
+    return sorted(found.values())
+
+
+def load_call(path: Path) -> ArchivedCall:
+    return load_recorded_call(path) if path.suffix == ".lscr" else load_journal_call(path)
+
+
+def load_journal_call(path: Path) -> ArchivedCall:
+    with path.open("rb") as fh:
+        records = [json.loads(line) for line in fh if line.strip()]
+    if not records:
+        raise ValueError(f"{path} is empty")
+    first = records[0]["e"]
+    mode = first.get("mode", "live") if first.get("type") == "call_started" else "live"
+    call = ArchivedCall(path.stem, path, "journal", mode, records[0]["t"], records[-1]["t"])
+    for record in records:
+        event = record["e"]
+        if event.get("type") == "call_analytics":
+            call.ended = record["t"]  # Where the live analysis stopped
+            break
+        if event.get("type") not in HINT_TYPES:
+            call.messages.append((record["t"], event))
+    return call
+
+
+def load_recorded_call(path: Path) -> ArchivedCall:
+    """Rebuild a recorded call's dashboard messages, measuring its audio again."""
+    call: ArchivedCall | None = None
+    talk: TalkTimeTracker | None = None
+    next_push = TALK_RATIO_INTERVAL
+    for record in read_recording(path):
+        if record.kind == META:
+            meta = json.loads(record.payload)
+            config = meta.get("config") or {}
+            mode = config.get("mode", "live")
+            started = meta.get("started_at", 0.0)
+            call = ArchivedCall(path.stem, path, "recording", mode, started, started)
+            talk = TalkTimeTracker(mode, settings=DEFAULT_VAD.merged(config.get("vad")))
+            continue
+        if call is None:
+            raise ValueError(f"{path} has no metadata record")
+        # Measured talk_ratio pushes on the live cadence
+        while record.t >= next_push:
+            measured = talk.changed_measurement()
+            if measured is not None:
+                call.messages.append((call.started + next_push, measured))
+            next_push += TALK_RATIO_INTERVAL
+        t = call.started + record.t
+        call.ended = t
+        if record.kind == CLIENT_BYTES:
+            kind, _, _, payload = unpack_frame(record.payload)
+            if kind == KIND_AUDIO:
+                talk.on_input(bytes(payload))
+        elif record.kind == CLIENT_TEXT:
+            message = json.loads(record.payload)
+            if message.get("type") == "audio" and message.get("data"):
+                talk.on_input(base64.b64decode(message["data"]))
+        else:
+            call.messages.extend((t, message) for message in _event_messages(decode_event(record), talk))
+    if call is None:
+        raise ValueError(f"{path} has no metadata record")
+    call.messages.append((call.ended, talk.measure()))
+    return call
+
+
+def _event_messages(event, talk: TalkTimeTracker) -> list[dict]:
+    """The dashboard messages ``_handle_event`` made of one ADK event."""
+    messages = []
+    for part in (event.content.parts or []) if event.content else []:
+        blob = part.inline_data
+        if blob is not None and blob.data and "audio" in (blob.mime_type or ""):
+            talk.on_output(blob.data)
+    partial = bool(event.partial)
+    for transcription, source in ((event.input_transcription, "input"), (event.output_transcription, "output")):
+        if transcription is not None:
+            messages.append({"type": "transcript", "text": transcription.text or "", "source": source,
+                             "partial": partial})
+    for fc in event.get_function_calls():
+        messages.append({"type": "tool_call", "name": fc.name, "args": dict(fc.args) if fc.args else {}})
+    return messages
+
+
+# ── Scoring ─────────────────────────────────────────────────────────────
+def score_call(call: ArchivedCall, scorer: CallScorer, scorer_name: str) -> dict:
+    """One output row: objections, talk ratio and analytics again, then the scorer."""
+    now = call.started
+    hinter = ObjectionHinter(source="output" if call.mode == "practice" else "input", clock=lambda: now)
+    timeline = CallTimeline(call.mode, started=call.started)
+    lines = []
+    for now, message in call.messages:
+        timeline.add(message, now)
+        kind = message.get("type")
+        if kind == "transcript":
+            text, partial = message.get("text") or "", bool(message.get("partial"))
+            if message.get("source") == hinter.source:
+                for hint in hinter.on_transcript(text, partial):
+                    timeline.add(hint, now)
+            if not partial and text.strip():
+                lines.append(_transcript_line(call.mode, message.get("source"), text))
+        elif kind == "tool_call" and message.get("name") == "log_objection":
+            resolved = hinter.on_model_objection((message.get("args") or {}).get("objection_type", "custom"))
+            if resolved is not None:
+                timeline.add(resolved, now)
+    analytics = timeline.analyze(now=call.ended)
+    transcript = "\n".join(line for line in lines if line)
+    # Nothing was said: nothing for the scorer to judge
+    rubric = scorer.score(transcript, analytics) if transcript else {}
+
+    talk, sentiment, objections = analytics["talk_ratio"], analytics["sentiment"], analytics["objections"]
+    return {
+        "session_id": call.session_id,
+        "source": call.source,
+        "path": str(call.path),
+        "mode": call.mode,
+        "started_at": round(call.started * 1000),
+        "duration_s": analytics["duration_s"],
+        "rep_pct": talk["rep_pct"],
+        "prospect_pct": talk["prospect_pct"],
+        "talk_source": talk["source"],
+        "objections": objections["count"],
+        "objections_per_minute": objections["per_minute_avg"],
+        **{f"objections_{c}": objections["by_category"].get(c, 0) for c in CATEGORIES},
+        "sentiment_final": sentiment["final"],
+        "sentiment_mean": sentiment["mean"],
+        **{f"live_{dim}": analytics["scores"][dim]["final"] for dim in RUBRIC},
+        **{key: rubric.get(key) for key in (*RUBRIC, "overall", "outcome", "summary")},
+        "scorer": scorer_name,
+        "scored_at": round(time.time() * 1000),
+        "error": None,
+    }
+
+
+def _transcript_line(mode: str, source: str, text: str) -> str | None:
+    if mode == "practice":
+        return f"{'Prospect' if source == 'output' else 'Rep'}: {text}"
+    # Live calls: one mic hears both sides; the model only coaches
+    return f"Call: {text}" if source == "input" else None
+
+
+# Per worker process
+_scorer: CallScorer | None = None
+_scorer_name = ""
+
+
+def _init_worker(spec: str) -> None:
+    global _scorer, _scorer_name
+    _scorer, _scorer_name = load_scorer(spec), spec
+
+
+def _score_path(path: str) -> dict:
+    try:
+        return score_call(load_call(Path(path)), _scorer, _scorer_name)
+    except Exception as e:
+        # One bad call must not end the run; it is retried next time
+        return {
+            "session_id": Path(path).stem,
+            "source": "recording" if path.endswith(".lscr") else "journal",
+            "path": path,
+            "scorer": _scorer_name,
+            "scored_at": round(time.time() * 1000),
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+
+# ── Output ──────────────────────────────────────────────────────────────
+class ScoreWriter:
+    """Appends rows to a Parquet dataset directory, a row group at a time."""
+
+    def __init__(self, directory: str | Path, rows_per_group: int = 256, rows_per_file: int = 4096):
+        self.directory = Path(directory)
+        self.rows_per_group = rows_per_group
+        self.rows_per_file = rows_per_file
+        self.run = time.strftime("%Y%m%d-%H%M%S")
+        self._pending: list[dict] = []
+        self._writer: pq.ParquetWriter | None = None
+        self._part: Path | None = None
+        self._file_rows = 0
+        self.rows = 0
+        self.superseded = 0  # Older rows dropped on close
+        self.files: list[Path] = []
+
+    def write(self, row: dict) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.rows_per_group:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending rows as one row group."""
+        if not self._pending:
+            return
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._part = self.directory / f"_scores-{self.run}-{len(self.files):04d}.parquet"
+            self._writer = pq.ParquetWriter(self._part, SCHEMA, compression="zstd")
+        self._writer.write_table(pa.Table.from_pylist(self._pending, schema=SCHEMA))
+        self._file_rows += len(self._pending)
+        self.rows += len(self._pending)
+        self._pending = []
+        if self._file_rows >= self.rows_per_file:
+            self._seal()
+
+    def _seal(self) -> None:
+        self._writer.close()
+        path = self._part.with_name(self._part.name[1:])
+        self._part.rename(path)
+        self.files.append(path)
+        self._writer, self._part, self._file_rows = None, None, 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._seal()
+        self.superseded = dedupe_scores(self.directory)
+
+
+def dedupe_scores(directory: str | Path) -> int:
+    """Drop every row but the latest per (session_id, scorer); return the rows dropped."""
+    paths = sorted(Path(directory).glob("scores-*.parquet"))
+    latest: dict[tuple[str, str], tuple[int, bool, Path, int]] = {}
+    stale: dict[Path, set[int]] = {}
+    for path in paths:
+        table = pq.read_table(path, columns=["session_id", "scorer", "scored_at", "error"])
+        columns = [table.column(name) for name in table.column_names]
+        columns[2] = columns[2].cast(pa.int64())  # Milliseconds, comparable
+        columns = (column.to_pylist() for column in columns)
+        for i, (session_id, scorer, scored_at, error) in enumerate(zip(*columns)):
+            # Newest wins; at the same time an error-free row beats an error
+            row = (scored_at or 0, error is None, path, i)
+            best = latest.setdefault((session_id, scorer), row)
+            if best is row:
+                continue
+            if row[:2] > best[:2]:
+                latest[(session_id, scorer)], row = row, best
+            stale.setdefault(row[2], set()).add(row[3])
+    for path, rows in stale.items():
+        table = pq.read_table(path, schema=SCHEMA)
+        keep = [i for i in range(table.num_rows) if i not in rows]
+        part = path.with_name(f"_{path.name}")
+        pq.write_table(table.take(keep), part, compression="zstd")
+        os.replace(part, path)
+    return sum(len(rows) for rows in stale.values())
+
+
+def scored_ids(directory: str | Path, scorer: str) -> set[str]:
+    """Sessions the dataset already has an error-free row for, from ``scorer``."""
+    done: set[str] = set()
+    for path in sorted(Path(directory).glob("scores-*.parquet")):
+        table = pq.read_table(path, columns=["session_id", "scorer", "error"])
+        for session_id, by, error in zip(*(table.column(name).to_pylist() for name in table.column_names)):
+            if by == scorer and error is None:
+                done.add(session_id)
+    return done
+
+
+def rescore(
+    roots: list[str | Path],
+    out: str | Path = RESCORE_OUTPUT_DIR,
+    scorer: str = RESCORE_SCORER,
+    workers: int = RESCORE_WORKERS,
+    chunksize: int = 1,
+    rows_per_group: int = 256,
+    rows_per_file: int = 4096,
+    progress_every: int = 0,
+) -> dict:
+    """Score every call under ``roots`` not yet in ``out``; return run stats."""
+    began = time.perf_counter()
+    calls = archived_calls(roots)
+    done = scored_ids(out, scorer)
+    todo = [str(path) for path in calls if path.stem not in done]
+    for torn in Path(out).glob("_scores-*.parquet"):
+        torn.unlink()  # Open part of a run that died
+    workers = workers or os.cpu_count() or 1
+    stats = {"found": len(calls), "skipped": len(calls) - len(todo), "scored": 0, "failed": 0, "workers": workers}
+    writer = ScoreWriter(out, rows_per_group, rows_per_file)
+    try:
+        if todo:
+            # Spawned workers don't inherit the parent's threads and sockets
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(min(workers, len(todo)), _init_worker, (scorer,)) as pool:
+                for row in pool.imap_unordered(_score_path, todo, chunksize):
+                    writer.write(row)
+                    stats["failed" if row["error"] else "scored"] += 1
+                    finished = stats["scored"] + stats["failed"]
+                    if progress_every and finished % progress_every == 0:
+                        rate = finished / (time.perf_counter() - began)
+                        print(f"Re-scoring: {finished}/{len(todo)} calls, {rate:.1f} calls/s")
+    finally:
+        writer.close()
+    stats["seconds"] = round(time.perf_counter() - began, 2)
+    stats["files"] = [str(path) for path in writer.files]
+    stats["superseded"] = writer.superseded
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("roots", nargs="*", default=[RECORDING_DIR, JOURNAL_DIR],
+                        help="recordings, journals, or directories of them")
+    parser.add_argument("--out", default=RESCORE_OUTPUT_DIR)
+    parser.add_argument("--scorer", default=RESCORE_SCORER, help="gemini, gemini:<model>, stub or module:factory")
+    parser.add_argument("--workers", type=int, default=RESCORE_WORKERS, help="0: one per core")
+    parser.add_argument("--chunksize", type=int, default=1, help="calls handed to a worker at a time")
+    parser.add_argument("--rows-per-group", type=int, default=256)
+    parser.add_argument("--rows-per-file", type=int, default=4096)
+    args = parser.parse_args()
+    result = rescore(
+        [root for root in args.roots if root], args.out, args.scorer, args.workers,
+        args.chunksize, args.rows_per_group, args.rows_per_file, progress_every=100,
+    )
+    print(f"Re-scoring done: {json.dumps(result)}")
@@ -0,0 +1,98 @@
+"""
+Resumable Calls — keep a call's model session alive across reconnects.
+
+A Wi-Fi blip used to end the call: the socket closed, ``run_live`` was torn
+down, and the reconnect started a brand-new model session with no context.
+Now every call gets a resume token (sent in the first ``status`` message)
+and is registered here. When its socket drops without an ``end`` message
+the call is *parked*: ``run_live`` keeps running, model events keep
+folding into the outbound queue (audio excepted), and a timer ends the
+call for good after ``grace_seconds``.
+
+A client that reconnects with ``{"type":"config","resume":token,
+"last_seq":n}`` claims the call back: the timer is cancelled, the new socket
+is attached to the call's ``OutboundWriter``, and only the dashboard
+messages numbered after ``n`` are replayed. The model context is never
+rebuilt. A reconnect may also arrive before the server has noticed the old
+socket is gone; claiming an attached call takes it over from that socket.
+"""
+
+import asyncio
+import secrets
+
+from app.metrics import REGISTRY
+
+RESUMES = REGISTRY.counter(
+    "lsc_session_resumes_total",
+    "Resume attempts (resumed / unknown) and parked calls that expired (expired).",
+    ["outcome"],
+)
+
+
+def new_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+class ResumableCalls:
+    """Token → call registry with a grace timer for calls without a socket."""
+
+    def __init__(self, on_expire, grace_seconds: float = 30.0):
+        self._on_expire = on_expire  # async fn(call): end the call for good
+        self.grace_seconds = grace_seconds
+        self._calls: dict[str, object] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self.resumed = 0
+        self.expired = 0
+
+    def register(self, token: str, call) -> None:
+        self._calls[token] = call
+
+    def claim(self, token: str | None):
+        """The call for ``token``, parked or still attached; None if unknown."""
+        call = self._calls.get(token) if token else None
+        if call is None:
+            RESUMES.labels("unknown").inc()
+            return None
+        timer = self._timers.pop(token, None)
+        if timer is not None:
+            timer.cancel()
+        self.resumed += 1
+        RESUMES.labels("resumed").inc()
+        return call
+
+    def park(self, token: str, call) -> None:
+        """Socket gone: end the call unless it is claimed within the grace window."""
+        if token not in self._calls:
+            return
+        self._timers[token] = asyncio.create_task(self._expire(token, call))
+
+    async def _expire(self, token: str, call) -> None:
+        await asyncio.sleep(self.grace_seconds)
+        self._timers.pop(token, None)
+        if self._calls.pop(token, None) is None:
+            return
+        self.expired += 1
+        RESUMES.labels("expired").inc()
+        await self._on_expire(call)
+
+    def remove(self, token: str) -> None:
+        self._calls.pop(token, None)
+        timer = self._timers.pop(token, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def close_all(self) -> None:
+        """Shutdown: end every parked call now."""
+        parked = [(token, self._calls.get(token)) for token in list(self._timers)]
+        for token, call in parked:
+            self.remove(token)
+            if call is not None:
+                await self._on_expire(call)
+
+    def stats(self) -> dict:
+        return {
+            "calls": len(self._calls),
+            "parked": len(self._timers),
+            "resumed": self.resumed,
+            "expired": self.expired,
+        }
@@ -0,0 +1,142 @@
+"""
+Call Scorers — rubric scores for a finished call, from its transcript.
+
+During a call the Live model scores the rep through ``update_dashboard``
+(discovery, rapport, objection handling, next steps). Offline re-scoring
+(``app.rescore``) asks a *scorer* for the same four dimensions, given the
+call's final transcript and its local analytics (``app.analytics``):
+
+    score(transcript, analytics) → {"discovery": 0-100 | None, "rapport": ...,
+                                    "objection": ..., "next_steps": ...,
+                                    "overall": ..., "outcome": str | None,
+                                    "summary": str | None}
+
+  - ``GeminiScorer`` sends the transcript, the measured facts and
+    ``CALL_ANALYSIS_PROMPT`` to ``STANDARD_MODEL`` and reads its JSON answer.
+  - ``StubScorer`` is a deterministic stand-in that needs no network:
+    question rate, sentiment, talk share, objection load and next-step
+    phrases near the end of the call. It is for dry runs and benchmarks of
+    the pipeline, not a judgment of the rep.
+
+``load_scorer()`` builds one from a spec string: ``"gemini"``, ``"stub"``,
+or ``"package.module:factory"`` for a scorer of your own (any object with
+a ``name`` and this ``score()`` method).
+"""
+
+import importlib
+import json
+import re
+from typing import Protocol
+
+from google import genai
+from google.genai import types
+
+from app.analytics import prompt_facts
+from app.config import STANDARD_MODEL
+from app.prompts.coach_system import CALL_ANALYSIS_PROMPT
+
+RUBRIC = ("discovery", "rapport", "objection", "next_steps")
+OUTCOMES = ("meeting_booked", "follow_up", "no_interest", "needs_info")
+
+_QUESTION = re.compile(r"\?|\b(?:what|how|why|who|when|which|tell me)\b", re.IGNORECASE)
+_NEXT_STEP = re.compile(
+    r"\b(?:next steps?|follow[ -]up|schedule|calendar|invite|demo|send (?:you|it|over)"
+    r"|next week|tomorrow|proposal|trial)\b",
+    re.IGNORECASE,
+)
+
+
+class CallScorer(Protocol):
+    name: str
+
+    def score(self, transcript: str, analytics: dict) -> dict:
+        ...
+
+
+def _clamp(value) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        return None
+    return int(min(round(value), 100))
+
+
+def _result(scores: dict, overall=None, outcome=None, summary=None) -> dict:
+    result = {dim: _clamp(scores.get(dim)) for dim in RUBRIC}
+    known = [v for v in result.values() if v is not None]
+    overall = _clamp(overall)
+    if overall is None and known:
+        overall = round(sum(known) / len(known))
+    result["overall"] = overall
+    result["outcome"] = outcome if outcome in OUTCOMES else None
+    result["summary"] = summary if isinstance(summary, str) and summary else None
+    return result
+
+
+class StubScorer:
+    """Deterministic local scores from the transcript and the analytics."""
+
+    name = "stub"
+
+    def score(self, transcript: str, analytics: dict) -> dict:
+        lines = transcript.splitlines()
+        rep = [line for line in lines if not line.startswith("Prospect:")]
+        minutes = max(analytics["duration_s"] / 60, 0.5)
+        questions = sum(len(_QUESTION.findall(line)) for line in rep)
+        closing = lines[len(lines) * 4 // 5:]
+        next_steps = sum(len(_NEXT_STEP.findall(line)) for line in closing)
+        rep_pct = analytics["talk_ratio"]["rep_pct"]
+        objections = analytics["objections"]["count"]
+        sentiment = analytics["sentiment"]["mean"]
+
+        talk_penalty = 0 if rep_pct is None else max(0, rep_pct - 60)
+        return _result(
+            {
+                "discovery": 30 + 15 * questions / minutes - talk_penalty,
+                "rapport": 55 + 35 * sentiment - talk_penalty / 2,
+                # Nothing to handle, nothing to score
+                "objection": 60 + 30 * sentiment - 5 * max(0, objections - 3) if objections else None,
+                "next_steps": 20 + 25 * next_steps,
+            },
+            summary=analytics["summary"],
+        )
+
+
+class GeminiScorer:
+    """Scores from ``STANDARD_MODEL`` with ``CALL_ANALYSIS_PROMPT``."""
+
+    def __init__(self, model: str = STANDARD_MODEL):
+        self.model = model
+        self.name = f"gemini:{model}"
+        # Reads GOOGLE_API_KEY or the Vertex settings from the environment
+        self._client = genai.Client()
+
+    def score(self, transcript: str, analytics: dict) -> dict:
+        response = self._client.models.generate_content(
+            model=self.model,
+            contents=(
+                f"{CALL_ANALYSIS_PROMPT}\n\n"
+                f"Measured facts (trust these over your own estimates): {prompt_facts(analytics)}\n\n"
+                f"Transcript:\n{transcript}"
+            ),
+            config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0.0),
+        )
+        data = json.loads(response.text or "{}")
+        if not isinstance(data, dict):
+            raise ValueError(f"Scorer answered {type(data).__name__}, not an object")
+        return _result(
+            {dim: data.get(f"{dim}_score") for dim in RUBRIC},
+            overall=data.get("overall_score"),
+            outcome=data.get("outcome"),
+            summary=data.get("summary"),
+        )
+
+
+def load_scorer(spec: str) -> CallScorer:
+    """``"gemini"`` (optionally ``"gemini:<model>"``), ``"stub"`` or ``"module:factory"``."""
+    name, _, arg = spec.partition(":")
+    if name == "stub":
+        return StubScorer()
+    if name == "gemini":
+        return GeminiScorer(arg or STANDARD_MODEL)
+    if not arg:
+        raise ValueError(f"Unknown scorer {spec!r}: use gemini, stub or module:factory")
+    return getattr(importlib.import_module(name), arg)()
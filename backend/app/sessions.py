@@ -0,0 +1,245 @@
+"""
+Bounded Session Store — TTL + LRU eviction on top of ADK's in-memory service.
+
+``InMemorySessionService`` keeps every session (and every event appended to
+it) forever. On a node serving thousands of calls a day that is an
+unbounded leak. ``BoundedSessionService`` keeps the same API but enforces:
+
+  - a hard cap on sessions (least-recently-used are evicted first)
+  - a memory cap: the events held by all sessions, in approximate bytes
+    (text, transcriptions, tool arguments and inline data)
+  - an idle TTL (sessions untouched for ``ttl_seconds`` are evicted)
+  - per-session event count and byte caps (oldest events are trimmed on
+    long calls)
+
+A session whose call is still running is *pinned* (``pin()``): eviction
+skips it, even if that leaves the store over its caps for a while. Only
+its oldest events are trimmed. ``delete_session()`` unpins it.
+
+Sessions should still be deleted explicitly when a call ends; eviction is
+the safety net for connections that never reach their cleanup path.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+SessionKey = tuple[str, str, str]  # (app_name, user_id, session_id)
+
+# Per-event bookkeeping on top of the payload sizes below
+EVENT_OVERHEAD_BYTES = 512
+
+
+def event_bytes(event: Event) -> int:
+    """Approximate memory held by one stored event."""
+    size = EVENT_OVERHEAD_BYTES
+    if event.content is not None:
+        for part in event.content.parts or []:
+            size += len(part.text or "")
+            if part.inline_data is not None and part.inline_data.data:
+                size += len(part.inline_data.data)
+            if part.function_call is not None and part.function_call.args:
+                size += len(str(part.function_call.args))
+            if part.function_response is not None and part.function_response.response:
+                size += len(str(part.function_response.response))
+    for transcription in (event.input_transcription, event.output_transcription):
+        if transcription is not None:
+            size += len(transcription.text or "")
+    return size
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory ADK session service with TTL/LRU eviction and hard caps."""
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 3600.0,
+        max_events_per_session: int = 2000,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_bytes_per_session: int = 16 * 1024 * 1024,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_events_per_session = max_events_per_session
+        self.max_bytes = max_bytes
+        self.max_bytes_per_session = max_bytes_per_session
+        self._clock = clock
+        # LRU order: oldest access first → (app, user, session) → last access
+        self._access: OrderedDict[SessionKey, float] = OrderedDict()
+        self._bytes: dict[SessionKey, int] = {}
+        self._pinned: set[SessionKey] = set()
+        self.total_bytes = 0
+        self.evicted_ttl = 0
+        self.evicted_lru = 0
+        self.evicted_bytes = 0
+        self.deleted = 0
+        self.trimmed_events = 0
+
+    # ── Gauges ──────────────────────────────────────────────────────────
+    @property
+    def live_sessions(self) -> int:
+        return len(self._access)
+
+    @property
+    def evicted_total(self) -> int:
+        return self.evicted_ttl + self.evicted_lru + self.evicted_bytes
+
+    def stats(self) -> dict:
+        return {
+            "live": self.live_sessions,
+            "max": self.max_sessions,
+            "pinned": len(self._pinned),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_lru": self.evicted_lru,
+            "evicted_bytes": self.evicted_bytes,
+            "evicted_total": self.evicted_total,
+            "deleted": self.deleted,
+            "trimmed_events": self.trimmed_events,
+        }
+
+    # ── Session API overrides ──────────────────────────────────────────
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        self.evict_expired()
+        # Make room before inserting; pinned sessions are never evicted
+        while len(self._access) >= self.max_sessions and self._evict_oldest():
+            self.evicted_lru += 1
+
+        session = await super().create_session(
+            app_name=app_name,
+            user_id=user_id,
+            state=state,
+            session_id=session_id,
+        )
+        key = (app_name, user_id, session.id)
+        self._access[key] = self._clock()
+        self._bytes[key] = 0
+        return session
+
+    def pin(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        """Keep a session with a running call out of eviction until it is deleted."""
+        key = (app_name, user_id, session_id)
+        if key in self._access:
+            self._pinned.add(key)
+
+    async def get_session(self, *, app_name: str, user_id: str, session_id: str, **kwargs):
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, **kwargs
+        )
+        if session is not None:
+            self._touch((app_name, user_id, session_id))
+        return session
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        if self._access.pop(key, None) is not None:
+            self.deleted += 1
+        self._forget(key)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        self._drop(key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        if key in self._bytes:
+            size = event_bytes(event)
+            self._bytes[key] += size
+            self.total_bytes += size
+        self._touch(key)
+        self._trim_events(key, session)
+        # Over the memory cap: idle sessions go first, oldest access first
+        while self.total_bytes > self.max_bytes and self._evict_oldest():
+            self.evicted_bytes += 1
+        return event
+
+    # ── Eviction ────────────────────────────────────────────────────────
+    def evict_expired(self) -> int:
+        """Evict sessions idle for longer than ``ttl_seconds``."""
+        cutoff = self._clock() - self.ttl_seconds
+        # OrderedDict is in access order, so expired entries are at the front
+        expired = []
+        for key, last_access in self._access.items():
+            if last_access > cutoff:
+                break
+            if key not in self._pinned:
+                expired.append(key)
+        for key in expired:
+            self._evict(key)
+        self.evicted_ttl += len(expired)
+        return len(expired)
+
+    def _evict_oldest(self) -> bool:
+        """Evict the least recently used unpinned session; False if none."""
+        for key in self._access:
+            if key not in self._pinned:
+                self._evict(key)
+                return True
+        return False
+
+    def _evict(self, key: SessionKey) -> None:
+        del self._access[key]
+        self._forget(key)
+        self._drop(key)
+
+    def _forget(self, key: SessionKey) -> None:
+        self._pinned.discard(key)
+        self.total_bytes -= self._bytes.pop(key, 0)
+
+    def _touch(self, key: SessionKey) -> None:
+        if key in self._access:
+            self._access[key] = self._clock()
+            self._access.move_to_end(key)
+
+    def _drop(self, key: SessionKey) -> None:
+        app_name, user_id, session_id = key
+        users = self.sessions.get(app_name)
+        if not users:
+            return
+        user_sessions = users.get(user_id)
+        if not user_sessions:
+            return
+        user_sessions.pop(session_id, None)
+        if not user_sessions:
+            del users[user_id]
+        if not users:
+            del self.sessions[app_name]
+
+    def _trim_events(self, key: SessionKey, session: Session) -> None:
+        app_name, user_id, session_id = key
+        storage = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        if storage is not None:
+            overflow = len(storage.events) - self.max_events_per_session
+            # Then whole events off the front until under the byte cap
+            held = self._bytes.get(key, 0)
+            freed = 0
+            for i, event in enumerate(storage.events):
+                if i >= overflow and held - freed <= self.max_bytes_per_session:
+                    break
+                freed += event_bytes(event)
+                overflow = i + 1
+            if overflow > 0:
+                del storage.events[:overflow]
+                self.trimmed_events += overflow
+                if key in self._bytes:
+                    self._bytes[key] -= freed
+                    self.total_bytes -= freed
+        if session is not storage and storage is not None:
+            overflow = len(session.events) - len(storage.events)
+            if overflow > 0:
+                del session.events[:overflow]
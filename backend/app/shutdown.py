@@ -0,0 +1,121 @@
+"""
+Call Shutdown — end a live call when its summary is in, not after a fixed sleep.
+
+On ``{"type":"end"}`` a live call asks the model for ``save_call_summary()``.
+The socket handler used to wait a fixed five seconds before closing the
+upstream queue. A slow summary was cut off, and a fast one left the model
+session open for nothing. ``CallShutdown`` waits for what actually ends
+the summary, with a deadline:
+
+    ACTIVE ──end──▶ SUMMARIZING ──save_call_summary result──▶ CLOSED  "model"
+                        │ ────turn_complete, no summary call──▶ CLOSED  "declined"
+                        │ ────deadline──────────────────────────▶ CLOSED  "deadline"
+                        └────model session ended─────────────────▶ CLOSED  "upstream_closed"
+
+``_forward_events`` passes every model event to ``on_event()``. Once a
+``save_call_summary`` call has been seen, the ``turn_complete`` of that
+turn is not enough: the tool's result is. The model may still be
+answering the rep when ``summarize()`` sends the summary request; that
+turn's ``turn_complete`` arrives after the request but says nothing about
+it, so it is not taken as "declined". On every outcome but ``"model"``
+the caller falls back to the local summary (``app.analytics``). On a
+deadline it also cancels the model session right away instead of
+letting it finish in the background.
+"""
+
+import asyncio
+import time
+
+from app.metrics import REGISTRY
+
+SUMMARY_TOOL = "save_call_summary"
+
+ACTIVE = "active"
+SUMMARIZING = "summarizing"
+CLOSED = "closed"
+
+CALL_SHUTDOWNS = REGISTRY.counter(
+    "lsc_call_shutdown_total",
+    "Ended calls by how the summary wait ended: model, declined, deadline, upstream_closed or skipped.",
+    ["outcome"],
+)
+CALL_SUMMARY_WAIT_SECONDS = REGISTRY.histogram(
+    "lsc_call_summary_wait_seconds",
+    "Time from the end-of-call summary request to the model's summary (or the fallback).",
+)
+
+
+class CallShutdown:
+    """One call's end-of-call state machine."""
+
+    def __init__(self, deadline: float = 10.0, clock=time.monotonic):
+        self.deadline = deadline
+        self._clock = clock
+        self.state = ACTIVE
+        self.outcome: str | None = None
+        self.waited: float | None = None
+        self._called = False  # save_call_summary requested by the model
+        self._in_turn = False  # The model is mid-answer
+        self._stale_turns = 0  # turn_completes still due from before the request
+        self._done = asyncio.Event()
+        self._since = 0.0
+
+    def on_event(self, event) -> None:
+        """Feed one model event; tracks turns, then the summary once requested."""
+        turn_complete = getattr(event, "turn_complete", False)
+        if self.state == ACTIVE:
+            if turn_complete or getattr(event, "interrupted", False):
+                self._in_turn = False
+            elif event.content is not None or getattr(event, "output_transcription", None):
+                self._in_turn = True
+            return
+        if self.state != SUMMARIZING:
+            return
+        if any(fr.name == SUMMARY_TOOL for fr in event.get_function_responses()):
+            self._finish("model")
+        elif any(fc.name == SUMMARY_TOOL for fc in event.get_function_calls()):
+            self._called = True
+        elif turn_complete and not self._called:
+            if self._stale_turns:
+                self._stale_turns -= 1  # The answer in flight when we asked
+            else:
+                self._finish("declined")
+
+    async def summarize(self, upstream: asyncio.Task, request=None) -> str:
+        """Send the summary request (``request()``), wait for the summary; return the outcome."""
+        if self.state != ACTIVE:
+            return self.outcome
+        self.state = SUMMARIZING
+        self._stale_turns = 1 if self._in_turn else 0
+        self._since = self._clock()
+        if request is not None:
+            request()
+        waiter = asyncio.ensure_future(self._done.wait())
+        try:
+            await asyncio.wait([waiter, upstream], timeout=self.deadline, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if self.state == SUMMARIZING:
+            self._finish("upstream_closed" if upstream.done() else "deadline")
+        return self.outcome
+
+    def skip(self) -> None:
+        """No model summary for this call (practice mode, or turned off)."""
+        if self.state == ACTIVE:
+            self.state = CLOSED
+            self.outcome = "skipped"
+            CALL_SHUTDOWNS.labels("skipped").inc()
+
+    def _finish(self, outcome: str) -> None:
+        self.state = CLOSED
+        self.outcome = outcome
+        self.waited = self._clock() - self._since
+        CALL_SHUTDOWNS.labels(outcome).inc()
+        CALL_SUMMARY_WAIT_SECONDS.observe(self.waited)
+        self._done.set()
+
+    def stats(self) -> dict:
+        return {
+            "outcome": self.outcome,
+            "waited_ms": None if self.waited is None else round(self.waited * 1000),
+        }
@@ -0,0 +1,151 @@
+"""
+Talk-Time Tracker — rep/prospect talk ratio measured from the audio itself.
+
+The model only guesses the talk ratio. The server sees every audio byte, so
+it can measure speech time directly with the VAD frame classifier
+(20 ms frames, see ``app/vad.py``):
+
+  - Practice mode has two clean channels: mic audio is the rep, the
+    model's 24 kHz output audio is the prospect.
+  - Live mode has one mic that hears the rep up close and the prospect
+    through the speakers, noticeably quieter. Speech-frame energies go
+    into a histogram; if it is clearly bimodal (Otsu split with a real
+    valley between the two peaks), the loud side is the rep and the quiet
+    side the prospect. With a headset the prospect never reaches the mic,
+    so no split is found and the ratio is reported as unknown rather than
+    guessed.
+
+``websocket_endpoint`` pushes ``measure()`` as a ``talk_ratio`` message on
+a fixed cadence. The tracker for the current call is also published in a
+context variable, so ``save_call_summary`` (which runs inside ``run_live``)
+can replace the model's estimate with the measured numbers.
+"""
+
+from contextvars import ContextVar
+
+import numpy as np
+
+from app.vad import FRAME_MS, FrameClassifier, VadSettings
+
+HIST_MIN_DB = -90.0
+HIST_STEP_DB = 0.5
+HIST_BINS = int(-HIST_MIN_DB / HIST_STEP_DB)
+# Don't report a ratio until this much speech has been heard
+MIN_SPEECH_SECONDS = 5.0
+# Live-mode split: each side needs this share of speech frames, and the
+# valley between the two peaks must be this much lower than the smaller one
+MIN_SIDE_SHARE = 0.05
+MAX_VALLEY_RATIO = 0.5
+
+current_talk_tracker: ContextVar["TalkTimeTracker | None"] = ContextVar(
+    "current_talk_tracker", default=None
+)
+
+
+def measured_talk_ratio() -> dict | None:
+    """Measured ratio for the call running in this context, if known."""
+    tracker = current_talk_tracker.get()
+    if tracker is None:
+        return None
+    measured = tracker.measure()
+    return measured if measured["rep_pct"] is not None else None
+
+
+class TalkTimeTracker:
+    """Per-session speech-time accounting for the rep and the prospect."""
+
+    def __init__(
+        self,
+        mode: str,
+        settings: VadSettings = VadSettings(),
+        input_rate: int = 16000,
+        output_rate: int = 24000,
+    ):
+        self.mode = mode
+        self._input = FrameClassifier(settings, input_rate)
+        self._output = FrameClassifier(settings, output_rate)
+        self._input_hist = np.zeros(HIST_BINS, dtype=np.int64)
+        self._output_speech_frames = 0
+        self._last_pushed: tuple | None = None
+
+    # ── Feeding ──
+    def on_input(self, pcm: bytes) -> np.ndarray:
+        """Classify and count a mic chunk; returns its per-frame speech mask."""
+        _, speech, energy_db = self._input.feed(pcm)
+        self.on_input_frames(speech, energy_db)
+        return speech
+
+    def on_input_frames(self, speech: np.ndarray, energy_db: np.ndarray) -> None:
+        """Take an already-classified chunk (e.g. from the VAD gate)."""
+        if speech.any():
+            bins = ((energy_db[speech] - HIST_MIN_DB) / HIST_STEP_DB).astype(np.int64)
+            np.clip(bins, 0, HIST_BINS - 1, out=bins)
+            self._input_hist += np.bincount(bins, minlength=HIST_BINS)
+
+    def on_output(self, pcm: bytes) -> None:
+        _, speech, _ = self._output.feed(pcm)
+        self._output_speech_frames += int(np.count_nonzero(speech))
+
+    # ── Reading ──
+    def measure(self) -> dict:
+        frame_s = FRAME_MS / 1000
+        if self.mode == "practice":
+            rep_frames = int(self._input_hist.sum())
+            prospect_frames = self._output_speech_frames
+            method = "channels"
+        else:
+            split = _level_split(self._input_hist)
+            if split is None:
+                rep_frames, prospect_frames = int(self._input_hist.sum()), 0
+                method = "unseparated"
+            else:
+                rep_frames = int(self._input_hist[split:].sum())
+                prospect_frames = int(self._input_hist[:split].sum())
+                method = "level_split"
+
+        total = rep_frames + prospect_frames
+        known = method != "unseparated" and total * frame_s >= MIN_SPEECH_SECONDS
+        rep_pct = round(100 * rep_frames / total) if known else None
+        return {
+            "type": "talk_ratio",
+            "rep_pct": rep_pct,
+            "prospect_pct": 100 - rep_pct if known else None,
+            "rep_seconds": round(rep_frames * frame_s, 1),
+            "prospect_seconds": round(prospect_frames * frame_s, 1),
+            "method": method,
+        }
+
+    def changed_measurement(self) -> dict | None:
+        """``measure()`` if it differs from the last pushed one, else None."""
+        measured = self.measure()
+        key = (measured["rep_pct"], measured["rep_seconds"], measured["prospect_seconds"])
+        if key == self._last_pushed:
+            return None
+        self._last_pushed = key
+        return measured
+
+
+def _level_split(hist: np.ndarray) -> int | None:
+    """Bin index separating quiet (far) from loud (near) speech, if bimodal."""
+    total = hist.sum()
+    if total == 0:
+        return None
+    p = hist / total
+    centers = np.arange(HIST_BINS, dtype=np.float64)
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * centers)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    between[~np.isfinite(between)] = 0.0
+    k = int(np.argmax(between))
+    if min(omega[k], 1.0 - omega[k]) < MIN_SIDE_SHARE:
+        return None
+
+    # Require a valley: smoothed density around the split well below both peaks
+    smooth = np.convolve(hist, np.ones(7) / 7, mode="same")
+    low_i = int(np.argmax(smooth[: k + 1]))
+    high_i = k + 1 + int(np.argmax(smooth[k + 1:]))
+    valley = smooth[low_i:high_i + 1].min()
+    if valley > MAX_VALLEY_RATIO * min(smooth[low_i], smooth[high_i]):
+        return None
+    return k + 1
@@ -2,12 +2,42 @@
 CRM Tool — Post-call summary logging.
 
 Saves call analysis to Firestore and optionally triggers
-an n8n webhook for follow-up automation.
+an n8n webhook for follow-up automation. Webhook delivery is handed off
+to the background queue in app/delivery.py so the tool never blocks.
+When the server has measured the talk ratio from the call audio
+(app/talk.py), that replaces the model's estimate in the summary.
+
+Only one summary per call reaches the webhook. The model may call the tool
+more than once, or only after the server gave up and sent the local
+summary (app/analytics.py); a ``CallSummaryGate`` lets the first through.
 """
 
-import os
+import threading
 import time
-import httpx
+from contextvars import ContextVar
+
+from app.delivery import webhook_delivery
+from app.talk import measured_talk_ratio
+
+
+class CallSummaryGate:
+    """Lets one call summary per call through to the webhook."""
+
+    def __init__(self):
+        self.source: str | None = None  # "model" or "local", once claimed
+        self._lock = threading.Lock()  # Sync tools may run in a worker thread
+
+    def claim(self, source: str) -> bool:
+        with self._lock:
+            if self.source is not None:
+                return False
+            self.source = source
+            return True
+
+
+current_summary_gate: ContextVar[CallSummaryGate | None] = ContextVar(
+    "current_summary_gate", default=None
+)
 
 
 def save_call_summary(
@@ -58,16 +88,26 @@ def save_call_summary(
         "talk_ratio": {
             "rep": rep_talk_pct,
             "prospect": prospect_talk_pct,
+            "source": "model",
         },
     }
 
-    # Fire n8n webhook for follow-up automation (non-blocking)
-    webhook_url = os.getenv("N8N_WEBHOOK_URL")
-    if webhook_url:
-        try:
-            httpx.post(webhook_url, json=call_data, timeout=5.0)
-        except Exception:
-            pass  # Non-critical, don't block the response
+    # Prefer the ratio the server measured from the audio over the model's guess
+    measured = measured_talk_ratio()
+    if measured is not None:
+        call_data["talk_ratio"] = {
+            "rep": measured["rep_pct"],
+            "prospect": measured["prospect_pct"],
+            "rep_seconds": measured["rep_seconds"],
+            "prospect_seconds": measured["prospect_seconds"],
+            "source": "measured",
+            "model_estimate": {"rep": rep_talk_pct, "prospect": prospect_talk_pct},
+        }
+
+    # Queue n8n webhook for follow-up automation (returns immediately)
+    gate = current_summary_gate.get()
+    if webhook_delivery.enabled and (gate is None or gate.claim("model")):
+        webhook_delivery.enqueue(call_data)
 
     return {
         "status": "success",
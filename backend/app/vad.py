@@ -0,0 +1,277 @@
+"""
+Voice Activity Gate — drop or thin silent mic audio before it goes upstream.
+
+Every 16-bit PCM chunk is cut into 20 ms frames and analysed in one
+vectorized pass: per-frame energy (dBFS) and zero-crossing rate. A frame is
+speech when its energy clears both an absolute floor and an adaptive noise
+floor by ``margin_db``. Low-energy frames with a high zero-crossing rate
+(hiss, fan noise) need an extra 10 dB to count.
+
+A small state machine on top of that keeps ``hangover_ms`` of audio after
+speech stops (so word endings and short pauses survive) and replays
+``preroll_ms`` of buffered audio when speech starts (so onsets aren't
+clipped). Outside speech:
+
+  - ``gate``: silence is dropped. Activity boundaries are sent upstream
+    (``activity_start`` / ``activity_end``) and the model's own VAD is
+    disabled for the session — see ``manual_activity``.
+  - ``thin``: one of every ``thin_every`` silent frames is still sent and
+    the model's automatic VAD stays in charge.
+
+Per-session settings come from the ``config`` message, e.g.
+``"vad": "gate"`` or ``"vad": {"mode": "thin", "hangover_ms": 800}``.
+Client values are checked field by field: an unknown mode, or a value
+that isn't a finite number, is ignored and keeps the default. Numbers are
+clamped to ``LIMITS``.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+from app.metrics import REGISTRY
+
+FRAME_MS = 20
+ACTIVITY_START = "activity_start"
+ACTIVITY_END = "activity_end"
+VAD_MODES = ("off", "gate", "thin")
+# Accepted range of each numeric setting from a client config
+LIMITS = {
+    "threshold_db": (-120.0, 0.0),
+    "margin_db": (0.0, 60.0),
+    "zcr_noise": (0.0, 1.0),
+    "hangover_ms": (0, 10_000),
+    "preroll_ms": (0, 2_000),
+    "thin_every": (1, 1_000),
+}
+
+VAD_INPUT_BYTES = REGISTRY.counter(
+    "lsc_vad_input_bytes_total", "Mic PCM bytes seen by the VAD gate.", ["mode"]
+)
+VAD_FORWARDED_BYTES = REGISTRY.counter(
+    "lsc_vad_forwarded_bytes_total", "Mic PCM bytes the VAD gate sent upstream.", ["mode"]
+)
+
+
+@dataclass(frozen=True)
+class VadSettings:
+    mode: str = "off"  # "off" | "gate" | "thin"
+    threshold_db: float = -50.0  # Absolute energy floor for speech
+    margin_db: float = 12.0  # Required rise above the adaptive noise floor
+    zcr_noise: float = 0.35  # Above this crossing rate, quiet frames are noise
+    hangover_ms: int = 600
+    preroll_ms: int = 200
+    thin_every: int = 5
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("gate", "thin")
+
+    @property
+    def manual_activity(self) -> bool:
+        """Whether the client-side gate replaces the model's automatic VAD."""
+        return self.mode == "gate"
+
+    def merged(self, value) -> "VadSettings":
+        """Apply a ``config.vad`` value (bool, mode string or dict) on top."""
+        if value is None:
+            return self
+        if isinstance(value, bool):
+            return replace(self, mode="gate" if value else "off")
+        if isinstance(value, str):
+            return replace(self, mode=value) if value in VAD_MODES else self
+        if isinstance(value, dict):
+            known = {f.name for f in fields(self)}
+            updates = {}
+            for key, raw in value.items():
+                if key not in known:
+                    continue
+                if key == "mode":
+                    if raw in VAD_MODES:
+                        updates[key] = raw
+                    continue
+                checked = _checked(raw, type(getattr(self, key)), *LIMITS[key])
+                if checked is not None:
+                    updates[key] = checked
+            return replace(self, **updates)
+        return self
+
+
+def _checked(raw, kind: type, low, high):
+    """``raw`` as a finite ``kind`` clamped to ``[low, high]``, or None."""
+    if isinstance(raw, bool):
+        return None
+    try:
+        number = float(raw)
+    except (ValueError, TypeError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return kind(min(max(number, low), high))
+
+
+class FrameClassifier:
+    """Energy + zero-crossing speech detector over 20 ms frames of 16-bit PCM."""
+
+    def __init__(self, settings: VadSettings, sample_rate: int = 16000):
+        self.settings = settings
+        self.frame_bytes = sample_rate * FRAME_MS // 1000 * 2
+        self.noise_db = settings.threshold_db - settings.margin_db
+        self._remainder = b""
+
+    def feed(self, pcm: bytes) -> tuple[bytes, np.ndarray, np.ndarray]:
+        """Classify ``pcm`` plus any carried-over partial frame.
+
+        Returns ``(whole_frames, speech_mask, energy_db)``; a trailing
+        partial frame is kept for the next call.
+        """
+        data = self._remainder + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+        data = data[:usable]
+        if not data:
+            return b"", np.zeros(0, dtype=bool), np.zeros(0, dtype=np.float32)
+        speech, energy_db = self.classify(data)
+        return data, speech, energy_db
+
+    def take_remainder(self) -> bytes:
+        remainder, self._remainder = self._remainder, b""
+        return remainder
+
+    def classify(self, data: bytes) -> tuple[np.ndarray, np.ndarray]:
+        """Speech mask and energy (dBFS) per frame of ``data`` (whole frames only)."""
+        samples = np.frombuffer(data, dtype="<i2").reshape(-1, self.frame_bytes // 2)
+        frames = samples.astype(np.float32) * (1.0 / 32768.0)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        crossings = np.count_nonzero(np.diff(np.signbit(samples), axis=1), axis=1)
+        zcr = crossings / (samples.shape[1] - 1)
+
+        s = self.settings
+        threshold = max(s.threshold_db, self.noise_db + s.margin_db)
+        speech = (energy_db > threshold) & ((zcr < s.zcr_noise) | (energy_db > threshold + 10.0))
+
+        # Track the noise floor from non-speech frames: follow it down quickly,
+        # up slowly, so quiet stretches of speech don't raise it
+        quiet = energy_db[~speech]
+        if quiet.size:
+            level = float(np.median(quiet))
+            alpha = 0.3 if level < self.noise_db else 0.02
+            self.noise_db += alpha * (level - self.noise_db)
+        return speech, energy_db
+
+
+class VoiceGate:
+    """Per-session VAD state over a stream of 16-bit mono PCM chunks.
+
+    ``process()`` returns an ordered list of upstream operations: ``bytes``
+    to send as realtime audio, or the ``ACTIVITY_START`` / ``ACTIVITY_END``
+    markers (gate mode only). The frame classification of the last chunk
+    is kept in ``last_speech`` / ``last_energy_db`` for other consumers
+    (e.g. talk-time measurement) so the audio is only analysed once.
+    """
+
+    def __init__(self, settings: VadSettings, sample_rate: int = 16000, tokens_per_second: float = 32.0):
+        self.settings = settings
+        self.sample_rate = sample_rate
+        self.tokens_per_second = tokens_per_second
+        self.classifier = FrameClassifier(settings, sample_rate)
+        self._frame_bytes = self.classifier.frame_bytes
+        self._hangover_frames = max(1, settings.hangover_ms // FRAME_MS)
+        self._preroll: deque[bytes] = deque(maxlen=max(0, settings.preroll_ms // FRAME_MS))
+        self._active = False
+        self._hang = 0
+        self._silent_count = 0
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.speech_frames = 0
+        self.frames = 0
+        self.segments = 0
+        self.last_speech = np.zeros(0, dtype=bool)
+        self.last_energy_db = np.zeros(0, dtype=np.float32)
+        self._in_counter = VAD_INPUT_BYTES.labels(settings.mode)
+        self._out_counter = VAD_FORWARDED_BYTES.labels(settings.mode)
+
+    def process(self, pcm: bytes) -> list:
+        self.bytes_in += len(pcm)
+        self._in_counter.inc(len(pcm))
+        data, self.last_speech, self.last_energy_db = self.classifier.feed(pcm)
+        if not data:
+            return []
+        return self._run(data, self.last_speech)
+
+    def finish(self) -> list:
+        """End of stream: flush buffered audio and close an open segment."""
+        ops: list = []
+        remainder = self.classifier.take_remainder()
+        if remainder and self._active:
+            ops.append(self._emit(remainder))
+        if self._active:
+            self._active = False
+            if self.settings.manual_activity:
+                ops.append(ACTIVITY_END)
+        return ops
+
+    def _run(self, data: bytes, speech: np.ndarray) -> list:
+        s = self.settings
+        fb = self._frame_bytes
+        ops: list = []
+        run: list[bytes] = []  # Contiguous frames to forward
+
+        def flush_run():
+            if run:
+                ops.append(self._emit(b"".join(run)))
+                run.clear()
+
+        for i, is_speech in enumerate(speech.tolist()):
+            frame = data[i * fb:(i + 1) * fb]
+            self.frames += 1
+            if is_speech:
+                self.speech_frames += 1
+                self._hang = self._hangover_frames
+                if not self._active:
+                    self._active = True
+                    self.segments += 1
+                    flush_run()
+                    if s.manual_activity:
+                        ops.append(ACTIVITY_START)
+                    run.extend(self._preroll)
+                    self._preroll.clear()
+                run.append(frame)
+            elif self._active:
+                run.append(frame)
+                self._hang -= 1
+                if self._hang <= 0:
+                    self._active = False
+                    flush_run()
+                    if s.manual_activity:
+                        ops.append(ACTIVITY_END)
+            else:
+                self._silent_count += 1
+                if s.mode == "thin" and self._silent_count % s.thin_every == 0:
+                    run.append(frame)
+                else:
+                    self._preroll.append(frame)
+        flush_run()
+        return ops
+
+    def _emit(self, chunk: bytes) -> bytes:
+        self.bytes_out += len(chunk)
+        self._out_counter.inc(len(chunk))
+        return chunk
+
+    def stats(self) -> dict:
+        saved = max(0, self.bytes_in - self.bytes_out)
+        saved_seconds = saved / (self.sample_rate * 2)
+        return {
+            "mode": self.settings.mode,
+            "bytes_in": self.bytes_in,
+            "bytes_forwarded": self.bytes_out,
+            "bytes_saved": saved,
+            "seconds_saved": round(saved_seconds, 1),
+            "tokens_saved": int(saved_seconds * self.tokens_per_second),
+            "speech_pct": round(100 * self.speech_frames / self.frames, 1) if self.frames else None,
+            "segments": self.segments,
+        }
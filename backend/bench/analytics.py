@@ -0,0 +1,173 @@
+"""
+Post-call analytics: cost per event, cost per call, determinism, end-to-end.
+
+1. In-process, synthetic practice calls of ``--minutes`` each: rep and
+   prospect transcripts alternating every few seconds, ``update_dashboard``
+   every ~15 s, measured ``talk_ratio`` pushes every 5 s, objection hints
+   (most later resolved by ``log_objection``). Reports the cost of
+   ``CallTimeline.add`` per event and of ``analyze()`` per call. It also
+   reports whether a timeline rebuilt from the same events, written out the
+   way the call journal writes them (``from_journal``), gives the same
+   analytics.
+
+2. Against the mock server: a live call of ``--turns`` turns, then
+   ``end``. Reports how long after ``end`` the ``call_analytics`` message
+   arrives, compared with the model's ``save_call_summary`` tool call. It
+   also checks that re-scoring the stored journal reproduces the message.
+
+    python -m bench.analytics
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+from app.analytics import CallTimeline
+from app.prompts.objections import OBJECTION_CATEGORIES
+from bench.load_ws import _free_port, spawn_server, wait_healthy
+
+CATEGORIES = list(OBJECTION_CATEGORIES)
+
+
+def call_events(minutes: float, rng: random.Random, start: float = 1_700_000_000.0):
+    """(t, message) for one synthetic practice call."""
+    events = [(start, {"type": "call_started", "session_id": "bench", "mode": "practice"})]
+    t, speaker, rep_s, prospect_s, hint = start, "input", 0.0, 0.0, 0
+    next_dashboard, next_talk = start + 15, start + 5
+    while t < start + minutes * 60:
+        words = rng.randint(3, 40)
+        t += words / 2.5 + rng.uniform(0.2, 2.0)
+        if speaker == "input":
+            rep_s += words / 2.5
+        else:
+            prospect_s += words / 2.5
+        events.append((t, {"type": "transcript", "text": "word " * words, "source": speaker, "partial": False}))
+        if speaker == "output" and rng.random() < 0.1:
+            hint += 1
+            category = rng.choice(CATEGORIES)
+            events.append((t + 0.05, {"type": "objection_hint", "id": f"h{hint}", "category": category}))
+            if rng.random() < 0.8:
+                events.append((t + 1.5, {"type": "tool_call", "name": "log_objection",
+                                         "args": {"objection_type": category}}))
+                events.append((t + 1.5, {"type": "objection_hint_resolved", "id": f"h{hint}"}))
+        if t >= next_dashboard:
+            next_dashboard += 15
+            events.append((t + 1.0, {"type": "tool_call", "name": "update_dashboard", "args": {
+                "coaching_tip": "Ask about their timeline",
+                "sentiment": rng.choice(("positive", "neutral", "neutral", "negative")),
+                "rapport_score": rng.randint(40, 90), "discovery_score": rng.randint(30, 90),
+                "key_moment": "Budget confirmed" if rng.random() < 0.05 else "",
+            }}))
+        if t >= next_talk:
+            next_talk += 5
+            total = rep_s + prospect_s
+            events.append((t, {"type": "talk_ratio", "rep_pct": round(100 * rep_s / total),
+                               "prospect_pct": 100 - round(100 * rep_s / total),
+                               "rep_seconds": round(rep_s, 1), "prospect_seconds": round(prospect_s, 1)}))
+        speaker = "output" if speaker == "input" else "input"
+    return sorted(events, key=lambda e: e[0]), t + 2
+
+
+def in_process(args) -> None:
+    print(f"synthetic practice calls, {args.repeat} analyses each\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            events, ended = call_events(minutes, random.Random(minutes))
+            timeline = CallTimeline("practice", started=events[0][0])
+            started = time.perf_counter()
+            for t, message in events[1:]:
+                timeline.add(message, t)
+            add_us = (time.perf_counter() - started) / (len(events) - 1) * 1e6
+
+            analyze_ms = []
+            for _ in range(args.repeat):
+                timeline.ended = None
+                began = time.perf_counter()
+                live = timeline.analyze(now=ended)
+                analyze_ms.append((time.perf_counter() - began) * 1000)
+
+            # The journal keeps millisecond timestamps; the analytics record ends the timeline
+            path = Path(tmp) / f"{minutes}.ndjson"
+            with path.open("w") as fh:
+                for t, message in events + [(ended, {"type": "call_analytics"})]:
+                    fh.write(json.dumps({"t": round(t, 3), "e": message}) + "\n")
+            began = time.perf_counter()
+            stored = CallTimeline.from_journal(path).analyze()
+            rescore_ms = (time.perf_counter() - began) * 1000
+            print(f"{minutes:>4.0f} min  {len(events):6d} events  add {add_us:4.1f} µs/event  "
+                  f"analyze p50 {statistics.median(analyze_ms):5.2f} ms  "
+                  f"from journal {rescore_ms:6.1f} ms  same result: {stored == live}")
+    print(f"\n{live['summary']}")
+
+
+async def live_call(base: str, turns: int) -> tuple[dict, dict, float, float | None]:
+    async with websockets.connect(f"ws://{base}/ws") as ws:
+        await ws.send(json.dumps({"type": "config", "mode": "live"}))
+        status = json.loads(await ws.recv())
+        for t in range(turns):
+            await ws.send(json.dumps({"type": "text", "text": f"turn {t}"}))
+            while json.loads(await ws.recv())["type"] != "turn_complete":
+                pass
+        ended = time.perf_counter()
+        await ws.send(json.dumps({"type": "end"}))
+        analytics, analytics_s, summary_s = None, None, None
+        try:
+            while True:
+                message = json.loads(await ws.recv())
+                if message["type"] == "call_analytics":
+                    analytics, analytics_s = message, time.perf_counter() - ended
+                elif message["type"] == "tool_call" and message["name"] == "save_call_summary":
+                    summary_s = time.perf_counter() - ended
+        except websockets.ConnectionClosed:
+            pass
+    return status, analytics, analytics_s, summary_s
+
+
+async def server(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        base = f"127.0.0.1:{port}"
+        proc = spawn_server(port, {"JOURNAL_DIR": tmp, "MOCK_FIRST_EVENT_MS": "200", "MOCK_STEP_MS": "20"})
+        try:
+            await wait_healthy(f"http://{base}")
+            status, analytics, analytics_s, summary_s = await live_call(base, args.turns)
+            url = f"http://{base}/api/calls/{status['session_id']}/events"
+            async with httpx.AsyncClient() as client:
+                for _ in range(50):
+                    response = await client.get(url, params={"token": status["observe"]})
+                    if response.status_code != 409:
+                        break
+                    await asyncio.sleep(0.1)
+                response.raise_for_status()
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        records = [json.loads(line) for line in response.text.splitlines()]
+        rescored = CallTimeline.from_records(records).analyze()
+        sent = {k: v for k, v in analytics.items() if k not in ("type", "session_id")}
+        print(f"\nserver: {args.turns}-turn live call, after end: call_analytics in {analytics_s * 1000:.0f} ms, "
+              f"model's save_call_summary in "
+              + (f"{summary_s * 1000:.0f} ms" if summary_s is not None else "(none)")
+              + f"; re-scored from the journal: same result: {rescored == sent}")
+        print(f"  {analytics['summary']}")
+
+
+def main(args) -> None:
+    in_process(args)
+    asyncio.run(server(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[10, 30, 60, 120])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4)
+    main(parser.parse_args())
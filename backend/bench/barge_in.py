@@ -0,0 +1,161 @@
+"""
+Barge-in latency in practice mode, against the mock Live backend.
+
+Each client waits for the AI prospect to start answering (a 3 s answer
+generated faster than real time, as the real model does), then the "rep"
+talks over it after ``--talk-after`` ms. The client plays audio on a
+simulated clock, answers ``interrupt`` with ``playback_flushed`` straight
+away, and records:
+
+  - onset → interrupt: from the start of the rep's speech (the first
+    speech chunk covers the ``--chunk-ms`` before it was sent) until the
+    ``interrupt`` message arrives — i.e. until the client goes silent;
+  - audio cut: prospect audio still scheduled when the interrupt arrived,
+    which the old path would have played over the rep;
+  - leaked frames: prospect audio that arrived after the interrupt.
+
+Runs twice: with the server's voice-activity trigger, and with only the
+model's own ``interrupted`` event (mock model reacts after 400 ms).
+
+    python -m bench.barge_in --calls 10
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import tempfile
+import time
+
+import websockets
+
+from app.protocol import INPUT_SAMPLE_RATE, KIND_AUDIO, FrameSequencer, pack_frame
+from bench.load_ws import _free_port, spawn_server, wait_healthy
+
+ANSWER_SCRIPT = {
+    "turns": [[
+        {"kind": "output_transcript", "text": "Well, let me tell you about our current vendor situation."},
+        *[{"kind": "audio", "ms": 100, "delay_ms": 30} for _ in range(30)],
+        {"kind": "turn_complete"},
+    ]],
+    "summary": [],
+}
+
+
+def _chunk(samples: int, amplitude: int) -> bytes:
+    return b"".join(
+        int(amplitude * math.sin(2 * math.pi * 160 * i / INPUT_SAMPLE_RATE)).to_bytes(2, "little", signed=True)
+        for i in range(samples)
+    )
+
+
+async def one_call(url: str, args) -> dict:
+    samples = INPUT_SAMPLE_RATE * args.chunk_ms // 1000
+    silence, speech = _chunk(samples, 20), _chunk(samples, 6000)
+    interval = args.chunk_ms / 1000
+    result = {"latency": None, "cut_ms": 0.0, "leaked": 0}
+    first_audio = asyncio.Event()
+    playing_until = 0.0
+
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps({"type": "config", "mode": "practice", "binary": True}))
+        await ws.recv()
+
+        async def receive():
+            nonlocal playing_until
+            try:
+                async for message in ws:
+                    now = time.perf_counter()
+                    if isinstance(message, bytes):
+                        if result["latency"] is not None:
+                            result["leaked"] += 1
+                        seconds = (len(message) - 8) / 48000
+                        playing_until = max(now, playing_until) + seconds
+                        first_audio.set()
+                        continue
+                    msg = json.loads(message)
+                    if msg.get("type") == "interrupt" and result["latency"] is None:
+                        result["latency"] = now - onset
+                        result["cut_ms"] = max(0.0, playing_until - now) * 1000
+                        playing_until = now
+                        await ws.send(json.dumps({"type": "playback_flushed",
+                                                  "flushed_ms": result["cut_ms"]}))
+            except websockets.ConnectionClosed:
+                pass
+
+        receiver = asyncio.create_task(receive())
+        sequencer = FrameSequencer()
+
+        async def send(pcm: bytes, count: int):
+            for _ in range(count):
+                await ws.send(pack_frame(KIND_AUDIO, pcm, seq=sequencer.next(),
+                                         sample_rate=INPUT_SAMPLE_RATE))
+                await asyncio.sleep(interval)
+
+        # Silence until the mock's turn threshold, then wait for the answer
+        sender = asyncio.create_task(send(silence, 10_000))
+        await first_audio.wait()
+        await asyncio.sleep(args.talk_after / 1000)
+        sender.cancel()
+        # The first speech chunk holds the last chunk_ms of captured audio
+        onset = time.perf_counter()
+        await ws.send(pack_frame(KIND_AUDIO, speech, seq=sequencer.next(), sample_rate=INPUT_SAMPLE_RATE))
+        onset -= interval
+        await asyncio.sleep(interval)
+        await send(speech, int(1.5 / interval))
+        await send(silence, 4)
+        await ws.send(json.dumps({"type": "end"}))
+        try:
+            await asyncio.wait_for(receiver, timeout=5)
+        except asyncio.TimeoutError:
+            receiver.cancel()
+    return result
+
+
+async def run(label: str, args, env: dict) -> None:
+    port = _free_port()
+    proc = spawn_server(port, env)
+    try:
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        url = f"ws://127.0.0.1:{port}/ws"
+        results = await asyncio.gather(*(one_call(url, args) for _ in range(args.calls)))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    hits = [r for r in results if r["latency"] is not None]
+    if not hits:
+        print(f"{label:<14} no interrupts")
+        return
+    latencies = sorted(r["latency"] * 1000 for r in hits)
+    print(f"{label:<14} interrupted {len(hits)}/{len(results)}  "
+          f"onset→silence p50 {statistics.median(latencies):6.0f} ms  max {latencies[-1]:6.0f} ms  "
+          f"audio cut p50 {statistics.median(r['cut_ms'] for r in hits):6.0f} ms  "
+          f"leaked frames {sum(r['leaked'] for r in hits)}")
+
+
+async def main(args) -> None:
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(ANSWER_SCRIPT, f)
+    env = {
+        "MOCK_LIVE_SCRIPT": f.name,
+        "MOCK_TURN_AUDIO_SECONDS": "4",
+        "MOCK_FIRST_EVENT_MS": "200",
+        "AUDIO_FRAME_MS": str(args.chunk_ms if args.chunk_ms % 20 == 0 else 100),
+    }
+    print(f"{args.calls} calls, rep talks {args.talk_after} ms into a 3 s answer, "
+          f"{args.chunk_ms} ms mic chunks\n")
+    try:
+        await run("voice trigger", args, env)
+        await run("model only", args, {**env, "BARGE_IN_MIN_SPEECH_MS": "100000"})
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--talk-after", type=int, default=500)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
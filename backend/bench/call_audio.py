@@ -0,0 +1,277 @@
+"""
+Call audio recorder: hot-path cost, memory, alignment, and Range serving.
+
+1. In-process, ``--calls`` simulated practice calls of ``--minutes`` each,
+   played ``--speed`` times faster than real time on a fake clock. In
+   every 10 s turn the rep speaks for 4 s: a 440 Hz tone in 100 ms mic
+   chunks at 16 kHz that arrive with up to 30 ms of jitter. Then the model
+   answers with 3 s of 660 Hz at 24 kHz, streamed as a burst of chunks.
+   Every fifth answer is cut by a barge-in 1 s after it starts. Reports:
+
+     - hot path: ``rep()`` / ``model()`` per chunk, and event-loop lag;
+     - memory: the Python heap peak (tracemalloc, in a second run, as it
+       slows the loop down) while recording with ``CallAudioRecorder``, vs
+       buffering one call in memory and writing the WAV at the end;
+     - alignment, from the finished WAV: where each turn's rep speech and
+       model answer start vs where they were sent, each cut answer's
+       length, and the rep channel's pitch after resampling.
+
+2. Against the mock server: a practice call with ``"record_audio": true``,
+   then ``/api/calls/{id}/audio`` in full and with Range requests (a
+   prefix, a middle slice, a suffix, one past the end).
+
+    python -m bench.call_audio
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+import httpx
+import numpy as np
+import websockets
+
+from app.call_audio import CallAudioRecorder, _Resampler, wav_header
+from app.protocol import INPUT_SAMPLE_RATE, KIND_AUDIO, OUTPUT_SAMPLE_RATE, FrameSequencer, pack_frame
+from bench.load_ws import _free_port, _pct, spawn_server, wait_healthy
+
+TURN_SECONDS = 10.0
+REP_SECONDS = 4.0
+ANSWER_AT = 5.0
+ANSWER_SECONDS = 3.0
+CUT_EVERY = 5
+CUT_AFTER = 1.0
+CHUNK = 0.1
+
+
+def tone(freq: float, seconds: float, rate: int) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * freq * t) * 8000).astype("<i2").tobytes()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def script(minutes: float, rng: np.random.Generator):
+    """(time, kind, pcm) for one call, in arrival order, a turn at a time."""
+    speech = tone(440, CHUNK, INPUT_SAMPLE_RATE)  # Whole cycles: chunks join seamlessly
+    silence = bytes(len(speech))
+    answer = tone(660, ANSWER_SECONDS, OUTPUT_SAMPLE_RATE)
+    size = len(answer) // 6
+    for turn in range(int(minutes * 60 / TURN_SECONDS)):
+        base = turn * TURN_SECONDS
+        events = [
+            (base + (k + 1) * CHUNK + rng.uniform(0, 0.03), "rep", speech if k * CHUNK < REP_SECONDS else silence)
+            for k in range(int(TURN_SECONDS / CHUNK))
+        ]
+        # Faster than real time: the whole answer within 60 ms
+        events += [(base + ANSWER_AT + i * 0.01, "model", answer[i * size:(i + 1) * size]) for i in range(6)]
+        if turn % CUT_EVERY == CUT_EVERY - 1:
+            events.append((base + ANSWER_AT + CUT_AFTER, "cut", b""))
+        yield from sorted(events, key=lambda e: e[0])
+
+
+async def probe(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - started - 0.005)
+
+
+async def record_calls(args, directory: Path, trace: bool = False) -> tuple[list[Path], dict]:
+    append_us, lags = [], []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, stop))
+    paths, dropped = [], []
+
+    async def call(c: int) -> None:
+        clock = FakeClock()
+        path = directory / f"call-{c}.wav"
+        paths.append(path)
+        recorder = CallAudioRecorder(path, flush_interval=0.5 / args.speed, clock=clock).start()
+        started = time.perf_counter()
+        for t, kind, pcm in script(args.minutes, np.random.default_rng(c)):
+            ahead = t / args.speed - (time.perf_counter() - started)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+            clock.now = t
+            began = time.perf_counter()
+            if kind == "rep":
+                recorder.rep(pcm, INPUT_SAMPLE_RATE)
+            elif kind == "model":
+                recorder.model(pcm, OUTPUT_SAMPLE_RATE)
+            else:
+                recorder.interrupt()
+            append_us.append((time.perf_counter() - began) * 1e6)
+        await recorder.close()
+        dropped.append(recorder.dropped_bytes)
+
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(call(c) for c in range(args.calls)))
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stop.set()
+    await prober
+    return paths, {"append_us": append_us, "lag": lags, "peak": peak, "wall": wall, "dropped": sum(dropped)}
+
+
+def buffered_peak(args) -> int:
+    """Heap peak of the naive way: keep every chunk, mix and write at the end."""
+    tracemalloc.start()
+    rep, model = [], []
+    for _, kind, pcm in script(args.minutes, np.random.default_rng(0)):
+        (rep if kind == "rep" else model).append(pcm)
+    left = _Resampler(INPUT_SAMPLE_RATE, OUTPUT_SAMPLE_RATE)(
+        np.frombuffer(b"".join(rep), dtype="<i2").astype(np.float32)).astype("<i2")
+    right = np.frombuffer(b"".join(model), dtype="<i2")
+    frames = np.zeros((max(len(left), len(right)), 2), dtype="<i2")
+    frames[:len(left), 0] = left
+    frames[:len(right), 1] = right
+    out = io.BytesIO()
+    out.write(wav_header(OUTPUT_SAMPLE_RATE, frames.nbytes))
+    out.write(frames.tobytes())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def onsets(channel: np.ndarray, rate: int) -> list[tuple[float, float]]:
+    """(start, length) in seconds of each stretch of sound, at 10 ms resolution."""
+    hop = rate // 100
+    frames = len(channel) // hop
+    loud = np.abs(channel[:frames * hop].reshape(frames, hop)).max(axis=1) > 1000
+    edges = np.diff(np.concatenate(([0], loud.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return [(s / 100, (e - s) / 100) for s, e in zip(starts, ends)]
+
+
+def check_alignment(path: Path) -> dict:
+    with wave.open(str(path)) as wav:
+        rate = wav.getframerate()
+        frames = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").reshape(-1, 2)
+    rep, model = onsets(frames[:, 0], rate), onsets(frames[:, 1], rate)
+    rep_err = [abs(start - turn * TURN_SECONDS) for turn, (start, _) in enumerate(rep)]
+    model_err = [abs(start - (turn * TURN_SECONDS + ANSWER_AT)) for turn, (start, _) in enumerate(model)]
+    cut = [length for turn, (_, length) in enumerate(model) if turn % CUT_EVERY == CUT_EVERY - 1]
+    full = [length for turn, (_, length) in enumerate(model) if turn % CUT_EVERY != CUT_EVERY - 1]
+    speech = frames[int(0.5 * rate):int(3.5 * rate), 0].astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(speech))
+    return {
+        "seconds": len(frames) / rate,
+        "turns": (len(rep), len(model)),
+        "rep_err_ms": max(rep_err) * 1000,
+        "model_err_ms": max(model_err) * 1000,
+        "cut_s": (min(cut), max(cut)) if cut else None,
+        "full_s": (min(full), max(full)),
+        "pitch": np.argmax(spectrum) * rate / len(speech),
+    }
+
+
+async def in_process(args) -> None:
+    print(f"{args.calls} practice calls × {args.minutes:.0f} min at {args.speed:.0f}x real time\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, r = await record_calls(args, Path(tmp) / "timed")
+        _, traced = await record_calls(args, Path(tmp) / "traced", trace=True)
+        audio_mib = sum(p.stat().st_size for p in paths) / 2**20
+        print(f"hot path: append p50 {_pct(r['append_us'], 0.5):5.1f} µs p99 {_pct(r['append_us'], 0.99):6.1f} µs, "
+              f"loop lag p50 {_pct(r['lag'], 0.5) * 1000:5.2f} ms p99 {_pct(r['lag'], 0.99) * 1000:6.2f} ms, "
+              f"{args.calls * args.minutes * 60 / r['wall']:.0f} call-seconds recorded per second, "
+              f"{r['dropped'] / 2**20:.1f} MiB dropped")
+        print(f"memory:   heap peak {traced['peak'] / 2**20:6.1f} MiB for {args.calls} calls "
+              f"({audio_mib:.0f} MiB of WAV written); buffering one call and writing at the end: "
+              f"{buffered_peak(args) / 2**20:6.1f} MiB")
+        a = check_alignment(paths[0])
+        print(f"aligned:  {a['seconds']:.1f} s WAV, {a['turns'][0]} rep turns / {a['turns'][1]} answers, "
+              f"onset error rep ≤ {a['rep_err_ms']:.0f} ms, model ≤ {a['model_err_ms']:.0f} ms, "
+              f"answers {a['full_s'][0]:.2f}-{a['full_s'][1]:.2f} s, cut answers "
+              f"{a['cut_s'][0]:.2f}-{a['cut_s'][1]:.2f} s (cut at {CUT_AFTER:.1f} s), "
+              f"rep pitch {a['pitch']:.0f} Hz (sent 440 Hz at 16 kHz)")
+
+
+async def practice_call(base: str, seconds: float) -> tuple[str, int]:
+    """Record a practice call; return its audio URL (with the observe token) and the status while live."""
+    pcm = tone(440, CHUNK, INPUT_SAMPLE_RATE)
+    config = {"type": "config", "mode": "practice", "binary": True, "record_audio": True}
+    async with websockets.connect(f"ws://{base}/ws", max_size=None) as ws:
+        await ws.send(json.dumps(config))
+        status = json.loads(await ws.recv())
+        url = f"http://{base}/api/calls/{status['session_id']}/audio?token={status['observe']}"
+        async with httpx.AsyncClient() as client:
+            live = (await client.get(url)).status_code
+        sequencer = FrameSequencer()
+        t0 = time.perf_counter()
+        for k in range(int(seconds / CHUNK)):
+            await asyncio.sleep(max(0.0, t0 + k * CHUNK - time.perf_counter()))
+            await ws.send(pack_frame(KIND_AUDIO, pcm, seq=sequencer.next(), sample_rate=INPUT_SAMPLE_RATE))
+        await ws.send(json.dumps({"type": "end"}))
+        try:
+            while True:
+                await ws.recv()
+        except websockets.ConnectionClosed:
+            pass
+    return url, live
+
+
+async def server(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = _free_port()
+        base = f"127.0.0.1:{port}"
+        proc = spawn_server(port, {"AUDIO_RECORDING_DIR": tmp, "JOURNAL_DIR": "", "MOCK_TURN_AUDIO_SECONDS": "2"})
+        try:
+            await wait_healthy(f"http://{base}")
+            url, live = await practice_call(base, args.server_seconds)
+            async with httpx.AsyncClient() as client:
+                for _ in range(50):
+                    full = await client.get(url)
+                    if full.status_code != 409:
+                        break
+                    await asyncio.sleep(0.1)
+                full.raise_for_status()
+                size = len(full.content)
+                with wave.open(io.BytesIO(full.content)) as wav:
+                    info = f"{wav.getnchannels()} ch {wav.getframerate()} Hz, {wav.getnframes() / wav.getframerate():.1f} s"
+                print(f"\nserver: {args.server_seconds:.0f} s practice call → while live {live}, "
+                      f"after: {full.status_code} {full.headers['content-type']}, {size / 1024:.0f} KiB ({info}), "
+                      f"accept-ranges {full.headers.get('accept-ranges')}")
+                middle = size // 2
+                for label, header, want in (
+                    ("header", "bytes=0-43", full.content[:44]),
+                    ("middle", f"bytes={middle}-{middle + 65535}", full.content[middle:middle + 65536]),
+                    ("suffix", "bytes=-4096", full.content[-4096:]),
+                    ("past end", f"bytes={size}-", None),
+                ):
+                    r = await client.get(url, headers={"Range": header})
+                    ok = r.content == want if want is not None else r.status_code == 416
+                    print(f"  Range {header:<22} {r.status_code} {r.headers.get('content-range', ''):<28} "
+                          f"{len(r.content):6d} bytes  matches: {ok}")
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+async def main(args) -> None:
+    await in_process(args)
+    await server(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--speed", type=float, default=20.0)
+    parser.add_argument("--server-seconds", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
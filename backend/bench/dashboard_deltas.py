@@ -0,0 +1,126 @@
+"""
+Outbound bytes for the raw dashboard stream vs server-folded deltas.
+
+Each client runs a live call against the mock backend, triggering
+``--turns`` scripted turns (transcripts, ``update_dashboard`` and
+``log_objection`` calls, usage) with text messages, and counts the JSON
+bytes it receives. Runs once with the raw protocol and once with
+``"dashboard": "delta"``. The delta client also folds every delta the way
+the frontend does, then asks for a ``snapshot`` and checks the two agree,
+and reports what a late-joining viewer pays: one snapshot.
+
+    python -m bench.dashboard_deltas --calls 10 --turns 30
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+
+import websockets
+
+from bench.load_ws import _free_port, spawn_server, wait_healthy
+
+
+def fold(state: dict, delta: dict) -> None:
+    """Client-side delta application, as in the frontend's ``applyDelta``."""
+    changed, added, dropped = delta.get("set", {}), delta.get("add", {}), delta.get("drop", {})
+    for key, value in changed.items():
+        state[key] = {**state[key], **value} if key == "scores" else value
+    for key, items in added.items():
+        state[key] = list(reversed(items)) + state[key] if key == "coachingTips" else state[key] + items
+    state["coachingTips"] = state["coachingTips"][:10]
+    gone = set(dropped.get("objections", []))
+    state["objections"] = [o for o in state["objections"] if o.get("hintId") not in gone]
+
+
+async def one_call(url: str, args, deltas: bool) -> dict:
+    config = {"type": "config", "mode": "live"}
+    if deltas:
+        config["dashboard"] = "delta"
+    bytes_by_type: Counter = Counter()
+    state = None
+    version = 0
+    in_order = True
+    snapshot = None
+    snapshot_ms = 0.0
+    requested = 0.0
+
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps(config))
+        await ws.recv()
+        if deltas:
+            await ws.send(json.dumps({"type": "snapshot"}))
+        for turn in range(args.turns + 1):
+            if turn < args.turns:
+                await ws.send(json.dumps({"type": "text", "text": f"turn {turn}"}))
+            elif deltas:
+                requested = time.perf_counter()
+                await ws.send(json.dumps({"type": "snapshot"}))
+            while True:
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    break
+                msg = json.loads(raw)
+                bytes_by_type[msg["type"]] += len(raw)
+                if msg["type"] == "dashboard_snapshot":
+                    if state is None:
+                        state, version = msg["state"], msg["v"]
+                    else:
+                        snapshot = msg
+                        snapshot_ms = (time.perf_counter() - requested) * 1000
+                elif msg["type"] == "dashboard_delta":
+                    in_order &= msg["v"] == version + 1
+                    version = msg["v"]
+                    fold(state, msg)
+                if msg["type"] == "turn_complete" and turn < args.turns:
+                    break
+
+    result = {"bytes": bytes_by_type, "in_order": in_order}
+    if deltas:
+        bytes_by_type["dashboard_snapshot"] -= len(json.dumps(snapshot))  # Not part of the stream
+        result["matches"] = snapshot is not None and snapshot["state"] == state and snapshot["v"] == version
+        result["snapshot_bytes"] = len(json.dumps(snapshot))
+        result["snapshot_ms"] = snapshot_ms
+    return result
+
+
+async def run(label: str, args, deltas: bool) -> dict:
+    port = _free_port()
+    proc = spawn_server(port, {"MOCK_FIRST_EVENT_MS": "50", "MOCK_STEP_MS": "5"})
+    try:
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        url = f"ws://127.0.0.1:{port}/ws"
+        results = await asyncio.gather(*(one_call(url, args, deltas) for _ in range(args.calls)))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    totals: Counter = Counter()
+    for r in results:
+        totals.update(r["bytes"])
+    per_call = sum(totals.values()) / len(results)
+    top = ", ".join(f"{kind} {n / len(results) / 1024:.1f}" for kind, n in totals.most_common(4))
+    print(f"{label:<6} {per_call / 1024:7.1f} KiB per call  ({top} KiB)")
+    if deltas:
+        print(f"{'':<6} deltas in order {sum(r['in_order'] for r in results)}/{len(results)}, "
+              f"folded state == snapshot {sum(r['matches'] for r in results)}/{len(results)}, "
+              f"late-join snapshot {statistics.mean(r['snapshot_bytes'] for r in results) / 1024:.1f} KiB "
+              f"in {statistics.median(r['snapshot_ms'] for r in results):.1f} ms")
+    return {"per_call": per_call}
+
+
+async def main(args) -> None:
+    print(f"{args.calls} live calls, {args.turns} scripted turns each\n")
+    raw = await run("raw", args, deltas=False)
+    delta = await run("delta", args, deltas=True)
+    print(f"\noutbound bytes: {delta['per_call'] / raw['per_call']:.0%} of raw")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=30)
+    asyncio.run(main(parser.parse_args()))
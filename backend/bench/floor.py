@@ -0,0 +1,138 @@
+"""
+Floor view cost: incremental aggregates vs rescanning every call.
+
+In-process, ``--calls`` concurrent calls each fold a stream of synthetic
+dashboard messages (``update_dashboard`` scores and sentiment, objection
+hints and their resolutions, ``log_objection``, measured talk ratios)
+through their own ``DashboardState``, and every delta goes to one
+``FloorView``, as ``_send_dashboard`` does. It reports:
+
+  - update: ``FloorView.on_delta`` per delta;
+  - read: ``FloorView.frame()`` after a change (what ``/api/floor`` and
+    ``/ws/floor`` pay) vs building the same aggregates by rescanning every
+    call's dashboard and serializing them;
+  - whether the incremental totals equal the rescan at the end.
+
+    python -m bench.floor
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from collections import Counter
+
+from app.dashboard_state import DashboardState
+from app.floor import SCORES, FloorView
+from app.prompts.objections import OBJECTION_CATEGORIES
+
+CATEGORIES = list(OBJECTION_CATEGORIES)
+
+
+def message(rng: random.Random, call: dict, n: int) -> dict:
+    """One dashboard message; scores and sentiment drift around the call's level."""
+    roll = rng.random()
+    if roll < 0.5:
+        level = call["level"]
+        return {"type": "tool_call", "name": "update_dashboard", "args": {
+            "sentiment": "negative" if rng.random() < 0.05 else rng.choice(("positive", "neutral")),
+            "rapport_score": max(1, min(100, int(rng.gauss(level, 10)))),
+            "discovery_score": max(1, min(100, int(rng.gauss(level, 10)))),
+            "coaching_tip": f"tip {n}",
+        }}
+    if roll < 0.65:
+        hint_id = f"h{n}"
+        call["hints"].append(hint_id)
+        return {"type": "objection_hint", "id": hint_id, "category": rng.choice(CATEGORIES),
+                "text": "too expensive", "framework": "..."}
+    if roll < 0.75 and call["hints"]:
+        return {"type": "objection_hint_resolved", "id": call["hints"].pop(0)}
+    if roll < 0.85:
+        return {"type": "tool_call", "name": "log_objection", "args": {
+            "objection_type": rng.choice(CATEGORIES), "objection_text": "x", "suggested_response": "y",
+        }}
+    rep = max(5, min(95, int(rng.gauss(call["rep_pct"], 5))))
+    return {"type": "talk_ratio", "rep_pct": rep, "prospect_pct": 100 - rep}
+
+
+def rescan(calls: dict[str, DashboardState], floor: FloorView) -> dict:
+    """The aggregates the slow way: walk every call's whole dashboard."""
+    scores = {field: [] for field in SCORES}
+    objections = dict.fromkeys(OBJECTION_CATEGORIES, 0)
+    sentiments: Counter = Counter()
+    trouble = []
+    for session_id, state in calls.items():
+        snap = state.snapshot()["state"]
+        sentiments[snap["sentiment"]] += 1
+        scored = {f: v for f, v in state.scores.items() if v is not None}
+        for field, value in scored.items():
+            scores[field].append(value)
+        for objection in snap["objections"]:
+            objections[objection["type"]] += 1
+        if (snap["sentiment"] == "negative"
+                or any(v < floor.trouble_score for v in scored.values())
+                or snap["talkRatio"]["rep"] > floor.trouble_rep_pct):
+            trouble.append(session_id)
+    return {
+        "active_calls": len(calls),
+        "avg_scores": {f: round(sum(v) / len(v), 1) if v else None for f, v in scores.items()},
+        "objections": objections,
+        "sentiment": dict(sentiments),
+        "in_trouble": trouble,
+    }
+
+
+def run(n_calls: int, args) -> None:
+    rng = random.Random(n_calls)
+    floor = FloorView()
+    calls = {f"call-{i}": DashboardState() for i in range(n_calls)}
+    # Most calls go fine; a few are weak or have a rep who won't stop talking
+    profiles = {
+        session_id: {"level": rng.gauss(70, 12), "rep_pct": rng.gauss(50, 10), "hints": []}
+        for session_id in calls
+    }
+    for session_id in calls:
+        floor.open(session_id, "live")
+
+    update_us, read_us, rescan_us = [], [], []
+    ids = list(calls)
+    for n in range(args.messages):
+        session_id = rng.choice(ids)
+        delta = calls[session_id].apply(message(rng, profiles[session_id], n))
+        if delta is None:
+            continue
+        started = time.perf_counter()
+        floor.on_delta(session_id, delta)
+        update_us.append((time.perf_counter() - started) * 1e6)
+        if n % args.read_every == 0:
+            started = time.perf_counter()
+            floor.frame()
+            read_us.append((time.perf_counter() - started) * 1e6)
+            started = time.perf_counter()
+            json.dumps(rescan(calls, floor))
+            rescan_us.append((time.perf_counter() - started) * 1e6)
+
+    got = floor.snapshot()
+    want = rescan(calls, floor)
+    matches = all(got[key] == want[key] for key in ("active_calls", "avg_scores", "objections", "sentiment"))
+    matches &= {c["session_id"] for c in got["in_trouble"]} == set(want["in_trouble"])
+    print(f"{n_calls:>5} calls  update p50 {statistics.median(update_us):5.1f} µs  "
+          f"read p50 {statistics.median(read_us):7.1f} µs  "
+          f"rescan p50 {statistics.median(rescan_us):9.1f} µs  "
+          f"({statistics.median(rescan_us) / statistics.median(read_us):5.0f}x)  "
+          f"in trouble {len(got['in_trouble']):>4}  matches rescan: {matches}")
+
+
+def main(args) -> None:
+    print(f"{args.messages} dashboard messages spread over the calls, a read every {args.read_every}\n")
+    for n_calls in args.calls:
+        run(n_calls, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--read-every", type=int, default=50)
+    main(parser.parse_args())
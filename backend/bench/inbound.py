@@ -0,0 +1,99 @@
+"""
+Inbound audio path under an upstream stall: memory bound, drops, re-frame cost.
+
+Feeds real-time 256 ms mic chunks for ``--seconds`` into a LiveRequestQueue
+whose consumer (standing in for run_live) stops reading for ``--stall``
+seconds halfway through. Compares pushing chunks straight into the queue
+(the old ``read_client``) with the re-framer + bounded inbound queue, under
+both overflow policies.
+
+    python -m bench.inbound --seconds 20 --stall 8
+"""
+
+import argparse
+import asyncio
+import time
+
+from google.genai import types
+
+from app.inbound import AudioReframer, InboundAudioQueue, UpstreamQueue
+
+RATE = 16000
+CHUNK = 4096 * 2  # 256 ms of 16-bit PCM
+
+
+async def consume(live_queue: UpstreamQueue, stall: tuple[float, float], started: float, peak: list):
+    while True:
+        now = time.perf_counter() - started
+        if stall[0] <= now < stall[1]:
+            peak[0] = max(peak[0], live_queue.depth)
+            await asyncio.sleep(0.01)
+            continue
+        request = await live_queue.get()
+        if request.close:
+            return
+
+
+async def run(label: str, args, overflow: str | None) -> None:
+    live_queue = UpstreamQueue()
+    started = time.perf_counter()
+    stall = (args.seconds / 2 - args.stall / 2, args.seconds / 2 + args.stall / 2)
+    peak = [0]
+    consumer = asyncio.create_task(consume(live_queue, stall, started, peak))
+    signals = []
+    reframer = inbound = None
+    if overflow is not None:
+        reframer = AudioReframer(args.frame_ms)
+        inbound = InboundAudioQueue(
+            live_queue, max_frames=args.max_frames, overflow=overflow, on_signal=signals.append
+        ).start()
+
+    chunk = b"\1\0" * (CHUNK // 2)
+    steps = int(args.seconds * RATE * 2 / CHUNK)
+    reframe_cost = []
+    for i in range(steps):
+        delay = started + i * CHUNK / (RATE * 2) - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if inbound is None:
+            live_queue.send_realtime(types.Blob(data=chunk, mime_type="audio/pcm"))
+            continue
+        t0 = time.perf_counter()
+        frames = reframer.feed(chunk)
+        reframe_cost.append(time.perf_counter() - t0)
+        for frame in frames:
+            inbound.send_realtime(types.Blob(data=frame, mime_type="audio/pcm"))
+        peak[0] = max(peak[0], live_queue.depth)
+
+    if inbound is not None:
+        await inbound.drain(timeout=10)
+    live_queue.close()
+    await consumer
+    line = f"{label:<22} peak upstream queue {peak[0]:4d} requests"
+    if inbound is not None:
+        s = inbound.stats()
+        buffered = (s["max_depth"] * args.frame_ms + args.frame_ms * 8) / 1000
+        cost = sorted(reframe_cost)[len(reframe_cost) // 2] * 1e6
+        line += (f"  inbound max {s['max_depth']:3d} frames  dropped {s['dropped']:4d}  "
+                 f"signals {signals}  held <= {buffered:.1f} s  re-frame {cost:.1f} us/chunk")
+    else:
+        line += f" ({peak[0] * CHUNK / (RATE * 2):.1f} s of audio, unbounded)"
+    print(line)
+    if inbound is not None:
+        inbound.close()
+
+
+async def main(args) -> None:
+    print(f"{args.seconds:.0f} s of mic audio, upstream stalled for {args.stall:.0f} s\n")
+    await run("direct (unbounded)", args, None)
+    await run("bounded, drop_oldest", args, "drop_oldest")
+    await run("bounded, signal", args, "signal")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--stall", type=float, default=8.0)
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--max-frames", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
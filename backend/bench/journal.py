@@ -0,0 +1,217 @@
+"""
+Call journal: hot-path cost, group commits, rotation, compaction, recovery.
+
+In-process, ``--calls`` concurrent calls each journal ``--rate`` events/s
+(partial and final transcripts, tool calls, usage) for ``--duration``
+seconds, while a probe measures event-loop lag (how late a 5 ms sleep
+wakes up). Three ways of persisting them:
+
+  - none: events are not written anywhere;
+  - sync: ``write`` + ``fsync`` per event on the event loop;
+  - journal: ``CallJournal.append`` with background group commits.
+
+Then, against the mock server: a live call, its journal read back from
+``/api/calls/{id}/events``, and a server killed mid-call (SIGKILL), whose
+journal is compacted by the next start and served like any other.
+
+    python -m bench.journal
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+from app.journal import CallJournal
+from bench.load_ws import _free_port, _pct, spawn_server, wait_healthy
+
+
+def events(n: int):
+    """A repeating mix shaped like a live call's outbound stream."""
+    for i in range(n):
+        k = i % 10
+        if k < 5:
+            yield {"type": "transcript", "text": "and the pricing for the " * 2, "source": "input", "partial": True}
+        elif k < 7:
+            yield {"type": "transcript", "text": "And the pricing for the enterprise tier?", "source": "input", "partial": False}
+        elif k < 9:
+            yield {"type": "tool_call", "name": "update_dashboard", "args": {
+                "sentiment": "neutral", "rapport_score": 60, "coaching_tip": "Ask about their timeline"}}
+        else:
+            yield {"type": "usage", "prompt_tokens": 12000 + i, "candidates_tokens": 40, "total_tokens": 12040 + i}
+
+
+async def probe(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - started - 0.005)
+
+
+async def in_process(mode: str, args, directory: Path) -> dict:
+    journal = CallJournal(directory / mode, commit_interval=args.commit_ms / 1000,
+                          segment_bytes=args.segment_kib * 1024, fsync=True)
+    await journal.start()
+    files = {}
+    lags, append_us = [], []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe(lags, stop))
+
+    async def call(c: int) -> None:
+        session_id = f"call-{c}"
+        if mode == "journal":
+            journal.open(session_id, {"mode": "live"})
+        elif mode == "sync":
+            files[session_id] = open(directory / f"sync-{c}.ndjson", "ab")
+        interval = 1 / args.rate
+        t0 = time.perf_counter()
+        for i, event in enumerate(events(int(args.duration * args.rate))):
+            await asyncio.sleep(max(0.0, t0 + i * interval - time.perf_counter()))
+            started = time.perf_counter()
+            if mode == "journal":
+                journal.append(session_id, event)
+            elif mode == "sync":
+                fh = files[session_id]
+                fh.write(json.dumps({"t": time.time(), "e": event}).encode() + b"\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            append_us.append((time.perf_counter() - started) * 1e6)
+        if mode == "journal":
+            journal.finish(session_id)
+
+    await asyncio.gather(*(call(c) for c in range(args.calls)))
+    stop.set()
+    await prober
+    await journal.stop()
+    for fh in files.values():
+        fh.close()
+    stored = list((directory / mode).glob("*.ndjson")) if mode == "journal" else []
+    return {
+        "append_us": append_us,
+        "lag": lags,
+        "commits": journal.commits,
+        "stored": len(stored),
+        "stored_bytes": sum(p.stat().st_size for p in stored),
+    }
+
+
+async def rotation(args, directory: Path) -> None:
+    journal = CallJournal(directory / "rotation", commit_interval=0.01, segment_bytes=16 * 1024)
+    await journal.start()
+    journal.open("long-call", {"mode": "live"})
+    for i, event in enumerate(events(20000)):
+        journal.append("long-call", event)
+        if i % 500 == 0:
+            await asyncio.sleep(0.02)
+    await asyncio.sleep(0.1)
+    segments = list((directory / "rotation" / "long-call").glob("*.ndjson"))
+    raw = sum(p.stat().st_size for p in segments)
+    started = time.perf_counter()
+    journal.finish("long-call")
+    await journal.stop()
+    compact_ms = (time.perf_counter() - started) * 1000
+    stored = directory / "rotation" / "long-call.ndjson"
+    lines = stored.read_bytes().count(b"\n")
+    print(f"\nrotation: 20000 events → {len(segments)} segments rolled at 16 KiB ({raw / 1024:.0f} KiB); "
+          f"compacted in {compact_ms:.0f} ms to {stored.stat().st_size / 1024:.0f} KiB, "
+          f"{lines} records (partial transcripts dropped)")
+
+
+async def live_call(base: str, turns: int, end: bool = True) -> tuple[str, str]:
+    """Run a call; return its session id and observe token."""
+    async with websockets.connect(f"ws://{base}/ws") as ws:
+        await ws.send(json.dumps({"type": "config", "mode": "live"}))
+        status = json.loads(await ws.recv())
+        session_id = status["session_id"]
+        for t in range(turns):
+            await ws.send(json.dumps({"type": "text", "text": f"turn {t}"}))
+            while json.loads(await ws.recv())["type"] != "turn_complete":
+                pass
+        if end:
+            await ws.send(json.dumps({"type": "end"}))
+            try:
+                while True:
+                    await ws.recv()
+            except websockets.ConnectionClosed:
+                pass
+    return session_id, status["observe"]
+
+
+async def read_back(base: str, session_id: str, token: str) -> list[dict]:
+    async with httpx.AsyncClient() as client:
+        for _ in range(50):
+            response = await client.get(f"http://{base}/api/calls/{session_id}/events", params={"token": token})
+            if response.status_code != 409:
+                break
+            await asyncio.sleep(0.1)
+        response.raise_for_status()
+        return [json.loads(line)["e"] for line in response.text.splitlines()]
+
+
+async def server(directory: Path) -> None:
+    env = {"JOURNAL_DIR": str(directory / "server"), "MOCK_FIRST_EVENT_MS": "20", "MOCK_STEP_MS": "2"}
+    port = _free_port()
+    base = f"127.0.0.1:{port}"
+    proc = spawn_server(port, env)
+    try:
+        await wait_healthy(f"http://{base}")
+        session_id, token = await live_call(base, turns=5)
+        refused = (await httpx.AsyncClient().get(f"http://{base}/api/calls/{session_id}/events")).status_code
+        records = await read_back(base, session_id, token)
+        kinds = {}
+        for r in records:
+            kinds[r["type"]] = kinds.get(r["type"], 0) + 1
+        print(f"\nserver: 5-turn call → {len(records)} records, first {records[0]['type']}, "
+              f"last {records[-1]['type']}, {dict(sorted(kinds.items()))}; without a token: {refused}")
+
+        crashed, crashed_token = await live_call(base, turns=3, end=False)
+        await asyncio.sleep(0.5)  # Past a group commit
+    finally:
+        proc.send_signal(signal.SIGKILL)
+        proc.wait(timeout=10)
+    leftover = directory / "server" / crashed
+    print(f"killed mid-call: segments on disk {len(list(leftover.glob('*.ndjson')))}")
+    proc = spawn_server(port, env)
+    try:
+        await wait_healthy(f"http://{base}")
+        records = await read_back(base, crashed, crashed_token)
+        print(f"after restart: {len(records)} records served for the crashed call "
+              f"(first {records[0]['type']}, no call_ended: {records[-1]['type'] != 'call_ended'}), "
+              f"segment dir gone: {not leftover.exists()}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+async def main(args) -> None:
+    print(f"{args.calls} calls × {args.rate} events/s for {args.duration:.0f} s, "
+          f"group commit every {args.commit_ms:.0f} ms, fsync on\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for mode in ("none", "sync", "journal"):
+            r = await in_process(mode, args, directory)
+            line = (f"{mode:<8} append p50 {_pct(r['append_us'], 0.5):7.1f} µs p99 {_pct(r['append_us'], 0.99):8.1f} µs  "
+                    f"loop lag p50 {_pct(r['lag'], 0.5) * 1000:5.2f} ms p99 {_pct(r['lag'], 0.99) * 1000:6.2f} ms")
+            if mode == "journal":
+                line += (f"  {r['commits']} group commits, {r['stored']} calls stored "
+                         f"({r['stored_bytes'] / r['stored'] / 1024:.0f} KiB each after compaction)")
+            print(line)
+        await rotation(args, directory)
+        await server(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--commit-ms", type=float, default=200.0)
+    parser.add_argument("--segment-kib", type=int, default=4096)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,275 @@
+"""
+Offline load test for /ws against the mock Live backend.
+
+Spawns the server with ``LIVE_BACKEND=mock`` (or targets ``--url``), opens
+N concurrent binary-protocol clients that stream 16 kHz PCM at real-time
+pace, and reports message throughput, end-to-end event latency (mock
+runner → client, via the ``_mock_sent_at`` stamp on tool calls) and the
+server's CPU and RSS per session. Raise ``--sessions`` until p99 latency or
+CPU saturates to find the per-node ceiling.
+
+    python -m bench.load_ws --sessions 50 --duration 30
+    python -m bench.load_ws --sessions 20 --mode practice
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+from app.protocol import INPUT_SAMPLE_RATE, KIND_AUDIO, FrameSequencer, pack_frame
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+# ── Server process ─────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port: int, env_overrides: dict[str, str]) -> subprocess.Popen:
+    env = {**os.environ, "LIVE_BACKEND": "mock", **env_overrides}
+    env.setdefault("GOOGLE_API_KEY", "offline")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_healthy(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not become healthy")
+
+
+class ProcSampler:
+    """CPU seconds and RSS of a process, read from /proc (Linux only)."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.available = Path(f"/proc/{pid}/stat").exists()
+        self.peak_rss = 0
+
+    def cpu_seconds(self) -> float:
+        fields = Path(f"/proc/{self.pid}/stat").read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLK_TCK  # utime + stime
+
+    def rss_bytes(self) -> int:
+        for line in Path(f"/proc/{self.pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) * 1024
+                self.peak_rss = max(self.peak_rss, rss)
+                return rss
+        return 0
+
+    async def track_peak(self, interval: float = 0.5) -> None:
+        while True:
+            self.rss_bytes()
+            await asyncio.sleep(interval)
+
+
+# ── Client ─────────────────────────────────────────────────────────────
+class ClientStats:
+    def __init__(self):
+        self.messages = 0
+        self.audio_frames = 0
+        self.tool_calls = 0
+        self.turns = 0
+        self.bytes_sent = 0
+        self.latencies: list[float] = []
+        self.send_lag: list[float] = []
+        self.connect_seconds = 0.0
+        self.summary_seconds: float | None = None
+        self.error: str | None = None
+
+
+def _pcm_chunk(samples: int) -> bytes:
+    # A near-silent 220 Hz tone: content doesn't matter to the mock, size
+    # does, and staying under the speech threshold keeps barge-in out of it
+    return b"".join(
+        int(40 * math.sin(2 * math.pi * 220 * i / INPUT_SAMPLE_RATE)).to_bytes(2, "little", signed=True)
+        for i in range(samples)
+    )
+
+
+async def run_client(url: str, mode: str, duration: float, chunk_ms: int, pcm: bytes) -> ClientStats:
+    stats = ClientStats()
+    started = time.perf_counter()
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            await ws.send(json.dumps({"type": "config", "mode": mode, "binary": True}))
+            status = json.loads(await ws.recv())
+            stats.connect_seconds = time.perf_counter() - started
+            if status.get("type") != "status":
+                raise RuntimeError(f"unexpected first message: {status}")
+
+            ended = asyncio.Event()
+
+            async def receive():
+                try:
+                    await _receive()
+                except websockets.ConnectionClosed:
+                    pass  # The server ends the session without a close frame
+
+            async def _receive():
+                async for message in ws:
+                    stats.messages += 1
+                    if isinstance(message, bytes):
+                        stats.audio_frames += 1
+                        continue
+                    msg = json.loads(message)
+                    kind = msg.get("type")
+                    if kind == "tool_call":
+                        stats.tool_calls += 1
+                        sent_at = msg.get("args", {}).get("_mock_sent_at")
+                        if sent_at is not None:
+                            stats.latencies.append(time.time() - sent_at)
+                        if msg.get("name") == "save_call_summary" and ended.is_set():
+                            stats.summary_seconds = time.perf_counter() - end_at
+                    elif kind == "turn_complete":
+                        stats.turns += 1
+
+            receiver = asyncio.create_task(receive())
+            sequencer = FrameSequencer()
+            interval = chunk_ms / 1000
+            t0 = time.perf_counter()
+            for k in range(int(duration / interval)):
+                # Absolute schedule: late sends don't accumulate drift
+                target = t0 + k * interval
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -0.005:
+                    stats.send_lag.append(-delay)
+                frame = pack_frame(KIND_AUDIO, pcm, seq=sequencer.next(), sample_rate=INPUT_SAMPLE_RATE)
+                await ws.send(frame)
+                stats.bytes_sent += len(frame)
+
+            end_at = time.perf_counter()
+            ended.set()
+            await ws.send(json.dumps({"type": "end"}))
+            try:
+                await asyncio.wait_for(receiver, timeout=15)
+            except asyncio.TimeoutError:
+                receiver.cancel()
+    except Exception as exc:  # noqa: BLE001 - report, don't abort the run
+        stats.error = f"{type(exc).__name__}: {exc}"
+    return stats
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _ms(value: float | None) -> str:
+    return "n/a" if value is None else f"{value * 1000:.1f} ms"
+
+
+async def main(args) -> None:
+    proc = None
+    sampler = None
+    if args.url:
+        ws_url = args.url
+    else:
+        port = _free_port()
+        proc = spawn_server(port, {
+            "MOCK_FIRST_EVENT_MS": str(args.first_event_ms),
+            "MOCK_TURN_AUDIO_SECONDS": str(args.turn_seconds),
+        })
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        ws_url = f"ws://127.0.0.1:{port}/ws"
+        sampler = ProcSampler(proc.pid)
+
+    try:
+        pcm = _pcm_chunk(INPUT_SAMPLE_RATE * args.chunk_ms // 1000)
+        baseline_rss = sampler.rss_bytes() if sampler and sampler.available else 0
+        cpu_before = sampler.cpu_seconds() if sampler and sampler.available else 0.0
+        peak_task = asyncio.create_task(sampler.track_peak()) if sampler and sampler.available else None
+
+        wall_start = time.perf_counter()
+        clients = []
+        for i in range(args.sessions):
+            clients.append(asyncio.create_task(
+                run_client(ws_url, args.mode, args.duration, args.chunk_ms, pcm)
+            ))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.sessions)
+        results: list[ClientStats] = await asyncio.gather(*clients)
+        wall = time.perf_counter() - wall_start
+
+        if peak_task:
+            peak_task.cancel()
+            cpu_used = sampler.cpu_seconds() - cpu_before
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    ok = [r for r in results if r.error is None]
+    latencies = [v for r in ok for v in r.latencies]
+    lags = [v for r in ok for v in r.send_lag]
+    messages = sum(r.messages for r in ok)
+
+    print(f"\nSessions: {len(ok)}/{args.sessions} ok, mode={args.mode}, "
+          f"{args.duration:.0f}s of audio each, wall {wall:.1f}s")
+    for r in results:
+        if r.error:
+            print(f"  error: {r.error}")
+    print(f"Throughput:     {messages / wall:,.0f} msg/s to clients, "
+          f"{sum(r.bytes_sent for r in ok) / wall / 1e6:.2f} MB/s of PCM from clients")
+    print(f"Turns:          {sum(r.turns for r in ok)}  tool calls: {sum(r.tool_calls for r in ok)}  "
+          f"audio frames: {sum(r.audio_frames for r in ok)}")
+    print(f"Event latency:  p50 {_ms(_pct(latencies, 0.5))}  p99 {_ms(_pct(latencies, 0.99))}  "
+          f"max {_ms(max(latencies, default=None))}  (n={len(latencies)})")
+    print(f"Connect:        p50 {_ms(_pct([r.connect_seconds for r in ok], 0.5))}  "
+          f"p99 {_ms(_pct([r.connect_seconds for r in ok], 0.99))}")
+    summaries = [r.summary_seconds for r in ok if r.summary_seconds is not None]
+    if summaries:
+        print(f"End → summary:  p50 {_ms(statistics.median(summaries))}")
+    print(f"Client send lag: {len(lags)} late chunks, p99 {_ms(_pct(lags, 0.99))}")
+    if sampler and sampler.available and ok:
+        cpu_pct = 100 * cpu_used / wall
+        rss_delta = max(0, sampler.peak_rss - baseline_rss)
+        print(f"Server CPU:     {cpu_pct:.1f}% of one core total, {cpu_pct / len(ok):.2f}% per session")
+        print(f"Server RSS:     {baseline_rss / 1e6:.1f} MB idle, peak {sampler.peak_rss / 1e6:.1f} MB, "
+              f"{rss_delta / len(ok) / 1e3:.0f} KB per session")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of audio per session")
+    parser.add_argument("--mode", choices=["live", "practice"], default="live")
+    parser.add_argument("--chunk-ms", type=int, default=256, help="PCM chunk size (browser sends 256 ms)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which to open sessions")
+    parser.add_argument("--first-event-ms", type=float, default=300.0)
+    parser.add_argument("--turn-seconds", type=float, default=4.0)
+    parser.add_argument("--url", default="", help="target an already-running server instead")
+    asyncio.run(main(parser.parse_args()))
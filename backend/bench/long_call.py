@@ -0,0 +1,157 @@
+"""
+Per-turn latency over a 60-minute call, with and without long-call mode.
+
+Drives ``MockLiveRunner.run_live`` in-process with an hour of mic audio,
+sent faster than real time so each call takes about a minute.
+The mock accounts context like the Live API (32 audio tokens/s plus text
+and tool calls) and adds ``--ms-per-1k`` of prefill delay per 1k tokens of
+context to the first event of each turn. That delay is the modelled part;
+everything else (compression, the state-block cadence, the digest) is the
+server's real code path.
+
+For each mode it reports, around the 10, 30 and 60 minute marks:
+
+  - turn latency: last audio of the rep's turn → first model event;
+  - context: ``prompt_token_count`` of the last usage event.
+
+In long-call mode the ``CallDigest`` state block is sent every
+``--summary-seconds`` of call time, as ``_push_call_state`` does.
+
+    python -m bench.long_call
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.agents.run_config import RunConfig
+from google.genai import types
+
+from app.longcall import CallDigest, LongCallSettings
+from app.mock_live import INPUT_BYTES_PER_SECOND, MockLiveRunner
+
+MARKS_MINUTES = (10, 30, 60)
+CHUNK_SECONDS = 0.1
+QUIET_CHUNK = b"\x01\x00" * int(INPUT_BYTES_PER_SECOND * CHUNK_SECONDS / 2)
+
+
+async def one_call(args, long_call: bool) -> dict:
+    settings = LongCallSettings(
+        trigger_tokens=args.trigger_tokens,
+        target_tokens=args.target_tokens,
+        summary_seconds=args.summary_seconds,
+    )
+    runner = MockLiveRunner(
+        first_event_ms=args.first_event_ms,
+        step_ms=0,
+        jitter=0,
+        turn_audio_seconds=args.turn_seconds,
+        context_ms_per_1k=args.ms_per_1k,
+    )
+    run_config = RunConfig(
+        response_modalities=["TEXT"],
+        context_window_compression=settings.compression() if long_call else None,
+    )
+    live_queue = LiveRequestQueue()
+    digest = CallDigest()
+    first_event = asyncio.Event()
+    turn_done = asyncio.Event()
+    context = {"tokens": 0}
+
+    async def consume():
+        async for event in runner.run_live(
+            user_id="bench", session_id="bench", live_request_queue=live_queue, run_config=run_config
+        ):
+            first_event.set()
+            for fc in event.get_function_calls():
+                digest.on_tool_call(fc.name, dict(fc.args or {}))
+            if event.usage_metadata:
+                context["tokens"] = event.usage_metadata.prompt_token_count or 0
+            if event.turn_complete:
+                digest.on_turn_complete()
+                turn_done.set()
+
+    async def model_turn(send) -> float:
+        first_event.clear()
+        turn_done.clear()
+        sent = time.perf_counter()
+        send()
+        await first_event.wait()
+        latency = time.perf_counter() - sent
+        await turn_done.wait()
+        return latency
+
+    consumer = asyncio.create_task(consume())
+    turns: list[tuple[float, float, int]] = []  # (call minute, latency, context tokens)
+    render_us: list[float] = []
+    block_chars = 0
+    call_seconds = 0.0
+    next_block = settings.summary_seconds
+    chunks_per_turn = round(args.turn_seconds / CHUNK_SECONDS)
+    while call_seconds < MARKS_MINUTES[-1] * 60:
+        for _ in range(chunks_per_turn - 1):
+            live_queue.send_realtime(types.Blob(data=QUIET_CHUNK, mime_type="audio/pcm"))
+        call_seconds += args.turn_seconds
+        latency = await model_turn(
+            lambda: live_queue.send_realtime(types.Blob(data=QUIET_CHUNK, mime_type="audio/pcm"))
+        )
+        turns.append((call_seconds / 60, latency, context["tokens"]))
+        if long_call and call_seconds >= next_block:
+            next_block += settings.summary_seconds
+            if digest.changed:
+                started = time.perf_counter()
+                block = digest.state_block()
+                render_us.append((time.perf_counter() - started) * 1e6)
+                block_chars = len(block)
+                await model_turn(lambda: live_queue.send_content(
+                    types.Content(role="user", parts=[types.Part(text=block)])
+                ))
+    live_queue.close()
+    await consumer
+
+    marks = {}
+    for minute in MARKS_MINUTES:
+        window = [t for t in turns if minute - 2 < t[0] <= minute]
+        marks[minute] = (
+            statistics.median(t[1] for t in window) * 1000,
+            window[-1][2],
+        )
+    return {
+        "marks": marks,
+        "blocks": digest.blocks_sent,
+        "render_us": statistics.median(render_us) if render_us else 0.0,
+        "block_chars": block_chars,
+    }
+
+
+def report(label: str, result: dict) -> None:
+    cells = "  ".join(
+        f"{minute:>2} min {latency:6.0f} ms / {tokens / 1000:5.1f}k tok"
+        for minute, (latency, tokens) in result["marks"].items()
+    )
+    print(f"{label:<10} {cells}")
+    if result["blocks"]:
+        print(f"{'':<10} {result['blocks']} state blocks, {result['block_chars']} chars "
+              f"(~{result['block_chars'] // 4} tokens), render p50 {result['render_us']:.0f} µs")
+
+
+async def main(args) -> None:
+    print(f"60-minute call, a turn every {args.turn_seconds:.0f} s, "
+          f"prefill {args.ms_per_1k} ms per 1k context tokens, "
+          f"compression {args.trigger_tokens // 1000}k → {args.target_tokens // 1000}k\n"
+          "turn latency p50 / context at each mark\n")
+    report("default", await one_call(args, long_call=False))
+    report("long call", await one_call(args, long_call=True))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turn-seconds", type=float, default=20.0)
+    parser.add_argument("--first-event-ms", type=float, default=100.0)
+    parser.add_argument("--ms-per-1k", type=float, default=5.0)
+    parser.add_argument("--trigger-tokens", type=int, default=32000)
+    parser.add_argument("--target-tokens", type=int, default=16000)
+    parser.add_argument("--summary-seconds", type=float, default=300.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Benchmark the Aho-Corasick objection matcher against the original
+substring-scan ``detect_objection_type``.
+
+    python -m bench.objection_matcher
+"""
+
+import random
+import timeit
+
+from app.prompts.objections import (
+    OBJECTION_CATEGORIES,
+    detect_objections,
+    objection_scanner,
+)
+
+
+def legacy_detect_objection_type(text: str) -> str:
+    """The pre-matcher implementation: N substring scans, first hit wins."""
+    text_lower = text.lower()
+    for category, info in OBJECTION_CATEGORIES.items():
+        if category == "custom":
+            continue
+        for trigger in info["triggers"]:
+            if trigger in text_lower:
+                return category
+    return "custom"
+
+
+FILLER = (
+    "so uh we looked at the dashboard last week and the team thinks it could "
+    "help with reporting but i want to understand how the rollout works"
+).split()
+
+TRIGGERS = [t for info in OBJECTION_CATEGORIES.values() for t in info["triggers"]]
+
+
+def make_utterance(rng: random.Random, words: int, hit_rate: float) -> str:
+    out = [rng.choice(FILLER) for _ in range(words)]
+    if rng.random() < hit_rate:
+        out.insert(rng.randrange(len(out)), rng.choice(TRIGGERS))
+    return " ".join(out)
+
+
+def per_call_us(fn, corpus: list[str], repeat: int = 5) -> float:
+    n = len(corpus)
+    best = min(timeit.repeat(lambda: [fn(t) for t in corpus], number=1, repeat=repeat))
+    return best / n * 1e6
+
+
+def deltas(text: str, size: int = 12) -> list[str]:
+    """Split an utterance into ~word-sized partial transcription deltas."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def legacy_streaming(chunks: list[str]) -> str:
+    """The only way to use the legacy function on deltas: rescan the buffer."""
+    buffer = ""
+    result = "custom"
+    for chunk in chunks:
+        buffer += chunk
+        result = legacy_detect_objection_type(buffer)
+    return result
+
+
+def matcher_streaming(chunks: list[str]):
+    scanner = objection_scanner()
+    hits = []
+    for chunk in chunks:
+        hits += scanner.feed(chunk)
+    return hits + scanner.flush()
+
+
+def main() -> None:
+    rng = random.Random(7)
+    for label, hit_rate in (("50% of utterances contain a trigger", 0.5), ("no triggers", 0.0)):
+        print(f"\n── {label} ──")
+        print(f"{'words':>6} {'legacy first-hit':>18} {'matcher all-hits':>18} "
+              f"{'legacy on deltas':>18} {'matcher on deltas':>18}")
+        for words in (8, 25, 80, 250):
+            corpus = [make_utterance(rng, words, hit_rate) for _ in range(1000)]
+            chunked = [deltas(t) for t in corpus]
+            print(
+                f"{words:>6} "
+                f"{per_call_us(legacy_detect_objection_type, corpus):>15.2f} µs "
+                f"{per_call_us(detect_objections, corpus):>15.2f} µs "
+                f"{per_call_us(legacy_streaming, chunked):>15.2f} µs "
+                f"{per_call_us(matcher_streaming, chunked):>15.2f} µs"
+            )
+    print("\n'on deltas' = total cost of scanning one utterance as it streams in")
+    print("as 12-character partial transcription deltas.\n")
+
+    # Behavioural differences worth knowing about
+    for text in ("we're onboarding next month", "Costco is our client", "we already have a vendor"):
+        print(f"{text!r}: legacy={legacy_detect_objection_type(text)} "
+              f"matcher={[m.category for m in detect_objections(text)]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Supervisor fan-out: read-only viewers on /ws/observe/{session_id}.
+
+Against the mock Live backend, each rep client streams mic audio at real
+time (a scripted turn every ``MOCK_TURN_AUDIO_SECONDS``) while viewers
+watch its call. For 1 call × 50 viewers and 100 calls × 3 viewers, each
+next to the same calls without viewers, it reports:
+
+  - rep latency: mock runner → rep client, via the ``_mock_sent_at`` stamp
+    on tool calls (viewers must not move it);
+  - viewer lag: fold on the server → viewer, via the ``timestamp`` on the
+    transcript entries in each delta;
+  - frames per viewer, viewers that saw ``call_ended``, and server CPU.
+
+Then, in-process, one ``CallBroadcast`` with 20 fast viewers, one slow
+viewer (50 ms per send) and one stalled viewer: publish cost per delta,
+and what each kind of viewer ends up with.
+
+    python -m bench.observe --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import websockets
+
+from app.fanout import CallBroadcast
+from app.protocol import INPUT_SAMPLE_RATE, KIND_AUDIO, FrameSequencer, pack_frame
+from bench.load_ws import ProcSampler, _free_port, _pcm_chunk, _pct, spawn_server, wait_healthy
+
+
+async def viewer(base: str, status: dict, stats: dict, ready: asyncio.Event) -> None:
+    url = f"{base}/ws/observe/{status['session_id']}?token={status['observe']}"
+    async with websockets.connect(url, max_size=None) as ws:
+        snapshot = json.loads(await ws.recv())
+        assert snapshot["type"] == "dashboard_snapshot", snapshot
+        ready.set()
+        try:
+            async for raw in ws:
+                now = time.time()
+                msg = json.loads(raw)
+                stats["frames"] += 1
+                for entry in msg.get("add", {}).get("transcript", []):
+                    stats["lag"].append(now - entry["timestamp"])
+                if msg["type"] == "call_ended":
+                    stats["ended"] += 1
+        except websockets.ConnectionClosed:
+            pass
+
+
+async def rep(base: str, args, n_viewers: int, stats: dict) -> None:
+    pcm = _pcm_chunk(INPUT_SAMPLE_RATE * args.chunk_ms // 1000)
+    async with websockets.connect(f"{base}/ws", max_size=None) as ws:
+        await ws.send(json.dumps({"type": "config", "mode": "live", "binary": True}))
+        status = json.loads(await ws.recv())
+        ready = [asyncio.Event() for _ in range(n_viewers)]
+        viewers = [
+            asyncio.create_task(viewer(base, status, stats, r)) for r in ready
+        ]
+        for r in ready:
+            await r.wait()
+
+        async def receive():
+            try:
+                async for raw in ws:
+                    if isinstance(raw, bytes):
+                        continue
+                    msg = json.loads(raw)
+                    sent_at = msg.get("args", {}).get("_mock_sent_at") if msg["type"] == "tool_call" else None
+                    if sent_at is not None:
+                        stats["rep"].append(time.time() - sent_at)
+            except websockets.ConnectionClosed:
+                pass
+
+        receiver = asyncio.create_task(receive())
+        sequencer = FrameSequencer()
+        interval = args.chunk_ms / 1000
+        t0 = time.perf_counter()
+        for k in range(int(args.duration / interval)):
+            await asyncio.sleep(max(0.0, t0 + k * interval - time.perf_counter()))
+            await ws.send(pack_frame(KIND_AUDIO, pcm, seq=sequencer.next(), sample_rate=INPUT_SAMPLE_RATE))
+        await ws.send(json.dumps({"type": "end"}))
+        await asyncio.wait_for(receiver, timeout=20)
+        await asyncio.wait_for(asyncio.gather(*viewers), timeout=20)
+
+
+async def scenario(args, calls: int, n_viewers: int) -> None:
+    port = _free_port()
+    proc = spawn_server(port, {"MOCK_TURN_AUDIO_SECONDS": "1"})
+    sampler = ProcSampler(proc.pid)
+    stats = {"rep": [], "lag": [], "frames": 0, "ended": 0}
+    try:
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        cpu0, t0 = sampler.cpu_seconds() if sampler.available else 0.0, time.perf_counter()
+        await asyncio.gather(*(rep(f"ws://127.0.0.1:{port}", args, n_viewers, stats) for _ in range(calls)))
+        cpu = (sampler.cpu_seconds() - cpu0) / (time.perf_counter() - t0) if sampler.available else None
+        async with httpx.AsyncClient() as client:
+            observers = (await client.get(f"http://127.0.0.1:{port}/health")).json()["observers"]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    total_viewers = calls * n_viewers
+    line = (f"{calls:>3} calls × {n_viewers:>2} viewers  "
+            f"rep p50 {_pct(stats['rep'], 0.5) * 1000:5.1f} ms p99 {_pct(stats['rep'], 0.99) * 1000:6.1f} ms")
+    if total_viewers:
+        line += (f"  viewer lag p50 {_pct(stats['lag'], 0.5) * 1000:5.1f} ms "
+                 f"p99 {_pct(stats['lag'], 0.99) * 1000:6.1f} ms  "
+                 f"{stats['frames'] / total_viewers:5.1f} frames/viewer  "
+                 f"call_ended {stats['ended']}/{total_viewers}")
+    if cpu is not None:
+        line += f"  CPU {cpu:5.1%}"
+    print(line + ("" if observers["viewers"] == 0 else f"  (leaked viewers: {observers['viewers']})"))
+
+
+class FakeSocket:
+    def __init__(self, delay: float | None):
+        self.delay = delay  # None: never completes a send
+        self.received = 0
+
+    async def send_text(self, frame: str) -> None:
+        if self.delay is None:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+
+
+async def slow_viewers(args) -> None:
+    version = {"v": 0}
+    broadcast = CallBroadcast(
+        "bench", lambda: {"type": "dashboard_snapshot", "v": version["v"], "state": {}},
+        max_queue=64, max_resyncs=3, send_timeout=1.0,
+    )
+    sockets = {"fast": [FakeSocket(0) for _ in range(20)], "slow": [FakeSocket(0.05)], "stalled": [FakeSocket(None)]}
+    joined = {kind: [broadcast.join(ws) for ws in group] for kind, group in sockets.items()}
+    writers = [asyncio.create_task(v.serve()) for group in joined.values() for v in group]
+    cost = []
+    for i in range(args.deltas):
+        version["v"] += 1
+        delta = {"type": "dashboard_delta", "v": version["v"], "add": {"transcript": [{"text": "x" * 80, "source": "input"}]}}
+        started = time.perf_counter()
+        broadcast.publish(delta)
+        cost.append(time.perf_counter() - started)
+        await asyncio.sleep(1 / args.rate)
+    broadcast.close()
+    await asyncio.wait(writers, timeout=5)
+    print(f"\nin-process: {args.deltas} deltas at {args.rate}/s to 22 viewers, "
+          f"publish p50 {statistics.median(cost) * 1e6:.0f} µs (one json.dumps per delta)")
+    for kind, group in joined.items():
+        v = group[0]
+        print(f"  {kind:<8} received {sockets[kind][0].received:5d} frames, "
+              f"resyncs {v.resyncs}, ended as {v.closed_reason}")
+    for w in writers:
+        w.cancel()
+
+
+async def main(args) -> None:
+    print(f"{args.duration:.0f} s calls, a scripted turn every second of rep audio\n")
+    for calls, n_viewers in ((1, 0), (1, 50), (100, 0), (100, 3)):
+        await scenario(args, calls, n_viewers)
+    await slow_viewers(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--deltas", type=int, default=1000)
+    parser.add_argument("--rate", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+"""
+Outbound writer against a slow browser: producer stall, frames, merges, drops.
+
+Replays a practice-mode event stream (audio chunks, word-sized partial
+transcripts, dashboard updates, usage, talk ratio) at real-time pace into
+a fake socket whose every send takes ``--send-ms``. Compares awaiting the
+socket directly (the old ``_handle_event`` path) with the ``OutboundWriter``,
+with and without batching.
+
+    python -m bench.outbound --seconds 30 --send-ms 4
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.outbound import OutboundWriter
+
+
+class SlowSocket:
+    def __init__(self, send_ms: float):
+        self.delay = send_ms / 1000
+        self.frames = 0
+
+    async def send_json(self, message: dict) -> None:
+        await asyncio.sleep(self.delay)
+        self.frames += 1
+
+    async def send_bytes(self, data: bytes) -> None:
+        await asyncio.sleep(self.delay)
+        self.frames += 1
+
+
+def script(seconds: float, seed: int = 3):
+    """(offset_seconds, message) pairs for a practice call."""
+    rng = random.Random(seed)
+    events = []
+    t = 0.0
+    while t < seconds:
+        events.append((t, b"\0" * 4800))  # 100 ms of 24 kHz audio
+        for _ in range(rng.randint(1, 4)):
+            events.append((t, {"type": "transcript", "text": " word", "source": "output", "partial": True}))
+        if rng.random() < 0.05:
+            events.append((t, {"type": "transcript", "text": "a full sentence", "source": "output", "partial": False}))
+        if rng.random() < 0.08:
+            events.append((t, {"type": "tool_call", "name": "update_dashboard", "args": {
+                "coaching_tip": "Ask about budget", "rapport_score": rng.randint(0, 100),
+                "discovery_score": -1, "key_moment": ""}}))
+        if rng.random() < 0.1:
+            events.append((t, {"type": "usage", "prompt_tokens": 10, "candidates_tokens": 5, "total_tokens": 15}))
+        if rng.random() < 0.02:
+            events.append((t, {"type": "talk_ratio", "rep_pct": 55, "prospect_pct": 45}))
+        t += 0.1
+    return events
+
+
+async def run(label: str, events, send_ms: float, writer_kwargs: dict | None) -> None:
+    sock = SlowSocket(send_ms)
+    out = OutboundWriter(sock, **writer_kwargs).start() if writer_kwargs is not None else sock
+    stalls = []
+    started = time.perf_counter()
+    for offset, message in events:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        if isinstance(message, bytes):
+            await out.send_bytes(message)
+        else:
+            await out.send_json(message)
+        stalls.append(time.perf_counter() - t0)
+    lag = time.perf_counter() - started - events[-1][0]
+    if writer_kwargs is not None:
+        await out.close(timeout=60)
+    extra = ""
+    if writer_kwargs is not None:
+        s = out.stats()
+        extra = f"  merged {s['merged']:5d}  dropped {s['dropped']:4d}  max depth {s['max_depth']:4d}"
+    print(f"{label:<16} frames {sock.frames:6d}  producer p50 {statistics.median(stalls) * 1e6:7.1f} us  "
+          f"max {max(stalls) * 1e3:7.1f} ms  behind real time {lag:6.2f} s{extra}")
+
+
+async def main(args) -> None:
+    events = script(args.seconds)
+    print(f"{len(events)} messages over {args.seconds:.0f} s, {args.send_ms} ms per socket send\n")
+    await run("direct await", events, args.send_ms, None)
+    await run("writer", events, args.send_ms, {"max_queue": args.max_queue})
+    await run("writer + batch", events, args.send_ms, {"max_queue": args.max_queue, "batch": True})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--send-ms", type=float, default=4.0)
+    parser.add_argument("--max-queue", type=int, default=256)
+    asyncio.run(main(parser.parse_args()))
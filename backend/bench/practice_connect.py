@@ -0,0 +1,88 @@
+"""
+Practice-mode connect cost: per-connect agent/runner build vs the registry.
+
+Takes the persona set from ``/api/personas`` and simulates a classroom
+burst — ``--burst`` reps connecting at once, spread over those personas —
+timing the runner setup each connect performs, the old way
+(``create_practice_agent`` + ``Runner``) and via ``PersonaRunnerRegistry``.
+
+    python -m bench.practice_connect --burst 30 --rounds 20
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "offline")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+
+from app.agent import create_practice_agent  # noqa: E402
+from app.persona_registry import PersonaRunnerRegistry  # noqa: E402
+from app.prompts.personas import PERSONAS  # noqa: E402
+from main import app, session_service  # noqa: E402
+
+
+def make_runner(agent):
+    return Runner(agent=agent, app_name="live_sales_coach", session_service=session_service)
+
+
+def legacy_connect(persona_id: str):
+    runner = make_runner(create_practice_agent(persona_id))
+    return runner, PERSONAS.get(persona_id, {})
+
+
+def burst(connect, persona_ids: list[str], size: int) -> list[float]:
+    timings = []
+    for i in range(size):
+        started = time.perf_counter()
+        connect(persona_ids[i % len(persona_ids)])
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(label: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    print(f"{label:<26} p50 {statistics.median(ordered) * 1e3:8.3f} ms   "
+          f"p99 {p99 * 1e3:8.3f} ms   burst total {sum(ordered) / (len(ordered) / args.burst) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        persona_ids = [p["id"] for p in client.get("/api/personas").json()["personas"]]
+    print(f"Personas: {', '.join(persona_ids)}  burst={args.burst}  rounds={args.rounds}\n")
+
+    legacy = []
+    for _ in range(args.rounds):
+        legacy += burst(legacy_connect, persona_ids, args.burst)
+
+    cold_registry = []
+    warm = []
+    for _ in range(args.rounds):
+        registry = PersonaRunnerRegistry(make_runner)
+        cold_registry += burst(registry.get, persona_ids, args.burst)
+        warmed = PersonaRunnerRegistry(make_runner)
+        warmed.warm(persona_ids)
+        warm += burst(warmed.get, persona_ids, args.burst)
+
+    summarize("per-connect build", legacy)
+    summarize("registry (lazy, cold)", cold_registry)
+    summarize("registry (warmed)", warm)
+
+    # Editing a persona must be picked up without a restart
+    registry = PersonaRunnerRegistry(make_runner)
+    first, _ = registry.get(persona_ids[0])
+    PERSONAS[persona_ids[0]] = {**PERSONAS[persona_ids[0]], "difficulty": "hard"}
+    second, _ = registry.get(persona_ids[0])
+    PERSONAS[persona_ids[0]]["common_objections"].append("We use spreadsheets.")
+    third, _ = registry.get(persona_ids[0])
+    assert first is not second is not third and registry.rebuilds == 2, "persona edit not picked up"
+    print(f"\nInvalidation on persona edit: ok ({registry.stats()})")
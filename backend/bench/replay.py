@@ -0,0 +1,203 @@
+"""
+Record a call against the mock backend, then replay it offline.
+
+1. record: a live call (binary mic audio at real time, scripted turns) and
+   a practice call (model audio out) run against ``LIVE_BACKEND=mock`` with
+   ``"record": true``. Reports each recording's size next to the raw bytes
+   it holds.
+2. replay: each recording is played back with ``LIVE_BACKEND=replay``.
+   The client side (the recorded config, audio frames and text) goes in at
+   the recorded pace, and the server yields the recorded ADK events at
+   ``REPLAY_SPEED`` 1 (real time) and 0 (as fast as possible). It reports
+   wall time, how far the replay's outbound messages match the original
+   call's, and the server's mean ``_handle_event`` time from ``/metrics``.
+   Only the real-time replay should match exactly: as fast as possible,
+   the outbound queue coalesces more (usage, back-to-back dashboard
+   updates) and objection hints fall inside their cooldown.
+3. ``--parallel`` fast replays of the live recording at once, as a
+   regression run would do: throughput and server CPU.
+
+    python -m bench.replay --seconds 20
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import websockets
+
+from app.protocol import INPUT_SAMPLE_RATE, KIND_AUDIO, FrameSequencer, pack_frame
+from app.recording import CLIENT_BYTES, load_recording
+from bench.load_ws import ProcSampler, _free_port, _pcm_chunk, spawn_server, wait_healthy
+
+# Messages that depend on wall-clock timers rather than on model events.
+# Partial transcripts are left out too: the outbound queue coalesces them
+# depending on how fast the socket drains.
+TIMING_TYPES = {"status", "talk_ratio", "backpressure", "batch"}
+
+
+def _kinds(messages: list[dict]) -> list[str]:
+    return [
+        m["type"] + (f":{m['name']}" if "name" in m else "")
+        for m in messages
+        if m["type"] not in TIMING_TYPES and not m.get("partial")
+    ]
+
+
+async def _collect(ws, messages: list[dict], counts: dict) -> None:
+    try:
+        async for raw in ws:
+            if isinstance(raw, bytes):
+                counts["audio_frames"] += 1
+                continue
+            messages.append(json.loads(raw))
+    except websockets.ConnectionClosed:
+        pass
+
+
+async def record_call(url: str, mode: str, args) -> tuple[str, list[dict]]:
+    pcm = _pcm_chunk(INPUT_SAMPLE_RATE * args.chunk_ms // 1000)
+    messages: list[dict] = []
+    counts = {"audio_frames": 0}
+    config = {"type": "config", "mode": mode, "binary": True, "record": True}
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps(config))
+        session_id = json.loads(await ws.recv())["session_id"]
+        receiver = asyncio.create_task(_collect(ws, messages, counts))
+        sequencer = FrameSequencer()
+        interval = args.chunk_ms / 1000
+        t0 = time.perf_counter()
+        for k in range(int(args.seconds / interval)):
+            await asyncio.sleep(max(0.0, t0 + k * interval - time.perf_counter()))
+            await ws.send(pack_frame(KIND_AUDIO, pcm, seq=sequencer.next(), sample_rate=INPUT_SAMPLE_RATE))
+        await ws.send(json.dumps({"type": "end"}))
+        await asyncio.wait_for(receiver, timeout=30)
+    return session_id, messages
+
+
+async def replay_call(url: str, path: Path, pace: bool) -> tuple[list[dict], dict, float]:
+    meta, client, _ = load_recording(path)
+    config = {k: v for k, v in meta["config"].items() if k != "record"}
+    messages: list[dict] = []
+    counts = {"audio_frames": 0}
+    started = time.perf_counter()
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps(config))
+        await ws.recv()
+        receiver = asyncio.create_task(_collect(ws, messages, counts))
+        t0 = time.perf_counter()
+        for record in client:
+            if pace:
+                await asyncio.sleep(max(0.0, t0 + record.t - time.perf_counter()))
+            await ws.send(record.payload if record.kind == CLIENT_BYTES else record.payload.decode())
+        await asyncio.wait_for(receiver, timeout=60)
+    return messages, counts, time.perf_counter() - started
+
+
+def _match(original: list[str], replayed: list[str]) -> str:
+    same = sum(a == b for a, b in zip(original, replayed))
+    return f"{same}/{len(original)} messages match" + (
+        "" if len(original) == len(replayed) else f" (replay sent {len(replayed)})"
+    )
+
+
+async def _handle_event_mean_us(base: str) -> float:
+    async with httpx.AsyncClient() as client:
+        text = (await client.get(f"{base}/metrics")).text
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(("lsc_handle_event_seconds_sum", "lsc_handle_event_seconds_count")):
+            name, value = line.rsplit(" ", 1)
+            values[name.split("{")[0]] = values.get(name.split("{")[0], 0.0) + float(value)
+    count = values.get("lsc_handle_event_seconds_count", 0)
+    return values.get("lsc_handle_event_seconds_sum", 0.0) / count * 1e6 if count else 0.0
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        recordings = Path(tmp)
+        port = _free_port()
+        proc = spawn_server(port, {
+            "RECORDING_DIR": str(recordings),
+            "MOCK_TURN_AUDIO_SECONDS": "2",
+            "JOURNAL_DIR": "",
+        })
+        originals = {}
+        try:
+            await wait_healthy(f"http://127.0.0.1:{port}")
+            for mode in ("live", "practice"):
+                session_id, messages = await record_call(f"ws://127.0.0.1:{port}/ws", mode, args)
+                originals[mode] = (recordings / f"{session_id}.lscr", messages)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+        print(f"record: {args.seconds:.0f} s calls against the mock backend\n")
+        for mode, (path, messages) in originals.items():
+            meta, client, events = load_recording(path)
+            raw = sum(len(r.payload) + 13 for r in client + events)
+            print(f"  {mode:<8} {len(client):4d} client + {len(events):4d} event records, "
+                  f"{path.stat().st_size / 1024:6.1f} KiB on disk ({raw / 1024:6.1f} KiB raw, "
+                  f"{path.stat().st_size / args.seconds * 60 / 1024:6.1f} KiB per call minute)")
+
+        print("\nreplay: LIVE_BACKEND=replay, no model, no network\n")
+        for mode, (path, original) in originals.items():
+            for speed in (1.0, 0.0):
+                port = _free_port()
+                proc = spawn_server(port, {
+                    "LIVE_BACKEND": "replay",
+                    "REPLAY_RECORDING": str(path),
+                    "REPLAY_SPEED": str(speed),
+                    "JOURNAL_DIR": "",
+                })
+                try:
+                    await wait_healthy(f"http://127.0.0.1:{port}")
+                    messages, counts, wall = await replay_call(
+                        f"ws://127.0.0.1:{port}/ws", path, pace=speed > 0
+                    )
+                    handle_us = await _handle_event_mean_us(f"http://127.0.0.1:{port}")
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=10)
+                label = "real time" if speed else "as fast"
+                print(f"  {mode:<8} {label:<9} wall {wall:5.1f} s  {_match(_kinds(original), _kinds(messages))}, "
+                      f"{counts['audio_frames']} audio frames  _handle_event mean {handle_us:5.1f} µs")
+
+        path = originals["live"][0]
+        port = _free_port()
+        proc = spawn_server(port, {
+            "LIVE_BACKEND": "replay",
+            "REPLAY_RECORDING": str(path),
+            "REPLAY_SPEED": "0",
+            "JOURNAL_DIR": "",
+        })
+        sampler = ProcSampler(proc.pid)
+        try:
+            await wait_healthy(f"http://127.0.0.1:{port}")
+            cpu0 = sampler.cpu_seconds() if sampler.available else 0.0
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                replay_call(f"ws://127.0.0.1:{port}/ws", path, pace=False) for _ in range(args.parallel)
+            ))
+            wall = time.perf_counter() - started
+            cpu = (sampler.cpu_seconds() - cpu0) / wall if sampler.available else None
+            handle_us = await _handle_event_mean_us(f"http://127.0.0.1:{port}")
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        sent = [len(_kinds(m)) for m, _, _ in results]
+        print(f"\n{args.parallel} fast replays of the live call at once: {wall:.1f} s "
+              f"({args.parallel * args.seconds / wall:.0f}x real time), {min(sent)}-{max(sent)} messages each, "
+              f"_handle_event mean {handle_us:.1f} µs" + (f", server CPU {cpu:.0%}" if cpu is not None else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--parallel", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
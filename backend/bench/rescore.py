@@ -0,0 +1,159 @@
+"""
+Offline re-scoring: throughput per worker count, determinism, resume.
+
+1. Corpus: ``--calls`` synthetic practice-call journals of 5–30 minutes
+   (``bench.analytics.call_events`` with sales-call sentences). Also one
+   live and one practice recording made against the mock backend (mic
+   audio in, model audio out), each copied ``--recording-copies`` times.
+2. ``rescore()`` with the stub scorer at 1, 2, 4… workers up to the core
+   count: calls/s and speedup over one worker, and whether every worker
+   count wrote the same rows.
+3. Resume: ``python -m app.rescore`` is killed after ``--kill-after-s``,
+   then run again. Reports the rows that survived the kill, the calls the
+   second run skipped, and whether the dataset ends with one row per call.
+
+    python -m bench.rescore
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow.dataset as ds
+
+from app.rescore import rescore
+from app.scorers import RUBRIC
+from bench.analytics import call_events
+from bench.load_ws import _free_port, spawn_server, wait_healthy
+from bench.replay import record_call
+
+REP = [
+    "Thanks for taking the time today.",
+    "What does your current process look like?",
+    "How are you handling that today?",
+    "Who else is involved in the decision?",
+    "Could we schedule a demo for next week?",
+    "I can send over a proposal tomorrow.",
+]
+PROSPECT = [
+    "Honestly that is over our budget for this year.",
+    "We already use a competitor for this.",
+    "I need to check with my boss first.",
+    "Now is not a good time, maybe next quarter.",
+    "That sounds interesting, tell me more.",
+    "We are locked into a contract until spring.",
+    "Our team has been growing quickly.",
+]
+
+
+def write_journals(directory: Path, calls: int) -> None:
+    rng = random.Random(7)
+    for i in range(calls):
+        events, ended = call_events(rng.uniform(5, 30), random.Random(i))
+        with (directory / f"call-{i:05d}.ndjson").open("w") as fh:
+            for t, message in events + [(ended, {"type": "call_analytics"})]:
+                if message["type"] == "transcript":
+                    pool = REP if message["source"] == "input" else PROSPECT
+                    message = {**message, "text": " ".join(rng.sample(pool, 2))}
+                elif message["type"] in ("objection_hint", "objection_hint_resolved"):
+                    continue  # Detected again from the transcripts
+                fh.write(json.dumps({"t": round(t, 3), "e": message}) + "\n")
+
+
+async def record_calls(directory: Path, seconds: float) -> list[Path]:
+    port = _free_port()
+    proc = spawn_server(port, {"RECORDING_DIR": str(directory), "JOURNAL_DIR": "",
+                               "MOCK_TURN_AUDIO_SECONDS": "2"})
+    try:
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        args = argparse.Namespace(seconds=seconds, chunk_ms=100)
+        paths = []
+        for mode in ("live", "practice"):
+            session_id, _ = await record_call(f"ws://127.0.0.1:{port}/ws", mode, args)
+            paths.append(directory / f"{session_id}.lscr")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return paths
+
+
+def rows(out: Path) -> list[dict]:
+    table = ds.dataset(out, format="parquet").to_table()
+    return sorted(
+        ({k: v for k, v in row.items() if k not in ("scored_at", "path")} for row in table.to_pylist()),
+        key=lambda row: row["session_id"],
+    )
+
+
+def throughput(corpus: Path, tmp: Path, calls: int) -> None:
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *[2 ** k for k in range(1, 8) if 2 ** k < cores], cores})
+    print(f"rescore, stub scorer, {calls} calls, {cores} cores\n")
+    baseline, reference = None, None
+    for workers in counts:
+        out = tmp / f"out-{workers}"
+        stats = rescore([corpus], out, "stub", workers)
+        rate = stats["scored"] / stats["seconds"]
+        baseline = baseline or rate
+        written = rows(out)
+        reference = reference or written
+        print(f"{workers:>3} workers  {stats['seconds']:6.2f} s  {rate:7.1f} calls/s  "
+              f"×{rate / baseline:4.1f}  failed {stats['failed']}  same rows as 1 worker: {written == reference}")
+
+    recorded = [row for row in reference if row["source"] == "recording"]
+    for row in {row["mode"]: row for row in recorded}.values():
+        print(f"  recording ({row['mode']}): talk {row['rep_pct']}/{row['prospect_pct']} ({row['talk_source']}), "
+              f"{row['objections']} objections, scores {[row[dim] for dim in RUBRIC]}")
+
+
+def resume(corpus: Path, tmp: Path, calls: int, kill_after: float) -> None:
+    out = tmp / "out-resume"
+    command = [sys.executable, "-m", "app.rescore", str(corpus), "--out", str(out), "--scorer", "stub",
+               "--rows-per-group", "50", "--rows-per-file", "200"]
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, start_new_session=True)
+    time.sleep(kill_after)
+    os.killpg(proc.pid, signal.SIGKILL)  # The run and its workers, mid-write
+    proc.wait()
+    survived = len(rows(out)) if any(out.glob("scores-*.parquet")) else 0
+    torn = len(list(out.glob("_scores-*.parquet")))
+    started = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    stats = json.loads(result.stdout.strip().splitlines()[-1].split(": ", 1)[1])
+    final = rows(out)
+    print(f"\nresume: killed after {kill_after:.0f} s with {survived} rows in sealed files "
+          f"({torn} open part lost); second run skipped {stats['skipped']}, scored {stats['scored']} "
+          f"in {time.perf_counter() - started:.1f} s → {len(final)} rows, "
+          f"one per call: {len({row['session_id'] for row in final}) == len(final) == calls}")
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = tmp / "calls"
+        corpus.mkdir()
+        write_journals(corpus, args.calls)
+        recordings = asyncio.run(record_calls(tmp / "recordings", args.recording_seconds))
+        for path in recordings:
+            for i in range(args.recording_copies):
+                shutil.copy(path, corpus / f"{path.stem}-{i:03d}.lscr")
+        calls = args.calls + len(recordings) * args.recording_copies
+        throughput(corpus, tmp, calls)
+        resume(corpus, tmp, calls, args.kill_after_s)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--recording-copies", type=int, default=25)
+    parser.add_argument("--recording-seconds", type=float, default=15)
+    parser.add_argument("--kill-after-s", type=float, default=10)
+    main(parser.parse_args())
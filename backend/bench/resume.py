@@ -0,0 +1,126 @@
+"""
+Session resumption across a dropped socket, against the mock Live backend.
+
+Each client starts a live call, plays one scripted turn, then asks for a
+second turn and immediately kills its TCP connection. The turn plays while
+the call is parked. After ``--gap`` seconds the client reconnects with its
+resume token and the last ``seq`` it saw, then asks for a third turn, and
+records:
+
+  - reconnect: socket open → ``status`` (resumed or not);
+  - replayed: dashboard messages delivered right after the reconnect, and
+    whether their ``seq`` numbers continue exactly where the client left
+    off (no gaps, no duplicates);
+  - context kept: the third turn is the script's third turn, i.e. the
+    same ``run_live`` session carried on instead of a fresh one.
+
+Runs twice: resuming with the token, and reconnecting cold (the old
+behaviour: a new session, everything from the dropped turn is lost).
+
+    python -m bench.resume --calls 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import websockets
+
+from bench.load_ws import _free_port, spawn_server, wait_healthy
+
+THIRD_TURN = "I'd need to ask my boss"  # Only in the default script's third turn
+
+
+async def _collect(ws, into: list, seconds: float) -> None:
+    """Receive JSON messages (unpacking batches) for ``seconds``."""
+    deadline = time.perf_counter() + seconds
+    while (left := deadline - time.perf_counter()) > 0:
+        try:
+            raw = await asyncio.wait_for(ws.recv(), timeout=left)
+        except (asyncio.TimeoutError, websockets.ConnectionClosed):
+            return
+        if isinstance(raw, bytes):
+            continue
+        msg = json.loads(raw)
+        into.extend(msg["messages"] if msg.get("type") == "batch" else [msg])
+
+
+async def one_call(url: str, args, resume: bool) -> dict:
+    config = {"type": "config", "mode": "live", "batch": True}
+    seen: list[dict] = []
+
+    ws = await websockets.connect(url, max_size=None)
+    status = json.loads(await ws.recv())
+    await ws.send(json.dumps({"type": "text", "text": "first turn"}))
+    await _collect(ws, seen, 1.0)
+    last_seq = max((m["seq"] for m in seen if "seq" in m), default=None)
+
+    # Second turn plays while nobody is connected
+    await ws.send(json.dumps({"type": "text", "text": "second turn"}))
+    ws.transport.abort()
+    await asyncio.sleep(args.gap)
+
+    if resume:
+        config = {**config, "resume": status.get("resume"), "last_seq": last_seq}
+    opened = time.perf_counter()
+    ws = await websockets.connect(url, max_size=None)
+    await ws.send(json.dumps(config))
+    status = json.loads(await ws.recv())
+    reconnect = time.perf_counter() - opened
+
+    replayed: list[dict] = []
+    await _collect(ws, replayed, 0.3)
+    await ws.send(json.dumps({"type": "text", "text": "third turn"}))
+    after: list[dict] = []
+    await _collect(ws, after, 1.0)
+    await ws.send(json.dumps({"type": "end"}))
+    await _collect(ws, [], 10)
+    await ws.close()
+
+    seqs = [m["seq"] for m in replayed if "seq" in m]
+    first = (last_seq or 0) + 1
+    return {
+        "resumed": bool(status.get("resumed")),
+        "reconnect": reconnect,
+        "replayed": len(seqs),
+        "in_order": seqs == list(range(first, first + len(seqs))),
+        "got_objection": any(m.get("name") == "log_objection" for m in replayed),
+        "context_kept": any(THIRD_TURN in m.get("text", "") for m in after),
+    }
+
+
+async def run(label: str, args, resume: bool) -> None:
+    port = _free_port()
+    proc = spawn_server(port, {"MOCK_FIRST_EVENT_MS": "200"})
+    try:
+        await wait_healthy(f"http://127.0.0.1:{port}")
+        url = f"ws://127.0.0.1:{port}/ws"
+        results = await asyncio.gather(*(one_call(url, args, resume) for _ in range(args.calls)))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    reconnect = sorted(r["reconnect"] * 1000 for r in results)
+
+    def count(key: str) -> str:
+        return f"{sum(r[key] for r in results)}/{len(results)}"
+
+    print(f"{label:<8} resumed {count('resumed'):>5}  "
+          f"reconnect p50 {statistics.median(reconnect):5.1f} ms  max {reconnect[-1]:5.1f} ms  "
+          f"replayed {statistics.mean(r['replayed'] for r in results):4.1f} msgs "
+          f"(in order {count('in_order')}, dropped-turn objection {count('got_objection')})  "
+          f"context kept {count('context_kept')}")
+
+
+async def main(args) -> None:
+    print(f"{args.calls} calls, socket killed mid-turn, reconnect after {args.gap:.1f} s\n")
+    await run("resume", args, resume=True)
+    await run("cold", args, resume=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--gap", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
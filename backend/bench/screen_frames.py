@@ -0,0 +1,78 @@
+"""
+Screen-share pipeline on a synthetic presentation: dedupe, downscale, budget.
+
+Simulates the browser sending a 1024×768 JPEG every 3 s (useScreenShare's
+defaults) for ``--minutes``. The "screen" is a slide that changes every
+``--slide-seconds``; in between, only a cursor moves and a clock ticks.
+Halfway through, the model stops responding for a minute to exercise the
+lag backoff. Uses a simulated clock, so it runs in a couple of seconds.
+
+    python -m bench.screen_frames --minutes 10
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+from PIL import Image, ImageDraw
+
+from app.frames import FrameSettings, ScreenFramePipeline, image_tokens
+
+
+def render(slide: int, t: float) -> bytes:
+    image = Image.new("RGB", (1024, 768), (245, 245, 250))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 1024, 90), fill=(30 + slide * 37 % 200, 60, 120))
+    draw.text((40, 30), f"Quarterly review - slide {slide}", fill="white")
+    for row in range(8):
+        width = 200 + (slide * 97 + row * 131) % 600
+        draw.rectangle((60, 150 + row * 60, 60 + width, 180 + row * 60), fill=(90, 90, 110))
+    # Noise the dedupe should ignore: a moving cursor and a ticking clock
+    cx, cy = 300 + int(t * 7) % 400, 400 + int(t * 3) % 200
+    draw.polygon([(cx, cy), (cx + 12, cy + 18), (cx + 4, cy + 18)], fill="black")
+    draw.text((900, 740), time.strftime("%H:%M:%S", time.gmtime(t)), fill="gray")
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=70)
+    return buf.getvalue()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=3.0)
+    parser.add_argument("--slide-seconds", type=float, default=45.0)
+    args = parser.parse_args()
+
+    clock = FakeClock()
+    pipeline = ScreenFramePipeline(FrameSettings(), clock=clock)
+    timings = []
+    stall = (args.minutes * 30, args.minutes * 30 + 60)
+    steps = int(args.minutes * 60 / args.interval)
+    for i in range(steps):
+        clock.now = i * args.interval
+        if not stall[0] <= clock.now < stall[1]:
+            pipeline.note_model_event()
+        frame = render(int(clock.now // args.slide_seconds), clock.now)
+        started = time.perf_counter()
+        pipeline.process(frame)
+        timings.append(time.perf_counter() - started)
+
+    s = pipeline.stats()
+    print(f"{args.minutes:.0f} min share, one 1024x768 frame every {args.interval:.0f}s "
+          f"({image_tokens(1024, 768)} tokens each as-is)\n")
+    print(f"received {s['received']}  forwarded {s['forwarded']}  duplicates {s['duplicates']}  "
+          f"rate-limited {s['rate_limited']}  invalid {s['invalid']}")
+    print(f"bytes in {s['bytes_in'] / 1e6:.2f} MB  out {s['bytes_out'] / 1e6:.2f} MB  "
+          f"saved {s['bytes_saved'] / 1e6:.2f} MB")
+    print(f"tokens saved {s['tokens_saved']:,} of {pipeline.tokens_in:,}")
+    print(f"process(): p50 {statistics.median(timings) * 1e3:.2f} ms  "
+          f"max {max(timings) * 1e3:.2f} ms")
@@ -0,0 +1,122 @@
+"""
+End-of-call shutdown: how long a live call holds its model session after ``end``.
+
+Against the mock server, live calls of a few text turns, then ``end``.
+Each scenario changes how the mock answers the summary request:
+
+  - fast: ``save_call_summary`` within a few hundred ms (the built-in script);
+  - slow: the summary takes ``--slow-s`` seconds, past the
+    ``--deadline-s`` deadline, so the local summary is sent instead;
+  - declined: the model ends its turn without calling the tool.
+
+Reports, per scenario, the time from ``end`` to the socket closing (the
+session is released just before). It also reports when the client got
+``call_analytics`` and the model's or the local ``call_summary``. Then
+``--burst`` fast calls end at the same moment, as at the end of a
+working day. The fixed sleep used to hold every call for at least 5 s
+after ``end``.
+
+    python -m bench.shutdown
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import websockets
+
+from app.mock_live import DEFAULT_SCRIPT
+from bench.load_ws import _free_port, _pct, spawn_server, wait_healthy
+
+
+def scripts(slow_s: float) -> dict[str, dict | None]:
+    slow = copy.deepcopy(DEFAULT_SCRIPT)
+    slow["summary"][0]["delay_ms"] = slow_s * 1000
+    slow["summary"].insert(0, {"kind": "usage", "prompt": 300, "candidates": 0})
+    declined = copy.deepcopy(DEFAULT_SCRIPT)
+    declined["summary"] = [{"kind": "usage", "prompt": 300, "candidates": 10}, {"kind": "turn_complete"}]
+    return {"fast": None, "slow": slow, "declined": declined}
+
+
+async def call(url: str, turns: int, start: asyncio.Event | None = None) -> dict:
+    async with websockets.connect(url) as ws:
+        await ws.send(json.dumps({"type": "config", "mode": "live"}))
+        await ws.recv()
+        for t in range(turns):
+            await ws.send(json.dumps({"type": "text", "text": f"turn {t}"}))
+            while json.loads(await ws.recv())["type"] != "turn_complete":
+                pass
+        if start is not None:
+            await start.wait()
+        ended = time.perf_counter()
+        await ws.send(json.dumps({"type": "end"}))
+        seen = {}
+        try:
+            while True:
+                message = json.loads(await ws.recv())
+                kind = message["type"]
+                if kind == "tool_call" and message["name"] == "save_call_summary":
+                    kind = "model summary"
+                elif kind == "call_summary":
+                    kind = "local summary"
+                seen.setdefault(kind, time.perf_counter() - ended)
+        except websockets.ConnectionClosed:
+            pass
+        seen["closed"] = time.perf_counter() - ended
+    return seen
+
+
+async def main(args) -> None:
+    print(f"live calls of {args.turns} turns, summary deadline {args.deadline_s:.0f} s\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, script in scripts(args.slow_s).items():
+            env = {"JOURNAL_DIR": "", "CALL_SUMMARY_DEADLINE_SECONDS": str(args.deadline_s),
+                   "MOCK_FIRST_EVENT_MS": "200", "MOCK_STEP_MS": "20"}
+            if script is not None:
+                path = Path(tmp) / f"{name}.json"
+                path.write_text(json.dumps(script))
+                env["MOCK_LIVE_SCRIPT"] = str(path)
+            port = _free_port()
+            proc = spawn_server(port, env)
+            try:
+                await wait_healthy(f"http://127.0.0.1:{port}")
+                seen = await call(f"ws://127.0.0.1:{port}/ws", args.turns)
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+            marks = "  ".join(f"{k} {v * 1000:5.0f} ms" for k, v in sorted(seen.items(), key=lambda kv: kv[1]))
+            print(f"{name:<9} {marks}")
+
+        port = _free_port()
+        proc = spawn_server(port, {"JOURNAL_DIR": "", "CALL_SUMMARY_DEADLINE_SECONDS": str(args.deadline_s),
+                                   "MOCK_FIRST_EVENT_MS": "200", "MOCK_STEP_MS": "20"})
+        try:
+            await wait_healthy(f"http://127.0.0.1:{port}")
+            start = asyncio.Event()
+            calls = [asyncio.create_task(call(f"ws://127.0.0.1:{port}/ws", args.turns, start))
+                     for _ in range(args.burst)]
+            await asyncio.sleep(3)  # Every call through its turns
+            start.set()
+            results = await asyncio.gather(*calls)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        closed = [r["closed"] for r in results]
+        summarized = sum("model summary" in r for r in results)
+        print(f"\nburst: {args.burst} calls end at once → closed p50 {statistics.median(closed) * 1000:.0f} ms, "
+              f"p99 {_pct(closed, 0.99) * 1000:.0f} ms, all released after {max(closed):.2f} s "
+              f"(fixed sleep: ≥ 5 s); {summarized}/{args.burst} with the model's summary")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--deadline-s", type=float, default=3.0)
+    parser.add_argument("--slow-s", type=float, default=8.0)
+    parser.add_argument("--burst", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
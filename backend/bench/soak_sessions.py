@@ -0,0 +1,75 @@
+"""
+Soak test for BoundedSessionService.
+
+Simulates thousands of calls against the session store — some cleaned up
+explicitly, some abandoned (as if the WebSocket died before ``finally``) —
+and checks that live sessions never exceed the configured cap.
+
+    python -m bench.soak_sessions --sessions 20000 --max 500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+from google.adk.events import Event
+from google.genai import types
+
+from app.sessions import BoundedSessionService
+
+APP = "live_sales_coach"
+
+
+async def soak(n_sessions: int, max_sessions: int, events: int, abandon_pct: float) -> None:
+    service = BoundedSessionService(
+        max_sessions=max_sessions,
+        ttl_seconds=3600,
+        max_events_per_session=events // 2 or 1,
+    )
+    rng = random.Random(42)
+    peak_live = 0
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for i in range(n_sessions):
+        session = await service.create_session(app_name=APP, user_id="user_1")
+        for _ in range(events):
+            await service.append_event(
+                session,
+                Event(
+                    author="live_sales_coach",
+                    content=types.Content(role="model", parts=[types.Part(text="tip " * 8)]),
+                ),
+            )
+        if rng.random() >= abandon_pct:
+            await service.delete_session(app_name=APP, user_id="user_1", session_id=session.id)
+        peak_live = max(peak_live, service.live_sessions)
+        assert service.live_sessions <= max_sessions, service.stats()
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stored = sum(len(s) for users in service.sessions.values() for s in users.values())
+    assert stored == service.live_sessions, (stored, service.stats())
+
+    print(f"sessions simulated : {n_sessions}")
+    print(f"peak live sessions : {peak_live} (cap {max_sessions})")
+    print(f"stats              : {service.stats()}")
+    print(f"traced memory      : current={current / 1e6:.1f} MB peak={peak / 1e6:.1f} MB")
+    print(f"elapsed            : {elapsed:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--max", type=int, default=500)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--abandon", type=float, default=0.3, help="fraction never deleted")
+    args = parser.parse_args()
+    asyncio.run(soak(args.sessions, args.max, args.events, args.abandon))
+
+
+if __name__ == "__main__":
+    main()
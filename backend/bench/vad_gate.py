@@ -0,0 +1,87 @@
+"""
+VAD gate on a synthetic call: bytes/tokens saved, speech kept, cost per chunk.
+
+The call alternates speech bursts (amplitude-modulated harmonics plus a
+little noise) with "thinking" pauses of low room noise, and is fed in the
+browser's 256 ms chunks. Reports, per mode, how much audio went upstream,
+the tokens that saves at 32 tokens/s, how many speech frames survived, and
+the analysis cost per chunk.
+
+    python -m bench.vad_gate --minutes 10 --speech-pct 45
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.vad import ACTIVITY_START, FRAME_MS, VadSettings, VoiceGate
+
+RATE = 16000
+CHUNK = 4096  # Samples per browser chunk (256 ms)
+
+
+def synth_call(minutes: float, speech_pct: float, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """Return (pcm int16, per-20ms-frame ground-truth speech mask)."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * RATE)
+    pcm = (rng.normal(0, 60, total)).astype(np.float32)  # Room noise ≈ -55 dBFS
+    truth = np.zeros(total, dtype=bool)
+    pos = 0
+    while pos < total:
+        talk = int(rng.uniform(1.5, 8.0) * RATE)
+        pause = int(talk * (100 - speech_pct) / speech_pct * rng.uniform(0.5, 1.5))
+        end = min(total, pos + talk)
+        t = np.arange(end - pos) / RATE
+        f0 = rng.uniform(110, 220)
+        voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.5 * t) ** 2  # Syllable rate
+        pcm[pos:end] += 4000 * voice * envelope
+        truth[pos:end] = True
+        pos = end + pause
+    frame = RATE * FRAME_MS // 1000
+    usable = total - total % frame
+    frame_truth = truth[:usable].reshape(-1, frame).mean(axis=1) > 0.5
+    return np.clip(pcm, -32768, 32767).astype("<i2"), frame_truth
+
+
+def run(mode: str, pcm: np.ndarray, truth: np.ndarray) -> None:
+    gate = VoiceGate(VadSettings(mode=mode))
+    data = pcm.tobytes()
+    step = CHUNK * 2
+    timings = []
+    activity = 0
+    for i in range(0, len(data), step):
+        started = time.perf_counter()
+        ops = gate.process(data[i:i + step])
+        timings.append(time.perf_counter() - started)
+        activity += sum(op is ACTIVITY_START for op in ops)
+    gate.finish()
+
+    # Recall: speech frames the model still receives
+    check = VoiceGate(VadSettings(mode=mode))
+    frame_bytes = RATE * FRAME_MS // 1000 * 2
+    detected, _ = check.classifier.classify(data[: len(truth) * frame_bytes])
+    recall = (detected & truth).sum() / max(1, truth.sum())
+
+    s = gate.stats()
+    print(
+        f"{mode:<5} forwarded {s['bytes_forwarded'] / max(1, s['bytes_in']) * 100:5.1f}%  "
+        f"saved {s['bytes_saved'] / 1e6:6.2f} MB  {s['seconds_saved']:7.1f} s  "
+        f"{s['tokens_saved']:6d} tokens  segments {s['segments']:4d}  "
+        f"speech recall {recall * 100:5.1f}%  "
+        f"p50 {np.median(timings) * 1e6:5.1f} us/chunk  p99 {np.percentile(timings, 99) * 1e6:5.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--speech-pct", type=float, default=45.0)
+    args = parser.parse_args()
+
+    pcm, truth = synth_call(args.minutes, args.speech_pct)
+    print(f"{args.minutes:.0f} min call, {truth.mean() * 100:.0f}% speech, "
+          f"{pcm.nbytes / 1e6:.1f} MB of PCM, {args.minutes * 60 * 32:.0f} input tokens ungated\n")
+    for mode in ("gate", "thin"):
+        run(mode, pcm, truth)
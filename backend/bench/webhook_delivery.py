@@ -0,0 +1,84 @@
+"""
+Exercise WebhookDelivery against a local stub HTTP server.
+
+The stub fails the first ``--fail-first`` requests with 503 to exercise
+retries, then accepts batches. Checks that every summary is delivered
+exactly once, that enqueue() never blocks the loop, and that the spill
+file is empty afterwards.
+
+    python -m bench.webhook_delivery --summaries 200
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from app.delivery import WebhookDelivery
+
+
+def start_stub(fail_first: int) -> tuple[ThreadingHTTPServer, list[dict]]:
+    received: list[dict] = []
+    state = {"failures": fail_first}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if state["failures"] > 0:
+                state["failures"] -= 1
+                self.send_response(503)
+            else:
+                received.append(json.loads(body))
+                self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, received
+
+
+async def run(n: int, fail_first: int) -> None:
+    server, received = start_stub(fail_first)
+    spill = Path(tempfile.mkdtemp()) / "spill.ndjson"
+    delivery = WebhookDelivery(
+        url=f"http://127.0.0.1:{server.server_port}/hook",
+        spill_path=spill,
+        batch_size=10,
+        batch_window=0.05,
+        backoff_base=0.01,
+    )
+    await delivery.start()
+
+    worst = 0.0
+    for i in range(n):
+        t0 = time.perf_counter()
+        delivery.enqueue({"type": "call_summary", "call": i})
+        worst = max(worst, time.perf_counter() - t0)
+    await delivery.stop(drain_timeout=30)
+    server.shutdown()
+
+    calls = [item["call"] for batch in received for item in batch["items"]]
+    assert sorted(calls) == list(range(n)), "lost or duplicated summaries"
+    assert not spill.exists(), "spill file not compacted"
+    print(f"summaries delivered : {len(calls)} in {len(received)} POSTs")
+    print(f"worst enqueue()     : {worst * 1e6:.1f} µs")
+    print(f"stats               : {delivery.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--summaries", type=int, default=200)
+    parser.add_argument("--fail-first", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(run(args.summaries, args.fail_first))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,33 +12,211 @@ Two modes:
 import asyncio
 import base64
 import json
+import math
+import time
 import traceback
+from pathlib import Path
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from google.adk.agents.live_request_queue import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
-from app.agent import root_agent, create_practice_agent
-from app.config import COACH_VOICE, HOST, PORT
+from app.agent import root_agent
+from app.config import (
+    AUDIO_FRAME_MS,
+    AUDIO_RECORDING_DIR,
+    AUDIO_TOKENS_PER_SECOND,
+    BARGE_IN_MIN_SPEECH_MS,
+    BARGE_IN_RESUME_SECONDS,
+    CALL_SUMMARY_DEADLINE_SECONDS,
+    COACH_VOICE,
+    FLOOR_PUSH_SECONDS,
+    FLOOR_TROUBLE_REP_TALK_PCT,
+    FLOOR_TROUBLE_SCORE,
+    HOST,
+    INBOUND_MAX_FRAMES,
+    INBOUND_OVERFLOW,
+    INBOUND_UPSTREAM_DEPTH,
+    LIVE_BACKEND,
+    LONG_CALL,
+    LONG_CALL_SUMMARY_SECONDS,
+    LONG_CALL_TARGET_TOKENS,
+    LONG_CALL_TRIGGER_TOKENS,
+    MOCK_CONTEXT_MS_PER_1K,
+    MOCK_FIRST_EVENT_MS,
+    MOCK_LIVE_SCRIPT,
+    MOCK_STEP_MS,
+    MOCK_TURN_AUDIO_SECONDS,
+    MODEL_CALL_SUMMARY,
+    OBSERVER_MAX_QUEUE,
+    OBSERVER_MAX_RESYNCS,
+    OBSERVER_SEND_TIMEOUT,
+    OUTBOUND_MAX_QUEUE,
+    PORT,
+    RECORD_AUDIO,
+    RECORD_CALLS,
+    RECORDING_DIR,
+    REPLAY_RECORDING,
+    REPLAY_SPEED,
+    RESUME_GRACE_SECONDS,
+    SESSION_MAX_BYTES,
+    SESSION_MAX_BYTES_PER_SESSION,
+    SESSION_MAX_ENTRIES,
+    SESSION_MAX_EVENTS,
+    SCREEN_DEDUPE_DISTANCE,
+    SCREEN_MAX_DIM,
+    SCREEN_MAX_PIXELS,
+    SCREEN_MIN_INTERVAL,
+    SCREEN_TOKENS_PER_MINUTE,
+    SESSION_TTL_SECONDS,
+    SUPERVISOR_TOKEN,
+    TALK_RATIO_INTERVAL,
+    VAD_HANGOVER_MS,
+    VAD_MODE,
+    VAD_THRESHOLD_DB,
+    WEBHOOK_SEND_ANALYTICS,
+)
+from app.access import allowed, token_digest
+from app.analytics import CallTimeline, local_call_summary, prompt_facts
+from app.bargein import BargeInDetector
+from app.call_audio import CallAudioRecorder, audio_access, audio_state
+from app.dashboard_state import DashboardState, folded
+from app.delivery import webhook_delivery
+from app.fanout import Broadcaster, CallBroadcast
+from app.floor import FloorView
+from app.frames import FrameSettings, ScreenFramePipeline
+from app.hints import ObjectionHinter
+from app.inbound import AudioReframer, InboundAudioQueue, UpstreamQueue
+from app.journal import call_journal
+from app.longcall import CallDigest, LongCallSettings
+from app.metrics import REGISTRY, SessionMetrics
+from app.outbound import OutboundWriter, ReplayLog
+from app.persona_registry import PersonaRunnerRegistry
+from app.protocol import (
+    INPUT_SAMPLE_RATE,
+    KIND_AUDIO,
+    FrameError,
+    FrameSequencer,
+    pack_frame,
+    sample_rate_from_mime,
+    unpack_frame,
+)
+from app.recording import CallRecorder
+from app.resume import ResumableCalls
+from app.resume import new_token as new_resume_token
+from app.sessions import BoundedSessionService
+from app.shutdown import CallShutdown
+from app.talk import TalkTimeTracker, current_talk_tracker
+from app.tools.crm import CallSummaryGate, current_summary_gate
+from app.vad import ACTIVITY_END, ACTIVITY_START, VadSettings, VoiceGate
 
 load_dotenv()
 
 # ---------------------------------------------------------------------------
 # ADK Runner setup
 # ---------------------------------------------------------------------------
-session_service = InMemorySessionService()
+session_service = BoundedSessionService(
+    max_sessions=SESSION_MAX_ENTRIES,
+    ttl_seconds=SESSION_TTL_SECONDS,
+    max_events_per_session=SESSION_MAX_EVENTS,
+    max_bytes=SESSION_MAX_BYTES,
+    max_bytes_per_session=SESSION_MAX_BYTES_PER_SESSION,
+)
+
+REGISTRY.gauge(
+    "lsc_session_store_live", "Sessions held by the session store.",
+    fn=lambda: session_service.live_sessions,
+)
+REGISTRY.gauge(
+    "lsc_session_store_evicted", "Sessions evicted by TTL, LRU or the byte cap (cumulative).",
+    fn=lambda: session_service.evicted_total,
+)
+REGISTRY.gauge(
+    "lsc_webhook_pending", "Call summaries awaiting webhook delivery.",
+    fn=lambda: webhook_delivery.stats()["pending"],
+)
+
+
+def _make_runner(agent):
+    """Real ADK Runner, or an offline stand-in (LIVE_BACKEND=mock|replay)."""
+    if LIVE_BACKEND == "replay":
+        from app.recording import ReplayRunner
+
+        return ReplayRunner(REPLAY_RECORDING, speed=REPLAY_SPEED, author=agent.name)
+    if LIVE_BACKEND == "mock":
+        from app.mock_live import MockLiveRunner, load_script
+
+        return MockLiveRunner(
+            script=load_script(MOCK_LIVE_SCRIPT),
+            first_event_ms=MOCK_FIRST_EVENT_MS,
+            step_ms=MOCK_STEP_MS,
+            turn_audio_seconds=MOCK_TURN_AUDIO_SECONDS,
+            context_ms_per_1k=MOCK_CONTEXT_MS_PER_1K,
+            author=agent.name,
+        )
+    return Runner(
+        agent=agent,
+        app_name="live_sales_coach",
+        session_service=session_service,
+    )
+
 
 # Default runner for live coaching mode
-live_runner = Runner(
-    agent=root_agent,
-    app_name="live_sales_coach",
-    session_service=session_service,
+live_runner = _make_runner(root_agent)
+
+# Practice mode: one shared runner per persona, built once
+practice_runners = PersonaRunnerRegistry(_make_runner)
+
+SCREEN_FRAME_SETTINGS = FrameSettings(
+    max_dim=SCREEN_MAX_DIM,
+    dedupe_distance=SCREEN_DEDUPE_DISTANCE,
+    min_interval=SCREEN_MIN_INTERVAL,
+    tokens_per_minute=SCREEN_TOKENS_PER_MINUTE,
+    max_pixels=SCREEN_MAX_PIXELS,
+)
+
+LONG_CALL_SETTINGS = LongCallSettings(
+    trigger_tokens=LONG_CALL_TRIGGER_TOKENS,
+    target_tokens=LONG_CALL_TARGET_TOKENS,
+    summary_seconds=LONG_CALL_SUMMARY_SECONDS,
+)
+
+# Server-wide VAD defaults; each session may override them in its config
+DEFAULT_VAD = VadSettings(
+    mode=VAD_MODE,
+    threshold_db=VAD_THRESHOLD_DB,
+    hangover_ms=VAD_HANGOVER_MS,
+)
+
+# Calls whose socket dropped wait here for a reconnect (see app/resume.py)
+resumable_calls = ResumableCalls(
+    on_expire=lambda call: _end_call(call),
+    grace_seconds=RESUME_GRACE_SECONDS,
+)
+
+# Read-only supervisor viewers per live call (see app/fanout.py)
+broadcaster = Broadcaster(
+    max_queue=OBSERVER_MAX_QUEUE,
+    max_resyncs=OBSERVER_MAX_RESYNCS,
+    send_timeout=OBSERVER_SEND_TIMEOUT,
+    supervisor_token=SUPERVISOR_TOKEN,
+)
+
+# Team-wide aggregates over every active call (see app/floor.py)
+floor = FloorView(
+    trouble_score=FLOOR_TROUBLE_SCORE,
+    trouble_rep_pct=FLOOR_TROUBLE_REP_TALK_PCT,
+)
+REGISTRY.gauge(
+    "lsc_floor_calls_in_trouble", "Active calls flagged as in trouble on the floor view.",
+    fn=lambda: floor.stats()["in_trouble"],
 )
 
 
@@ -47,8 +225,14 @@ live_runner = Runner(
 # ---------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Live Sales Coach server starting...")
+    print(f"Live Sales Coach server starting (backend={LIVE_BACKEND})...")
+    await webhook_delivery.start()
+    await call_journal.start()
+    practice_runners.warm()
     yield
+    await resumable_calls.close_all()
+    await call_journal.stop()
+    await webhook_delivery.stop()
     print("Server shutting down.")
 
 
@@ -73,7 +257,25 @@ app.add_middleware(
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "agent": "live_sales_coach"}
+    return {
+        "status": "healthy",
+        "agent": "live_sales_coach",
+        "sessions": session_service.stats(),
+        "webhook": webhook_delivery.stats(),
+        "practice_runners": practice_runners.stats(),
+        "resumable_calls": resumable_calls.stats(),
+        "observers": broadcaster.stats(),
+        "floor": floor.stats(),
+        "journal": call_journal.stats(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint — formatting only happens here."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.get("/api/personas")
@@ -95,15 +297,169 @@ async def get_personas():
     }
 
 
+@app.get("/api/floor")
+async def get_floor(token: str | None = None):
+    """Live aggregates across every active call (see ``app.floor``).
+
+    Needs ``?token=SUPERVISOR_TOKEN``: the snapshot names the session ids of
+    calls in trouble, which open their journals and viewers to anyone who
+    also holds a call's token.
+    """
+    if not allowed(token, SUPERVISOR_TOKEN):
+        raise HTTPException(status_code=401, detail="SUPERVISOR_TOKEN is required")
+    return Response(floor.frame(), media_type="application/json")
+
+
+def _authorize_download(token: str | None, digest: str | None) -> None:
+    """The call's observe token or ``SUPERVISOR_TOKEN``, checked before the file is looked at."""
+    if not allowed(token, SUPERVISOR_TOKEN, digest):
+        raise HTTPException(status_code=401, detail="A valid token for that call is required")
+
+
+@app.get("/api/calls/{session_id}/events")
+async def get_call_events(session_id: str, token: str | None = None):
+    """A finished call's journal as NDJSON, streamed (see ``app.journal``).
+
+    Needs ``?token=``: the call's observe token or ``SUPERVISOR_TOKEN``.
+    """
+    digest = await asyncio.to_thread(call_journal.access, session_id)
+    _authorize_download(token, digest)
+    state = call_journal.state(session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No journal for that session id")
+    if state == "live":
+        raise HTTPException(status_code=409, detail="Call still in progress")
+    return StreamingResponse(call_journal.stream(session_id), media_type="application/x-ndjson")
+
+
+@app.get("/api/calls/{session_id}/audio")
+async def get_call_audio(session_id: str, token: str | None = None):
+    """A finished call's stereo WAV, with Range requests (see ``app.call_audio``).
+
+    Needs ``?token=``: the call's observe token or ``SUPERVISOR_TOKEN``.
+    """
+    _authorize_download(token, await asyncio.to_thread(audio_access, AUDIO_RECORDING_DIR, session_id))
+    state = audio_state(AUDIO_RECORDING_DIR, session_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No audio for that session id")
+    if state == "live":
+        raise HTTPException(status_code=409, detail="Call still in progress")
+    return FileResponse(Path(AUDIO_RECORDING_DIR) / f"{session_id}.wav", media_type="audio/wav")
+
+
+@app.websocket("/ws/floor")
+async def floor_stream(websocket: WebSocket):
+    """The ``/api/floor`` snapshot, pushed whenever it changes.
+
+    At most one push per ``FLOOR_PUSH_SECONDS``; all clients share the
+    same serialized frame. Connect with ``?token=SUPERVISOR_TOKEN``;
+    anything else is refused before the socket is accepted (close 1008).
+    """
+    if not allowed(websocket.query_params.get("token"), SUPERVISOR_TOKEN):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+
+    async def push():
+        sent = -1
+        while True:
+            if floor.version != sent:
+                sent = floor.version
+                await websocket.send_text(floor.frame())
+            await asyncio.sleep(FLOOR_PUSH_SECONDS)
+
+    async def read():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(push()), asyncio.create_task(read())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-def _build_run_config(mode: str = "live", voice: str = COACH_VOICE) -> RunConfig:
+@dataclass
+class CallState:
+    """Per-call state threaded through the event handler.
+
+    A call outlives its WebSocket while it is parked for resumption, so the
+    socket is just one (replaceable) field here.
+    """
+
+    mode: str
+    sequencer: FrameSequencer | None = None  # Set for binary-protocol clients
+    hinter: ObjectionHinter | None = None
+    metrics: SessionMetrics | None = None
+    gate: VoiceGate | None = None  # Set when VAD is enabled for the session
+    talk: TalkTimeTracker | None = None
+    frames: ScreenFramePipeline | None = None
+    reframer: AudioReframer | None = None  # Fixed-size mic frames
+    inbound: InboundAudioQueue | None = None  # Bounded mic queue before live_queue
+    barge: BargeInDetector | None = None  # Practice mode only
+    digest: CallDigest | None = None  # Long-call mode, live coaching only
+    dashboard: DashboardState | None = None
+    deltas: bool = False  # Client takes dashboard deltas instead of raw messages
+    broadcast: CallBroadcast | None = None  # Supervisor viewers
+    recorder: CallRecorder | None = None  # Recording for offline replay
+    audio_recorder: CallAudioRecorder | None = None  # Stereo WAV for review
+    timeline: CallTimeline | None = None  # Post-call analytics
+    analytics: dict | None = None  # Set once the call has ended
+    model_summary: bool = True  # Also ask the model for save_call_summary()
+    shutdown: CallShutdown | None = None  # End-of-call summary wait
+    summary_gate: CallSummaryGate | None = None  # One summary per call on the webhook
+    live_queue: LiveRequestQueue | None = None
+    outbound: OutboundWriter | None = None
+    websocket: WebSocket | None = None  # None while parked
+    session_id: str = ""
+    resume_token: str = ""
+    forward_task: asyncio.Task | None = None
+    talk_task: asyncio.Task | None = None
+    digest_task: asyncio.Task | None = None
+
+
+def _queue_depth(live_queue: UpstreamQueue) -> int:
+    """Pending requests in the upstream queue (counted by ``UpstreamQueue``)."""
+    return live_queue.depth
+
+
+def _build_run_config(
+    mode: str = "live",
+    voice: str = COACH_VOICE,
+    manual_activity: bool = False,
+    long_call: bool = False,
+) -> RunConfig:
     """Build RunConfig for the requested session mode.
 
     Live Coaching  → TEXT modality (dashboard updates only, no audio out)
     Practice Mode  → AUDIO modality (whispered coaching + AI prospect voice)
+
+    With ``manual_activity`` the server's VAD gate sends activity
+    boundaries itself, so the model's automatic detection is turned off.
+    With ``long_call`` the context window slides instead of growing for the
+    whole call (see ``app.longcall``).
     """
+    realtime_input_config = None
+    if manual_activity:
+        realtime_input_config = types.RealtimeInputConfig(
+            automatic_activity_detection=types.AutomaticActivityDetection(
+                disabled=True
+            )
+        )
+    context_window_compression = None
+    session_resumption = None
+    if long_call:
+        context_window_compression = LONG_CALL_SETTINGS.compression()
+        session_resumption = types.SessionResumptionConfig()
+
     if mode == "practice":
         return RunConfig(
             response_modalities=["AUDIO"],
@@ -117,12 +473,18 @@ def _build_run_config(mode: str = "live", voice: str = COACH_VOICE) -> RunConfig
             ),
             output_audio_transcription=types.AudioTranscriptionConfig(),
             input_audio_transcription=types.AudioTranscriptionConfig(),
+            realtime_input_config=realtime_input_config,
+            context_window_compression=context_window_compression,
+            session_resumption=session_resumption,
         )
     else:
         # Live coaching — text-only output (silent overlay for the dashboard)
         return RunConfig(
             response_modalities=["TEXT"],
             input_audio_transcription=types.AudioTranscriptionConfig(),
+            realtime_input_config=realtime_input_config,
+            context_window_compression=context_window_compression,
+            session_resumption=session_resumption,
         )
 
 
@@ -135,22 +497,53 @@ async def websocket_endpoint(websocket: WebSocket):
 
     Client → Server messages
     ────────────────────────
-    {"type":"config","mode":"live"|"practice","voice":"...","persona":"..."}
-    {"type":"audio","data":"<base64 16-bit PCM 16 kHz mono>"}
+    {"type":"config","mode":"live"|"practice","voice":"...","persona":"...",
+     "binary":bool,"batch":bool,"long_call":bool,"dashboard":"raw"|"delta",
+     "record":bool,"record_audio":bool,"model_summary":bool}
+    {"type":"config","resume":"<token>","last_seq":n}         # reattach a call
+    {"type":"audio","data":"<base64 16-bit PCM 16 kHz mono>"}   # legacy only
     {"type":"image","data":"<base64 JPEG>","mimeType":"image/jpeg"}
     {"type":"text","text":"..."}
+    {"type":"playback_flushed","flushed_ms":n}                 # after interrupt
+    {"type":"snapshot"}                                         # full dashboard
     {"type":"end"}
+    <binary frame: KIND_AUDIO | KIND_IMAGE>                     # binary=true
 
     Server → Client messages
     ────────────────────────
-    {"type":"audio","data":"<base64 24 kHz PCM>"}          # practice mode
+    {"type":"audio","data":"<base64 24 kHz PCM>"}          # practice, legacy
+    <binary frame: KIND_AUDIO, 24 kHz PCM>                  # practice, binary
     {"type":"text","text":"..."}                            # text response
     {"type":"transcript","text":"...","source":"input"|"output","partial":bool}
     {"type":"tool_call","name":"...","args":{...}}          # dashboard updates
     {"type":"tool_result","name":"...","data":{...}}        # tool return values
+    {"type":"objection_hint","id":"...","category":"...","framework":"..."}
+    {"type":"objection_hint_resolved","id":"...","status":"confirmed"|"overridden"}
+    {"type":"talk_ratio","rep_pct":int|null,"prospect_pct":int|null,...}
     {"type":"turn_complete"}
-    {"type":"status","message":"..."}
+    {"type":"status","message":"...","protocol":"json"|"binary",
+     "session_id":"...","resume":"<token>","observe":"<token>","resumed":bool}
     {"type":"error","message":"..."}
+    {"type":"batch","messages":[...]}                       # batch=true only
+    {"type":"backpressure","paused":bool}                   # pause/resume mic
+    {"type":"interrupt","reason":"voice"|"model","dropped_bytes":n}  # flush audio
+    {"type":"dashboard_delta","v":n,"set":{...},"add":{...},"drop":{...}}
+    {"type":"dashboard_snapshot","v":n,"state":{...}}        # dashboard=delta
+    {"type":"call_analytics","summary":"...","talk_ratio":{...},...}  # after end
+    {"type":"call_summary","source":"local",...}  # model summary missed its deadline
+
+    Everything after the status message goes through an ``OutboundWriter``
+    (``app.outbound``), so a slow browser never blocks ``run_live``.
+    Dashboard messages carry a ``seq`` number for resumption
+    (``app.resume``): if the socket drops without ``end``, the call stays
+    alive for ``RESUME_GRACE_SECONDS`` and a reconnect with its token picks
+    it up where it left off.
+    With ``"dashboard": "delta"`` the dashboard messages (dashboard tool
+    calls and results, hints, talk ratio, final transcripts) are replaced by
+    versioned deltas from ``app.dashboard_state``; a resumed delta client
+    gets a snapshot instead of their replay.
+    Binary framing is described in ``app.protocol``. It is only used when
+    the client announces ``"binary": true`` in its config message.
     """
     await websocket.accept()
     print("Client connected")
@@ -159,173 +552,757 @@ async def websocket_endpoint(websocket: WebSocket):
     mode = "live"
     persona_id = "sarah-startup"
     voice = COACH_VOICE
+    binary = False
+    batch = False
+    vad = DEFAULT_VAD
+    long_call = LONG_CALL
+    deltas = False
+    record = RECORD_CALLS
+    record_audio = RECORD_AUDIO
+    model_summary = MODEL_CALL_SUMMARY
+    config = {}
+    resume_token = None
+    last_seq = None
 
     try:
         raw = await asyncio.wait_for(websocket.receive_text(), timeout=30)
         msg = json.loads(raw)
-        if msg.get("type") == "config":
-            mode = msg.get("mode", "live")
+        if isinstance(msg, dict) and msg.get("type") == "config":
+            mode = "practice" if msg.get("mode") == "practice" else "live"
             persona_id = msg.get("persona", "sarah-startup")
             voice = msg.get("voice", COACH_VOICE)
+            binary = bool(msg.get("binary", False))
+            batch = bool(msg.get("batch", False))
+            vad = DEFAULT_VAD.merged(msg.get("vad"))
+            long_call = bool(msg.get("long_call", LONG_CALL))
+            deltas = msg.get("dashboard") == "delta"
+            record = bool(msg.get("record", RECORD_CALLS))
+            record_audio = bool(msg.get("record_audio", RECORD_AUDIO))
+            model_summary = bool(msg.get("model_summary", MODEL_CALL_SUMMARY))
+            config = msg
+            resume_token = msg.get("resume")
+            last_seq = msg.get("last_seq")
+            if isinstance(last_seq, bool) or not isinstance(last_seq, int) or last_seq < 0:
+                last_seq = None  # Replay everything still retained
     except (asyncio.TimeoutError, WebSocketDisconnect):
         pass  # Use defaults
+    except (ValueError, TypeError) as exc:
+        # A malformed config must not take the handler down
+        print(f"Ignoring malformed config message: {exc}")
+
+    call = resumable_calls.claim(resume_token) if resume_token else None
+    if call is not None and call.forward_task.done():
+        await _end_call(call)  # Model session already gone: start over
+        call = None
+
+    if call is not None:
+        # ── Resume: same model session and context, new socket ─────────
+        previous = call.websocket
+        call.websocket = websocket
+        try:
+            await websocket.send_json({
+                "type": "status",
+                "message": f"Session resumed: mode={call.mode}",
+                "protocol": "binary" if call.sequencer is not None else "json",
+                "session_id": call.session_id,
+                "resume": call.resume_token,
+                "observe": call.broadcast.token,
+                "resumed": True,
+            })
+            call.outbound.attach(websocket, last_seq)
+            if call.deltas:
+                call.outbound.put_urgent(call.dashboard.snapshot())
+        except Exception as exc:
+            # claim() already cancelled the grace timer: park the call again
+            # rather than leave it running with nobody to end it
+            print(f"Resume failed, call parked again (session_id={call.session_id}): {exc}")
+            _park_call(call)
+            return
+        finally:
+            if previous is not None:
+                try:
+                    await previous.close(code=4000)  # Taken over by the new socket
+                except Exception:
+                    pass
+        print(f"Client resumed (session_id={call.session_id}, last_seq={last_seq})")
+    else:
+        call = await _start_call(
+            websocket, mode, persona_id, voice, binary, batch, vad, long_call, deltas,
+            record_config=config if record else None,
+            record_audio=record_audio,
+            model_summary=model_summary,
+        )
+
+    # ── Phase 2: Bidirectional streaming ───────────────────────────────
+    ended = await _read_client(websocket, call)
+    if call.websocket is not websocket:
+        return  # Another socket resumed this call
+    if ended or call.forward_task.done():
+        await _end_call(call)
+    else:
+        _park_call(call)
+        print(f"Client gone, call parked for {RESUME_GRACE_SECONDS:.0f}s (session_id={call.session_id})")
 
+
+def _park_call(call: CallState) -> None:
+    """No socket: keep the model session for ``RESUME_GRACE_SECONDS``."""
+    call.websocket = None
+    call.outbound.detach()
+    resumable_calls.park(call.resume_token, call)
+
+
+@app.websocket("/ws/observe/{session_id}")
+async def observe_endpoint(websocket: WebSocket, session_id: str):
+    """Read-only view of a live call for supervisors (see ``app.fanout``).
+
+    Connect with ``?token=``: the call's observe token or ``SUPERVISOR_TOKEN``.
+    Anything else is refused before the socket is accepted (close 1008).
+
+    Server → Client: one ``dashboard_snapshot``, then ``dashboard_delta``
+    and partial ``transcript`` messages as the call goes on, then
+    ``{"type":"call_ended"}``. The viewer may send ``{"type":"snapshot"}``.
+    """
+    if not broadcaster.authorize(session_id, websocket.query_params.get("token")):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    broadcast = broadcaster.get(session_id)
+    if broadcast is None:
+        await websocket.send_json({"type": "error", "message": "No live call with that session id"})
+        await websocket.close(code=4404)
+        return
+
+    viewer = broadcast.join(websocket)
+
+    async def read_viewer():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                try:
+                    msg = json.loads(message.get("text") or "{}")
+                except json.JSONDecodeError:
+                    continue
+                if msg.get("type") == "snapshot":
+                    viewer.push(broadcast.snapshot_frame(), broadcast.snapshot_frame)
+        except Exception:
+            return
+
+    writer = asyncio.create_task(viewer.serve())
+    reader = asyncio.create_task(read_viewer())
+    try:
+        await asyncio.wait([writer, reader], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broadcast.leave(viewer)
+        writer.cancel()
+        reader.cancel()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+async def _start_call(
+    websocket: WebSocket,
+    mode: str,
+    persona_id: str,
+    voice: str,
+    binary: bool,
+    batch: bool,
+    vad: VadSettings,
+    long_call: bool = False,
+    deltas: bool = False,
+    record_config: dict | None = None,
+    record_audio: bool = False,
+    model_summary: bool = True,
+) -> CallState:
+    """Create the model session for a new call and start streaming from it.
+
+    With ``record_config`` (the client's config message) the call is
+    recorded for offline replay (see ``app.recording``). With
+    ``record_audio`` its audio is kept as a stereo WAV (``app.call_audio``).
+    """
     # Select agent + runner based on mode
     if mode == "practice":
-        practice_agent = create_practice_agent(persona_id)
-        active_runner = Runner(
-            agent=practice_agent,
-            app_name="live_sales_coach",
-            session_service=session_service,
-        )
-        from app.prompts.personas import PERSONAS
-        persona = PERSONAS.get(persona_id, {})
+        active_runner, persona = practice_runners.get(persona_id)
         voice = persona.get("voice", voice)
     else:
         active_runner = live_runner
 
-    run_config = _build_run_config(mode, voice)
+    run_config = _build_run_config(
+        mode, voice, manual_activity=vad.manual_activity, long_call=long_call
+    )
 
     # Create a unique session
+    started = time.time()
     session = await session_service.create_session(
         app_name="live_sales_coach",
         user_id="user_1",
     )
+    # Running call: never evicted, only deleted by _end_call
+    session_service.pin(app_name="live_sales_coach", user_id="user_1", session_id=session.id)
 
+    resume_token = new_resume_token()
+    observe_token = new_resume_token()
     await websocket.send_json({
         "type": "status",
         "message": f"Session started: mode={mode}" + (
             f", persona={persona_id}" if mode == "practice" else ""
         ),
+        "protocol": "binary" if binary else "json",
+        "session_id": session.id,
+        "resume": resume_token,
+        "observe": observe_token,
+        "resumed": False,
     })
 
+    outbound = OutboundWriter(
+        websocket, max_queue=OUTBOUND_MAX_QUEUE, batch=batch, replay=ReplayLog()
+    ).start()
+    metrics = SessionMetrics(mode)
+    metrics.open()
+
     # Live request queue — the bridge between client audio and the ADK agent
-    live_queue = LiveRequestQueue()
+    live_queue = UpstreamQueue()
 
-    # ── Phase 2: Bidirectional streaming ───────────────────────────────
+    call = CallState(
+        mode=mode,
+        # Outbound frame sequencing — only used for binary clients
+        sequencer=FrameSequencer() if binary else None,
+        # Local objection fast path. The prospect is the remote party on the
+        # rep's mic in live mode, and the model itself in practice mode.
+        hinter=ObjectionHinter(source="output" if mode == "practice" else "input"),
+        metrics=metrics,
+        gate=VoiceGate(vad, tokens_per_second=AUDIO_TOKENS_PER_SECOND)
+        if vad.enabled
+        else None,
+        talk=TalkTimeTracker(mode, settings=vad),
+        frames=ScreenFramePipeline(SCREEN_FRAME_SETTINGS),
+        reframer=AudioReframer(AUDIO_FRAME_MS) if AUDIO_FRAME_MS > 0 else None,
+        inbound=InboundAudioQueue(
+            live_queue,
+            max_frames=INBOUND_MAX_FRAMES,
+            upstream_limit=INBOUND_UPSTREAM_DEPTH,
+            overflow=INBOUND_OVERFLOW,
+            on_signal=lambda paused: outbound.put({"type": "backpressure", "paused": paused}),
+        ).start(),
+        barge=BargeInDetector(
+            on_trigger=lambda reason: _interrupt_playback(outbound, reason, call.audio_recorder),
+            min_speech_ms=BARGE_IN_MIN_SPEECH_MS,
+            resume_after=BARGE_IN_RESUME_SECONDS,
+        )
+        if mode == "practice"
+        else None,
+        dashboard=DashboardState(),
+        deltas=deltas,
+        timeline=CallTimeline(mode, started=started),
+        model_summary=model_summary,
+        shutdown=CallShutdown(CALL_SUMMARY_DEADLINE_SECONDS),
+        summary_gate=CallSummaryGate(),
+        live_queue=live_queue,
+        outbound=outbound,
+        websocket=websocket,
+        session_id=session.id,
+        resume_token=resume_token,
+    )
+    if record_config is not None:
+        call.recorder = CallRecorder(
+            Path(RECORDING_DIR) / f"{session.id}.lscr",
+            {"session_id": session.id, "config": record_config},
+        ).start()
+    if record_audio:
+        call.audio_recorder = CallAudioRecorder(
+            Path(AUDIO_RECORDING_DIR) / f"{session.id}.wav", access=token_digest(observe_token)
+        ).start()
+    call.broadcast = broadcaster.open(session.id, call.dashboard.snapshot, observe_token)
+    floor.open(session.id, mode)
+    call_journal.open(session.id, {
+        "access": token_digest(observe_token),
+        "mode": mode,
+        "persona": persona_id if mode == "practice" else None,
+        "long_call": long_call,
+    }, started)
+    call.forward_task = asyncio.create_task(_forward_events(call, active_runner, run_config))
+    call.talk_task = asyncio.create_task(_push_talk_ratio(call))
+    if long_call and mode == "live":
+        call.digest = CallDigest()
+        call.digest_task = asyncio.create_task(_push_call_state(call))
+    resumable_calls.register(resume_token, call)
+    return call
 
-    async def forward_events():
-        """Read events from runner.run_live() and push to the client."""
-        try:
-            async for event in active_runner.run_live(
-                user_id="user_1",
-                session_id=session.id,
-                live_request_queue=live_queue,
-                run_config=run_config,
-            ):
-                try:
-                    await _handle_event(websocket, event)
-                except WebSocketDisconnect:
-                    break
-                except Exception:
-                    break
-        except Exception as exc:
-            print(f"run_live error: {exc}")
-            traceback.print_exc()
+
+async def _forward_events(call: CallState, runner, run_config: RunConfig) -> None:
+    """Read events from runner.run_live() and push them to the client.
+
+    Runs for the whole call, including while it is parked between sockets.
+    """
+    # Tools run inside run_live; this lets save_call_summary find the
+    # measured talk ratio and the summary gate for this call
+    current_talk_tracker.set(call.talk)
+    current_summary_gate.set(call.summary_gate)
+    metrics = call.metrics
+    try:
+        async for event in runner.run_live(
+            user_id="user_1",
+            session_id=call.session_id,
+            live_request_queue=call.live_queue,
+            run_config=run_config,
+        ):
+            started = metrics.on_model_event()
+            call.frames.note_model_event()
+            if call.recorder is not None:
+                call.recorder.event(event)
+            call.shutdown.on_event(event)
             try:
-                await websocket.send_json(
-                    {"type": "error", "message": str(exc)}
-                )
+                await _handle_event(call.outbound, event, call)
+                metrics.on_handled(started)
             except Exception:
-                pass
+                break
+    except Exception as exc:
+        print(f"run_live error: {exc}")
+        traceback.print_exc()
+        call.outbound.put({"type": "error", "message": str(exc)})
 
-    async def read_client():
-        """Read messages from the client and push to the live queue."""
-        try:
-            while True:
-                raw = await websocket.receive_text()
-                msg = json.loads(raw)
-                msg_type = msg.get("type")
-
-                if msg_type == "end":
-                    # Request a call summary before closing (live mode)
-                    if mode == "live":
-                        live_queue.send_content(
-                            types.Content(
-                                role="user",
-                                parts=[types.Part(
-                                    text="The call has ended. Please call save_call_summary() "
-                                    "with the complete call analysis."
-                                )],
-                            )
-                        )
-                        await asyncio.sleep(5)  # Give the agent time to respond
-                    live_queue.close()
-                    break
-
-                elif msg_type == "audio":
-                    audio_bytes = base64.b64decode(msg["data"])
-                    live_queue.send_realtime(
-                        types.Blob(
-                            data=audio_bytes,
-                            mime_type="audio/pcm",
-                        )
+
+async def _read_client(websocket: WebSocket, call: CallState) -> bool:
+    """Read messages from the client and push them to the live queue.
+
+    Returns True when the client ended the call, False when the socket
+    went away (the call can still be resumed).
+    """
+    live_queue = call.live_queue
+    metrics = call.metrics
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if call.recorder is not None:
+                call.recorder.client(message)
+
+            # Binary frames carry raw PCM / JPEG — no JSON, no base64
+            if message.get("bytes") is not None:
+                kind = await _forward_binary_frame(live_queue, message["bytes"], call)
+                if kind is not None:
+                    metrics.on_client_input(
+                        audio=kind == KIND_AUDIO,
+                        queue_depth=_queue_depth(live_queue),
                     )
+                continue
 
-                elif msg_type == "image":
-                    image_bytes = base64.b64decode(msg["data"])
-                    mime = msg.get("mimeType", "image/jpeg")
-                    live_queue.send_content(
-                        types.Content(
-                            role="user",
-                            parts=[
-                                types.Part(
-                                    inline_data=types.Blob(
-                                        data=image_bytes,
-                                        mime_type=mime,
-                                    )
-                                )
-                            ],
-                        )
+            msg = json.loads(message["text"])
+            msg_type = msg.get("type")
+
+            if msg_type == "end":
+                _flush_audio(live_queue, call)
+                await call.inbound.drain()
+                analytics = _finish_analytics(call)
+                call.outbound.put(analytics)
+                # The model's own summary is an optional extra (live mode)
+                if call.mode == "live" and call.model_summary:
+                    request = types.Content(
+                        role="user",
+                        parts=[types.Part(
+                            text="The call has ended. Please call save_call_summary() "
+                            "with the complete call analysis. Measured from the call "
+                            f"(use these numbers): {prompt_facts(analytics)}"
+                        )],
+                    )
+                    outcome = await call.shutdown.summarize(
+                        call.forward_task, lambda: live_queue.send_content(request)
                     )
+                    if outcome != "model":
+                        _send_local_summary(call)
+                else:
+                    call.shutdown.skip()
+                live_queue.close()
+                return True
 
-                elif msg_type == "text":
-                    live_queue.send_content(
-                        types.Content(
-                            role="user",
-                            parts=[types.Part(text=msg["text"])],
-                        )
+            elif msg_type == "audio":
+                audio_bytes = base64.b64decode(msg["data"])
+                if _forward_audio(
+                    live_queue, audio_bytes, "audio/pcm", call
+                ):
+                    metrics.on_client_input(
+                        audio=True, queue_depth=_queue_depth(live_queue)
                     )
 
-        except WebSocketDisconnect:
-            live_queue.close()
-        except Exception as exc:
-            print(f"read_client error: {exc}")
-            traceback.print_exc()
-            live_queue.close()
+            elif msg_type == "image":
+                image_bytes = base64.b64decode(msg["data"])
+                mime = msg.get("mimeType", "image/jpeg")
+                if await _forward_image(live_queue, image_bytes, call, mime):
+                    metrics.on_client_input(queue_depth=_queue_depth(live_queue))
 
-    # ── Run both tasks concurrently ────────────────────────────────────
-    try:
-        await asyncio.gather(forward_events(), read_client())
+            elif msg_type == "snapshot":
+                call.outbound.put(call.dashboard.snapshot())
+
+            elif msg_type == "playback_flushed":
+                if call.barge is not None:
+                    call.barge.on_flushed(_flushed_ms(msg.get("flushed_ms")))
+
+            elif msg_type == "text":
+                live_queue.send_content(
+                    types.Content(
+                        role="user",
+                        parts=[types.Part(text=msg["text"])],
+                    )
+                )
+                metrics.on_client_input(queue_depth=_queue_depth(live_queue))
+
+    except WebSocketDisconnect:
+        return False
     except Exception as exc:
-        print(f"Session error: {exc}")
-    finally:
-        print(f"Session ended (mode={mode}, session_id={session.id})")
+        print(f"read_client error: {exc}")
+        traceback.print_exc()
+        return False
+
+
+async def _push_talk_ratio(call: CallState) -> None:
+    """Send the measured talk ratio on a fixed cadence, when it changes."""
+    while True:
+        await asyncio.sleep(TALK_RATIO_INTERVAL)
+        measured = call.talk.changed_measurement()
+        if measured is not None:
+            await _send_dashboard(call.outbound, call, measured)
+
+
+async def _push_call_state(call: CallState) -> None:
+    """Long-call mode: re-send the call's state block when it has changed."""
+    while True:
+        await asyncio.sleep(LONG_CALL_SETTINGS.summary_seconds)
+        if not call.digest.changed:
+            continue
+        block = call.digest.state_block(call.talk.measure()["rep_pct"])
+        call.live_queue.send_content(
+            types.Content(role="user", parts=[types.Part(text=block)])
+        )
+
+
+async def _end_call(call: CallState) -> None:
+    """Close the model session and release everything the call holds."""
+    resumable_calls.remove(call.resume_token)
+    call.shutdown.skip()
+    call.live_queue.close()
+    if call.shutdown.outcome == "deadline":
+        call.forward_task.cancel()  # The summary is late: don't let it hold the session
+    done, _ = await asyncio.wait([call.forward_task], timeout=15)
+    if not done:
+        call.forward_task.cancel()
+    call.talk_task.cancel()
+    if call.digest_task is not None:
+        call.digest_task.cancel()
+    call.inbound.close()
+    await call.outbound.close()
+    call.metrics.close()
+    if call.recorder is not None:
+        await call.recorder.close()
+    if call.audio_recorder is not None:
+        await call.audio_recorder.close()
+    _finish_analytics(call)
+    broadcaster.close(call.session_id)
+    floor.close(call.session_id)
+    call_journal.finish(call.session_id)
+    await session_service.delete_session(
+        app_name="live_sales_coach",
+        user_id="user_1",
+        session_id=call.session_id,
+    )
+    print(
+        f"Session ended (mode={call.mode}, session_id={call.session_id}, "
+        f"hints={call.hinter.stats()}"
+        + (f", vad={call.gate.stats()}" if call.gate else "")
+        + f", talk={call.talk.measure()}"
+        + (f", barge_in={call.barge.stats()}" if call.barge else "")
+        + (f", long_call={call.digest.stats()}" if call.digest else "")
+        + (f", recording={call.recorder.stats()}" if call.recorder else "")
+        + (f", audio={call.audio_recorder.stats()}" if call.audio_recorder else "")
+        + f", shutdown={call.shutdown.stats()}"
+        + f", frames={call.frames.stats()}"
+        + f", inbound={call.inbound.stats()}"
+        + f", outbound={call.outbound.stats()}"
+        + ")"
+    )
+
+
+def _finish_analytics(call: CallState) -> dict:
+    """Run the local post-call analytics once; journal them (and queue the webhook if enabled)."""
+    if call.analytics is None:
+        now = time.time()
+        call.analytics = {
+            "type": "call_analytics",
+            "session_id": call.session_id,
+            **call.timeline.analyze(now),
+        }
+        call_journal.append(call.session_id, call.analytics, now)
+        if call.broadcast is not None:
+            call.broadcast.publish(call.analytics)
+        if webhook_delivery.enabled and WEBHOOK_SEND_ANALYTICS:
+            webhook_delivery.enqueue(call.analytics)
+    return call.analytics
+
+
+def _send_local_summary(call: CallState) -> None:
+    """The model's summary did not come: send the local one in its place.
+
+    The webhook gets it only if no model summary was queued for this call.
+    """
+    summary = local_call_summary(call.analytics)
+    call_journal.append(call.session_id, summary)
+    call.outbound.put(summary)
+    if webhook_delivery.enabled and call.summary_gate.claim("local"):
+        webhook_delivery.enqueue(summary)
+
+
+def _forward_audio(
+    live_queue: LiveRequestQueue,
+    pcm: bytes,
+    mime_type: str,
+    call: CallState | None = None,
+    reframe: bool = True,
+) -> bool:
+    """Send mic PCM upstream, through the VAD gate when one is set.
+
+    With ``call.reframer`` set the PCM is first re-cut into fixed-size
+    frames, and with ``call.inbound`` set it goes through the bounded
+    inbound queue rather than straight into ``live_queue``. Also feeds the
+    talk-time tracker and the barge-in detector, reusing the gate's frame
+    analysis when there is one, and the call's audio recorder with the PCM
+    as received. Returns whether any audio was actually forwarded.
+    """
+    gate = call.gate if call is not None else None
+    talk = call.talk if call is not None else None
+    barge = call.barge if call is not None else None
+    upstream = live_queue
+    chunks = [pcm]
+    if call is not None:
+        if call.inbound is not None:
+            upstream = call.inbound
+        if reframe and call.audio_recorder is not None:
+            call.audio_recorder.rep(pcm, sample_rate_from_mime(mime_type, INPUT_SAMPLE_RATE))
+        if reframe and call.reframer is not None:
+            rate = sample_rate_from_mime(mime_type, INPUT_SAMPLE_RATE)
+            if rate != call.reframer.sample_rate:
+                call.reframer = AudioReframer(call.reframer.frame_ms, rate)
+            chunks = call.reframer.feed(pcm)
+
+    forwarded = False
+    for chunk in chunks:
+        if gate is None:
+            upstream.send_realtime(types.Blob(data=chunk, mime_type=mime_type))
+            if talk is not None:
+                speech = talk.on_input(chunk)
+                if barge is not None:
+                    barge.on_input_frames(speech)
+            forwarded = True
+            continue
+
+        ops = gate.process(chunk)
+        if talk is not None:
+            talk.on_input_frames(gate.last_speech, gate.last_energy_db)
+        if barge is not None:
+            barge.on_input_frames(gate.last_speech)
+        for op in ops:
+            if op is ACTIVITY_START:
+                upstream.send_activity_start()
+            elif op is ACTIVITY_END:
+                upstream.send_activity_end()
+            else:
+                upstream.send_realtime(types.Blob(data=op, mime_type=mime_type))
+                forwarded = True
+    return forwarded
+
+
+def _flush_audio(live_queue: LiveRequestQueue, call: CallState) -> None:
+    """End of call: push buffered mic audio and close an open speech segment."""
+    upstream = call.inbound if call.inbound is not None else live_queue
+    if call.reframer is not None:
+        rest = call.reframer.flush()
+        if rest:
+            mime_type = f"audio/pcm;rate={call.reframer.sample_rate}"
+            _forward_audio(live_queue, rest, mime_type, call, reframe=False)
+    gate = call.gate
+    if gate is None:
+        return
+    for op in gate.finish():
+        if op is ACTIVITY_END:
+            upstream.send_activity_end()
+        elif op is not ACTIVITY_START:
+            upstream.send_realtime(
+                types.Blob(data=op, mime_type=f"audio/pcm;rate={gate.sample_rate}")
+            )
+
+
+def _flushed_ms(value) -> float:
+    """The client's ``flushed_ms``: a non-negative, finite number, else 0."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return value if math.isfinite(value) and value > 0 else 0
+
+
+def _interrupt_playback(
+    outbound: OutboundWriter, reason: str, audio_recorder: CallAudioRecorder | None = None
+) -> None:
+    """Barge-in: drop queued prospect audio and tell the client to flush."""
+    if audio_recorder is not None:
+        audio_recorder.interrupt()
+    dropped = outbound.cancel_audio()
+    outbound.put_urgent({"type": "interrupt", "reason": reason, "dropped_bytes": dropped})
+
+
+async def _forward_image(
+    live_queue: LiveRequestQueue,
+    image: bytes,
+    call: CallState | None = None,
+    mime_type: str = "image/jpeg",
+) -> bool:
+    """Send a screen-share image upstream unless the frame pipeline drops it.
+
+    Decoding, hashing and re-encoding run in a worker thread so a large
+    frame never stalls audio for the other sessions on this loop.
+    """
+    if call is not None and call.frames is not None:
+        processed = await asyncio.to_thread(
+            call.frames.process, image, _queue_depth(live_queue)
+        )
+        if processed is None:
+            return False
+        if processed is not image:
+            image, mime_type = processed, "image/jpeg"  # Re-encoded
+    live_queue.send_content(
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(
+                    inline_data=types.Blob(
+                        data=image,
+                        mime_type=mime_type,
+                    )
+                )
+            ],
+        )
+    )
+    return True
+
+
+async def _forward_binary_frame(
+    live_queue: LiveRequestQueue,
+    frame: bytes,
+    call: CallState | None = None,
+) -> int | None:
+    """Push one inbound binary frame (audio or image) to the live queue.
+
+    Returns the frame kind, or None if nothing was forwarded (the frame was
+    malformed, its audio was silence dropped by the VAD gate, or the image
+    was dropped by the screen frame pipeline).
+    """
+    try:
+        kind, _seq, sample_rate, payload = unpack_frame(frame)
+    except FrameError as exc:
+        print(f"Dropping malformed frame: {exc}")
+        return None
+
+    if kind == KIND_AUDIO:
+        rate = sample_rate or INPUT_SAMPLE_RATE
+        if not _forward_audio(
+            live_queue, bytes(payload), f"audio/pcm;rate={rate}", call
+        ):
+            return None
+    elif not await _forward_image(live_queue, bytes(payload), call):
+        return None
+    return kind
 
 
 # ---------------------------------------------------------------------------
 # Event handler — converts ADK events to WebSocket messages
 # ---------------------------------------------------------------------------
-async def _handle_event(ws: WebSocket, event) -> None:
-    """Translate a single ADK Event into WebSocket JSON messages."""
+async def _send_dashboard(
+    ws: WebSocket | OutboundWriter, call: CallState, message: dict
+) -> None:
+    """Send a dashboard-relevant message, folding it into the call's state.
+
+    Delta clients get the folded ``dashboard_delta`` (if anything changed)
+    in place of ``message``; everyone else gets ``message`` as before.
+    Supervisor viewers always get the delta, and it moves the floor view.
+    Every message is journaled as is and goes into the call's timeline
+    for the post-call analytics (``app.analytics``).
+    """
+    now = time.time()
+    call_journal.append(call.session_id, message, now)
+    if call.timeline is not None:
+        call.timeline.add(message, now)
+    delta = call.dashboard.apply(message) if call.dashboard is not None else None
+    if delta is not None:
+        floor.on_delta(call.session_id, delta)
+    if call.broadcast is not None:
+        if delta is not None:
+            call.broadcast.publish(delta)
+        elif message.get("type") == "transcript" and message.get("partial"):
+            call.broadcast.publish(message)  # Live captions
+    if not call.deltas or not folded(message):
+        await ws.send_json(message)
+    elif delta is not None:
+        await ws.send_json(delta)
+
+
+async def _handle_event(
+    ws: WebSocket | OutboundWriter,
+    event,
+    call: CallState | None = None,
+) -> None:
+    """Translate a single ADK Event into WebSocket messages.
+
+    Audio goes out as binary frames when ``call.sequencer`` is set (the
+    client negotiated the binary protocol), otherwise as legacy base64 JSON.
+    When ``call.hinter`` is set, prospect transcripts are scanned locally
+    and provisional ``objection_hint`` messages go out ahead of the model.
+    ``ws`` is normally the connection's ``OutboundWriter``, so the sends
+    below only enqueue.
+    """
+    call = call or CallState(mode="live")
+    sequencer = call.sequencer
+    hinter = call.hinter
+    metrics = call.metrics
+    barge = call.barge
+
+    # ── Barge-in: the model stopped talking because the rep did ───────
+    if barge is not None and getattr(event, "interrupted", False):
+        barge.on_model_interrupted()
 
     # ── Audio output (practice mode) ──────────────────────────────────
     if event.content and event.content.parts:
         for part in event.content.parts:
-            # Inline audio blob → base64 encode and send to client
+            # Inline audio blob → binary frame, or base64 for legacy clients
             if hasattr(part, "inline_data") and part.inline_data:
                 blob = part.inline_data
                 if blob.data and blob.mime_type and "audio" in blob.mime_type:
-                    await ws.send_json(
-                        {
-                            "type": "audio",
-                            "data": base64.b64encode(blob.data).decode(),
-                            "mimeType": blob.mime_type,
-                        }
-                    )
+                    if barge is not None and not barge.allow_output(len(blob.data)):
+                        continue  # Interrupted answer — never reaches the client
+                    if call.talk is not None:
+                        call.talk.on_output(blob.data)
+                    if call.audio_recorder is not None:
+                        call.audio_recorder.model(blob.data, sample_rate_from_mime(blob.mime_type))
+                    if sequencer is not None:
+                        await ws.send_bytes(
+                            pack_frame(
+                                KIND_AUDIO,
+                                blob.data,
+                                seq=sequencer.next(),
+                                sample_rate=sample_rate_from_mime(blob.mime_type),
+                            )
+                        )
+                    else:
+                        await ws.send_json(
+                            {
+                                "type": "audio",
+                                "data": base64.b64encode(blob.data).decode(),
+                                "mimeType": blob.mime_type,
+                            }
+                        )
 
             # Text response
             if part.text:
+                call_journal.append(call.session_id, {"type": "text", "text": part.text})
                 await ws.send_json(
                     {
                         "type": "text",
@@ -335,72 +1312,105 @@ async def _handle_event(ws: WebSocket, event) -> None:
 
     # ── Input transcription (what the user/rep said) ──────────────────
     if event.input_transcription:
-        await ws.send_json(
+        text = event.input_transcription.text or ""
+        partial = getattr(event, "partial", False) or False
+        await _send_dashboard(
+            ws,
+            call,
             {
                 "type": "transcript",
-                "text": event.input_transcription.text or "",
+                "text": text,
                 "source": "input",
-                "partial": getattr(event, "partial", False) or False,
-            }
+                "partial": partial,
+            },
         )
+        if hinter is not None and hinter.source == "input":
+            for hint in hinter.on_transcript(text, partial):
+                await _send_dashboard(ws, call, hint)
 
     # ── Output transcription (what the model said) ────────────────────
     if event.output_transcription:
-        await ws.send_json(
+        text = event.output_transcription.text or ""
+        partial = getattr(event, "partial", False) or False
+        await _send_dashboard(
+            ws,
+            call,
             {
                 "type": "transcript",
-                "text": event.output_transcription.text or "",
+                "text": text,
                 "source": "output",
-                "partial": getattr(event, "partial", False) or False,
-            }
+                "partial": partial,
+            },
         )
+        if hinter is not None and hinter.source == "output":
+            for hint in hinter.on_transcript(text, partial):
+                await _send_dashboard(ws, call, hint)
 
     # ── Tool calls (dashboard updates, objections, etc.) ──────────────
-    if event.actions:
-        if event.actions.tool_calls:
-            for tc in event.actions.tool_calls:
-                await ws.send_json(
-                    {
-                        "type": "tool_call",
-                        "name": tc.name,
-                        "args": tc.args if isinstance(tc.args, dict) else {},
-                    }
-                )
-
-        if event.actions.tool_results:
-            for tr in event.actions.tool_results:
-                # Extract the dict from the FunctionResponse
-                result_data = tr
-                if hasattr(tr, "response"):
-                    result_data = tr.response
-                elif hasattr(tr, "result"):
-                    result_data = tr.result
+    for fc in event.get_function_calls():
+        args = dict(fc.args) if fc.args else {}
+        await _send_dashboard(
+            ws,
+            call,
+            {
+                "type": "tool_call",
+                "name": fc.name,
+                "args": args,
+            },
+        )
+        if metrics is not None:
+            metrics.on_tool_call()
+        if call.digest is not None:
+            call.digest.on_tool_call(fc.name, args)
+        # The model's verdict confirms or overrides our provisional hint
+        if hinter is not None and fc.name == "log_objection":
+            resolved = hinter.on_model_objection(args.get("objection_type", "custom"))
+            if resolved is not None:
+                await _send_dashboard(ws, call, resolved)
 
-                await ws.send_json(
-                    {
-                        "type": "tool_result",
-                        "data": result_data
-                        if isinstance(result_data, dict)
-                        else str(result_data),
-                    }
-                )
+    for fr in event.get_function_responses():
+        result_data = fr.response
+        await _send_dashboard(
+            ws,
+            call,
+            {
+                "type": "tool_result",
+                "name": fr.name,
+                "data": result_data
+                if isinstance(result_data, dict)
+                else str(result_data),
+            },
+        )
 
     # ── Turn complete ─────────────────────────────────────────────────
     if getattr(event, "turn_complete", False):
+        call_journal.append(call.session_id, {"type": "turn_complete"})
         await ws.send_json({"type": "turn_complete"})
+        if barge is not None:
+            barge.on_turn_complete()
+        if metrics is not None:
+            metrics.on_turn_complete()
+        if call.digest is not None:
+            call.digest.on_turn_complete()
 
     # ── Usage metadata (for cost tracking) ────────────────────────────
     if event.usage_metadata:
         meta = event.usage_metadata
-        await ws.send_json(
-            {
-                "type": "usage",
-                "prompt_tokens": getattr(meta, "prompt_token_count", 0) or 0,
-                "candidates_tokens": getattr(meta, "candidates_token_count", 0)
-                or 0,
-                "total_tokens": getattr(meta, "total_token_count", 0) or 0,
-            }
-        )
+        usage = {
+            "type": "usage",
+            "prompt_tokens": getattr(meta, "prompt_token_count", 0) or 0,
+            "candidates_tokens": getattr(meta, "candidates_token_count", 0)
+            or 0,
+            "total_tokens": getattr(meta, "total_token_count", 0) or 0,
+        }
+        call_journal.append(call.session_id, usage)
+        await ws.send_json(usage)
+        if metrics is not None:
+            metrics.on_usage(
+                usage["prompt_tokens"],
+                usage["candidates_tokens"],
+                usage["total_tokens"],
+            )
 
 
 # ---------------------------------------------------------------------------
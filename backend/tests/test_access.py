@@ -0,0 +1,17 @@
+from app.access import allowed, token_digest
+
+
+def test_call_token_by_digest():
+    digest = token_digest("rep-token")
+    assert allowed("rep-token", digest=digest)
+    assert not allowed("other", digest=digest)
+    assert not allowed("rep-token")
+    assert not allowed(None, digest=digest)
+    assert not allowed("", digest=digest)
+
+
+def test_supervisor_token():
+    assert allowed("boss", "boss")
+    assert allowed("boss", "boss", token_digest("rep-token"))
+    assert not allowed("bos", "boss")
+    assert not allowed("", "")
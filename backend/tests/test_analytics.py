@@ -0,0 +1,87 @@
+from app.analytics import CallTimeline, local_call_summary
+
+START = 1_000.0
+
+
+def dashboard(**args) -> dict:
+    return {"type": "tool_call", "name": "update_dashboard", "args": args}
+
+
+def transcript(text: str, source: str, partial: bool = False) -> dict:
+    return {"type": "transcript", "text": text, "source": source, "partial": partial}
+
+
+def practice_call() -> tuple[CallTimeline, list[tuple[float, dict]]]:
+    events = [
+        (5, transcript("hello there how are you", "input")),
+        (6, transcript("partial words", "output", partial=True)),
+        (9, transcript("fine thanks what is this about", "output")),
+        (10, dashboard(sentiment="positive", discovery_score=60, rapport_score=0)),
+        (30, {"type": "objection_hint", "id": "h1", "category": "price"}),
+        (31, {"type": "objection_hint_resolved", "id": "h1"}),
+        (32, {"type": "tool_call", "name": "log_objection", "args": {"objection_type": "price"}}),
+        (70, {"type": "objection_hint", "id": "h2", "category": "timing"}),
+        (90, dashboard(sentiment="negative", discovery_score=80)),
+        (60, {"type": "talk_ratio", "rep_pct": 60, "prospect_pct": 40, "rep_seconds": 30.0, "prospect_seconds": 20.0}),
+        (120, {"type": "talk_ratio", "rep_pct": 50, "prospect_pct": 50, "rep_seconds": 45.0, "prospect_seconds": 45.0}),
+    ]
+    events.sort(key=lambda e: e[0])
+    timeline = CallTimeline("practice", started=START)
+    for t, message in events:
+        timeline.add(message, START + t)
+    return timeline, events
+
+
+def test_analyze_practice_call():
+    timeline, _ = practice_call()
+    analytics = timeline.analyze(START + 150)
+
+    assert analytics["duration_s"] == 150.0
+    talk = analytics["talk_ratio"]
+    assert (talk["rep_pct"], talk["prospect_pct"], talk["source"]) == (50, 50, "measured")
+    assert talk["per_minute"] == [60, 38, None]  # 30/50, then 15/40, then no new speech
+
+    sentiment = analytics["sentiment"]
+    assert sentiment["final"] == "negative"
+    assert sentiment["per_minute"] == [1.0, -1.0, -1.0]
+    assert sentiment["mean"] == round((80 - 60) / 150, 2)  # +1 for 80 s, -1 for 60 s
+
+    # A resolved hint is replaced by the model's log_objection; h2 was never resolved
+    assert analytics["objections"]["count"] == 2
+    assert analytics["objections"]["by_category"] == {"price": 1, "timing": 1}
+    assert analytics["objections"]["per_minute"] == [1, 1, 0]
+
+    assert analytics["scores"]["discovery"] == {"final": 80, "mean": 70.0}
+    assert analytics["scores"]["rapport"] == {"final": 0, "mean": 0.0}
+    assert analytics["scores"]["objection"] == {"final": None, "mean": None}
+    assert analytics["overall_score"] == 40
+
+
+def test_journal_round_trip_matches_live_analysis():
+    timeline, events = practice_call()
+    live = timeline.analyze(START + 150)
+    records = [{"t": START, "e": {"type": "call_started", "mode": "practice"}}]
+    records += [{"t": START + t, "e": message} for t, message in events]
+    records.append({"t": START + 150, "e": {"type": "call_analytics"}})
+    records.append({"t": START + 200, "e": transcript("after the end", "input")})
+
+    assert CallTimeline.from_records(records).analyze() == live
+
+
+def test_live_call_without_audio_split():
+    timeline = CallTimeline("live", started=START)
+    timeline.add(transcript("both sides on one mic", "input"), START + 3)
+    analytics = timeline.analyze(START + 30)
+    assert analytics["talk_ratio"]["rep_pct"] is None
+    assert analytics["longest_monologue"] is None
+    assert analytics["objections"]["count"] == 0
+    assert analytics["summary"] == "30-second live call, no objections, sentiment ended neutral."
+
+
+def test_local_summary_shape():
+    timeline, _ = practice_call()
+    summary = local_call_summary(timeline.analyze(START + 150))
+    assert summary["type"] == "call_summary" and summary["source"] == "local"
+    assert summary["outcome"] is None
+    assert summary["scores"]["discovery"] == 80
+    assert summary["objection_count"] == 2
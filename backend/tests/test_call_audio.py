@@ -0,0 +1,102 @@
+import wave
+
+import numpy as np
+
+from app.call_audio import REP, MODEL, CallAudioRecorder, audio_access, audio_state
+
+RATE = 1000  # Frames per second, so times map to frame indexes directly
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def pcm(frames: int, value: int) -> bytes:
+    return np.full(frames, value, dtype="<i2").tobytes()
+
+
+def recorder(tmp_path, clock: FakeClock, **kwargs) -> CallAudioRecorder:
+    # Never flushes on its own: close() writes everything
+    return CallAudioRecorder(
+        tmp_path / "call.wav", rate=RATE, flush_interval=60, block_seconds=1, clock=clock, **kwargs
+    ).start()
+
+
+def read_wav(path) -> np.ndarray:
+    with wave.open(str(path)) as wav:
+        assert wav.getnchannels() == 2
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == RATE
+        frames = wav.readframes(wav.getnframes())
+    return np.frombuffer(frames, dtype="<i2").reshape(-1, 2)
+
+
+async def test_chunks_land_on_the_call_timeline(tmp_path):
+    clock = FakeClock()
+    rec = recorder(tmp_path, clock)
+    clock.now = 0.5
+    rec.model(pcm(200, 7), RATE)  # Plays from when it arrived
+    clock.now = 1.0
+    rec.rep(pcm(100, 1), RATE)  # Captured over the 100 ms before it arrived
+    clock.now = 1.15
+    rec.rep(pcm(100, 2), RATE)  # Within slack of the cursor: continues the first
+    clock.now = 2.0
+    rec.rep(pcm(100, 3), RATE)  # Late: after a silent gap
+    await rec.close()
+
+    audio = read_wav(tmp_path / "call.wav")
+    assert len(audio) == 2000
+    assert (audio[500:700, MODEL] == 7).all() and not audio[:500, MODEL].any()
+    assert not audio[:900, REP].any()
+    assert (audio[900:1000, REP] == 1).all()
+    assert (audio[1000:1100, REP] == 2).all()
+    assert not audio[1100:1900, REP].any()
+    assert (audio[1900:2000, REP] == 3).all()
+
+
+async def test_interrupt_cuts_model_audio_nobody_heard(tmp_path):
+    clock = FakeClock()
+    rec = recorder(tmp_path, clock)
+    rec.model(pcm(1000, 5), RATE)
+    clock.now = 0.3
+    rec.interrupt()
+    clock.now = 0.4
+    rec.model(pcm(100, 6), RATE)  # The next answer starts where the cut left off
+    await rec.close()
+
+    audio = read_wav(tmp_path / "call.wav")
+    assert rec.cuts == 1
+    assert (audio[:300, MODEL] == 5).all()
+    assert (audio[300:400, MODEL] == 6).all()
+    assert not audio[400:, MODEL].any()
+
+
+async def test_close_finishes_the_wav_and_keeps_the_access_digest(tmp_path):
+    clock = FakeClock()
+    rec = recorder(tmp_path, clock, access="digest")
+    assert audio_state(tmp_path, "call") == "live"
+    assert audio_access(tmp_path, "call") == "digest"
+    rec.rep(pcm(500, 4), RATE // 2)  # Resampled to the file's rate on the way in
+    await rec.close()
+
+    assert not rec.part_path.exists()
+    assert audio_state(tmp_path, "call") == "stored"
+    assert audio_access(tmp_path, "call") == "digest"
+    assert audio_access(tmp_path, "other") is None
+    assert audio_access(tmp_path, "../call") is None
+    audio = read_wav(tmp_path / "call.wav")
+    assert len(audio) == rec.frames == 999
+    assert (tmp_path / "call.wav").stat().st_size == 44 + 999 * 4
+    assert rec.stats()["received_bytes"] == 1000
+
+
+async def test_pending_cap_drops_audio_instead_of_buffering_it(tmp_path):
+    rec = recorder(tmp_path, FakeClock(), max_pending_bytes=100)
+    rec.rep(pcm(50, 1), RATE)
+    rec.rep(pcm(50, 1), RATE)
+    await rec.close()
+    assert rec.stats()["dropped_bytes"] == 100
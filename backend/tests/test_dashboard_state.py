@@ -0,0 +1,24 @@
+from app.dashboard_state import DashboardState
+from app.floor import FloorView
+
+
+def dashboard(**args) -> dict:
+    return {"type": "tool_call", "name": "update_dashboard", "args": args}
+
+
+def test_first_zero_score_is_a_change():
+    state = DashboardState()
+    delta = state.apply(dashboard(discovery_score=0, rapport_score=-1))
+    assert delta["set"] == {"scores": {"discovery": 0}}
+    assert state.apply(dashboard(discovery_score=0)) is None
+    assert state.snapshot()["state"]["scores"] == {"discovery": 0, "rapport": 0, "objection": 0, "nextSteps": 0}
+
+
+def test_floor_counts_zero_scores():
+    state, floor = DashboardState(), FloorView()
+    floor.open("call", "live")
+    floor.on_delta("call", state.apply(dashboard(objection_score=0)))
+    floor.on_delta("call", state.apply(dashboard(rapport_score=80)))
+    averages = floor.snapshot()["avg_scores"]
+    assert averages["objection"] == 0 and averages["rapport"] == 80
+    assert averages["discovery"] is None
@@ -0,0 +1,47 @@
+import httpx
+
+from app.delivery import WebhookDelivery
+from app.tools.crm import CallSummaryGate
+
+
+def delivery(handler) -> WebhookDelivery:
+    webhook = WebhookDelivery(url="http://crm.test/hook", max_retries=0)
+    webhook._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return webhook
+
+
+async def test_one_post_per_payload_type():
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(httpx.Response(200, content=request.content).json())
+        return httpx.Response(200)
+
+    webhook = delivery(handler)
+    ids = [
+        webhook.enqueue({"type": "call_summary", "summary": "one"}),
+        webhook.enqueue({"type": "call_analytics", "session_id": "a"}),
+        webhook.enqueue({"type": "call_summary", "summary": "two"}),
+    ]
+    assert sorted(await webhook._deliver(ids)) == sorted(ids)
+    assert [(b["type"], b["count"]) for b in bodies] == [("call_summary_batch", 2), ("call_analytics_batch", 1)]
+    assert all(item["type"] == "call_summary" for item in bodies[0]["items"])
+
+
+async def test_failed_type_is_not_marked_delivered():
+    def handler(request: httpx.Request) -> httpx.Response:
+        failing = b"call_analytics_batch" in request.content
+        return httpx.Response(503 if failing else 200)
+
+    webhook = delivery(handler)
+    summary = webhook.enqueue({"type": "call_summary"})
+    analytics = webhook.enqueue({"type": "call_analytics"})
+    assert await webhook._deliver([summary, analytics]) == [summary]
+
+
+def test_summary_gate_lets_one_summary_through():
+    gate = CallSummaryGate()
+    assert gate.claim("model")
+    assert not gate.claim("local")
+    assert not gate.claim("model")
+    assert gate.source == "model"
@@ -0,0 +1,32 @@
+from app.fanout import Broadcaster
+
+
+def snapshot() -> dict:
+    return {"type": "dashboard_snapshot", "v": 0, "state": {}}
+
+
+def test_call_token_opens_only_its_call():
+    broadcaster = Broadcaster()
+    one = broadcaster.open("one", snapshot)
+    broadcaster.open("two", snapshot)
+    assert broadcaster.authorize("one", one.token)
+    assert not broadcaster.authorize("two", one.token)
+    assert not broadcaster.authorize("one", None)
+    assert not broadcaster.authorize("one", "")
+    assert not broadcaster.authorize("missing", one.token)
+    assert broadcaster.stats()["refused"] == 4
+
+
+def test_supervisor_token_opens_every_call():
+    broadcaster = Broadcaster(supervisor_token="boss")
+    broadcaster.open("one", snapshot, token="rep")
+    assert broadcaster.authorize("one", "boss")
+    assert broadcaster.authorize("missing", "boss")  # Accepted, then told there is no such call
+    assert broadcaster.authorize("one", "rep")
+    assert not broadcaster.authorize("one", "bos")
+
+
+def test_no_supervisor_token_configured():
+    broadcaster = Broadcaster()
+    broadcaster.open("one", snapshot)
+    assert not broadcaster.authorize("one", "")
@@ -0,0 +1,32 @@
+import io
+
+from PIL import Image
+
+from app.frames import FrameSettings, ScreenFramePipeline
+
+
+def jpeg(width: int, height: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_oversized_header_is_invalid_without_decoding():
+    pipeline = ScreenFramePipeline(FrameSettings(max_pixels=100 * 100))
+    assert pipeline.process(jpeg(200, 100)) is None
+    assert pipeline.stats()["invalid"] == 1
+    assert pipeline.tokens_in == 0
+    assert pipeline.process(jpeg(100, 100)) is not None
+
+
+def test_decompression_bomb_is_invalid(monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+    pipeline = ScreenFramePipeline()
+    assert pipeline.process(jpeg(300, 300)) is None
+    assert pipeline.stats()["invalid"] == 1
+
+
+def test_garbage_is_invalid():
+    pipeline = ScreenFramePipeline()
+    assert pipeline.process(b"not a jpeg") is None
+    assert pipeline.stats()["invalid"] == 1
@@ -0,0 +1,78 @@
+import asyncio
+
+from google.genai import types
+
+from app.inbound import AudioReframer, InboundAudioQueue, UpstreamQueue
+
+
+def blob(n: int) -> types.Blob:
+    return types.Blob(data=bytes([n]), mime_type="audio/pcm;rate=16000")
+
+
+async def test_upstream_queue_counts_every_send_and_get():
+    queue = UpstreamQueue()
+    queue.send_activity_start()
+    queue.send_realtime(blob(1))
+    queue.send_content(types.Content(role="user", parts=[types.Part(text="hi")]))
+    queue.send_activity_end()
+    assert queue.depth == 4
+    first = await queue.get()
+    assert first.activity_start is not None
+    assert queue.depth == 3
+    queue.close()
+    while queue.depth:
+        await queue.get()
+    assert queue.depth == 0
+
+
+def test_drop_oldest_keeps_activity_markers():
+    inbound = InboundAudioQueue(UpstreamQueue(), max_frames=2, overflow="drop_oldest")
+    inbound.send_activity_start()
+    for n in range(3):
+        inbound.send_realtime(blob(n))
+    inbound.send_activity_end()
+    assert inbound.depth == 2
+    assert inbound.dropped == 1
+    assert [(kind, b.data[0] if b else None) for kind, b in inbound._items] == [
+        ("start", None), ("audio", 1), ("audio", 2), ("end", None),
+    ]
+
+
+async def test_signal_pauses_at_three_quarters_and_resumes_under_a_quarter():
+    signals = []
+    upstream = UpstreamQueue()
+    inbound = InboundAudioQueue(upstream, max_frames=8, upstream_limit=0, on_signal=signals.append).start()
+    for n in range(6):
+        inbound.send_realtime(blob(n))
+    assert signals == [True] and inbound.paused
+
+    inbound.upstream_limit = 100  # Model caught up: the pump drains the queue
+    await inbound.drain()
+    assert signals == [True, False] and not inbound.paused
+    assert upstream.depth == 6
+    assert inbound.stats()["forwarded"] == 6
+    inbound.close()
+
+
+async def test_pump_holds_back_while_upstream_is_full():
+    upstream = UpstreamQueue()
+    inbound = InboundAudioQueue(upstream, upstream_limit=2, poll_interval=0.001).start()
+    for n in range(5):
+        inbound.send_realtime(blob(n))
+    await asyncio.sleep(0.02)
+    assert upstream.depth == 2
+    assert inbound.depth == 3
+    await upstream.get()
+    await asyncio.sleep(0.02)
+    assert upstream.depth == 2
+    assert inbound.depth == 2
+    inbound.close()
+    assert inbound.depth == 0
+
+
+def test_reframer_cuts_fixed_frames_across_chunks():
+    reframer = AudioReframer(frame_ms=20, capacity_frames=2)  # 640-byte frames
+    assert reframer.feed(bytes(500)) == []
+    frames = reframer.feed(bytes(range(256)) * 4)
+    assert [len(f) for f in frames] == [640, 640]
+    assert len(reframer.flush()) == 500 + 1024 - 1280
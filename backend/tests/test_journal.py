@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+from app.journal import CallJournal
+
+
+def records(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def journal(tmp_path, **options) -> CallJournal:
+    return CallJournal(tmp_path, commit_interval=0.01, fsync=False, **options)
+
+
+async def test_group_commit_then_compaction(tmp_path):
+    calls = journal(tmp_path)
+    await calls.start()
+    for call in ("a", "b"):
+        calls.open(call, {"mode": "live"}, t=1.0)
+    for i in range(5):
+        calls.append("a", {"type": "transcript", "text": "par", "partial": True}, t=2.0 + i)
+        calls.append("b", {"type": "usage", "total_tokens": i}, t=2.0 + i)
+    calls.append("a", {"type": "transcript", "text": "partial done", "partial": False}, t=9.0)
+    await asyncio.sleep(0.1)
+    # One commit wrote every call's buffered records
+    assert calls.stats()["commits"] == 1
+    assert calls.state("a") == "live"
+    assert len((tmp_path / "b" / "000001.ndjson").read_bytes().splitlines()) == 6
+
+    calls.finish("a")
+    await calls.stop()  # Finishes b too
+    assert calls.state("a") == calls.state("b") == "stored"
+    assert not (tmp_path / "a").exists()
+    kinds = [(r["e"]["type"], r["e"].get("partial")) for r in records(tmp_path / "a.ndjson")]
+    assert kinds == [("call_started", None), ("transcript", False), ("call_ended", None)]
+    assert b"".join(calls.stream("b")) == (tmp_path / "b.ndjson").read_bytes()
+
+
+async def test_recovers_segments_left_by_a_crash(tmp_path):
+    segments = tmp_path / "dead-call"
+    segments.mkdir()
+    (segments / "000001.ndjson").write_bytes(
+        b'{"t": 1.0, "e": {"type": "call_started", "session_id": "dead-call"}}\n'
+        b'{"t": 2.0, "e": {"type": "text", "text": "hi"}}\n'
+    )
+    (segments / "000002.ndjson").write_bytes(
+        b'{"t": 3.0, "e": {"type": "transcript", "text": "x", "partial": true}}\n'
+        b'{"t": 4.0, "e": {"type": "text", "te'  # Torn by the crash
+    )
+    calls = journal(tmp_path)
+    await calls.start()
+    await calls.stop()
+    assert calls.state("dead-call") == "stored"
+    assert [r["t"] for r in records(tmp_path / "dead-call.ndjson")] == [1.0, 2.0]
+    assert not segments.exists()
+
+
+async def test_segments_rotate_and_compact_in_order(tmp_path):
+    calls = journal(tmp_path, segment_bytes=200)
+    await calls.start()
+    calls.open("call", {}, t=0.0)
+    for i in range(20):
+        calls.append("call", {"type": "text", "text": f"message {i}"}, t=float(i + 1))
+        await asyncio.sleep(0.02)  # Several commits, several segments
+    assert len(list((tmp_path / "call").glob("*.ndjson"))) > 1
+    await calls.stop()
+    assert [r["t"] for r in records(tmp_path / "call.ndjson")][:-1] == [float(i) for i in range(21)]
+
+
+async def test_full_buffer_drops_and_bad_ids_are_ignored(tmp_path):
+    calls = journal(tmp_path, max_pending_bytes=100)
+    calls.open("call", {}, t=0.0)
+    calls.append("call", {"type": "text", "text": "x" * 200})
+    calls.append("call", {"type": "text", "text": "dropped"})
+    assert calls.stats()["dropped"] == 1
+    calls.open("../escape", {})
+    assert calls.state("../escape") is None
+
+    await calls.start()
+    await calls.stop()
+    assert calls.state("call") == "stored"
+
+
+async def test_keeps_only_the_newest_journals(tmp_path):
+    calls = journal(tmp_path, max_calls=2)
+    await calls.start()
+    for call in ("one", "two", "three"):
+        calls.open(call, {})
+        calls.finish(call)
+        await asyncio.sleep(0.05)
+    await calls.stop()
+    assert sorted(p.name for p in tmp_path.glob("*.ndjson")) == ["three.ndjson", "two.ndjson"]
+
+
+def test_disabled_without_a_directory():
+    calls = CallJournal("")
+    calls.open("call", {})
+    calls.append("call", {"type": "text"})
+    assert not calls.enabled and calls.state("call") is None
+
+
+async def test_access_digest_kept_with_the_journal(tmp_path):
+    calls = journal(tmp_path)
+    await calls.start()
+    calls.open("call", {"access": "digest", "mode": "live"})
+    calls.open("open", {})
+    assert calls.access("call") == "digest"  # Live: before anything is on disk
+    calls.finish("call")
+    await calls.stop()
+    assert calls.access("call") == "digest"  # Read back from call_started
+    assert calls.access("open") is None
+    assert calls.access("missing") is None
+    assert calls.access("../call") is None
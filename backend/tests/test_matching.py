@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from app.matching import TriggerMatch, TriggerMatcher
+from app.prompts.objections import OBJECTION_CATEGORIES, OBJECTION_MATCHER
+
+TRIGGERS = {category: info["triggers"] for category, info in OBJECTION_CATEGORIES.items()}
+FILLER = "so we looked at the board last week and the team thinks costco pricing could help".split()
+WORD = set("abcdefghijklmnopqrstuvwxyz0123456789'")
+
+
+def utterance(rng: random.Random, words: int = 40) -> list[str]:
+    out = [rng.choice(FILLER) for _ in range(words)]
+    for _ in range(rng.randint(0, 4)):
+        category = rng.choice(list(TRIGGERS))
+        if TRIGGERS[category]:
+            out.insert(rng.randint(0, len(out)), rng.choice(TRIGGERS[category]))
+    return out
+
+
+def substring_scan(text: str) -> list[TriggerMatch]:
+    """The old ``trigger in text.lower()`` scan, every occurrence, on word boundaries only."""
+    lower = text.lower()
+    hits = []
+    for category, triggers in TRIGGERS.items():
+        for trigger in triggers:
+            start = lower.find(trigger)
+            while start != -1:
+                end = start + len(trigger)
+                if (start == 0 or lower[start - 1] not in WORD) and (end == len(lower) or lower[end] not in WORD):
+                    hits.append(TriggerMatch(category, trigger, start, end))
+                start = lower.find(trigger, start + 1)
+    return sorted(hits, key=lambda m: (m.end, m.start, m.category, m.trigger))
+
+
+def ordered(hits: list[TriggerMatch]) -> list[TriggerMatch]:
+    return sorted(hits, key=lambda m: (m.end, m.start, m.category, m.trigger))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_the_substring_scan(seed):
+    text = " ".join(utterance(random.Random(seed)))
+    assert ordered(OBJECTION_MATCHER.find_all(text)) == substring_scan(text)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_streaming_matches_one_pass(seed):
+    rng = random.Random(seed)
+    separators = [" ", " ", " ", ", ", ". ", " — ", "? "]
+    words = utterance(rng)
+    text = "".join(word + rng.choice(separators) for word in words)
+    if seed % 3 == 0:
+        text = text.upper()
+    scanner = OBJECTION_MATCHER.scanner()
+    hits, i = [], 0
+    while i < len(text):
+        size = rng.randint(1, 15)  # Splits words, "can't" and multi-word triggers
+        hits += scanner.feed(text[i:i + size])
+        i += size
+    hits += scanner.flush()
+    assert hits == OBJECTION_MATCHER.find_all(text)
+    assert [(m.category, m.trigger) for m in hits] == \
+        [(m.category, m.trigger) for m in OBJECTION_MATCHER.find_all(" ".join(words))]
+
+
+def test_word_boundaries():
+    matcher = TriggerMatcher({"price": ["cost", "too expensive"], "authority": ["board"]})
+    assert matcher.find_all("We shop at Costco; onboarding was easy") == []
+    assert matcher.categories("The COST is, frankly, too   expensive!") == ["price"]
+    assert matcher.find_all("the board") == [TriggerMatch("authority", "board", 4, 9)]
+
+
+def test_overlapping_triggers_all_reported():
+    matcher = TriggerMatcher({"a": ["not now"], "b": ["now is not a good time"], "c": ["good time"]})
+    hits = matcher.find_all("now is not a good time, not now")
+    assert [(m.category, m.start, m.end) for m in hits] == [("b", 0, 22), ("c", 13, 22), ("a", 24, 31)]
+
+
+def test_chunk_boundary_inside_a_word():
+    scanner = TriggerMatcher({"price": ["budget"]}).scanner()
+    assert scanner.feed("no bud") == []
+    assert scanner.feed("get left") == [TriggerMatch("price", "budget", 3, 9)]
+    assert scanner.feed(" budge") == []
+    assert scanner.flush() == []
@@ -0,0 +1,15 @@
+from app.metrics import Registry
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.counter("test_total", "Test counter.", ["mode"])
+    counter.labels('a"b\\c\nd').inc()
+    assert 'test_total{mode="a\\"b\\\\c\\nd"} 1' in registry.render().splitlines()
+
+
+def test_histogram_labels_are_escaped_next_to_le():
+    registry = Registry()
+    histogram = registry.histogram("test_ms", "Test histogram.", ["mode"], buckets=(1,))
+    histogram.labels('x"').observe(0.5)
+    assert 'test_ms_bucket{mode="x\\"",le="1"} 1' in registry.render().splitlines()
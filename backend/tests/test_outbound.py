@@ -0,0 +1,141 @@
+import asyncio
+
+from app.outbound import OutboundWriter, merge_dashboard
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0):
+        self.sent = []
+        self.delay = delay
+
+    async def send_json(self, message):
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+
+def partial(text: str, source: str = "input") -> dict:
+    return {"type": "transcript", "text": text, "source": source, "partial": True}
+
+
+def dashboard(**args) -> dict:
+    return {"type": "tool_call", "name": "update_dashboard", "args": args}
+
+
+def queued(writer: OutboundWriter) -> list:
+    return list(writer._queue)
+
+
+def test_partials_concatenate_and_finals_replace_them():
+    writer = OutboundWriter(FakeSocket())
+    writer.put(partial("hel"))
+    writer.put(partial("lo"))
+    writer.put(partial("hi", source="output"))
+    writer.put(partial(" there", source="output"))
+    assert [m["text"] for m in queued(writer)] == ["hello", "hi there"]
+
+    writer.put({"type": "transcript", "text": "hello", "source": "input", "partial": False})
+    assert [(m["text"], m["partial"]) for m in queued(writer)] == [("hi there", True), ("hello", False)]
+    assert writer.merged == 3  # Two concatenations, one partial replaced
+
+
+def test_superseded_state_merges_only_under_pressure():
+    writer = OutboundWriter(FakeSocket(), max_queue=8, pressure=0.5)
+    writer.put({"type": "talk_ratio", "rep_pct": 40})
+    writer.put({"type": "talk_ratio", "rep_pct": 50})
+    assert writer.depth == 2  # Below pressure: both kept
+
+    writer.put(b"audio")
+    writer.put(b"audio")
+    writer.put({"type": "talk_ratio", "rep_pct": 60})
+    writer.put({"type": "usage", "total_tokens": 5})
+    writer.put({"type": "usage", "total_tokens": 7})
+    kinds = [m["type"] if isinstance(m, dict) else "bytes" for m in queued(writer)]
+    assert kinds == ["talk_ratio", "bytes", "bytes", "talk_ratio", "usage"]
+    assert queued(writer)[-2]["rep_pct"] == 60
+    assert queued(writer)[-1]["total_tokens"] == 12
+
+
+def test_dashboard_updates_fold_under_pressure():
+    writer = OutboundWriter(FakeSocket(), max_queue=4, pressure=0.25)
+    writer.put(dashboard(discovery_score=40, coaching_tip="Ask why", key_moment="Budget"))
+    writer.put(dashboard(discovery_score=-1, rapport_score=70, coaching_tip=""))
+    assert queued(writer) == [dashboard(discovery_score=40, coaching_tip="Ask why", key_moment="Budget", rapport_score=70)]
+
+    writer.put(dashboard(key_moment="Demo booked"))  # Two key moments never merge
+    assert writer.depth == 2
+    assert merge_dashboard({"key_moment": "a"}, {"key_moment": "b"}) is None
+
+
+def test_full_queue_evicts_droppable_first():
+    writer = OutboundWriter(FakeSocket(), max_queue=3, pressure=1.0)
+    writer.put({"type": "text", "text": "one"})
+    writer.put({"type": "usage", "total_tokens": 1})
+    writer.put({"type": "text", "text": "two"})
+    writer.put({"type": "text", "text": "three"})
+    assert [m["text"] for m in queued(writer)] == ["one", "two", "three"]
+    writer.put({"type": "text", "text": "four"})  # Nothing droppable left: the oldest goes
+    assert [m["text"] for m in queued(writer)] == ["two", "three", "four"]
+    assert writer.dropped == 2
+
+
+async def test_cancel_audio_and_urgent_interrupt():
+    writer = OutboundWriter(FakeSocket())
+    writer.put(b"\x00" * 100)
+    writer.put({"type": "text", "text": "keep"})
+    writer.put({"type": "audio", "data": "AAAA"})
+    assert writer.cancel_audio() > 0
+    writer.put_urgent({"type": "interrupt"})
+    assert [m["type"] for m in queued(writer)] == ["interrupt", "text"]
+
+
+async def test_batches_json_but_not_binary():
+    ws = FakeSocket()
+    writer = OutboundWriter(ws, batch=True, max_batch=2)
+    for item in ({"type": "text", "text": "a"}, {"type": "text", "text": "b"}, {"type": "text", "text": "c"},
+                 b"audio", {"type": "text", "text": "d"}):
+        writer.put(item)
+    writer.start()
+    await writer.close()
+    assert ws.sent == [
+        {"type": "batch", "messages": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]},
+        {"type": "text", "text": "c"},
+        b"audio",
+        {"type": "text", "text": "d"},
+    ]
+    assert writer.stats()["frames"] == 4 and writer.sent == 5
+
+
+async def test_slow_socket_never_blocks_the_producer():
+    ws = FakeSocket(delay=0.01)
+    writer = OutboundWriter(ws, max_queue=16).start()
+    for i in range(200):
+        writer.put({"type": "usage", "total_tokens": 1})
+        writer.put(b"x")
+    assert writer.depth <= 16
+    await writer.close(timeout=1.0)
+    assert writer.dropped + writer.merged + writer.sent == writer.enqueued
+
+
+async def test_close_stops_a_writer_stuck_on_a_send():
+    writer = OutboundWriter(FakeSocket(delay=10)).start()
+    writer.put({"type": "usage", "total_tokens": 1})
+    await asyncio.sleep(0)
+    await writer.close(timeout=0.01)
+    assert writer._task.done()
+
+
+async def test_close_lets_the_callers_cancellation_through():
+    writer = OutboundWriter(FakeSocket(delay=10)).start()
+    writer.put({"type": "usage", "total_tokens": 1})
+    closing = asyncio.create_task(writer.close(timeout=5))
+    await asyncio.sleep(0.01)
+    closing.cancel()
+    try:
+        await closing
+    except asyncio.CancelledError:
+        pass
+    assert closing.cancelled()
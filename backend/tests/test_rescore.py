@@ -0,0 +1,42 @@
+import pyarrow.dataset as ds
+
+from app.rescore import ScoreWriter, dedupe_scores, scored_ids
+
+
+def row(session_id: str, scored_at: int, error: str | None = None, scorer: str = "stub") -> dict:
+    return {"session_id": session_id, "scorer": scorer, "scored_at": scored_at, "error": error}
+
+
+def rows(out) -> list[tuple]:
+    table = ds.dataset(out, format="parquet").to_table()
+    return sorted((r["session_id"], r["scorer"], r["error"]) for r in table.to_pylist())
+
+
+def write_run(out, run: str, batch: list[dict]) -> ScoreWriter:
+    writer = ScoreWriter(out, rows_per_group=2, rows_per_file=2)
+    writer.run = run
+    for r in batch:
+        writer.write(r)
+    writer.close()
+    return writer
+
+
+def test_retried_call_keeps_only_its_final_row(tmp_path):
+    write_run(tmp_path, "1", [row("a", 1), row("b", 1, "ValueError: bad"), row("c", 1)])
+    assert scored_ids(tmp_path, "stub") == {"a", "c"}
+
+    writer = write_run(tmp_path, "2", [row("b", 2)])
+    assert writer.superseded == 1
+    assert rows(tmp_path) == [("a", "stub", None), ("b", "stub", None), ("c", "stub", None)]
+    assert not list(tmp_path.glob("_*"))
+
+
+def test_rows_from_other_scorers_are_kept(tmp_path):
+    write_run(tmp_path, "1", [row("a", 1), row("a", 2, scorer="gemini")])
+    assert dedupe_scores(tmp_path) == 0
+    assert len(rows(tmp_path)) == 2
+
+
+def test_error_row_loses_a_tie(tmp_path):
+    write_run(tmp_path, "1", [row("a", 5, "TimeoutError: "), row("a", 5)])
+    assert rows(tmp_path) == [("a", "stub", None)]
@@ -0,0 +1,87 @@
+import asyncio
+
+from app.outbound import OutboundWriter, ReplayLog
+from app.resume import ResumableCalls
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+async def test_claim_within_grace_cancels_expiry():
+    expired = []
+
+    async def on_expire(call):
+        expired.append(call)
+
+    calls = ResumableCalls(on_expire, grace_seconds=0.05)
+    calls.register("token", "call")
+    calls.park("token", "call")
+    assert calls.claim("token") == "call"
+    await asyncio.sleep(0.1)
+    assert expired == []
+    assert calls.stats() == {"calls": 1, "parked": 0, "resumed": 1, "expired": 0}
+
+
+async def test_parked_call_expires_and_cannot_be_claimed():
+    expired = []
+
+    async def on_expire(call):
+        expired.append(call)
+
+    calls = ResumableCalls(on_expire, grace_seconds=0.01)
+    calls.register("token", "call")
+    calls.park("token", "call")
+    await asyncio.sleep(0.05)
+    assert expired == ["call"]
+    assert calls.claim("token") is None
+    assert calls.claim(None) is None
+    assert calls.stats()["expired"] == 1
+
+
+async def test_close_all_ends_parked_calls_only():
+    expired = []
+
+    async def on_expire(call):
+        expired.append(call)
+
+    calls = ResumableCalls(on_expire, grace_seconds=60)
+    calls.register("parked", "a")
+    calls.register("attached", "b")
+    calls.park("parked", "a")
+    await calls.close_all()
+    assert expired == ["a"]
+    assert calls.stats()["calls"] == 1
+
+
+def test_replay_log_numbers_a_copy():
+    log = ReplayLog()
+    message = {"type": "text", "text": "hi"}
+    entry = log.record(message)
+    assert "seq" not in message
+    assert entry == {"type": "text", "text": "hi", "seq": 1}
+    assert log.since(0) == [entry]
+    assert log.since(1) == []
+
+
+async def test_attach_replays_messages_after_last_seq():
+    writer = OutboundWriter(None, replay=ReplayLog())
+    first = {"type": "text", "text": "one"}
+    writer.put(first)
+    writer.put({"type": "usage", "total_tokens": 5})  # Not replayable
+    writer.put(b"audio")  # Dropped while detached
+    writer.put({"type": "transcript", "source": "input", "text": "two", "partial": False})
+    assert "seq" not in first
+
+    ws = FakeSocket()
+    writer.start()
+    writer.attach(ws, last_seq=1)
+    await writer.close()
+    assert ws.sent == [{"type": "transcript", "source": "input", "text": "two", "partial": False, "seq": 2}]
@@ -0,0 +1,99 @@
+from google.adk.events import Event
+from google.genai import types
+
+from app.sessions import EVENT_OVERHEAD_BYTES, BoundedSessionService
+
+APP = "app"
+USER = "user"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def text_event(text: str) -> Event:
+    return Event(author="user", content=types.Content(role="user", parts=[types.Part(text=text)]))
+
+
+async def create(service: BoundedSessionService, session_id: str):
+    return await service.create_session(app_name=APP, user_id=USER, session_id=session_id)
+
+
+async def exists(service: BoundedSessionService, session_id: str) -> bool:
+    return await service.get_session(app_name=APP, user_id=USER, session_id=session_id) is not None
+
+
+async def test_lru_evicts_least_recently_used_unpinned():
+    service = BoundedSessionService(max_sessions=2)
+    await create(service, "a")
+    await create(service, "b")
+    service.pin(app_name=APP, user_id=USER, session_id="a")
+    await create(service, "c")
+    assert await exists(service, "a")
+    assert not await exists(service, "b")
+    assert service.stats()["evicted_lru"] == 1
+
+
+async def test_pinned_sessions_can_leave_the_store_over_its_cap():
+    service = BoundedSessionService(max_sessions=1)
+    await create(service, "a")
+    service.pin(app_name=APP, user_id=USER, session_id="a")
+    await create(service, "b")
+    assert service.live_sessions == 2
+    await service.delete_session(app_name=APP, user_id=USER, session_id="a")
+    assert service.stats()["pinned"] == 0
+    await create(service, "c")
+    assert not await exists(service, "b")
+
+
+async def test_ttl_skips_pinned_sessions():
+    clock = FakeClock()
+    service = BoundedSessionService(ttl_seconds=10, clock=clock)
+    await create(service, "idle")
+    await create(service, "running")
+    service.pin(app_name=APP, user_id=USER, session_id="running")
+    clock.now = 11
+    assert service.evict_expired() == 1
+    assert not await exists(service, "idle")
+    assert await exists(service, "running")
+
+
+async def test_byte_cap_evicts_idle_sessions_first():
+    event_size = EVENT_OVERHEAD_BYTES + 1000
+    service = BoundedSessionService(max_bytes=3 * event_size)
+    idle = await create(service, "idle")
+    running = await create(service, "running")
+    service.pin(app_name=APP, user_id=USER, session_id="running")
+    await service.append_event(idle, text_event("x" * 1000))
+    await service.append_event(running, text_event("x" * 1000))
+    await service.append_event(running, text_event("x" * 1000))
+    assert service.total_bytes == 3 * event_size
+    await service.append_event(running, text_event("x" * 1000))
+    assert not await exists(service, "idle")
+    assert service.stats()["evicted_bytes"] == 1
+    assert service.total_bytes == 3 * event_size
+
+
+async def test_per_session_byte_cap_trims_oldest_events():
+    event_size = EVENT_OVERHEAD_BYTES + 1000
+    service = BoundedSessionService(max_bytes_per_session=2 * event_size)
+    session = await create(service, "call")
+    for text in ("a", "b", "c"):
+        await service.append_event(session, text_event(text * 1000))
+    stored = await service.get_session(app_name=APP, user_id=USER, session_id="call")
+    assert [e.content.parts[0].text[0] for e in stored.events] == ["b", "c"]
+    assert service.trimmed_events == 1
+    assert service.total_bytes == 2 * event_size
+
+
+async def test_delete_releases_bytes():
+    service = BoundedSessionService()
+    session = await create(service, "call")
+    await service.append_event(session, text_event("hello"))
+    await service.delete_session(app_name=APP, user_id=USER, session_id="call")
+    assert service.total_bytes == 0
+    assert service.stats()["deleted"] == 1
@@ -0,0 +1,94 @@
+import asyncio
+
+from google.adk.events import Event
+from google.genai import types
+
+from app.shutdown import CallShutdown
+
+
+def text(value: str = "ok") -> Event:
+    return Event(author="coach", content=types.Content(role="model", parts=[types.Part(text=value)]))
+
+
+def turn_complete() -> Event:
+    return Event(author="coach", turn_complete=True)
+
+
+def summary_call() -> Event:
+    part = types.Part(function_call=types.FunctionCall(name="save_call_summary", args={}))
+    return Event(author="coach", content=types.Content(role="model", parts=[part]))
+
+
+def summary_result() -> Event:
+    part = types.Part(function_response=types.FunctionResponse(name="save_call_summary", response={}))
+    return Event(author="coach", content=types.Content(role="user", parts=[part]))
+
+
+async def run(shutdown: CallShutdown, events_after_request: list[Event]) -> tuple[str, list[str]]:
+    """Start summarizing, feed ``events_after_request`` one loop turn apart."""
+    upstream = asyncio.create_task(asyncio.sleep(60))
+    sent = []
+    waiter = asyncio.create_task(shutdown.summarize(upstream, lambda: sent.append("request")))
+    await asyncio.sleep(0)
+    for event in events_after_request:
+        shutdown.on_event(event)
+        await asyncio.sleep(0)
+    outcome = await waiter
+    upstream.cancel()
+    return outcome, sent
+
+
+async def test_in_flight_turn_complete_is_not_a_decline():
+    shutdown = CallShutdown(deadline=1.0)
+    shutdown.on_event(text("answering the rep"))  # Mid-turn when the call ends
+    outcome, sent = await run(shutdown, [
+        text("…rest of that answer"),
+        turn_complete(),  # Ends the old turn, not the summary turn
+        summary_call(),
+        turn_complete(),
+        summary_result(),
+    ])
+    assert sent == ["request"]
+    assert outcome == "model"
+
+
+async def test_turn_complete_without_summary_is_a_decline():
+    shutdown = CallShutdown(deadline=1.0)
+    shutdown.on_event(text())
+    shutdown.on_event(turn_complete())  # Idle when the call ends
+    outcome, _ = await run(shutdown, [text("no summary, sorry"), turn_complete()])
+    assert outcome == "declined"
+
+
+async def test_in_flight_turn_then_decline():
+    shutdown = CallShutdown(deadline=1.0)
+    shutdown.on_event(text())
+    outcome, _ = await run(shutdown, [turn_complete(), text("no"), turn_complete()])
+    assert outcome == "declined"
+
+
+async def test_interrupted_turn_is_not_in_flight():
+    shutdown = CallShutdown(deadline=1.0)
+    shutdown.on_event(text())
+    shutdown.on_event(Event(author="coach", interrupted=True))
+    outcome, _ = await run(shutdown, [turn_complete()])
+    assert outcome == "declined"
+
+
+async def test_deadline_and_upstream_closed():
+    shutdown = CallShutdown(deadline=0.01)
+    outcome, _ = await run(shutdown, [])
+    assert outcome == "deadline"
+
+    shutdown = CallShutdown(deadline=1.0)
+    upstream = asyncio.create_task(asyncio.sleep(0))
+    assert await shutdown.summarize(upstream) == "upstream_closed"
+
+
+async def test_skip_and_events_after_close():
+    shutdown = CallShutdown()
+    shutdown.skip()
+    assert shutdown.outcome == "skipped"
+    shutdown.on_event(summary_result())
+    assert await shutdown.summarize(asyncio.create_task(asyncio.sleep(0))) == "skipped"
+    assert shutdown.stats() == {"outcome": "skipped", "waited_ms": None}
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.vad import LIMITS, VadSettings, VoiceGate
+
+DEFAULT = VadSettings()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"threshold_db": "loud"},
+        {"margin_db": [1]},
+        {"hangover_ms": "nan"},
+        {"threshold_db": float("inf")},
+        {"preroll_ms": None},
+        {"thin_every": True},
+        {"mode": "loud"},
+        {"mode": 3},
+        "loud",
+        42,
+    ],
+)
+def test_invalid_values_keep_defaults(value):
+    assert DEFAULT.merged(value) == DEFAULT
+
+
+def test_numbers_are_coerced_and_clamped():
+    merged = DEFAULT.merged({"threshold_db": "-40", "hangover_ms": 1e9, "thin_every": 0, "margin_db": -5})
+    assert merged.threshold_db == -40.0
+    assert merged.hangover_ms == LIMITS["hangover_ms"][1]
+    assert merged.thin_every == 1
+    assert merged.margin_db == 0.0
+    assert isinstance(merged.hangover_ms, int)
+
+
+def test_modes():
+    assert DEFAULT.merged(True).mode == "gate"
+    assert DEFAULT.merged(False).mode == "off"
+    assert DEFAULT.merged("thin").mode == "thin"
+    assert DEFAULT.merged({"mode": "gate", "unknown": 1}).mode == "gate"
+
+
+def test_thin_every_zero_does_not_break_the_gate():
+    settings = DEFAULT.merged({"mode": "thin", "thin_every": 0})
+    gate = VoiceGate(settings)
+    silence = np.zeros(16000, dtype=np.int16).tobytes()  # 1 s
+    ops = gate.process(silence)
+    # Every silent frame is sent when thinning by 1
+    assert sum(len(op) for op in ops if isinstance(op, bytes)) == len(silence)
@@ -1,4 +1,4 @@
-import { useCallback } from 'react';
+import { useCallback, useRef } from 'react';
 import { useWebSocket } from './hooks/useWebSocket';
 import { useAudioStream } from './hooks/useAudioStream';
 import { useAudioPlayback } from './hooks/useAudioPlayback';
@@ -11,13 +11,24 @@ import { ObjectionTracker } from './components/ObjectionTracker';
 import { SentimentGauge } from './components/SentimentGauge';
 import { KeyMoments } from './components/KeyMoments';
 import { TranscriptPanel } from './components/TranscriptPanel';
-import type { CallMode, ServerMessage } from './lib/types';
+import type { CallMode, ClientMessage, ServerMessage } from './lib/types';
+import { KIND_AUDIO, KIND_IMAGE, packFrame, type BinaryFrame } from './lib/protocol';
+
+const INPUT_SAMPLE_RATE = 16000;
 
 function App() {
   const { state, startCall, endCall, setConnected, handleServerMessage } =
     useCallMetrics();
 
-  const { playChunk, stop: stopPlayback } = useAudioPlayback();
+  const { playChunk, playPcm, flush: flushPlayback, stop: stopPlayback } = useAudioPlayback();
+
+  // Set while the server's inbound audio queue is backed up
+  const micPausedRef = useRef(false);
+  const sendRef = useRef<((msg: ClientMessage) => void) | null>(null);
+  const snapshotPendingRef = useRef(false);
+  // Resume token of the current call and the last dashboard seq seen,
+  // so an auto-reconnect picks the same call back up
+  const resumeRef = useRef<{ token: string; mode: CallMode; lastSeq?: number } | null>(null);
 
   // Handle server messages — both metrics + audio playback
   const onServerMessage = useCallback(
@@ -26,17 +37,64 @@ function App() {
       if (msg.type === 'audio' && msg.data) {
         playChunk(msg.data);
       }
-      // Forward all messages to metrics handler
-      handleServerMessage(msg);
+      if (msg.type === 'status' && msg.resume && resumeRef.current) {
+        resumeRef.current.token = msg.resume;
+      }
+      if (msg.seq !== undefined && resumeRef.current) {
+        resumeRef.current.lastSeq = Math.max(resumeRef.current.lastSeq ?? 0, msg.seq);
+      }
+      if (msg.type === 'backpressure') {
+        micPausedRef.current = msg.paused;
+      }
+      // The rep talked over the prospect: cut its audio off right away
+      if (msg.type === 'interrupt') {
+        const flushedMs = flushPlayback();
+        sendRef.current?.({ type: 'playback_flushed', flushed_ms: Math.round(flushedMs) });
+      }
+      // Forward all messages to metrics handler; a gap in dashboard deltas
+      // is repaired with a fresh snapshot
+      if (msg.type === 'dashboard_snapshot') {
+        snapshotPendingRef.current = false;
+      }
+      if (!handleServerMessage(msg) && !snapshotPendingRef.current) {
+        snapshotPendingRef.current = true;
+        sendRef.current?.({ type: 'snapshot' });
+      }
+    },
+    [handleServerMessage, playChunk, flushPlayback]
+  );
+
+  // Binary frames — raw 24 kHz PCM from the AI prospect
+  const onBinaryFrame = useCallback(
+    (frame: BinaryFrame) => {
+      if (frame.kind === KIND_AUDIO) {
+        playPcm(frame.payload);
+      }
     },
-    [handleServerMessage, playChunk]
+    [playPcm]
   );
 
-  const { isConnected, connect, disconnect, send } = useWebSocket({
+  const { isConnected, connect, disconnect, send, sendBinary } = useWebSocket({
     onMessage: onServerMessage,
+    onBinary: onBinaryFrame,
     onConnect: () => setConnected(true),
     onDisconnect: () => setConnected(false),
+    getReconnectMessage: () => {
+      const call = resumeRef.current;
+      if (!call?.token) return undefined;
+      return {
+        type: 'config',
+        mode: call.mode,
+        binary: true,
+        batch: true,
+        dashboard: 'delta',
+        resume: call.token,
+        last_seq: call.lastSeq,
+      };
+    },
   });
+  // onServerMessage is created before the socket, so it replies through a ref
+  sendRef.current = send;
 
   const { isRecording, startRecording, stopRecording } = useAudioStream();
   const { isSharing, startSharing, stopSharing } = useScreenShare();
@@ -44,17 +102,21 @@ function App() {
   const handleStartCall = useCallback(
     async (mode: CallMode, persona?: string) => {
       startCall(mode);
+      resumeRef.current = { token: '', mode };
 
       // Connect WebSocket with config as the first message
       // (server expects config as the initial frame to select agent + mode)
-      connect({ type: 'config', mode, persona });
+      connect({ type: 'config', mode, persona, binary: true, batch: true, dashboard: 'delta' });
 
-      // Start audio capture — stream mic audio to the server
-      await startRecording((base64) => {
-        send({ type: 'audio', data: base64 });
+      // Start audio capture — stream raw mic PCM to the server
+      let seq = 0;
+      micPausedRef.current = false;
+      await startRecording((pcm) => {
+        if (micPausedRef.current) return;
+        sendBinary(packFrame(KIND_AUDIO, pcm, seq++, INPUT_SAMPLE_RATE));
       });
     },
-    [connect, startCall, startRecording, send]
+    [connect, startCall, startRecording, sendBinary]
   );
 
   const handleEndCall = useCallback(() => {
@@ -62,6 +124,7 @@ function App() {
     stopSharing();
     stopPlayback();
     send({ type: 'end' });
+    resumeRef.current = null;
     // Short delay then disconnect (give server time for call summary)
     setTimeout(() => disconnect(), 2000);
     endCall();
@@ -72,10 +135,15 @@ function App() {
       stopSharing();
     } else {
       await startSharing((base64) => {
-        send({ type: 'image', data: base64 });
+        const binary = atob(base64);
+        const jpeg = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+          jpeg[i] = binary.charCodeAt(i);
+        }
+        sendBinary(packFrame(KIND_IMAGE, jpeg));
       });
     }
-  }, [isSharing, startSharing, stopSharing, send]);
+  }, [isSharing, startSharing, stopSharing, sendBinary]);
 
   return (
     <div className="min-h-screen bg-[#0a0a0f] text-white">
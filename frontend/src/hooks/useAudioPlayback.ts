@@ -9,6 +9,8 @@ const OUTPUT_SAMPLE_RATE = 24000; // Gemini outputs 24kHz PCM
 export function useAudioPlayback() {
   const contextRef = useRef<AudioContext | null>(null);
   const nextStartTimeRef = useRef(0);
+  // Scheduled or playing chunks, so a barge-in can cut them off
+  const sourcesRef = useRef(new Set<AudioBufferSourceNode>());
 
   const getContext = useCallback(() => {
     if (!contextRef.current || contextRef.current.state === 'closed') {
@@ -18,19 +20,12 @@ export function useAudioPlayback() {
     return contextRef.current;
   }, []);
 
-  const playChunk = useCallback(
-    (base64Pcm: string) => {
+  const playPcm = useCallback(
+    (pcm: ArrayBuffer) => {
       const ctx = getContext();
 
-      // Decode base64 to Int16 PCM bytes
-      const binary = atob(base64Pcm);
-      const bytes = new Uint8Array(binary.length);
-      for (let i = 0; i < binary.length; i++) {
-        bytes[i] = binary.charCodeAt(i);
-      }
-
       // Convert Int16 PCM to Float32 for Web Audio API
-      const int16 = new Int16Array(bytes.buffer);
+      const int16 = new Int16Array(pcm);
       const float32 = new Float32Array(int16.length);
       for (let i = 0; i < int16.length; i++) {
         float32[i] = int16[i] / 32768;
@@ -43,6 +38,8 @@ export function useAudioPlayback() {
       const source = ctx.createBufferSource();
       source.buffer = buffer;
       source.connect(ctx.destination);
+      sourcesRef.current.add(source);
+      source.onended = () => sourcesRef.current.delete(source);
 
       // Schedule seamless playback — queue chunks back-to-back
       const now = ctx.currentTime;
@@ -53,13 +50,43 @@ export function useAudioPlayback() {
     [getContext]
   );
 
+  /** Legacy path: base64-encoded PCM from a JSON ``audio`` message. */
+  const playChunk = useCallback(
+    (base64Pcm: string) => {
+      const binary = atob(base64Pcm);
+      const bytes = new Uint8Array(binary.length);
+      for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+      }
+      playPcm(bytes.buffer);
+    },
+    [playPcm]
+  );
+
+  /**
+   * Barge-in: silence now and drop everything scheduled.
+   * Returns how many ms of queued audio were discarded.
+   */
+  const flush = useCallback(() => {
+    const ctx = contextRef.current;
+    const flushedMs = ctx ? Math.max(0, nextStartTimeRef.current - ctx.currentTime) * 1000 : 0;
+    sourcesRef.current.forEach((source) => {
+      source.onended = null;
+      source.stop();
+    });
+    sourcesRef.current.clear();
+    nextStartTimeRef.current = 0;
+    return flushedMs;
+  }, []);
+
   const stop = useCallback(() => {
     if (contextRef.current && contextRef.current.state !== 'closed') {
       contextRef.current.close();
     }
     contextRef.current = null;
     nextStartTimeRef.current = 0;
+    sourcesRef.current.clear();
   }, []);
 
-  return { playChunk, stop };
+  return { playChunk, playPcm, flush, stop };
 }
@@ -8,9 +8,10 @@ export function useAudioStream() {
   const streamRef = useRef<MediaStream | null>(null);
   const contextRef = useRef<AudioContext | null>(null);
   const processorRef = useRef<ScriptProcessorNode | null>(null);
-  const onChunkRef = useRef<((base64: string) => void) | null>(null);
+  const onChunkRef = useRef<((pcm: Int16Array) => void) | null>(null);
 
-  const startRecording = useCallback(async (onChunk: (base64: string) => void) => {
+  /** Streams 16 kHz Int16 PCM chunks to ``onChunk`` (raw, not base64). */
+  const startRecording = useCallback(async (onChunk: (pcm: Int16Array) => void) => {
     try {
       onChunkRef.current = onChunk;
 
@@ -39,14 +40,7 @@ export function useAudioStream() {
           const s = Math.max(-1, Math.min(1, float32[i]));
           int16[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
         }
-        // Convert to base64
-        const bytes = new Uint8Array(int16.buffer);
-        let binary = '';
-        for (let i = 0; i < bytes.length; i++) {
-          binary += String.fromCharCode(bytes[i]);
-        }
-        const base64 = btoa(binary);
-        onChunkRef.current?.(base64);
+        onChunkRef.current?.(int16);
       };
 
       source.connect(processor);
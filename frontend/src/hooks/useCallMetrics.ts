@@ -1,5 +1,6 @@
 import { useCallback, useRef, useState } from 'react';
 import type {
+  DashboardDelta,
   DashboardState,
   Objection,
   KeyMoment,
@@ -9,6 +10,9 @@ import type {
   TranscriptEntry,
 } from '../lib/types';
 
+// Transcript entries kept on screen; a 90-minute call produces thousands
+const TRANSCRIPT_WINDOW = 300;
+
 const initialState: DashboardState = {
   isConnected: false,
   isCallActive: false,
@@ -23,11 +27,36 @@ const initialState: DashboardState = {
   transcript: [],
 };
 
+/** Apply one server-folded dashboard delta (config.dashboard = 'delta'). */
+function applyDelta(s: DashboardState, delta: DashboardDelta): DashboardState {
+  const { set = {}, add = {}, drop = {} } = delta;
+  const dropped = new Set(drop.objections ?? []);
+  return {
+    ...s,
+    sentiment: set.sentiment ?? s.sentiment,
+    scores: set.scores ? { ...s.scores, ...set.scores } : s.scores,
+    talkRatio: set.talkRatio ?? s.talkRatio,
+    coachingTips: add.coachingTips
+      ? [...[...add.coachingTips].reverse(), ...s.coachingTips].slice(0, 10)
+      : s.coachingTips,
+    objections: [...s.objections, ...(add.objections ?? [])].filter(
+      (o) => !o.hintId || !dropped.has(o.hintId)
+    ),
+    keyMoments: add.keyMoments ? [...s.keyMoments, ...add.keyMoments] : s.keyMoments,
+    transcript: add.transcript
+      ? [...s.transcript, ...add.transcript].slice(-TRANSCRIPT_WINDOW)
+      : s.transcript,
+  };
+}
+
 export function useCallMetrics() {
   const [state, setState] = useState<DashboardState>(initialState);
   const timerRef = useRef<ReturnType<typeof setInterval> | undefined>(undefined);
+  // Last server dashboard version applied (delta protocol only)
+  const dashboardVersionRef = useRef(0);
 
   const startCall = useCallback((mode: CallMode) => {
+    dashboardVersionRef.current = 0;
     setState((s) => ({
       ...initialState,
       isConnected: s.isConnected,
@@ -48,7 +77,27 @@ export function useCallMetrics() {
     setState((s) => ({ ...s, isConnected: connected }));
   }, []);
 
-  const handleServerMessage = useCallback((msg: ServerMessage) => {
+  /** Returns false when a delta arrived out of order and a snapshot is needed. */
+  const handleServerMessage = useCallback((msg: ServerMessage): boolean => {
+    if (msg.type === 'dashboard_snapshot') {
+      const { state: snapshot } = msg;
+      dashboardVersionRef.current = msg.v;
+      setState((s) => ({
+        ...s,
+        ...snapshot,
+        transcript: snapshot.transcript.slice(-TRANSCRIPT_WINDOW),
+      }));
+      return true;
+    }
+    if (msg.type === 'dashboard_delta') {
+      if (msg.v <= dashboardVersionRef.current) return true; // Already in a snapshot
+      if (msg.v !== dashboardVersionRef.current + 1) return false;
+      const delta = msg;
+      dashboardVersionRef.current = delta.v;
+      setState((s) => applyDelta(s, delta));
+      return true;
+    }
+
     if (msg.type === 'tool_call') {
       const { name, args } = msg;
 
@@ -74,7 +123,7 @@ export function useCallMetrics() {
           if ((args.next_steps_score as number) >= 0) {
             updates.scores = { ...(updates.scores || s.scores), nextSteps: args.next_steps_score as number };
           }
-          if ((args.rep_talk_pct as number) >= 0) {
+          if ((args.rep_talk_pct as number) >= 0 && !s.talkRatio.measured) {
             updates.talkRatio = {
               rep: args.rep_talk_pct as number,
               prospect: 100 - (args.rep_talk_pct as number),
@@ -107,6 +156,32 @@ export function useCallMetrics() {
       }
     }
 
+    // Local fast-path hint — shown provisionally until the model weighs in
+    if (msg.type === 'objection_hint') {
+      const objection: Objection = {
+        type: msg.category,
+        text: msg.text,
+        suggestedResponse: msg.framework,
+        timestamp: Date.now() / 1000,
+        hintId: msg.id,
+      };
+      setState((s) => ({ ...s, objections: [...s.objections, objection] }));
+    }
+
+    // The model's log_objection (already added above) replaces the hint
+    if (msg.type === 'objection_hint_resolved') {
+      setState((s) => ({
+        ...s,
+        objections: s.objections.filter((o) => o.hintId !== msg.id),
+      }));
+    }
+
+    // Server-measured talk ratio supersedes the model's estimate
+    if (msg.type === 'talk_ratio' && msg.rep_pct !== null && msg.prospect_pct !== null) {
+      const { rep_pct: rep, prospect_pct: prospect } = msg;
+      setState((s) => ({ ...s, talkRatio: { rep, prospect, measured: true } }));
+    }
+
     // Transcriptions — only add finalized (non-partial) entries
     if (msg.type === 'transcript' && !msg.partial && msg.text.trim()) {
       const entry: TranscriptEntry = {
@@ -116,9 +191,10 @@ export function useCallMetrics() {
       };
       setState((s) => ({
         ...s,
-        transcript: [...s.transcript, entry],
+        transcript: [...s.transcript.slice(-(TRANSCRIPT_WINDOW - 1)), entry],
       }));
     }
+    return true;
   }, []);
 
   const reset = useCallback(() => {
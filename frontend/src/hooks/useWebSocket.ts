@@ -1,13 +1,23 @@
 import { useCallback, useEffect, useRef, useState } from 'react';
-import type { ClientMessage, ServerMessage } from '../lib/types';
+import type { ClientMessage, ServerBatch, ServerMessage } from '../lib/types';
+import { unpackFrame, type BinaryFrame } from '../lib/protocol';
 
 interface UseWebSocketOptions {
   onMessage: (msg: ServerMessage) => void;
+  onBinary?: (frame: BinaryFrame) => void;
   onConnect?: () => void;
   onDisconnect?: () => void;
+  /** First message after an automatic reconnect, e.g. a resume request */
+  getReconnectMessage?: () => ClientMessage | undefined;
 }
 
-export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocketOptions) {
+export function useWebSocket({
+  onMessage,
+  onBinary,
+  onConnect,
+  onDisconnect,
+  getReconnectMessage,
+}: UseWebSocketOptions) {
   const wsRef = useRef<WebSocket | null>(null);
   const [isConnected, setIsConnected] = useState(false);
   const reconnectTimeout = useRef<ReturnType<typeof setTimeout> | undefined>(undefined);
@@ -31,6 +41,7 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
       const wsUrl = `${protocol}//${window.location.host}/ws`;
 
       const ws = new WebSocket(wsUrl);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         setIsConnected(true);
@@ -42,9 +53,20 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
       };
 
       ws.onmessage = (event) => {
+        // Binary frames carry raw PCM audio (negotiated via config.binary)
+        if (event.data instanceof ArrayBuffer) {
+          const frame = unpackFrame(event.data);
+          if (frame) onBinary?.(frame);
+          return;
+        }
         try {
-          const msg: ServerMessage = JSON.parse(event.data);
-          onMessage(msg);
+          const msg: ServerMessage | ServerBatch = JSON.parse(event.data);
+          // Bursts arrive as one batch frame (negotiated via config.batch)
+          if (msg.type === 'batch') {
+            msg.messages.forEach(onMessage);
+          } else {
+            onMessage(msg);
+          }
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e);
         }
@@ -55,7 +77,7 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
         onDisconnect?.();
         // Only auto-reconnect if enabled
         if (autoReconnectRef.current) {
-          reconnectTimeout.current = setTimeout(() => connect(), 3000);
+          reconnectTimeout.current = setTimeout(() => connect(getReconnectMessage?.()), 3000);
         }
       };
 
@@ -65,7 +87,7 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
 
       wsRef.current = ws;
     },
-    [onMessage, onConnect, onDisconnect]
+    [onMessage, onBinary, onConnect, onDisconnect, getReconnectMessage]
   );
 
   const disconnect = useCallback(() => {
@@ -84,6 +106,12 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
     }
   }, []);
 
+  const sendBinary = useCallback((frame: ArrayBuffer) => {
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(frame);
+    }
+  }, []);
+
   useEffect(() => {
     return () => {
       autoReconnectRef.current = false;
@@ -92,5 +120,5 @@ export function useWebSocket({ onMessage, onConnect, onDisconnect }: UseWebSocke
     };
   }, []);
 
-  return { isConnected, connect, disconnect, send };
+  return { isConnected, connect, disconnect, send, sendBinary };
 }
@@ -0,0 +1,50 @@
+/**
+ * Binary WebSocket frame protocol — mirrors backend/app/protocol.py.
+ *
+ * 8-byte big-endian header: version (u8), kind (u8), sequence (u16),
+ * sample rate in Hz (u32), followed by the raw payload.
+ */
+
+export const PROTOCOL_VERSION = 1;
+export const KIND_AUDIO = 0x01;
+export const KIND_IMAGE = 0x02;
+export const HEADER_SIZE = 8;
+
+export interface BinaryFrame {
+  kind: number;
+  seq: number;
+  sampleRate: number;
+  payload: ArrayBuffer;
+}
+
+export function packFrame(
+  kind: number,
+  payload: ArrayBuffer | ArrayBufferView,
+  seq = 0,
+  sampleRate = 0
+): ArrayBuffer {
+  const body =
+    payload instanceof ArrayBuffer
+      ? new Uint8Array(payload)
+      : new Uint8Array(payload.buffer, payload.byteOffset, payload.byteLength);
+  const frame = new ArrayBuffer(HEADER_SIZE + body.byteLength);
+  const view = new DataView(frame);
+  view.setUint8(0, PROTOCOL_VERSION);
+  view.setUint8(1, kind);
+  view.setUint16(2, seq & 0xffff);
+  view.setUint32(4, sampleRate);
+  new Uint8Array(frame, HEADER_SIZE).set(body);
+  return frame;
+}
+
+export function unpackFrame(frame: ArrayBuffer): BinaryFrame | null {
+  if (frame.byteLength < HEADER_SIZE) return null;
+  const view = new DataView(frame);
+  if (view.getUint8(0) !== PROTOCOL_VERSION) return null;
+  return {
+    kind: view.getUint8(1),
+    seq: view.getUint16(2),
+    sampleRate: view.getUint32(4),
+    payload: frame.slice(HEADER_SIZE),
+  };
+}
@@ -2,6 +2,16 @@
 
 export type CallMode = 'live' | 'practice';
 
+/** Server-side voice-activity gate on mic audio */
+export type VadMode = 'off' | 'gate' | 'thin';
+
+export interface VadOptions {
+  mode: VadMode;
+  threshold_db?: number;
+  hangover_ms?: number;
+  preroll_ms?: number;
+}
+
 export type Sentiment = 'positive' | 'neutral' | 'negative';
 
 export type ObjectionType =
@@ -47,11 +57,15 @@ export interface Objection {
   text: string;
   suggestedResponse: string;
   timestamp: number;
+  /** Set on local fast-path hints until the model confirms or overrides them */
+  hintId?: string;
 }
 
 export interface TalkRatio {
   rep: number;
   prospect: number;
+  /** True once the server has measured it from the audio (model guesses are ignored) */
+  measured?: boolean;
 }
 
 export interface TranscriptEntry {
@@ -74,6 +88,62 @@ export interface DashboardState {
   transcript: TranscriptEntry[];
 }
 
+/** Dashboard fields the server folds itself (config.dashboard = 'delta') */
+export type DashboardFields = Pick<
+  DashboardState,
+  'coachingTips' | 'sentiment' | 'scores' | 'talkRatio' | 'objections' | 'keyMoments' | 'transcript'
+>;
+
+export interface DashboardDelta {
+  type: 'dashboard_delta';
+  v: number;
+  set?: { sentiment?: Sentiment; scores?: Partial<Scores>; talkRatio?: TalkRatio };
+  /** Appended in order; coaching tips are prepended (newest first) */
+  add?: {
+    coachingTips?: string[];
+    objections?: Objection[];
+    keyMoments?: KeyMoment[];
+    transcript?: TranscriptEntry[];
+  };
+  /** Provisional objection hints to remove, by hint id */
+  drop?: { objections?: string[] };
+}
+
+export interface Latency {
+  median_s: number;
+  p90_s: number;
+  count: number;
+}
+
+/** Post-call analytics computed by the server from the call's events */
+export interface CallAnalytics {
+  type: 'call_analytics';
+  session_id: string;
+  mode: CallMode;
+  duration_s: number;
+  overall_score: number | null;
+  summary: string;
+  talk_ratio: {
+    rep_pct: number | null;
+    prospect_pct: number | null;
+    source: 'measured' | 'transcript_words' | null;
+    per_minute: (number | null)[];
+  };
+  sentiment: { final: Sentiment; mean: number; lowest_minute: number | null; per_minute: number[] };
+  scores: Record<string, { final: number | null; mean: number | null }>;
+  objections: {
+    count: number;
+    per_minute: number[];
+    per_minute_avg: number;
+    peak_minute: number | null;
+    by_category: Record<string, number>;
+  };
+  longest_monologue: { speaker: 'rep' | 'prospect'; seconds: number; words: number; at_s: number } | null;
+  response_latency: Record<'rep' | 'prospect', Latency | null> | null;
+  coach_latency: Latency | null;
+  key_moments: { t: number; type: string; text: string }[];
+}
+
 export interface CallSummary {
   summary: string;
   overallScore: number;
@@ -90,11 +160,31 @@ export type ClientMessage =
   | { type: 'audio'; data: string }
   | { type: 'image'; data: string; mimeType?: string }
   | { type: 'text'; text: string }
-  | { type: 'config'; mode: CallMode; voice?: string; persona?: string }
+  | { type: 'playback_flushed'; flushed_ms: number }
+  | { type: 'snapshot' }
+  | {
+      type: 'config';
+      mode: CallMode;
+      voice?: string;
+      persona?: string;
+      binary?: boolean;
+      batch?: boolean;
+      vad?: VadMode | boolean | VadOptions;
+      /** Sliding-window context + periodic call-state summary for 60+ minute calls */
+      long_call?: boolean;
+      /** 'delta': the server folds the dashboard and sends dashboard_delta messages */
+      dashboard?: 'raw' | 'delta';
+      /** Live mode: also ask the model for save_call_summary() after the local analytics */
+      model_summary?: boolean;
+      /** Reattach to a dropped call: token from its status message */
+      resume?: string;
+      /** Highest ``seq`` received before the drop; only later messages are replayed */
+      last_seq?: number;
+    }
   | { type: 'end' };
 
-/** WebSocket message from server to client */
-export type ServerMessage =
+/** WebSocket message from server to client (dashboard messages carry a ``seq``) */
+export type ServerMessage = (
   | { type: 'tool_call'; name: string; args: Record<string, unknown> }
   | { type: 'tool_result'; data: Record<string, unknown> | string }
   | { type: 'text'; text: string }
@@ -102,5 +192,61 @@ export type ServerMessage =
   | { type: 'transcript'; text: string; source: 'input' | 'output'; partial: boolean }
   | { type: 'turn_complete' }
   | { type: 'usage'; prompt_tokens: number; candidates_tokens: number; total_tokens: number }
-  | { type: 'status'; message: string }
-  | { type: 'error'; message: string };
+  | {
+      type: 'status';
+      message: string;
+      protocol?: 'json' | 'binary';
+      /** Watch this call read-only on /ws/observe/{session_id}?token={observe} */
+      session_id?: string;
+      resume?: string;
+      observe?: string;
+      resumed?: boolean;
+    }
+  | {
+      type: 'objection_hint';
+      id: string;
+      category: ObjectionType;
+      trigger: string;
+      text: string;
+      framework: string;
+      source: 'input' | 'output';
+    }
+  | {
+      type: 'objection_hint_resolved';
+      id: string;
+      status: 'confirmed' | 'overridden';
+      objection_type: ObjectionType;
+      hint_ms: number;
+      model_ms: number;
+    }
+  | {
+      type: 'talk_ratio';
+      rep_pct: number | null;
+      prospect_pct: number | null;
+      rep_seconds: number;
+      prospect_seconds: number;
+      method: 'channels' | 'level_split' | 'unseparated';
+    }
+  | { type: 'backpressure'; paused: boolean }
+  | { type: 'interrupt'; reason: 'voice' | 'model'; dropped_bytes: number }
+  | DashboardDelta
+  | { type: 'dashboard_snapshot'; v: number; state: DashboardFields }
+  | CallAnalytics
+  | {
+      /** The model's summary missed its deadline; built from the call analytics */
+      type: 'call_summary';
+      source: 'local';
+      summary: string;
+      overall_score: number | null;
+      objections_faced: string[];
+      key_moments: string[];
+      talk_ratio: { rep: number | null; prospect: number | null; source: string | null };
+    }
+  | { type: 'error'; message: string }
+) & { seq?: number };
+
+/** Several server messages coalesced into one frame (config.batch) */
+export interface ServerBatch {
+  type: 'batch';
+  messages: ServerMessage[];
+}